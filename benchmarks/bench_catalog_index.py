@@ -0,0 +1,119 @@
+# benchmarks/bench_catalog_index.py
+"""
+도구 카탈로그 인덱스 벤치마크
+합성 카탈로그(기본 10,000개 도구)에서 기존 선형 탐색 + 복사 방식과
+CatalogIndex 역색인 조회를 비교합니다.
+
+실행: python benchmarks/bench_catalog_index.py [--tools N] [--categories N] [--repeat N]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.catalog_index import CatalogIndex
+
+
+def build_synthetic_catalog(tool_count: int, category_count: int, seed: int = 7):
+    """합성 도구 카탈로그와 카테고리 그룹을 생성합니다."""
+    rng = random.Random(seed)
+    categories = [f"category_{i}" for i in range(category_count)]
+    tools = {}
+    tool_categories = {category: [] for category in categories}
+
+    for i in range(tool_count):
+        tool_id = f"tool_{i}"
+        category = rng.choice(categories)
+        dependencies = rng.sample(list(tools), k=min(2, len(tools))) if tools and rng.random() < 0.2 else []
+        tools[tool_id] = {
+            "category": category,
+            "name": f"도구 {i}",
+            "description": f"합성 도구 {i}",
+            "priority": rng.randint(1, 5),
+            "inputSchema": {
+                "type": "object",
+                "properties": {"query": {"type": "string", "description": "입력"}},
+                "required": ["query"]
+            },
+            "dependencies": dependencies,
+            "estimated_time_ms": rng.randint(100, 5000)
+        }
+        tool_categories[category].append(tool_id)
+
+    return tools, tool_categories
+
+
+def legacy_recommend_scan(tools, capabilities):
+    """기존 recommend_nodes의 기능별 전체 카탈로그 선형 탐색"""
+    recommended_tools = []
+    for capability in capabilities:
+        for tool_name, tool_info in tools.items():
+            if tool_info.get("category") == capability:
+                tool_copy = tool_info.copy()
+                tool_copy["id"] = tool_name
+                recommended_tools.append(tool_copy)
+    return recommended_tools
+
+
+def legacy_select_tools(tools, tool_categories, capabilities):
+    """기존 PromptAnalyzer._select_tools의 카테고리 그룹 순회 + 복사"""
+    selected_tools = []
+    for capability in capabilities:
+        if capability in tool_categories:
+            for tool_name in tool_categories[capability]:
+                if tool_name in tools:
+                    tool_info = tools[tool_name].copy()
+                    tool_info["id"] = tool_name
+                    selected_tools.append(tool_info)
+    selected_tools.sort(key=lambda x: x.get("priority", 999))
+    return selected_tools
+
+
+def indexed_select_tools(index, capabilities):
+    """CatalogIndex 기반 도구 선택 (PromptAnalyzer._select_tools와 동일)"""
+    selected_tools = index.tools_for_capabilities(capabilities)
+    selected_tools.sort(key=lambda x: x.get("priority", 999))
+    return selected_tools
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--capabilities", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    tools, tool_categories = build_synthetic_catalog(args.tools, args.categories)
+    capabilities = list(tool_categories)[:args.capabilities]
+
+    build_s = timeit.timeit(lambda: CatalogIndex(tools), number=5) / 5
+    index = CatalogIndex(tools)
+
+    expected = legacy_recommend_scan(tools, capabilities)
+    actual = index.tools_for_capabilities(capabilities)
+    assert sorted(t["id"] for t in expected) == sorted(t["id"] for t in actual)
+    assert [t["id"] for t in legacy_select_tools(tools, tool_categories, capabilities)] == \
+        [t["id"] for t in indexed_select_tools(index, capabilities)]
+
+    def per_call_us(func):
+        return timeit.timeit(func, number=args.repeat) / args.repeat * 1e6
+
+    print(f"catalog: {args.tools} tools, {args.categories} categories, "
+          f"{len(capabilities)} capabilities -> {len(actual)} tools selected")
+    print(f"index build (once per catalog version): {build_s * 1000:.1f} ms")
+    print(f"{'path':<34} {'legacy_us':>12} {'indexed_us':>12}")
+    print(f"{'recommend_nodes tool selection':<34} "
+          f"{per_call_us(lambda: legacy_recommend_scan(tools, capabilities)):>12.1f} "
+          f"{per_call_us(lambda: index.tools_for_capabilities(capabilities)):>12.1f}")
+    print(f"{'PromptAnalyzer._select_tools':<34} "
+          f"{per_call_us(lambda: legacy_select_tools(tools, tool_categories, capabilities)):>12.1f} "
+          f"{per_call_us(lambda: indexed_select_tools(index, capabilities)):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/bench_cold_start.py
+"""
+stdio 서버 콜드 스타트 벤치마크
+MCP 클라이언트처럼 세션마다 src/server.py를 새로 띄워 initialize 응답과
+첫 analyze_prompt 응답까지 걸린 시간을 측정합니다.
+시작 시 import되면 안 되는 무거운 모듈(NumPy, 분석/추천/최적화 서비스 모듈)도 확인하며,
+중앙값이 기준을 넘거나 무거운 모듈이 import되면 종료 코드 1을 반환합니다.
+
+실행: python benchmarks/bench_cold_start.py [--runs 10] [--threshold-ms 3000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+SERVER_PATH = SRC_DIR / "server.py"
+
+# 첫 도구 호출 전에는 import되지 않아야 하는 모듈
+LAZY_MODULES = [
+    "numpy",
+    "services.prompt_analyzer",
+    "services.node_recommender",
+    "services.workflow_optimizer",
+    "services.workflow_simulator",
+    "services.workflow_designer",
+]
+
+
+def send(process: subprocess.Popen, message: dict) -> None:
+    process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+    process.stdin.flush()
+
+
+def read_response(process: subprocess.Popen, request_id: int) -> dict:
+    """요청 id에 대한 응답이 올 때까지 읽습니다 (알림은 건너뜀)."""
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("서버가 응답 없이 종료되었습니다")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def cold_start() -> dict:
+    """서버를 한 번 띄워 initialize/첫 analyze_prompt 응답 시간(ms)을 측정합니다."""
+    env = dict(os.environ, SERVER_TRANSPORT="stdio", SERVER_DEBUG="false")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER_PATH)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        env=env
+    )
+    try:
+        send(process, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_cold_start", "version": "1.0.0"}
+            }
+        })
+        read_response(process, 1)
+        initialize_ms = (time.perf_counter() - started) * 1000
+
+        send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send(process, {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {
+                "name": "analyze_prompt",
+                "arguments": {"user_prompt": "웹에서 최신 AI 뉴스를 검색하고 요약해줘", "format": "compact"}
+            }
+        })
+        response = read_response(process, 2)
+        first_call_ms = (time.perf_counter() - started) * 1000
+        if "error" in response or response["result"].get("isError"):
+            raise RuntimeError(f"analyze_prompt 호출 실패: {response}")
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {"initialize_ms": initialize_ms, "first_call_ms": first_call_ms}
+
+
+def eager_modules() -> list:
+    """server 모듈 import 직후 이미 로드된 LAZY_MODULES 목록"""
+    code = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {str(SRC_DIR)!r})\n"
+        "import server\n"
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, SERVER_DEBUG="false")
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--threshold-ms", type=float,
+                        default=float(os.getenv("COLD_START_THRESHOLD_MS", "3000")),
+                        help="첫 analyze_prompt 응답까지의 중앙값 기준 (ms)")
+    args = parser.parse_args()
+
+    # 첫 실행은 바이트코드 컴파일/디스크 캐시 영향이 있으므로 버림
+    cold_start()
+    runs = [cold_start() for _ in range(args.runs)]
+
+    print(f"runs: {args.runs}, python: {sys.version.split()[0]}, cpu count: {os.cpu_count()}")
+    print(f"{'metric':<14} {'min_ms':>9} {'median_ms':>10} {'max_ms':>9}")
+    for key in ("initialize_ms", "first_call_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:<14} {min(values):>9.1f} {statistics.median(values):>10.1f} {max(values):>9.1f}")
+
+    failures = []
+    median_first_call = statistics.median(run["first_call_ms"] for run in runs)
+    if median_first_call > args.threshold_ms:
+        failures.append(f"첫 응답 중앙값 {median_first_call:.1f} ms > 기준 {args.threshold_ms:.0f} ms")
+
+    eager = eager_modules()
+    print(f"eager modules at startup: {', '.join(eager) if eager else 'none'}")
+    if eager:
+        failures.append(f"시작 시 import된 모듈: {', '.join(eager)}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print(f"OK (threshold {args.threshold_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_incremental_optimizer.py
+"""
+증분 최적화 벤치마크
+노드 수를 늘려 가며 계층형 워크플로우(계층당 25개 처리 노드, 각 노드는 앞 계층의 1~2개 노드에 연결)를
+전체 최적화한 뒤, UI처럼 노드 하나씩 편집(소요 시간 변경, 노드 추가, 인자 변경)할 때마다
+전체를 다시 최적화하는 시간과 증분 최적화(세션만 / 저장소에 delta 버전 저장까지) 시간을 비교합니다.
+
+실행: python benchmarks/bench_incremental_optimizer.py [--sizes 500,2000,5000,10000] [--edits 60]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services import IncrementalOptimizer, OptimizationSession, WorkflowOptimizer, WorkflowStore, get_catalog_index
+from services.incremental_optimizer import apply_workflow_delta
+
+LAYER_WIDTH = 25
+
+
+def build_workflow(node_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    tools = list(get_catalog_index().views.values())
+    nodes = [{"id": "start", "type": "start", "name": "시작"}]
+    connections = []
+    previous, layer = ["start"], []
+    for i in range(node_count):
+        tool = tools[rng.randrange(len(tools))]
+        node_id = f"process_node_{i}"
+        sources = rng.sample(previous, min(len(previous), rng.randint(1, 2)))
+        nodes.append({
+            "id": node_id, "type": "process", "tool_id": tool["id"], "name": tool["name"],
+            "estimated_time_ms": rng.choice([200, 800, 1500, 3000]), "arguments": {"item": i},
+            "depends_on": [s for s in sources if s != "start"]
+        })
+        connections += [{"id": f"conn_{s}_to_{node_id}", "from_node": s, "to_node": node_id, "type": "direct"}
+                        for s in sources]
+        layer.append(node_id)
+        if len(layer) == LAYER_WIDTH:
+            previous, layer = layer, []
+    nodes.append({"id": "end", "type": "end", "name": "종료"})
+    connections += [{"id": f"conn_{s}_to_end", "from_node": s, "to_node": "end", "type": "direct"}
+                    for s in layer or previous]
+    return {"workflow_id": f"bench-{node_count}", "nodes": nodes, "connections": connections}
+
+
+def edits(session: OptimizationSession, count: int, seed: int = 1):
+    """노드 하나씩 편집하는 diff 목록 (소요 시간 변경 / 노드 추가 / 인자 변경 순환)"""
+    rng = random.Random(seed)
+    tools = list(get_catalog_index().views.values())
+    process = [n for n, node in session.graph.nodes.items() if node.get("type") == "process"]
+    for i in range(count):
+        node_id = rng.choice(process)
+        if i % 3 == 0:
+            yield {"changed_nodes": [{"id": node_id, "estimated_time_ms": rng.choice([100, 900, 2500])}]}
+        elif i % 3 == 1:
+            added = f"edited_node_{i}"
+            yield {"added_nodes": [{"id": added, "type": "process", "tool_id": tools[i % len(tools)]["id"],
+                                    "estimated_time_ms": 700, "depends_on": [node_id]}],
+                   "added_connections": [{"from_node": node_id, "to_node": added}]}
+        else:
+            yield {"changed_nodes": [{"id": node_id, "arguments": {"item": -i}}]}
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="500,2000,5000,10000")
+    parser.add_argument("--edits", type=int, default=60)
+    args = parser.parse_args()
+
+    optimizer = WorkflowOptimizer()
+    print(f"{args.edits} single-node edits per size, times in ms")
+    print(f"{'nodes':>6} {'full_optimize':>14} {'session_build':>14} "
+          f"{'incr_median':>12} {'incr_p95':>9} {'incr+store_median':>18} {'recomputed':>11}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        workflow = build_workflow(size)
+        optimized = {}
+        full_ms = timed(lambda: optimized.update(optimizer.optimize(workflow, "speed")))
+        session = None
+
+        def build():
+            nonlocal session
+            session = OptimizationSession(optimized, "speed", optimizer)
+        build_ms = timed(build)
+
+        samples, recomputed = [], []
+        for diff in edits(session, args.edits):
+            samples.append(timed(lambda: recomputed.append(session.apply(diff)["recomputed_nodes"])))
+
+        store = WorkflowStore(os.path.join(tempfile.mkdtemp(), "workflows.db"), delta_applier=apply_workflow_delta)
+        workflow_id = store.save(optimized["optimized_workflow"], "optimize_workflow:speed")["workflow_id"]
+        incremental = IncrementalOptimizer(store, optimizer)
+        incremental.optimize(workflow_id, {})  # 세션 구성
+        stored = [timed(lambda: incremental.optimize(workflow_id, diff))
+                  for diff in edits(incremental._sessions[workflow_id], args.edits)]
+
+        p95 = sorted(samples)[int(len(samples) * 0.95) - 1]
+        print(f"{len(session.graph.nodes):>6} {full_ms:>14.1f} {build_ms:>14.1f} "
+              f"{statistics.median(samples):>12.2f} {p95:>9.2f} {statistics.median(stored):>18.2f} "
+              f"{statistics.median(recomputed):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
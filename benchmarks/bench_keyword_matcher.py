@@ -0,0 +1,94 @@
+# benchmarks/bench_keyword_matcher.py
+"""
+PromptAnalyzer 키워드 매칭 벤치마크
+기존 방식(키워드마다 prompt.lower() 후 부분 문자열 검색)과
+Aho-Corasick 단일 스캔 방식을 프롬프트 길이별로 비교합니다.
+
+실행: python benchmarks/bench_keyword_matcher.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.prompt_analyzer import PromptAnalyzer
+
+SAMPLE_SENTENCE = (
+    "고객 구매 이력 데이터를 데이터베이스에서 가져와 통계 분석하고 "
+    "search the web for related information and then generate a summary report "
+    "각각의 세그먼트에 대해 결과를 비교 하고 if needed run python code "
+)
+
+# 신호 키워드가 거의 없는 붙여넣기 명세 형태의 텍스트
+FILLER_SENTENCE = (
+    "본 문서는 시스템 요구사항 명세의 일부로서 용어 정의와 배경 설명을 담고 있습니다 "
+    "the following section describes terminology background and scope of the document "
+)
+
+
+def legacy_scan(analyzer: PromptAnalyzer, prompt: str):
+    """기존 구현과 동일한 방식의 의도/기능/워크플로우 신호 감지"""
+    keywords = prompt.lower().split()
+
+    intents = []
+    for intent, words in analyzer.INTENT_KEYWORDS.items():
+        if any(word in keywords for word in words):
+            intents.append(intent)
+
+    capabilities = []
+    for capability, words in analyzer.CAPABILITY_KEYWORDS.items():
+        if any(word in prompt.lower() for word in words):
+            capabilities.append(capability)
+
+    workflow = []
+    for workflow_type, words in analyzer.WORKFLOW_KEYWORDS.items():
+        if any(word in prompt.lower() for word in words):
+            workflow.append(workflow_type)
+
+    return intents, capabilities, workflow
+
+
+def automaton_scan(analyzer: PromptAnalyzer, prompt: str):
+    """Aho-Corasick 매처 기반 신호 감지"""
+    signals = analyzer.matcher.scan(" ".join(prompt.lower().split()))
+    return (
+        list(signals["intents"]),
+        list(signals["capabilities"]),
+        list(signals["workflow"])
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    analyzer = PromptAnalyzer()
+
+    print(f"{'text':>7} {'prompt_chars':>12} {'legacy_us':>12} {'automaton_us':>14} {'analyze_us':>12}")
+    cases = [
+        (label, sentence * multiplier)
+        for label, sentence in (("dense", SAMPLE_SENTENCE), ("sparse", FILLER_SENTENCE + SAMPLE_SENTENCE))
+        for multiplier in (1, 10, 50, 200)
+    ]
+    for label, prompt in cases:
+        assert legacy_scan(analyzer, prompt) == automaton_scan(analyzer, prompt)
+
+        legacy = timeit.timeit(lambda: legacy_scan(analyzer, prompt), number=args.repeat)
+        automaton = timeit.timeit(lambda: automaton_scan(analyzer, prompt), number=args.repeat)
+        full = timeit.timeit(lambda: analyzer.analyze(prompt), number=args.repeat)
+
+        print(
+            f"{label:>7} "
+            f"{len(prompt):>12} "
+            f"{legacy / args.repeat * 1e6:>12.1f} "
+            f"{automaton / args.repeat * 1e6:>14.1f} "
+            f"{full / args.repeat * 1e6:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_pareto_optimizer.py
+"""
+파레토 최적화 벤치마크
+계층형 워크플로우(계층당 20개 처리 노드, 각 노드는 앞 계층의 1~2개 노드에 연결, 일부 도구는 대체 도구 지정)를
+시간 예산별로 파레토 최적화하여 예산 안에 끝나는지(elapsed_ms), 평가한 후보 수, 프론티어 크기와
+"p95 < 기준 p95의 110%, success >= 99%, minimize cost" 제약으로 고른 변형의 점수를 출력합니다.
+--verify-trials를 주면 선택한 변형의 해석적 p95/성공률을 몬테카를로 시뮬레이션 결과와 비교합니다.
+
+실행: python benchmarks/bench_pareto_optimizer.py [--sizes 50,200,500] [--budgets 250,1000,2000] [--verify-trials 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services import ParetoOptimizer, get_catalog_index
+
+LAYER_WIDTH = 20
+
+# 도구별 비용/실패 모델 (web_search는 비싸고 불안정한 대신 document_retrieve로 대체 가능)
+TOOL_MODEL = {
+    "default": {"failure_probability": 0.01},
+    "tools": {
+        "web_search": {"cost_per_call": 5.0, "failure_probability": 0.05},
+        "document_retrieve": {"cost_per_call": 1.0, "failure_probability": 0.02},
+        "content_generation": {"cost_per_call": 8.0, "cost_per_second": 0.5}
+    },
+    "substitutes": {"web_search": ["document_retrieve"]}
+}
+
+
+def build_workflow(node_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    tools = list(get_catalog_index().views.values())
+    nodes = [{"id": "start", "type": "start", "name": "시작"}]
+    connections = []
+    previous, layer = ["start"], []
+    for i in range(node_count):
+        tool = tools[rng.randrange(len(tools))]
+        node_id = f"process_node_{i}"
+        sources = rng.sample(previous, min(len(previous), rng.randint(1, 2)))
+        nodes.append({
+            "id": node_id, "type": "process", "tool_id": tool["id"], "name": tool["name"],
+            "estimated_time_ms": rng.choice([200, 800, 1500, 3000]), "arguments": {"item": i},
+            "depends_on": [s for s in sources if s != "start"]
+        })
+        connections += [{"id": f"conn_{s}_to_{node_id}", "from_node": s, "to_node": node_id, "type": "direct"}
+                        for s in sources]
+        layer.append(node_id)
+        if len(layer) == LAYER_WIDTH:
+            previous, layer = layer, []
+    nodes.append({"id": "end", "type": "end", "name": "종료"})
+    connections += [{"id": f"conn_{s}_to_end", "from_node": s, "to_node": "end", "type": "direct"}
+                    for s in layer or previous]
+    return {"workflow_id": f"bench-{node_count}", "nodes": nodes, "connections": connections}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50,200,500")
+    parser.add_argument("--budgets", default="250,1000,2000")
+    parser.add_argument("--verify-trials", type=int, default=0)
+    args = parser.parse_args()
+
+    optimizer = ParetoOptimizer()
+    print(f"{'nodes':>6} {'budget_ms':>10} {'elapsed_ms':>11} {'evaluated':>10} {'frontier':>9} "
+          f"{'base_p95':>9} {'base_cost':>10} {'base_ok':>8} {'sel_p95':>9} {'sel_cost':>9} {'sel_ok':>8} {'feasible':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        workflow = build_workflow(size)
+        baseline = optimizer.optimize(workflow, tool_model=TOOL_MODEL, time_budget_ms=1)["pareto"]["baseline"]
+        constraints = f"p95 < {baseline['p95_ms'] * 1.1:.0f}ms, success >= 99%, minimize cost"
+        for budget in (float(b) for b in args.budgets.split(",")):
+            started = time.perf_counter()
+            result = optimizer.optimize(workflow, tool_model=TOOL_MODEL, constraints=constraints,
+                                        time_budget_ms=budget)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            pareto = result["pareto"]
+            selected = pareto["selection"]["scores"]
+            print(f"{size:>6} {budget:>10.0f} {elapsed_ms:>11.1f} {pareto['search']['evaluated']:>10} "
+                  f"{pareto['search']['frontier_size']:>9} {baseline['p95_ms']:>9.0f} "
+                  f"{baseline['expected_cost']:>10.2f} {baseline['success_rate']:>8.4f} "
+                  f"{selected['p95_ms']:>9.0f} {selected['expected_cost']:>9.2f} {selected['success_rate']:>8.4f} "
+                  f"{str(pareto['selection']['feasible']):>9}")
+
+        if args.verify_trials:
+            result = optimizer.optimize(workflow, tool_model=TOOL_MODEL, constraints=constraints,
+                                        time_budget_ms=float(args.budgets.split(",")[-1]),
+                                        verify_trials=args.verify_trials)
+            for item in result["pareto"]["frontier"]:
+                if item["selected"]:
+                    print(f"{'':>6} selected {item['variant_id']}: analytic p95 {item['scores']['p95_ms']:.0f} ms / "
+                          f"success {item['scores']['success_rate']:.4f}, simulated p95 "
+                          f"{item['simulated']['p95_ms']:.0f} ms / success {item['simulated']['success_rate']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_schema_modes.py
+"""
+추천 결과 스키마 표현 방식 벤치마크
+같은 도구를 반복 사용하는 대규모 워크플로우(기본 500개 프로세스 노드)에 대해
+schema_mode(inline/ref/omit)별 응답 크기와 클라이언트 측 역직렬화 메모리를 비교합니다.
+
+실행: python benchmarks/bench_schema_modes.py [--nodes N] [--workflow-type TYPE]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services import NodeRecommender, get_catalog_index
+from services.node_recommender import SCHEMA_MODES
+
+
+def repeated_tools(node_count: int):
+    """의존성이 없는 카탈로그 도구를 반복하여 node_count개의 도구 목록을 만듭니다."""
+    index = get_catalog_index()
+    independent = [view for view in index.views.values() if not view.get("dependencies")]
+    return [independent[i % len(independent)] for i in range(node_count)]
+
+
+def parsed_size(payload: str) -> int:
+    """JSON 응답을 역직렬화했을 때 할당되는 메모리(bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    parsed = json.loads(payload)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del parsed
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--workflow-type", default="parallel")
+    args = parser.parse_args()
+
+    tools = repeated_tools(args.nodes)
+    recommender = NodeRecommender()
+    capabilities = sorted({tool["category"] for tool in tools})
+
+    print(f"{args.nodes} process nodes, {len({t['id'] for t in tools})} distinct tools, "
+          f"workflow_type={args.workflow_type}")
+    print(f"{'schema_mode':<12} {'bytes':>10} {'size':>7} {'parsed_bytes':>13} {'size':>7} {'recommend_ms':>13}")
+    base_bytes = base_parsed = None
+    for schema_mode in SCHEMA_MODES:
+        started = time.perf_counter()
+        recommendation = recommender.recommend(
+            intent="analyze",
+            required_capabilities=capabilities,
+            recommended_tools=tools,
+            complexity_level="high",
+            workflow_type=args.workflow_type,
+            schema_mode=schema_mode
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        payload = json.dumps(recommendation, ensure_ascii=False, separators=(",", ":"))
+        payload_bytes = len(payload.encode("utf-8"))
+        parsed_bytes = parsed_size(payload)
+        base_bytes = base_bytes or payload_bytes
+        base_parsed = base_parsed or parsed_bytes
+        print(f"{schema_mode:<12} {payload_bytes:>10} {payload_bytes / base_bytes:>7.1%} "
+              f"{parsed_bytes:>13} {parsed_bytes / base_parsed:>7.1%} {elapsed_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_serialization.py
+"""
+응답 직렬화 벤치마크
+실제 카탈로그로 만든 recommend_nodes 결과들에 대해 형식/백엔드별
+응답 크기(bytes)와 직렬화 시간을 비교합니다.
+
+실행: python benchmarks/bench_serialization.py [--repeat N]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services import NodeRecommender, get_catalog_index
+from utils import serialization
+
+
+def build_recommendations():
+    """워크플로우 타입/기능 조합별 대표 recommend_nodes 결과를 생성합니다."""
+    recommender = NodeRecommender()
+    index = get_catalog_index()
+    categories = list(index.by_category)
+    samples = []
+    for workflow_type in ("sequential", "parallel", "conditional", "loop"):
+        for count in (1, 2, len(categories)):
+            capabilities = categories[:count]
+            samples.append(recommender.recommend(
+                intent="analyze",
+                required_capabilities=capabilities,
+                recommended_tools=index.tools_for_capabilities(capabilities),
+                complexity_level="medium",
+                workflow_type=workflow_type
+            ))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = build_recommendations()
+    baseline = lambda obj: json.dumps(obj, ensure_ascii=False, indent=2)  # 기존 도구 응답
+
+    variants = [("baseline (json, indent=2)", None, baseline)]
+    backends = ["json"] + (["orjson"] if serialization.orjson is not None else [])
+    for backend in backends:
+        for format in ("pretty", "compact"):
+            variants.append((f"{backend} {format}", backend, lambda obj, f=format: serialization.dumps(obj, f)))
+    if serialization.msgpack is not None:
+        variants.append(("msgpack (base64)", None, lambda obj: serialization.dumps(obj, "msgpack")))
+
+    base_bytes = sum(len(baseline(sample).encode("utf-8")) for sample in samples)
+    base_us = None
+    print(f"{len(samples)} recommend_nodes results, "
+          f"{sum(len(s['nodes']) for s in samples)} nodes total")
+    print(f"{'variant':<28} {'bytes':>10} {'size':>7} {'encode_us':>11} {'speedup':>8}")
+    for name, backend, encode in variants:
+        if backend is not None:
+            serialization.set_json_backend(backend)
+        payload_bytes = sum(len(encode(sample).encode("utf-8")) for sample in samples)
+        seconds = timeit.timeit(lambda: [encode(sample) for sample in samples], number=args.repeat)
+        encode_us = seconds / args.repeat * 1e6
+        base_us = base_us or encode_us
+        print(f"{name:<28} {payload_bytes:>10} {payload_bytes / base_bytes:>7.1%} "
+              f"{encode_us:>11.1f} {base_us / encode_us:>7.1f}x")
+    serialization.set_json_backend("auto")
+
+
+if __name__ == "__main__":
+    main()
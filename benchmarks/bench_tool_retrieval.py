@@ -0,0 +1,108 @@
+# benchmarks/bench_tool_retrieval.py
+"""
+도구 검색 인덱스 벤치마크
+합성 카탈로그(기본 50,000개 도구)로 ToolRetrievalIndex를 만들어
+인덱스 구성/저장/읽기 시간, 정확 검색과 근사(IVF) 검색의 질의 지연,
+정확 검색 대비 근사 검색의 recall@k를 측정합니다.
+
+실행: python benchmarks/bench_tool_retrieval.py [--tools N] [--queries N] [--top-k N] [--nprobe N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.tool_retrieval import ToolRetrievalIndex
+
+ACTIONS = ["search", "fetch", "parse", "convert", "summarize", "translate", "classify", "extract",
+           "validate", "merge", "filter", "rank", "upload", "download", "schedule", "notify",
+           "검색", "요약", "번역", "분석", "변환", "생성", "조회", "전송"]
+OBJECTS = ["web page", "pdf document", "csv file", "email", "invoice", "image", "audio", "calendar event",
+           "database table", "spreadsheet", "news article", "stock price", "weather forecast", "github issue",
+           "slack message", "log file", "문서", "이메일", "뉴스", "이미지", "데이터베이스", "일정", "보고서"]
+QUALIFIERS = ["fast", "batch", "streaming", "secure", "multilingual", "incremental", "cached", "realtime",
+              "대용량", "실시간", "다국어"]
+
+
+def build_synthetic_catalog(tool_count: int, category_count: int = 40, seed: int = 7):
+    """동작/대상/수식어 조합으로 이름과 설명이 있는 합성 도구 카탈로그를 생성합니다."""
+    rng = random.Random(seed)
+    tools = {}
+    for i in range(tool_count):
+        action, target, qualifier = rng.choice(ACTIONS), rng.choice(OBJECTS), rng.choice(QUALIFIERS)
+        tools[f"{action}_{target.replace(' ', '_')}_{i}"] = {
+            "category": f"category_{rng.randrange(category_count)}",
+            "name": f"{qualifier} {target} {action}",
+            "description": f"{qualifier} {action} for {target} with {rng.choice(OBJECTS)} support",
+            "priority": rng.randint(1, 5),
+            "inputSchema": {"type": "object", "properties": {}},
+            "dependencies": [],
+            "estimated_time_ms": rng.randint(100, 5000)
+        }
+    return tools
+
+
+def build_queries(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [f"{rng.choice(ACTIONS)} the {rng.choice(OBJECTS)} and {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}"
+            for _ in range(count)]
+
+
+def timed_ms(func):
+    started = time.perf_counter()
+    value = func()
+    return value, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    tools = build_synthetic_catalog(args.tools)
+    queries = build_queries(args.queries)
+
+    index, build_ms = timed_ms(lambda: ToolRetrievalIndex.build(tools, dim=args.dim, approx_min_tools=1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tool_index.npz")
+        _, save_ms = timed_ms(lambda: index.save(path))
+        loaded, load_ms = timed_ms(lambda: ToolRetrievalIndex.load(path))
+        size_kb = os.path.getsize(path) / 1024
+    assert loaded is not None and loaded.tool_ids == index.tool_ids
+    assert loaded.search(queries[0], args.top_k) == index.search(queries[0], args.top_k)
+
+    latencies = {"exact": [], "approx": []}
+    recalls = []
+    for query in queries:
+        exact, exact_ms = timed_ms(lambda: index.search(query, args.top_k, mode="exact"))
+        approx, approx_ms = timed_ms(lambda: index.search(query, args.top_k, mode="approx", nprobe=args.nprobe))
+        latencies["exact"].append(exact_ms)
+        latencies["approx"].append(approx_ms)
+        if exact:
+            expected = {tool_id for tool_id, _ in exact}
+            recalls.append(len(expected & {tool_id for tool_id, _ in approx}) / len(expected))
+
+    print(f"catalog: {args.tools} tools, dim {args.dim}, {len(index.centroids)} clusters, "
+          f"{args.queries} queries, top_k {args.top_k}, nprobe {args.nprobe}")
+    print(f"index build: {build_ms:.0f} ms, save: {save_ms:.0f} ms, load: {load_ms:.0f} ms ({size_kb:.0f} KiB)")
+    print(f"{'mode':<8} {'p50_ms':>8} {'p95_ms':>8}")
+    for mode, values in latencies.items():
+        values.sort()
+        print(f"{mode:<8} {statistics.median(values):>8.3f} {values[int(len(values) * 0.95) - 1]:>8.3f}")
+    print(f"approx recall@{args.top_k} vs exact: {statistics.mean(recalls):.3f}")
+
+
+if __name__ == "__main__":
+    main()
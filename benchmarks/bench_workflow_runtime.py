@@ -0,0 +1,66 @@
+# benchmarks/bench_workflow_runtime.py
+"""
+워크플로우 실행 런타임 벤치마크
+추천된 워크플로우와 속도 최적화된 워크플로우를 stub 처리기로 실제 실행하여
+임계 경로로 계산한 예상 소요 시간과 실제 소요 시간, 동시 실행 수 제한의 영향을 비교합니다.
+stub 지연은 estimated_time_ms × time_scale 이므로 실제 시간은 time_scale로 나눠 ms 단위로 표시합니다.
+예상 소요 시간은 1회 반복 기준이므로 loop 시나리오(3회 반복)의 실제 시간은 약 3배가 됩니다.
+
+실행: python benchmarks/bench_workflow_runtime.py [--time-scale 0.01] [--runs 3]
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.catalog_index import get_catalog_index
+from services.node_recommender import NodeRecommender
+from services.workflow_optimizer import WorkflowOptimizer
+from services.workflow_runtime import WorkflowRuntime
+
+SCENARIOS = [
+    ("retrieve+generate", ["information_retrieval", "generation"], "sequential"),
+    ("all capabilities", ["information_retrieval", "data_processing", "computation",
+                          "data_access", "generation"], "sequential"),
+    ("loop x3", ["information_retrieval", "data_processing"], "loop"),
+]
+
+
+def measure(runtime: WorkflowRuntime, workflow: dict, runs: int, time_scale: float) -> dict:
+    results = [runtime.run_sync(workflow, time_scale=time_scale, loop_iterations=3) for _ in range(runs)]
+    assert all(result["status"] == "succeeded" for result in results)
+    return {
+        "actual_ms": statistics.median(result["elapsed_ms"] for result in results) / time_scale,
+        "estimated_ms": results[0]["estimated_makespan_ms"] / time_scale,
+        "max_concurrency": max(result["max_concurrency"] for result in results)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--time-scale", type=float, default=0.01)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    recommender = NodeRecommender()
+    optimizer = WorkflowOptimizer()
+    index = get_catalog_index()
+
+    print(f"time_scale {args.time_scale}, median of {args.runs} runs (times scaled back to ms)")
+    print(f"{'scenario':<20} {'workflow':<10} {'limit':>5} {'estimated_ms':>13} {'actual_ms':>10} {'max_conc':>9}")
+    for name, capabilities, workflow_type in SCENARIOS:
+        workflow = recommender.recommend("analyze", capabilities, index.tools_for_capabilities(capabilities),
+                                         "medium", workflow_type)
+        optimized = optimizer.optimize(workflow, "speed")["optimized_workflow"]
+        for label, candidate in (("original", workflow), ("optimized", optimized)):
+            for limit in (1, 8):
+                result = measure(WorkflowRuntime(concurrency_limit=limit), candidate, args.runs, args.time_scale)
+                print(f"{name:<20} {label:<10} {limit:>5} {result['estimated_ms']:>13.0f} "
+                      f"{result['actual_ms']:>10.0f} {result['max_concurrency']:>9}")
+
+
+if __name__ == "__main__":
+    main()
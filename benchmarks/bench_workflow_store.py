@@ -0,0 +1,79 @@
+# benchmarks/bench_workflow_store.py
+"""
+워크플로우 저장소 벤치마크
+대규모 워크플로우(기본 2,000개 프로세스 노드)를 optimize_workflow에 넘길 때
+전체 workflow_json을 보내는 방식과 저장소의 workflow_id(+JSON Patch 변경분)를 보내는 방식의
+요청 크기와 입력 준비 시간(파싱 또는 저장소 조회/패치 적용 후 새 버전 저장)을 비교합니다.
+
+실행: python benchmarks/bench_workflow_store.py [--nodes N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services import NodeRecommender, WorkflowStore, get_catalog_index
+
+
+def build_workflow(node_count: int) -> dict:
+    index = get_catalog_index()
+    independent = [view for view in index.views.values() if not view.get("dependencies")]
+    tools = [independent[i % len(independent)] for i in range(node_count)]
+    return NodeRecommender().recommend("analyze", sorted({tool["category"] for tool in tools}),
+                                       tools, "high", "parallel")
+
+
+def median_ms(func, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    workflow = build_workflow(args.nodes)
+    store = WorkflowStore(os.path.join(tempfile.mkdtemp(), "workflows.db"))
+    started = time.perf_counter()
+    stored = store.save(workflow, "recommend_nodes")
+    save_ms = (time.perf_counter() - started) * 1000
+    workflow_id = stored["workflow_id"]
+
+    workflow_json = json.dumps(workflow, ensure_ascii=False)
+    reference = json.dumps({"workflow_id": workflow_id})
+    counter = iter(range(1, 1_000_000))
+
+    def patch_json() -> str:
+        return json.dumps([{"op": "replace", "path": "/nodes/1/estimated_time_ms", "value": next(counter)}])
+
+    cold = WorkflowStore(store.path, cache_size=0)
+    rows = [
+        ("workflow_json", len(workflow_json.encode("utf-8")), lambda: json.loads(workflow_json)),
+        ("workflow_id (cached)", len(reference), lambda: store.load(workflow_id)),
+        ("workflow_id (sqlite)", len(reference), lambda: cold.load(workflow_id)),
+        ("workflow_id + patch", len(reference) + len(patch_json()),
+         lambda: store.patch(workflow_id, json.loads(patch_json()))),
+    ]
+
+    print(f"{args.nodes} process nodes, stored in {save_ms:.1f} ms, median of {args.runs} runs")
+    print(f"{'request':<22} {'request_bytes':>14} {'prepare_ms':>11}")
+    for name, size, func in rows:
+        print(f"{name:<22} {size:>14,} {median_ms(func, args.runs):>11.2f}")
+    print(f"versions stored: {store.stats()['versions']}")
+
+
+if __name__ == "__main__":
+    main()
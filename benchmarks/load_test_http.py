@@ -0,0 +1,192 @@
+# benchmarks/load_test_http.py
+"""
+HTTP 전송 부하 테스트
+작업자 수를 바꿔 가며 서버를 HTTP(stateless, JSON 응답) 모드로 띄우고,
+여러 클라이언트 프로세스에서 analyze_prompt 도구 호출을 보내 초당 요청 수를 측정합니다.
+
+실행: python benchmarks/load_test_http.py [--workers 1,2,4] [--duration 10] [--clients 4] [--threads 8]
+참고: 작업자 수에 따른 확장은 CPU 코어 수를 넘지 못합니다.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "src" / "server.py"
+
+PROMPTS = [
+    "웹에서 최신 AI 뉴스를 검색하고 요약해서 보고서를 작성해줘",
+    "매출 데이터를 분석해서 트렌드를 시각화하고 이상치를 찾아줘",
+    "고객 문의를 분류하고 조건에 따라 담당자에게 전달하는 흐름",
+    "문서를 반복적으로 검토하면서 품질 기준을 만족할 때까지 수정"
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """HTTP 모드 서버를 띄우고 모든 작업자가 /health에 응답할 때까지 기다립니다."""
+    env = dict(os.environ)
+    env.update({
+        "SERVER_TRANSPORT": "http",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+        "SERVER_STATELESS_HTTP": "true",
+        "SERVER_JSON_RESPONSE": "true",
+        "SERVER_DEBUG": "false",
+        "LOG_LEVEL": "warning"
+    })
+    process = subprocess.Popen([sys.executable, str(SERVER_PATH)], env=env)
+
+    deadline = time.time() + 60
+    healthy_pids = set()
+    while time.time() < deadline:
+        try:
+            # 새 연결마다 다른 작업자가 받을 수 있으므로 응답한 작업자 pid를 모음
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            response = connection.getresponse()
+            if response.status == 200:
+                healthy_pids.add(json.loads(response.read())["pid"])
+                if len(healthy_pids) >= workers:
+                    return process
+            connection.close()
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("서버가 시작되지 않았습니다")
+
+
+def stop_server(process: subprocess.Popen) -> float:
+    """SIGTERM으로 정상 종료를 요청하고 종료까지 걸린 시간을 반환합니다."""
+    started = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    return time.perf_counter() - started
+
+
+def client_worker(port: int, threads: int, duration: float, results: "multiprocessing.Queue") -> None:
+    """클라이언트 프로세스: 스레드마다 keep-alive 연결로 요청을 반복합니다."""
+    counts = []
+    errors = []
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def run(thread_index: int) -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        done = failed = 0
+        thread_latencies = []
+        request_id = 0
+        while time.time() < stop_at:
+            request_id += 1
+            body = json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "tools/call",
+                "params": {
+                    "name": "analyze_prompt",
+                    "arguments": {"user_prompt": PROMPTS[(thread_index + request_id) % len(PROMPTS)],
+                                  "format": "compact"}
+                }
+            })
+            sent = time.perf_counter()
+            try:
+                connection.request("POST", "/mcp", body, {
+                    "content-type": "application/json",
+                    "accept": "application/json, text/event-stream"
+                })
+                response = connection.getresponse()
+                payload = response.read()
+                if response.status == 200 and b'"error"' not in payload[:200]:
+                    done += 1
+                    thread_latencies.append(time.perf_counter() - sent)
+                else:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        with lock:
+            counts.append(done)
+            errors.append(failed)
+            latencies.extend(thread_latencies)
+
+    pool = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put((sum(counts), sum(errors), latencies))
+
+
+def run_load(port: int, clients: int, threads: int, duration: float) -> dict:
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client_worker, args=(port, threads, duration, results))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    done = sum(item[0] for item in collected)
+    failed = sum(item[1] for item in collected)
+    latencies = sorted(latency for item in collected for latency in item[2])
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        "requests": done,
+        "errors": failed,
+        "rps": done / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"cpu count: {os.cpu_count()}, clients: {args.clients} x {args.threads} threads, "
+          f"duration: {args.duration:.0f} s")
+    print(f"{'workers':>7} {'rps':>9} {'scale':>6} {'p50_ms':>8} {'p99_ms':>8} {'errors':>7} {'shutdown_s':>11}")
+    base_rps = None
+    for workers in [int(value) for value in args.workers.split(",")]:
+        port = free_port()
+        server = start_server(port, workers)
+        try:
+            result = run_load(port, args.clients, args.threads, args.duration)
+        finally:
+            shutdown_s = stop_server(server)
+        base_rps = base_rps or result["rps"]
+        print(f"{workers:>7} {result['rps']:>9.1f} {result['rps'] / base_rps:>5.2f}x "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7} {shutdown_s:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,41 @@
 # src/config/__init__.py
-from .tools_config import AVAILABLE_TOOLS
+from .tools_config import (
+    CatalogError,
+    ToolCatalog,
+    get_catalog,
+    get_catalog_version,
+    bump_catalog_version,
+    reload_catalog,
+    add_catalog_preparer,
+    pinned_catalog,
+    call_with_catalog,
+    start_catalog_watcher,
+    catalog_status,
+)
 from .patterns import NODE_PATTERNS, WORKFLOW_PATTERNS
 
-__all__ = ["AVAILABLE_TOOLS", "NODE_PATTERNS", "WORKFLOW_PATTERNS"]
+__all__ = [
+    "AVAILABLE_TOOLS",
+    "TOOL_CATEGORIES",
+    "NODE_PATTERNS",
+    "WORKFLOW_PATTERNS",
+    "CatalogError",
+    "ToolCatalog",
+    "get_catalog",
+    "get_catalog_version",
+    "bump_catalog_version",
+    "reload_catalog",
+    "add_catalog_preparer",
+    "pinned_catalog",
+    "call_with_catalog",
+    "start_catalog_watcher",
+    "catalog_status",
+]
 
+
+def __getattr__(name):
+    # AVAILABLE_TOOLS/TOOL_CATEGORIES는 hot reload로 바뀔 수 있으므로 접근할 때마다 현재 카탈로그에서 가져옴
+    if name in ("AVAILABLE_TOOLS", "TOOL_CATEGORIES"):
+        from . import tools_config
+        return getattr(tools_config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
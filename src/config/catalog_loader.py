@@ -0,0 +1,214 @@
+# src/config/catalog_loader.py
+"""
+도구 카탈로그 로더
+디렉터리의 JSON/YAML 파일에서 도구 카탈로그를 읽어 검증하고,
+검증된 결과를 marshal 스냅샷으로 저장해 다음 시작 때 파싱/검증 없이 읽습니다.
+"""
+
+import json
+import marshal
+import os
+import sys
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # 선택 의존성 (YAML 카탈로그 파일을 쓸 때만 필요)
+    yaml = None
+
+CATALOG_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# 스냅샷 형식이나 검증 규칙이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_FORMAT = 2
+
+REQUIRED_FIELDS = ("category", "name", "description", "inputSchema")
+
+
+class CatalogError(ValueError):
+    """카탈로그 파일을 읽거나 검증하지 못했을 때 발생하는 예외"""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("도구 카탈로그 오류: " + "; ".join(problems))
+
+
+def catalog_files(directory: str) -> List[str]:
+    """카탈로그 파일 경로 목록 (파일 이름 순, 숨김 파일 제외)"""
+    try:
+        names = os.listdir(directory)
+    except OSError as e:
+        raise CatalogError([f"카탈로그 디렉터리를 읽을 수 없습니다: {directory} ({e})"])
+    return [
+        os.path.join(directory, name)
+        for name in sorted(names)
+        if name.endswith(CATALOG_EXTENSIONS) and not name.startswith(".")
+    ]
+
+
+def fingerprint(directory: str) -> Tuple:
+    """
+    카탈로그 파일들의 (이름, 크기, 수정 시각) 목록
+    파일 내용을 읽지 않으므로 변경 감시에 매번 사용할 수 있습니다.
+    """
+    entries = []
+    for path in catalog_files(directory):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # 목록을 읽은 뒤 삭제된 파일
+            continue
+        entries.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return (SNAPSHOT_FORMAT,) + tuple(entries)
+
+
+def _read_file(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith(".json"):
+            return json.load(file)
+        if yaml is None:
+            raise CatalogError([f"YAML 카탈로그를 읽으려면 PyYAML 패키지가 필요합니다: {path}"])
+        return yaml.safe_load(file)
+
+
+def _validate_tool(tool_id: str, spec: Any, source: str) -> List[str]:
+    """도구 하나의 필드를 검증하고 문제 목록을 반환합니다."""
+    where = f"{source}: {tool_id}"
+    if not isinstance(spec, dict):
+        return [f"{where}: 도구 정의는 객체여야 합니다"]
+
+    problems = [f"{where}: 필수 필드 누락 ({field})" for field in REQUIRED_FIELDS if field not in spec]
+    for field in ("category", "name", "description"):
+        if field in spec and not (isinstance(spec[field], str) and spec[field]):
+            problems.append(f"{where}: {field}는 비어 있지 않은 문자열이어야 합니다")
+
+    schema = spec.get("inputSchema")
+    if schema is not None and not (isinstance(schema, dict) and schema.get("type") == "object"):
+        problems.append(f"{where}: inputSchema는 type이 object인 JSON 스키마여야 합니다")
+
+    priority = spec.get("priority")
+    if priority is not None and (isinstance(priority, bool) or not isinstance(priority, int)):
+        problems.append(f"{where}: priority는 정수여야 합니다")
+
+    estimated = spec.get("estimated_time_ms")
+    if estimated is not None and (isinstance(estimated, bool)
+                                  or not isinstance(estimated, (int, float)) or estimated < 0):
+        problems.append(f"{where}: estimated_time_ms는 0 이상의 숫자여야 합니다")
+
+    # 파레토 최적화의 도구 모델 기본값 (선택)
+    for field in ("cost_per_call", "cost_per_second"):
+        value = spec.get(field)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+            problems.append(f"{where}: {field}는 0 이상의 숫자여야 합니다")
+    failure = spec.get("failure_probability")
+    if failure is not None and (isinstance(failure, bool)
+                                or not isinstance(failure, (int, float)) or not 0 <= failure <= 1):
+        problems.append(f"{where}: failure_probability는 0과 1 사이의 숫자여야 합니다")
+
+    dependencies = spec.get("dependencies", [])
+    if not (isinstance(dependencies, list) and all(isinstance(item, str) for item in dependencies)):
+        problems.append(f"{where}: dependencies는 도구 id 문자열 목록이어야 합니다")
+    return problems
+
+
+def load_catalog(directory: str) -> Dict[str, Dict[str, Any]]:
+    """
+    카탈로그 디렉터리의 모든 파일을 읽어 검증합니다.
+
+    각 파일은 {도구 id: 도구 정의} 객체이며, 도구 순서는 파일 이름 순 → 파일 안의 정의 순입니다.
+
+    Returns:
+        {도구 id: 도구 정의} (AVAILABLE_TOOLS 형식)
+
+    Raises:
+        CatalogError: 파일을 읽을 수 없거나 검증에 실패한 경우 (문제 전체 목록 포함)
+    """
+    tools: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, str] = {}
+    problems: List[str] = []
+
+    paths = catalog_files(directory)
+    if not paths:
+        raise CatalogError([f"카탈로그 파일이 없습니다: {directory}"])
+
+    for path in paths:
+        source = os.path.basename(path)
+        try:
+            data = _read_file(path)
+        except CatalogError as e:
+            problems.extend(e.problems)
+            continue
+        except (OSError, ValueError) as e:
+            problems.append(f"{source}: 파일을 읽을 수 없습니다 ({e})")
+            continue
+        if data is None:
+            continue
+        if not isinstance(data, dict):
+            problems.append(f"{source}: 최상위는 {{도구 id: 도구 정의}} 객체여야 합니다")
+            continue
+
+        for tool_id, spec in data.items():
+            if tool_id in tools:
+                problems.append(f"{source}: 도구 id가 중복됩니다: {tool_id} ({sources[tool_id]}에도 정의됨)")
+                continue
+            problems.extend(_validate_tool(tool_id, spec, source))
+            tools[tool_id] = spec
+            sources[tool_id] = source
+
+    # 의존성은 모든 파일을 읽은 뒤 검사
+    for tool_id, spec in tools.items():
+        dependencies = spec.get("dependencies", []) if isinstance(spec, dict) else []
+        for dependency in dependencies if isinstance(dependencies, list) else []:
+            if dependency == tool_id:
+                problems.append(f"{sources[tool_id]}: {tool_id}: 자기 자신에 의존할 수 없습니다")
+            elif dependency not in tools:
+                problems.append(f"{sources[tool_id]}: {tool_id}: 알 수 없는 의존 도구입니다: {dependency}")
+
+    if problems:
+        raise CatalogError(problems)
+    return tools
+
+
+def derive_categories(tools: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """도구 정의에서 카테고리별 도구 id 목록을 만듭니다 (TOOL_CATEGORIES 형식, 정의 순서 유지)."""
+    categories: Dict[str, List[str]] = {}
+    for tool_id, spec in tools.items():
+        categories.setdefault(spec["category"], []).append(tool_id)
+    return categories
+
+
+def default_snapshot_path(directory: str) -> str:
+    """marshal 형식은 파이썬 버전마다 다르므로 버전 태그를 붙여 __pycache__ 아래에 둡니다."""
+    return os.path.join(directory, "__pycache__", f"catalog.{sys.implementation.cache_tag}.marshal")
+
+
+def read_snapshot(path: str, expected_fingerprint: Tuple) -> Optional[Dict[str, Dict[str, Any]]]:
+    """파일 지문이 같은 스냅샷이 있으면 검증된 도구 정의를 반환합니다 (없거나 다르면 None)."""
+    try:
+        with open(path, "rb") as file:
+            snapshot = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("fingerprint") != expected_fingerprint:
+        return None
+    return snapshot.get("tools")
+
+
+def write_snapshot(path: str, catalog_fingerprint: Tuple, tools: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    검증된 도구 정의를 스냅샷으로 저장합니다.
+    임시 파일에 쓴 뒤 교체하므로 다른 프로세스가 쓰다 만 파일을 읽지 않습니다.
+    저장하지 못해도(읽기 전용 디렉터리 등) 카탈로그 사용에는 문제가 없으므로 False만 반환합니다.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as file:
+            marshal.dump({"fingerprint": catalog_fingerprint, "tools": tools}, file)
+        os.replace(temp_path, path)
+        return True
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
@@ -1,195 +1,285 @@
 # src/config/tools_config.py
 """
 사용 가능한 도구들의 설정 데이터베이스
+도구 정의는 카탈로그 디렉터리(기본: config/tools)의 JSON/YAML 파일에서 읽고,
+파일이 바뀌면 새 카탈로그를 통째로 만든 뒤 참조 하나만 바꿔 교체합니다 (hot reload).
+진행 중인 호출은 pinned_catalog()로 고정한 이전 카탈로그를 끝까지 사용합니다.
 """
 
-AVAILABLE_TOOLS = {
-    # 정보 검색 카테고리
-    "web_search": {
-        "category": "information_retrieval",
-        "name": "웹 검색",
-        "description": "웹에서 실시간 정보를 검색합니다",
-        "priority": 1,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "검색 쿼리"
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "최대 결과 수",
-                    "default": 10
-                }
-            },
-            "required": ["query"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 2000
-    },
-    
-    "document_retrieve": {
-        "category": "information_retrieval",
-        "name": "문서 검색",
-        "description": "저장된 문서 데이터베이스에서 정보를 검색합니다",
-        "priority": 2,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "keywords": {
-                    "type": "string",
-                    "description": "검색 키워드"
-                },
-                "doc_type": {
-                    "type": "string",
-                    "description": "문서 타입 (pdf, txt, docx)",
-                    "enum": ["pdf", "txt", "docx", "all"]
-                }
-            },
-            "required": ["keywords"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 1000
-    },
-    
-    # 데이터 처리 카테고리
-    "data_analysis": {
-        "category": "data_processing",
-        "name": "데이터 분석",
-        "description": "데이터 분석 및 통계 계산을 수행합니다",
-        "priority": 2,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "data": {
-                    "type": "array",
-                    "description": "분석할 데이터"
-                },
-                "analysis_type": {
-                    "type": "string",
-                    "enum": ["statistical", "trend", "comparison"],
-                    "description": "분석 유형"
-                }
-            },
-            "required": ["data", "analysis_type"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 1500
-    },
-    
-    "code_execution": {
-        "category": "computation",
-        "name": "코드 실행",
-        "description": "Python 코드를 안전하게 실행합니다",
-        "priority": 3,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "code": {
-                    "type": "string",
-                    "description": "실행할 Python 코드"
-                },
-                "timeout": {
-                    "type": "integer",
-                    "description": "타임아웃 (초)",
-                    "default": 30
-                }
-            },
-            "required": ["code"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 3000
-    },
-    
-    # 데이터 접근 카테고리
-    "database_query": {
-        "category": "data_access",
-        "name": "데이터베이스 쿼리",
-        "description": "데이터베이스에서 데이터를 조회합니다",
-        "priority": 2,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "SQL 쿼리"
-                },
-                "database": {
-                    "type": "string",
-                    "description": "데이터베이스 이름"
-                }
-            },
-            "required": ["query", "database"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 2000
-    },
-    
-    "api_call": {
-        "category": "data_access",
-        "name": "API 호출",
-        "description": "외부 REST API를 호출합니다",
-        "priority": 2,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "url": {
-                    "type": "string",
-                    "description": "API URL"
-                },
-                "method": {
-                    "type": "string",
-                    "enum": ["GET", "POST", "PUT", "DELETE"],
-                    "description": "HTTP 메서드",
-                    "default": "GET"
-                },
-                "payload": {
-                    "type": "object",
-                    "description": "요청 바디"
-                }
-            },
-            "required": ["url"]
-        },
-        "dependencies": [],
-        "estimated_time_ms": 2000
-    },
-    
-    # 생성 카테고리
-    "content_generation": {
-        "category": "generation",
-        "name": "콘텐츠 생성",
-        "description": "텍스트 콘텐츠를 생성합니다",
-        "priority": 3,
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "prompt": {
-                    "type": "string",
-                    "description": "생성 프롬프트"
-                },
-                "style": {
-                    "type": "string",
-                    "description": "텍스트 스타일"
-                },
-                "length": {
-                    "type": "string",
-                    "enum": ["short", "medium", "long"],
-                    "description": "생성할 텍스트 길이"
-                }
-            },
-            "required": ["prompt"]
-        },
-        "dependencies": ["data_analysis"],
-        "estimated_time_ms": 3000
-    }
-}
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+from .catalog_loader import (
+    CatalogError,
+    default_snapshot_path,
+    derive_categories,
+    fingerprint,
+    load_catalog,
+    read_snapshot,
+    write_snapshot,
+)
+
+DEFAULT_CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools")
+
+
+class ToolCatalog:
+    """한 버전의 도구 카탈로그 (만든 뒤에는 수정하지 않음)"""
 
-# 카테고리별 도구 그룹
-TOOL_CATEGORIES = {
-    "information_retrieval": ["web_search", "document_retrieve"],
-    "data_processing": ["data_analysis"],
-    "computation": ["code_execution"],
-    "data_access": ["database_query", "api_call"],
-    "generation": ["content_generation"]
+    __slots__ = ("tools", "categories", "version", "fingerprint", "source", "loaded_at", "derived")
+
+    def __init__(self,
+                 tools: Dict[str, Dict[str, Any]],
+                 version: int,
+                 catalog_fingerprint: Tuple,
+                 source: str):
+        """
+        Args:
+            tools: {도구 id: 도구 정의} (AVAILABLE_TOOLS)
+            version: 카탈로그 버전 (파생 캐시 무효화 기준)
+            catalog_fingerprint: 카탈로그 파일 지문 (변경 감지용)
+            source: 읽어 온 곳 (files, snapshot)
+        """
+        self.tools = tools
+        self.categories: Dict[str, List[str]] = derive_categories(tools)
+        self.version = version
+        self.fingerprint = catalog_fingerprint
+        self.source = source
+        self.loaded_at = datetime.now().isoformat()
+        # 이 버전에서 파생된 구조(카탈로그 인덱스 등)를 보관 (버전이 바뀌면 함께 버려짐)
+        self.derived: Dict[str, Any] = {}
+
+    def with_version(self, version: int) -> "ToolCatalog":
+        """같은 도구 정의에 새 버전을 붙인 카탈로그 (파생 구조는 다시 만듦)"""
+        catalog = ToolCatalog.__new__(ToolCatalog)
+        catalog.tools = self.tools
+        catalog.categories = self.categories
+        catalog.version = version
+        catalog.fingerprint = self.fingerprint
+        catalog.source = self.source
+        catalog.loaded_at = datetime.now().isoformat()
+        catalog.derived = {}
+        return catalog
+
+
+_current: Optional[ToolCatalog] = None
+_catalog_version = 0
+_load_lock = threading.Lock()
+_pinned = threading.local()
+
+_status: Dict[str, Any] = {
+    "reloads": 0,
+    "failed_reloads": 0,
+    "last_error": None,
+    "last_error_at": None,
+    "watch_interval_s": None
 }
+_failed_fingerprint: Optional[Tuple] = None
+_watcher_pid: Optional[int] = None
+# hot reload로 교체하기 전에 새 카탈로그에 실행할 함수들 (add_catalog_preparer)
+_preparers: List[Callable[[ToolCatalog], Any]] = []
+
+
+def catalog_dir() -> str:
+    """카탈로그 디렉터리 (TOOL_CATALOG_DIR 환경 변수로 변경)"""
+    return os.getenv("TOOL_CATALOG_DIR") or DEFAULT_CATALOG_DIR
+
+
+def snapshot_path() -> Optional[str]:
+    """컴파일된 스냅샷 경로 (TOOL_CATALOG_SNAPSHOT=off이면 사용하지 않음)"""
+    path = os.getenv("TOOL_CATALOG_SNAPSHOT", "")
+    if path.lower() == "off":
+        return None
+    return path or default_snapshot_path(catalog_dir())
+
+
+def _build(version: int) -> ToolCatalog:
+    """스냅샷이 최신이면 스냅샷에서, 아니면 파일을 읽고 검증해 카탈로그를 만듭니다."""
+    directory = catalog_dir()
+    # 파일을 읽기 전에 지문을 구하므로, 읽는 도중 바뀐 파일은 다음 확인 때 다시 읽힘
+    catalog_fingerprint = fingerprint(directory)
+    path = snapshot_path()
+
+    tools = read_snapshot(path, catalog_fingerprint) if path else None
+    if tools is not None:
+        return ToolCatalog(tools, version, catalog_fingerprint, "snapshot")
+
+    tools = load_catalog(directory)
+    if path:
+        write_snapshot(path, catalog_fingerprint, tools)
+    return ToolCatalog(tools, version, catalog_fingerprint, "files")
+
+
+def get_catalog() -> ToolCatalog:
+    """
+    현재 도구 카탈로그를 반환합니다.
+    pinned_catalog() 안에서는 고정된 카탈로그를 반환하고, 처음 호출될 때 카탈로그를 읽습니다.
+    """
+    global _current
+    pinned = getattr(_pinned, "catalog", None)
+    if pinned is not None:
+        return pinned
+    catalog = _current
+    if catalog is None:
+        with _load_lock:
+            if _current is None:
+                _current = _build(_catalog_version)
+            catalog = _current
+    return catalog
+
+
+@contextmanager
+def pinned_catalog() -> Iterator[ToolCatalog]:
+    """블록 안에서는 교체와 관계없이 들어올 때의 카탈로그를 사용합니다 (스레드별)."""
+    previous = getattr(_pinned, "catalog", None)
+    catalog = get_catalog()
+    _pinned.catalog = catalog
+    try:
+        yield catalog
+    finally:
+        _pinned.catalog = previous
+
+
+def call_with_catalog(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    호출하는 동안 카탈로그를 고정하고 처리 함수를 실행합니다.
+    프로세스 풀에서도 실행할 수 있도록 모듈 수준 함수로 둡니다.
+    """
+    with pinned_catalog():
+        return func(*args)
+
+
+def get_catalog_version() -> int:
+    """현재 도구 카탈로그 버전을 반환합니다."""
+    return get_catalog().version
+
+
+def bump_catalog_version() -> int:
+    """도구 카탈로그 변경을 알리고 새 버전을 반환합니다 (카탈로그에서 파생된 캐시들이 무효화됨)."""
+    global _current, _catalog_version
+    get_catalog()
+    with _load_lock:
+        _catalog_version += 1
+        _current = _current.with_version(_catalog_version)
+        return _catalog_version
+
+
+def add_catalog_preparer(prepare: Callable[[ToolCatalog], Any]) -> None:
+    """
+    hot reload로 새 카탈로그를 교체하기 전에 실행할 함수를 등록합니다.
+    검색 인덱스처럼 만드는 데 오래 걸리는 파생 구조를 요청 경로 대신 감시 스레드에서 미리 만들 때 사용하며,
+    함수가 실패하면 검증 실패와 같이 교체하지 않고 기존 카탈로그를 유지합니다.
+    """
+    if prepare not in _preparers:
+        _preparers.append(prepare)
+
+
+def reload_catalog(force: bool = False) -> ToolCatalog:
+    """
+    카탈로그 파일이 바뀌었으면 새 카탈로그를 만들어 교체합니다.
+    새 카탈로그와 등록된 파생 구조(add_catalog_preparer)를 모두 만든 뒤 참조 하나만 바꾸므로 요청은 멈추지 않으며,
+    검증이나 파생 구조 생성에 실패하면 기존 카탈로그를 그대로 유지합니다.
+
+    Args:
+        force: 파일 지문이 같아도 다시 읽기
+
+    Raises:
+        CatalogError: 새 카탈로그 검증 또는 파생 구조 생성 실패
+    """
+    global _current, _catalog_version, _failed_fingerprint
+    current = get_catalog()
+    with _load_lock:
+        current = _current or current
+        if not force and fingerprint(catalog_dir()) == current.fingerprint:
+            return current
+        try:
+            catalog = _build(_catalog_version + 1)
+            for prepare in _preparers:
+                try:
+                    prepare(catalog)
+                except Exception as e:
+                    raise CatalogError([f"새 카탈로그의 파생 구조를 만들지 못했습니다 "
+                                        f"({getattr(prepare, '__name__', prepare)}): {e}"]) from e
+        except CatalogError as e:
+            _failed_fingerprint = fingerprint(catalog_dir())
+            _status["failed_reloads"] += 1
+            _status["last_error"] = e.problems
+            _status["last_error_at"] = datetime.now().isoformat()
+            raise
+        _catalog_version = catalog.version
+        _current = catalog
+        _failed_fingerprint = None
+        _status["reloads"] += 1
+        return catalog
+
+
+def check_for_changes() -> bool:
+    """파일 지문이 바뀌었으면 다시 읽고, 교체했으면 True를 반환합니다 (실패한 지문은 다시 시도하지 않음)."""
+    current_fingerprint = fingerprint(catalog_dir())
+    if current_fingerprint == get_catalog().fingerprint or current_fingerprint == _failed_fingerprint:
+        return False
+    try:
+        reload_catalog()
+    except CatalogError as e:
+        print(f"도구 카탈로그를 다시 읽지 못해 버전 {get_catalog().version}을 유지합니다: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def start_catalog_watcher(interval: float = 2.0) -> bool:
+    """
+    카탈로그 파일 변경을 주기적으로 확인하는 데몬 스레드를 시작합니다.
+    프로세스마다 한 번만 시작하며, 프로세스 풀 작업자의 initializer로도 사용할 수 있습니다.
+
+    Args:
+        interval: 확인 주기(초), 0 이하이면 시작하지 않음
+    """
+    global _watcher_pid
+    if interval <= 0:
+        return False
+    with _load_lock:
+        # fork된 자식에는 스레드가 복사되지 않으므로 pid로 확인
+        if _watcher_pid == os.getpid():
+            return False
+        _watcher_pid = os.getpid()
+        _status["watch_interval_s"] = interval
+
+    def watch() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                check_for_changes()
+            except Exception as e:
+                # 디렉터리가 잠시 사라지는 등의 오류로 감시를 멈추지 않음
+                print(f"도구 카탈로그 변경 확인 중 오류: {e}", file=sys.stderr)
+
+    threading.Thread(target=watch, name="tool-catalog-watcher", daemon=True).start()
+    return True
+
+
+def catalog_status() -> Dict[str, Any]:
+    """현재 카탈로그 버전/출처와 다시 읽기 통계"""
+    catalog = get_catalog()
+    return {
+        "directory": catalog_dir(),
+        "snapshot_path": snapshot_path(),
+        "version": catalog.version,
+        "source": catalog.source,
+        "loaded_at": catalog.loaded_at,
+        "tool_count": len(catalog.tools),
+        "categories": {category: len(tool_ids) for category, tool_ids in catalog.categories.items()},
+        **_status
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # 기존 코드와의 호환: 모듈 속성으로 접근하면 항상 현재 카탈로그를 반환
+    if name == "AVAILABLE_TOOLS":
+        return get_catalog().tools
+    if name == "TOOL_CATEGORIES":
+        return get_catalog().categories
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,13 @@ Agent Builder MCP 서버의 메인 서버 코드
 """
 
 # src/server.py
+import atexit
+import functools
 import json
 import os
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Python 경로 설정
@@ -15,14 +19,41 @@ sys.path.insert(0, str(Path(__file__).parent))
 from typing import Optional
 from fastmcp import FastMCP
 from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
 # ✓ 절대 import로 변경
-from config import AVAILABLE_TOOLS, NODE_PATTERNS
-from services import PromptAnalyzer, NodeRecommender, WorkflowOptimizer
+from config import (
+    NODE_PATTERNS,
+    add_catalog_preparer,
+    get_catalog,
+    get_catalog_version,
+    call_with_catalog,
+    catalog_status,
+    start_catalog_watcher,
+)
+# 분석/추천/최적화 서비스 모듈은 도구가 처음 필요로 할 때 import (시작 시간 단축)
+from services import (
+    ResultCache,
+    ToolExecutor,
+    ToolBusyError,
+    StaticPayload,
+    MetricsRegistry,
+    ToolProfiler,
+    get_catalog_index,
+)
+from services.metrics import call_with_phases, phase
+from services.profiler import profile_call
+from services.tool_executor import parse_limits
+from utils import iter_jsonl, dumps, set_default_format, set_json_backend
 
 # 환경 변수 로드
 load_dotenv()
 
+# 응답 직렬화 설정 (format을 지정하지 않은 호출의 기본 형식, JSON 백엔드)
+set_default_format(os.getenv("OUTPUT_FORMAT", "pretty"))
+set_json_backend(os.getenv("JSON_BACKEND", "auto"))
+
 # FastMCP 서버 초기화
 mcp = FastMCP(
     name="AgentBuilder",
@@ -34,45 +65,445 @@ mcp = FastMCP(
     ),
 )
 
-# 서비스 인스턴스 생성
-analyzer = PromptAnalyzer()
-recommender = NodeRecommender()
-optimizer = WorkflowOptimizer()
+# 결과 캐시 생성 (도구 카탈로그 버전이 바뀌면 자동 무효화)
+cache_size = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+cache_ttl_seconds = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300"))
+analysis_cache = ResultCache("analysis", cache_size, cache_ttl_seconds, get_catalog_version)
+recommendation_cache = ResultCache("recommendation", cache_size, cache_ttl_seconds, get_catalog_version)
+
+# 도구 카탈로그 인덱스를 시작 시 미리 구성
+get_catalog_index()
+
+# 정적 응답 사전 직렬화 (카탈로그 버전이 바뀔 때만 다시 직렬화)
+def _build_tools_payload() -> dict:
+    return {tool_id: dict(view) for tool_id, view in get_catalog_index().views.items()}
+
+def _build_server_info() -> dict:
+    return {
+        "name": "AgentBuilder MCP Server",
+        "version": "1.0.0",
+        "description": "에이전트 흐름 설계 및 노드 추천 시스템",
+        "tools_available": list(get_catalog().tools.keys()),
+        "patterns_available": list(NODE_PATTERNS.keys()),
+        "catalog_version": get_catalog_version(),
+        "tools_etag": tools_payload.etag,
+        "patterns_etag": patterns_payload.etag
+    }
+
+tools_payload = StaticPayload("tools", _build_tools_payload, get_catalog_version, "tools")
+patterns_payload = StaticPayload("patterns", lambda: NODE_PATTERNS, get_catalog_version, "patterns")
+server_info_payload = StaticPayload("server_info", _build_server_info, get_catalog_version, "info")
+
+# 서버가 읽고 쓰는 파일의 기본 디렉터리 (상대 경로는 프로젝트 루트 기준)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+data_dir = (PROJECT_ROOT / os.getenv("DATA_DIR", "data")).resolve()
+
+# 배치 분석의 JSONL 입력/결과 파일 디렉터리 (상대 경로는 DATA_DIR 기준)와 결과 파일 쓰기 허용 여부
+batch_io_dir = (data_dir / os.getenv("BATCH_IO_DIR", "batch")).resolve()
+batch_output_enabled = os.getenv("BATCH_OUTPUT_ENABLED", "false").lower() == "true"
+
+def _batch_io_path(path: str) -> Path:
+    """
+    도구 인자로 받은 배치 입력/결과 파일 경로를 BATCH_IO_DIR 아래의 경로로 바꿉니다.
+    절대 경로, '..'가 들어간 경로, 링크를 따라 디렉터리 밖을 가리키는 경로는 거부합니다.
+    """
+    relative = Path(path)
+    if relative.is_absolute() or relative.drive or ".." in relative.parts:
+        raise ValueError(f"파일 경로는 BATCH_IO_DIR 기준 상대 경로여야 하며 '..'를 쓸 수 없습니다: {path}")
+    resolved = (batch_io_dir / relative).resolve()
+    if resolved == batch_io_dir or batch_io_dir not in resolved.parents:
+        raise ValueError(f"BATCH_IO_DIR 밖의 경로입니다: {path}")
+    return resolved
+
+# 서비스 인스턴스는 처음 사용할 때 생성 (stdio 서버는 세션마다 새로 시작되므로
+# 첫 응답 전에 쓰지 않는 서비스 모듈과 NumPy 등의 import 비용을 치르지 않음)
+def _lazy_service(builder):
+    """builder를 처음 호출될 때 한 번만 실행하는 접근 함수로 만듭니다."""
+    lock = threading.Lock()
+    instance = []
+    
+    @functools.wraps(builder)
+    def get():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(builder())
+        return instance[0]
+    return get
+
+# 프롬프트와 비슷한 도구를 찾는 검색 인덱스 설정 (TOP_K=0이면 키워드 방식만 사용)
+retrieval_settings = {
+    "retrieval_top_k": int(os.getenv("TOOL_RETRIEVAL_TOP_K", "5")),
+    "retrieval_min_score": float(os.getenv("TOOL_RETRIEVAL_MIN_SCORE", "0.12")),
+    "retrieval_mode": os.getenv("TOOL_RETRIEVAL_MODE", "auto"),
+    "retrieval_nprobe": int(os.getenv("TOOL_RETRIEVAL_NPROBE", "8"))
+}
+
+def _prepare_retrieval_index(catalog) -> None:
+    """새 카탈로그로 교체하기 전에 검색 인덱스를 만들어 첫 요청이 인덱스 생성을 기다리지 않게 합니다."""
+    from services.tool_retrieval import prepare_tool_index
+    prepare_tool_index(catalog)
+
+if retrieval_settings["retrieval_top_k"] > 0:
+    # hot reload 시 감시 스레드에서 인덱스를 만든 뒤 교체 (NumPy는 첫 교체 때 import)
+    add_catalog_preparer(_prepare_retrieval_index)
+
+@_lazy_service
+def get_analyzer():
+    from services import PromptAnalyzer
+    return PromptAnalyzer(cache=analysis_cache, **retrieval_settings)
+
+@_lazy_service
+def get_recommender():
+    from services import NodeRecommender
+    return NodeRecommender(
+        cache=recommendation_cache,
+        template_min_score=float(os.getenv("WORKFLOW_TEMPLATE_MIN_SCORE", "0.5"))
+    )
+
+# 파레토 최적화 (optimization_goal=pareto) 탐색 시간 예산 기본값과 요청별 최댓값(ms)
+pareto_time_budget_ms = float(os.getenv("PARETO_TIME_BUDGET_MS", "2000"))
+pareto_max_time_budget_ms = float(os.getenv("PARETO_MAX_TIME_BUDGET_MS", "10000"))
+
+# optimize_workflow의 pareto_json에서 받을 수 있는 항목
+PARETO_OPTIONS = ("tool_model", "constraints", "weights", "time_budget_ms",
+                  "max_retries", "max_frontier", "seed", "verify_trials")
+
+@_lazy_service
+def get_optimizer():
+    from services import WorkflowOptimizer
+    return WorkflowOptimizer(pareto_defaults={"time_budget_ms": pareto_time_budget_ms})
+
+@_lazy_service
+def get_simulator():
+    from services import WorkflowSimulator
+    return WorkflowSimulator()
+
+@_lazy_service
+def get_tool_memo():
+    from services import ToolCallMemo
+    from services.tool_memo import parse_ttls
+    return ToolCallMemo(
+        maxsize=int(os.getenv("TOOL_MEMO_SIZE", "1024")),
+        default_ttl_seconds=float(os.getenv("TOOL_MEMO_TTL_SECONDS", "300")),
+        category_ttls=parse_ttls(os.getenv("TOOL_MEMO_CATEGORY_TTLS", "")),
+        sqlite_path=os.getenv("TOOL_MEMO_SQLITE_PATH") or None
+    )
+
+# execute_workflow 호출 하나가 실행기 작업자를 오래 붙잡지 않도록 요청별 반복 횟수와 시간 배율의 최댓값
+runtime_max_loop_iterations = int(os.getenv("WORKFLOW_RUNTIME_MAX_LOOP_ITERATIONS", "100"))
+runtime_max_time_scale = float(os.getenv("WORKFLOW_RUNTIME_MAX_TIME_SCALE", "1.0"))
+
+@_lazy_service
+def get_runtime():
+    from services import WorkflowRuntime
+    return WorkflowRuntime(
+        concurrency_limit=int(os.getenv("WORKFLOW_RUNTIME_CONCURRENCY", "8")),
+        default_timeout_ms=float(os.getenv("WORKFLOW_RUNTIME_TIMEOUT_MS", "30000")),
+        retry_backoff_ms=float(os.getenv("WORKFLOW_RUNTIME_BACKOFF_MS", "100")),
+        memo=get_tool_memo()
+    )
+
+@_lazy_service
+def get_workflow_store():
+    """워크플로우 저장소 (WORKFLOW_STORE_PATH=off이면 None, 상대 경로는 DATA_DIR 기준)"""
+    path = os.getenv("WORKFLOW_STORE_PATH", "workflows.db")
+    if path.lower() == "off":
+        return None
+    from services import WorkflowStore
+    from services.incremental_optimizer import apply_workflow_delta
+    return WorkflowStore(
+        str(data_dir / path),
+        cache_size=int(os.getenv("WORKFLOW_STORE_CACHE_SIZE", "256")),
+        max_versions=int(os.getenv("WORKFLOW_STORE_MAX_VERSIONS", "0")),
+        delta_applier=apply_workflow_delta,
+        compact_after=int(os.getenv("WORKFLOW_STORE_COMPACT_AFTER", "16")),
+        max_workflows=int(os.getenv("WORKFLOW_STORE_MAX_WORKFLOWS", "1000")),
+        max_age_seconds=float(os.getenv("WORKFLOW_STORE_MAX_AGE_SECONDS", "0"))
+    )
+
+def _require_workflow_store():
+    """저장소가 필요한 요청에서 사용 (꺼져 있으면 ValueError)"""
+    store = get_workflow_store()
+    if store is None:
+        raise ValueError("워크플로우 저장소가 꺼져 있습니다 (WORKFLOW_STORE_PATH)")
+    return store
+
+@_lazy_service
+def get_incremental_optimizer():
+    """저장소 기반 증분 최적화 세션 (저장소가 꺼져 있으면 None)"""
+    store = get_workflow_store()
+    if store is None:
+        return None
+    from services import IncrementalOptimizer
+    return IncrementalOptimizer(
+        store,
+        get_optimizer(),
+        max_sessions=int(os.getenv("INCREMENTAL_OPTIMIZER_SESSIONS", "64"))
+    )
+
+@_lazy_service
+def get_designer():
+    from services import WorkflowDesigner
+    return WorkflowDesigner(get_analyzer(), get_recommender(), get_optimizer(), get_workflow_store())
+
+# 도구 카탈로그 파일 변경 확인 주기(초, 0이면 hot reload 사용 안 함)
+catalog_watch_seconds = float(os.getenv("TOOL_CATALOG_WATCH_SECONDS", "2"))
+
+# 도구 실행기 생성 (처리 함수를 풀에서 실행하고 도구별 동시 실행/대기열 제한)
+executor_workers = os.getenv("TOOL_EXECUTOR_WORKERS", "")
+tool_executor = ToolExecutor(
+    mode=os.getenv("TOOL_EXECUTOR", "thread"),
+    max_workers=int(executor_workers) if executor_workers else None,
+    concurrency_limit=int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4")),
+    queue_limit=int(os.getenv("TOOL_QUEUE_LIMIT", "32")),
+    concurrency_limits=parse_limits(os.getenv("TOOL_CONCURRENCY_LIMITS", "")),
+    queue_limits=parse_limits(os.getenv("TOOL_QUEUE_LIMITS", "")),
+    # 작업자 프로세스도 카탈로그 변경을 각자 감시
+    process_initializer=start_catalog_watcher,
+    process_initargs=(catalog_watch_seconds,)
+)
+
+# 도구별 지연/처리량 지표 (스레드별 히스토그램)
+metrics = MetricsRegistry()
+
+# 요청 시 프로파일링 (PROFILE_TOOLS에 지정한 도구 또는 profile 플래그를 켠 호출)
+profiler = ToolProfiler(
+    dump_dir=os.getenv("PROFILE_DIR", "logs/profiles"),
+    keep_slowest=int(os.getenv("PROFILE_KEEP_SLOWEST", "10")),
+    tools=[name.strip() for name in os.getenv("PROFILE_TOOLS", "").split(",") if name.strip()],
+    allow_requests=os.getenv("PROFILE_ALLOW_REQUESTS", "false").lower() == "true",
+    trace_memory=os.getenv("PROFILE_TRACE_MEMORY", "false").lower() == "true",
+    top=int(os.getenv("PROFILE_TOP", "20"))
+)
+
+def _payload_size(value) -> int:
+    """
+    요청 인자/응답의 대략적인 크기 (문자 수)
+    호출마다 다시 직렬화하지 않도록 이미 직렬화된 문자열은 len()만 쓰고,
+    목록/객체 인자는 안에 든 문자열과 값의 길이를 더합니다.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(item) for item in value) + len(value) + 1
+    if isinstance(value, dict):
+        return sum(len(str(key)) + _payload_size(item) for key, item in value.items()) + 2 * len(value) + 1
+    return len(str(value))
+
+async def _run_tool(tool_name: str, func, *args, thread_only: bool = False, profile: bool = False) -> str:
+    """
+    처리 함수를 도구 실행기에서 실행하고 처리 시간/크기/오류를 지표에 기록합니다.
+    대기열이 가득 차면 구조화된 "busy" 오류를 반환합니다.
+    프로파일링 대상 호출은 풀 안에서 cProfile/tracemalloc으로 감싸 실행합니다.
+    """
+    started = time.perf_counter()
+    phases = None
+    error = None
+    try:
+        if profiler.should_profile(tool_name, profile):
+            (result, phases, error), record = await tool_executor.run(
+                tool_name, profile_call, profiler.trace_memory, profiler.top,
+                call_with_phases, call_with_catalog, func, *args, thread_only=thread_only
+            )
+            profiler.add(tool_name, record)
+        else:
+            result, phases, error = await tool_executor.run(
+                tool_name, call_with_phases, call_with_catalog, func, *args, thread_only=thread_only
+            )
+    except ToolBusyError as e:
+        error = "busy"
+        result = json.dumps(e.to_dict(), ensure_ascii=False)
+    except Exception as e:
+        # 처리 함수는 자체적으로 오류를 JSON으로 돌려주므로 여기에는 풀 오류만 도달
+        error = type(e).__name__
+        result = json.dumps({
+            "error": str(e),
+            "message": "도구 실행기 오류 발생"
+        }, ensure_ascii=False)
+    
+    _record_call(tool_name, started, args, result, phases, error)
+    return result
+
+def _record_call(tool_name: str, started: float, args: tuple, result: str, phases, error) -> None:
+    """도구 호출 한 번의 처리 시간/크기/오류를 지표에 기록합니다."""
+    metrics.record(
+        tool_name,
+        (time.perf_counter() - started) * 1000,
+        phases=phases,
+        request_bytes=sum(_payload_size(arg) for arg in args),
+        response_bytes=_payload_size(result),
+        error=error
+    )
 
 # ============================================================================
 # 도구 1: 프롬프트 분석
 # ============================================================================
 
 @mcp.tool()
-def analyze_prompt(user_prompt: str) -> str:
+async def analyze_prompt(user_prompt: str, format: str = "", profile: bool = False) -> str:
     """
     사용자 프롬프트를 분석하여 필요한 에이전트 기능을 파악합니다.
     
     Args:
         user_prompt: 사용자의 에이전트 요청 텍스트
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
         
     Returns:
         분석 결과 JSON 문자열
     """
+    return await _run_tool("analyze_prompt", _analyze_prompt, user_prompt, format, profile=profile)
+
+def _analyze_prompt(user_prompt: str, format: str = "") -> str:
+    """analyze_prompt 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
     try:
-        analysis = analyzer.analyze(user_prompt)
-        return json.dumps(analysis, ensure_ascii=False, indent=2)
+        with phase("service"):
+            analysis = get_analyzer().analyze(user_prompt)
+        with phase("serialize"):
+            return dumps(analysis, format)
     except Exception as e:
         return json.dumps({
             "error": str(e),
             "message": "프롬프트 분석 중 오류 발생"
         }, ensure_ascii=False)
 
+# ============================================================================
+# 도구 1-2: 프롬프트 배치 분석
+# ============================================================================
+
+def _iter_batch_prompts(prompts: Optional[list], jsonl_path: str):
+    """직접 전달된 프롬프트 목록 또는 JSONL 파일에서 프롬프트를 순서대로 꺼냅니다."""
+    if prompts is not None:
+        yield from prompts
+        return
+    
+    for record in iter_jsonl(jsonl_path):
+        # 각 줄은 문자열 또는 {"prompt": "..."} 객체
+        if isinstance(record, dict):
+            record = record.get("prompt", record.get("user_prompt"))
+        yield record
+
+@mcp.tool()
+async def analyze_prompts_batch(
+    prompts: Optional[list] = None,
+    jsonl_path: str = "",
+    workers: int = 0,
+    batch_size: int = 256,
+    output_path: str = "",
+    format: str = ""
+) -> str:
+    """
+    여러 프롬프트를 프로세스 풀로 나누어 분석합니다.
+    
+    Args:
+        prompts: 분석할 프롬프트 목록 (jsonl_path와 둘 중 하나)
+        jsonl_path: 한 줄에 하나씩 프롬프트 문자열 또는 {"prompt": ...} 객체가 있는 JSONL 파일 경로
+            (BATCH_IO_DIR 기준 상대 경로)
+        workers: 프로세스 수 (0이면 ANALYZER_BATCH_WORKERS 또는 CPU 수, 1이면 단일 프로세스)
+        batch_size: 워커에 한 번에 전달할 프롬프트 수
+        output_path: 지정하면 결과를 입력 순서대로 JSONL 파일(BATCH_IO_DIR 기준 상대 경로)에 기록하고
+            응답에는 통계만 포함 (BATCH_OUTPUT_ENABLED=true일 때만 사용 가능)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        
+    Returns:
+        배치별 처리량과 분석 결과 JSON 문자열
+    """
+    return await _run_tool(
+        "analyze_prompts_batch",
+        _analyze_prompts_batch,
+        prompts,
+        jsonl_path,
+        workers,
+        batch_size,
+        output_path,
+        format,
+        thread_only=True  # 자체 프로세스 풀을 만들므로 항상 스레드에서 실행
+    )
+
+def _analyze_prompts_batch(
+    prompts: Optional[list] = None,
+    jsonl_path: str = "",
+    workers: int = 0,
+    batch_size: int = 256,
+    output_path: str = "",
+    format: str = ""
+) -> str:
+    """analyze_prompts_batch 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
+    try:
+        with phase("parse"):
+            if (prompts is None) == (not jsonl_path):
+                raise ValueError("prompts 또는 jsonl_path 중 하나만 지정해야 합니다")
+            if output_path and not batch_output_enabled:
+                raise ValueError("output_path는 BATCH_OUTPUT_ENABLED=true일 때만 사용할 수 있습니다")
+            input_file = str(_batch_io_path(jsonl_path)) if jsonl_path else ""
+            output_file = _batch_io_path(output_path) if output_path else None
+        
+        started = time.perf_counter()
+        results = []
+        batches = []
+        with phase("service"):
+            output = None
+            if output_file is not None:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                output = open(output_file, "w", encoding="utf-8")
+            try:
+                for batch in get_analyzer().analyze_many(
+                    _iter_batch_prompts(prompts, input_file),
+                    workers=workers or None,
+                    batch_size=batch_size
+                ):
+                    # 배치는 입력 순서대로 도착하므로 그대로 이어 붙이거나 파일로 흘려보냄
+                    if output is not None:
+                        for result in batch["results"]:
+                            output.write(dumps(result, "compact"))
+                            output.write("\n")
+                    else:
+                        results.extend(batch["results"])
+                    batches.append({k: v for k, v in batch.items() if k != "results"})
+            finally:
+                if output is not None:
+                    output.close()
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        total = sum(batch["count"] for batch in batches)
+        response = {
+            "total": total,
+            "batch_count": len(batches),
+            "elapsed_ms": round(elapsed_ms, 3),
+            "prompts_per_sec": round(total / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else None,
+            "batches": batches
+        }
+        if output_path:
+            response["output_path"] = output_path
+        else:
+            response["results"] = results
+        
+        with phase("serialize"):
+            return dumps(response, format)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "message": "프롬프트 배치 분석 중 오류 발생"
+        }, ensure_ascii=False)
+
 # ============================================================================
 # 도구 2: 노드 구조 추천
 # ============================================================================
 
 @mcp.tool()
-def recommend_nodes(
+async def recommend_nodes(
     intent: str,
     required_capabilities: list,
     complexity_level: str = "medium",
-    workflow_type: str = "sequential"
+    workflow_type: str = "sequential",
+    schema_mode: str = "inline",
+    query: str = "",
+    save: bool = False,
+    format: str = "",
+    profile: bool = False
 ) -> str:
     """
     분석 결과에 따라 최적의 노드 구조를 추천합니다.
@@ -82,64 +513,229 @@ def recommend_nodes(
         required_capabilities: 필요한 기능 목록
         complexity_level: 복잡도 (low, medium, high)
         workflow_type: 워크플로우 타입 (sequential, parallel, conditional, loop)
+        schema_mode: 도구 입력 스키마 표현 방식 (inline: 노드마다 포함,
+            ref: 최상위 schemas 표에 한 번만 두고 노드는 {"$ref": "#/schemas/<도구 id>"}로 참조, omit: 제외)
+        query: 사용자 프롬프트 (주면 기능별 도구에 도구 검색 인덱스로 찾은 도구를 더함)
+        save: 추천 결과를 워크플로우 저장소에 저장 (이후 optimize_workflow 등에 workflow_id로 전달)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
         
     Returns:
-        노드 추천 결과 JSON 문자열
+        노드 추천 결과 JSON 문자열 (save이면 workflow_store에 저장한 workflow_id/version,
+        저장에 실패하면 오류 정보 포함)
     """
+    return await _run_tool(
+        "recommend_nodes",
+        _recommend_nodes,
+        intent,
+        required_capabilities,
+        complexity_level,
+        workflow_type,
+        schema_mode,
+        query,
+        save,
+        format,
+        profile=profile
+    )
+
+def _recommend_nodes(
+    intent: str,
+    required_capabilities: list,
+    complexity_level: str = "medium",
+    workflow_type: str = "sequential",
+    schema_mode: str = "inline",
+    query: str = "",
+    save: bool = False,
+    format: str = ""
+) -> str:
+    """recommend_nodes 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
     try:
-        # 추천 도구 선택
-        recommended_tools = []
-        for capability in required_capabilities:
-            category_tools = AVAILABLE_TOOLS
-            for tool_name, tool_info in category_tools.items():
-                if tool_info.get("category") == capability:
-                    tool_copy = tool_info.copy()
-                    tool_copy["id"] = tool_name
-                    recommended_tools.append(tool_copy)
-        
-        # 노드 추천
-        recommendation = recommender.recommend(
-            intent=intent,
-            required_capabilities=required_capabilities,
-            recommended_tools=recommended_tools,
-            complexity_level=complexity_level,
-            workflow_type=workflow_type
-        )
+        with phase("parse"):
+            store = _require_workflow_store() if save else None
+        with phase("service"):
+            # 추천 도구 선택 (카테고리 역색인의 읽기 전용 뷰 사용, query가 있으면 검색 결과 추가)
+            if query:
+                recommended_tools = get_analyzer().select_tools(query, required_capabilities)
+            else:
+                recommended_tools = get_catalog_index().tools_for_capabilities(required_capabilities)
+            
+            # 노드 추천
+            recommendation = get_recommender().recommend(
+                intent=intent,
+                required_capabilities=required_capabilities,
+                recommended_tools=recommended_tools,
+                complexity_level=complexity_level,
+                workflow_type=workflow_type,
+                schema_mode=schema_mode
+            )
+            if store is not None:
+                # 저장한 문서는 수정하지 않으므로 응답에는 복사본에 저장 정보를 더함
+                recommendation = dict(recommendation,
+                                      workflow_store=store.try_save(recommendation, "recommend_nodes"))
         
-        return json.dumps(recommendation, ensure_ascii=False, indent=2)
+        with phase("serialize"):
+            return dumps(recommendation, format)
     except Exception as e:
         return json.dumps({
             "error": str(e),
             "message": "노드 추천 중 오류 발생"
         }, ensure_ascii=False)
 
+def _load_workflow(
+    workflow_json: str,
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = ""
+) -> tuple:
+    """
+    도구 인자로 받은 워크플로우를 가져옵니다.
+    workflow_json을 주면 그대로 파싱하고, workflow_id를 주면 저장소의 버전(0이면 최신)을 읽으며,
+    patch_json(JSON Patch)을 함께 주면 그 버전에 적용해 새 버전으로 저장합니다.
+
+    Returns:
+        (워크플로우, 저장소 버전 정보 또는 None)
+    """
+    if workflow_json:
+        if workflow_id or patch_json:
+            raise ValueError("workflow_json과 workflow_id/patch_json은 함께 지정할 수 없습니다")
+        return json.loads(workflow_json), None
+    if not workflow_id:
+        raise ValueError("workflow_json 또는 workflow_id가 필요합니다")
+    store = _require_workflow_store()
+    if patch_json:
+        return store.patch(workflow_id, json.loads(patch_json), version or None)
+    return store.load(workflow_id, version or None)
+
 # ============================================================================
 # 도구 3: 워크플로우 최적화
 # ============================================================================
 
 @mcp.tool()
-def optimize_workflow(
-    workflow_json: str,
-    optimization_goal: str = "speed"
+async def optimize_workflow(
+    workflow_json: str = "",
+    optimization_goal: str = "speed",
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    diff_json: str = "",
+    include_workflow: bool = False,
+    pareto_json: str = "",
+    save: bool = False,
+    format: str = "",
+    profile: bool = False
 ) -> str:
     """
     워크플로우를 최적화합니다.
+    diff_json을 주면 저장된 최신 최적화 결과에 변경분만 반영하는 증분 모드로 동작합니다.
+    optimization_goal이 pareto이면 속도·비용·신뢰성의 파레토 프론티어를 탐색해 하나를 선택합니다.
     
     Args:
-        workflow_json: 최적화할 워크플로우의 JSON 문자열
-        optimization_goal: 최적화 목표 (speed, cost, reliability)
+        workflow_json: 최적화할 워크플로우의 JSON 문자열 (workflow_id를 주면 비움)
+        optimization_goal: 최적화 목표 (speed, cost, reliability, pareto)
+        workflow_id: 저장소에 있는 워크플로우 id (save=true로 저장한 recommend_nodes 결과의 workflow_store.workflow_id)
+        version: 사용할 저장 버전 (0이면 최신)
+        patch_json: 저장된 버전에 적용할 JSON Patch(RFC 6902) 연산 목록 JSON 문자열
+            (예: [{"op": "replace", "path": "/nodes/2/tool_id", "value": "web_search"}])
+        diff_json: 증분 모드의 그래프 변경분 JSON 문자열 (workflow_id 필요, version은 편집한 바탕 버전)
+            {"added_nodes": [...], "removed_nodes": [id], "changed_nodes": [{"id", 필드...}],
+             "added_connections": [...], "removed_connections": [{"from_node", "to_node"}]}
+        include_workflow: 증분 모드에서 전체 최적화 워크플로우도 반환 (노드 수에 비례하는 비용)
+        pareto_json: pareto 목표의 옵션 JSON 문자열
+            {"tool_model": {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}},
+                            "substitutes": {도구 id: [대체 도구 id]}},
+             "constraints": "p95 < 5s, success >= 99%, minimize cost",
+             "weights": {"latency": 1, "cost": 1, "reliability": 1},
+             "time_budget_ms": 2000, "max_retries": 3, "max_frontier": 32, "seed": 0, "verify_trials": 0}
+            도구 모델 항목: median_ms, sigma, failure_probability, cost_per_call, cost_per_second, retry_backoff_ms
+        save: workflow_json으로 받은 워크플로우와 최적화 결과를 저장소에 저장
+            (workflow_id로 받은 워크플로우의 최적화 결과는 항상 같은 id의 새 버전으로 저장)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
         
     Returns:
-        최적화 결과 JSON 문자열
+        최적화 결과 JSON 문자열 (저장했으면 workflow_store에 입력/결과 버전 정보, 저장에 실패하면
+        오류 정보 포함). 증분 모드는 일정이 바뀐 노드, 무효화된 항목
+        (invalidated), 패스별 결과와 새 delta 버전 정보를 반환. pareto 목표는 선택한 변형을 저장하고
+        pareto 항목에 프론티어 변형별 점수(p50/p95/p99, 기대 비용, 성공률)와 선택 근거를 반환
     """
+    return await _run_tool(
+        "optimize_workflow",
+        _optimize_workflow,
+        workflow_json,
+        optimization_goal,
+        workflow_id,
+        version,
+        patch_json,
+        diff_json,
+        include_workflow,
+        pareto_json,
+        save,
+        format,
+        profile=profile
+    )
+
+def _optimize_workflow(
+    workflow_json: str = "",
+    optimization_goal: str = "speed",
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    diff_json: str = "",
+    include_workflow: bool = False,
+    pareto_json: str = "",
+    save: bool = False,
+    format: str = ""
+) -> str:
+    """optimize_workflow 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
     try:
-        workflow = json.loads(workflow_json)
-        optimized = optimizer.optimize(workflow, optimization_goal)
-        return json.dumps(optimized, ensure_ascii=False, indent=2)
+        # 인자 검증 오류도 호출 오류로 기록되도록 parse 단계 안에서 검증
+        with phase("parse"):
+            if pareto_json and optimization_goal != "pareto":
+                raise ValueError("pareto_json은 optimization_goal이 pareto일 때만 사용할 수 있습니다")
+            if diff_json:
+                if workflow_json or patch_json:
+                    raise ValueError("diff_json은 workflow_json/patch_json과 함께 지정할 수 없습니다")
+                if optimization_goal == "pareto":
+                    raise ValueError("증분 최적화(diff_json)는 pareto 목표를 지원하지 않습니다")
+                if not workflow_id:
+                    raise ValueError("증분 최적화(diff_json)에는 workflow_id가 필요합니다")
+                incremental = get_incremental_optimizer()
+                if incremental is None:
+                    raise ValueError("워크플로우 저장소가 꺼져 있습니다 (WORKFLOW_STORE_PATH)")
+                diff = json.loads(diff_json)
+            else:
+                workflow, stored = _load_workflow(workflow_json, workflow_id, version, patch_json)
+                store = _require_workflow_store() if save or stored is not None else None
+                pareto_options = _pareto_options(pareto_json) if optimization_goal == "pareto" else None
+        
+        if diff_json:
+            with phase("service"):
+                optimized = incremental.optimize(workflow_id, diff, optimization_goal,
+                                                 expected_version=version or None,
+                                                 include_workflow=include_workflow)
+            with phase("serialize"):
+                return dumps(optimized, format)
+        
+        with phase("service"):
+            if pareto_options is not None:
+                optimized = get_optimizer().optimize_pareto(workflow, **pareto_options)
+            else:
+                optimized = get_optimizer().optimize(workflow, optimization_goal)
+            if store is not None:
+                if stored is None:
+                    # 직접 받은 워크플로우도 저장해 이후에는 id로 참조할 수 있게 함
+                    stored = store.try_save(workflow, "optimize_workflow:input")
+                result = stored if "error" in stored else store.try_save(
+                    optimized["optimized_workflow"], f"optimize_workflow:{optimization_goal}",
+                    workflow_id=stored["workflow_id"], parent_version=stored["version"]
+                )
+                optimized["workflow_store"] = {"input": stored, "optimized": result}
+        with phase("serialize"):
+            return dumps(optimized, format)
     except json.JSONDecodeError:
         return json.dumps({
             "error": "Invalid JSON format",
-            "message": "워크플로우 JSON 형식이 올바르지 않습니다"
+            "message": "워크플로우, 패치, 변경분 또는 파레토 옵션 JSON 형식이 올바르지 않습니다"
         }, ensure_ascii=False)
     except Exception as e:
         return json.dumps({
@@ -147,66 +743,449 @@ def optimize_workflow(
             "message": "워크플로우 최적화 중 오류 발생"
         }, ensure_ascii=False)
 
+def _pareto_options(pareto_json: str) -> dict:
+    """optimize_workflow의 pareto_json을 검증해 ParetoOptimizer.optimize() 인자로 바꿉니다."""
+    options = json.loads(pareto_json) if pareto_json else {}
+    if not isinstance(options, dict):
+        raise ValueError("pareto_json은 객체여야 합니다")
+    unknown = [key for key in options if key not in PARETO_OPTIONS]
+    if unknown:
+        raise ValueError(f"알 수 없는 pareto_json 항목: {', '.join(unknown)} (사용 가능: {', '.join(PARETO_OPTIONS)})")
+    budget = options.get("time_budget_ms", pareto_time_budget_ms)
+    if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget > pareto_max_time_budget_ms:
+        raise ValueError(f"time_budget_ms는 {pareto_max_time_budget_ms:g} 이하의 숫자여야 합니다 "
+                         "(PARETO_MAX_TIME_BUDGET_MS)")
+    return options
+
+# ============================================================================
+# 도구 3-1: 워크플로우 설계 파이프라인 (분석 → 추천 → 최적화)
+# ============================================================================
+
+@mcp.tool()
+async def design_workflow(
+    user_prompt: str,
+    stages: Optional[list] = None,
+    optimization_goal: str = "speed",
+    workflow_type: str = "",
+    fields: Optional[list] = None,
+    schema_mode: str = "inline",
+    save: bool = False,
+    format: str = "",
+    profile: bool = False
+) -> str:
+    """
+    프롬프트 분석, 노드 추천, 워크플로우 최적화를 한 번의 호출로 실행합니다.
+    
+    Args:
+        user_prompt: 사용자의 에이전트 요청 텍스트
+        stages: 실행할 단계 (analyze, recommend, optimize 중 선택, 기본값은 전체)
+            요청한 마지막 단계까지의 앞 단계는 함께 실행됩니다
+        optimization_goal: 최적화 목표 (speed, cost, reliability, pareto)
+            pareto는 기본 도구 모델과 PARETO_TIME_BUDGET_MS 시간 예산 사용
+        workflow_type: 분석 결과 대신 사용할 워크플로우 타입 (빈 문자열이면 분석 결과 사용)
+        fields: 응답에 포함할 필드 (예: ["optimization.optimized_workflow", "analysis.intent_analysis"])
+        schema_mode: 추천 노드의 도구 입력 스키마 표현 방식 (inline, ref, omit)
+        save: 추천/최적화 결과를 워크플로우 저장소에 저장 (workflow_store에 버전 정보)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
+            
+    Returns:
+        단계별 결과 JSON 문자열
+    """
+    return await _run_tool(
+        "design_workflow",
+        _design_workflow,
+        user_prompt,
+        stages,
+        optimization_goal,
+        workflow_type,
+        fields,
+        schema_mode,
+        save,
+        format,
+        profile=profile
+    )
+
+def _design_workflow(
+    user_prompt: str,
+    stages: Optional[list] = None,
+    optimization_goal: str = "speed",
+    workflow_type: str = "",
+    fields: Optional[list] = None,
+    schema_mode: str = "inline",
+    save: bool = False,
+    format: str = ""
+) -> str:
+    """design_workflow 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
+    try:
+        with phase("service"):
+            result = get_designer().design(
+                user_prompt,
+                stages=stages,
+                optimization_goal=optimization_goal,
+                workflow_type=workflow_type or None,
+                fields=fields,
+                schema_mode=schema_mode,
+                save=save
+            )
+        with phase("serialize"):
+            return dumps(result, format)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "message": "워크플로우 설계 중 오류 발생"
+        }, ensure_ascii=False)
+
+# ============================================================================
+# 도구 3-2: 워크플로우 지연 시뮬레이션
+# ============================================================================
+
+@mcp.tool()
+async def simulate_workflow(
+    workflow_json: str = "",
+    trials: int = 10000,
+    latency_model_json: str = "",
+    seed: Optional[int] = None,
+    loop_iterations: int = 1,
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    format: str = "",
+    profile: bool = False
+) -> str:
+    """
+    워크플로우 실행 시간을 몬테카를로 방식으로 시뮬레이션합니다.
+    
+    Args:
+        workflow_json: 시뮬레이션할 워크플로우의 JSON 문자열 (recommend_nodes 결과 등, workflow_id를 주면 비움)
+        trials: 시행 횟수
+        latency_model_json: 지연 모델 JSON 문자열
+            {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}}}
+            항목: distribution(lognormal/normal/exponential/uniform/fixed), median_ms, mean_ms,
+            sigma, cv, low_ms, high_ms, failure_probability, retry_count, timeout_ms, retry_backoff_ms
+        seed: 난수 시드 (재현용)
+        loop_iterations: 반복(loop_back) 구간의 반복 횟수
+        workflow_id: 저장소에 있는 워크플로우 id
+        version: 사용할 저장 버전 (0이면 최신)
+        patch_json: 저장된 버전에 적용할 JSON Patch 연산 목록 JSON 문자열 (적용 결과는 새 버전으로 저장)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
+        
+    Returns:
+        p50/p95/p99 소요 시간, 성공률, 노드별 지연 기여도 JSON 문자열
+    """
+    return await _run_tool(
+        "simulate_workflow",
+        _simulate_workflow,
+        workflow_json,
+        trials,
+        latency_model_json,
+        seed,
+        loop_iterations,
+        workflow_id,
+        version,
+        patch_json,
+        format,
+        profile=profile
+    )
+
+def _simulate_workflow(
+    workflow_json: str = "",
+    trials: int = 10000,
+    latency_model_json: str = "",
+    seed: Optional[int] = None,
+    loop_iterations: int = 1,
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    format: str = ""
+) -> str:
+    """simulate_workflow 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
+    try:
+        with phase("parse"):
+            workflow, stored = _load_workflow(workflow_json, workflow_id, version, patch_json)
+            latency_model = json.loads(latency_model_json) if latency_model_json else None
+        with phase("service"):
+            result = get_simulator().simulate(
+                workflow,
+                trials=trials,
+                latency_model=latency_model,
+                seed=seed,
+                loop_iterations=loop_iterations
+            )
+            if stored is not None:
+                result["workflow_store"] = stored
+        with phase("serialize"):
+            return dumps(result, format)
+    except json.JSONDecodeError:
+        return json.dumps({
+            "error": "Invalid JSON format",
+            "message": "워크플로우, 패치 또는 지연 모델 JSON 형식이 올바르지 않습니다"
+        }, ensure_ascii=False)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "message": "워크플로우 시뮬레이션 중 오류 발생"
+        }, ensure_ascii=False)
+
+# ============================================================================
+# 도구 3-3: 워크플로우 실행 (로컬 처리기/stub)
+# ============================================================================
+
+@mcp.tool()
+async def execute_workflow(
+    workflow_json: str = "",
+    inputs_json: str = "",
+    stub_model_json: str = "",
+    conditions_json: str = "",
+    loop_iterations: int = 1,
+    time_scale: float = 0.01,
+    arguments_json: str = "",
+    memoize: bool = False,
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    format: str = "",
+    profile: bool = False
+) -> str:
+    """
+    워크플로우를 로컬 처리기로 실제 실행하고 노드별 실제 소요 시간을 보고합니다.
+    병렬 연결은 동시에 실행되며(WORKFLOW_RUNTIME_CONCURRENCY 제한), 노드의 timeout_ms와
+    retry_count(지수 backoff)를 적용하고 loop_back 구간을 반복합니다.
+    등록된 처리기가 없는 카탈로그 도구는 estimated_time_ms만큼 기다리는 결정적 stub으로 실행합니다.
+    
+    Args:
+        workflow_json: 실행할 워크플로우의 JSON 문자열 (recommend_nodes 결과, 최적화된 워크플로우 등,
+            workflow_id를 주면 비움)
+        inputs_json: 모든 처리기에 전달할 실행 입력 JSON 문자열
+        stub_model_json: stub 설정 JSON 문자열
+            {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}}}
+            항목: latency_ms, fail_attempts(처음 N번 시도 실패), error
+        conditions_json: 연결 조건 평가 결과 JSON 문자열 (예: {"if_condition": false}, 없는 조건은 참)
+        loop_iterations: loop_back 구간의 최대 반복 횟수 (WORKFLOW_RUNTIME_MAX_LOOP_ITERATIONS 이하)
+        time_scale: 지연/타임아웃/backoff 배율 (기본 0.01: 100배 빠르게 실행, 1이면 실제 시간,
+            WORKFLOW_RUNTIME_MAX_TIME_SCALE 이하)
+        arguments_json: 도구 인자 JSON 문자열 {노드 id 또는 도구 id: {인자}} (노드 id 항목 우선,
+            주어진 인자는 inputSchema로 검증)
+        memoize: 도구 호출을 도구 id + 인자 + 노드/입력/선행 결과/반복 차수의 해시로 메모이제이션
+            (TTL은 TOOL_MEMO_CATEGORY_TTLS, 시도별 memo 항목에 memory/disk/shared/miss/uncacheable 표시)
+        workflow_id: 저장소에 있는 워크플로우 id
+        version: 사용할 저장 버전 (0이면 최신)
+        patch_json: 저장된 버전에 적용할 JSON Patch 연산 목록 JSON 문자열 (적용 결과는 새 버전으로 저장)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
+        
+    Returns:
+        실행 상태, 실제 총 소요 시간, 노드별 실행 시각/시도 결과 JSON 문자열
+    """
+    return await _run_tool(
+        "execute_workflow",
+        _execute_workflow,
+        workflow_json,
+        inputs_json,
+        stub_model_json,
+        conditions_json,
+        loop_iterations,
+        time_scale,
+        arguments_json,
+        memoize,
+        workflow_id,
+        version,
+        patch_json,
+        format,
+        profile=profile
+    )
+
+def _execute_workflow(
+    workflow_json: str = "",
+    inputs_json: str = "",
+    stub_model_json: str = "",
+    conditions_json: str = "",
+    loop_iterations: int = 1,
+    time_scale: float = 0.01,
+    arguments_json: str = "",
+    memoize: bool = False,
+    workflow_id: str = "",
+    version: int = 0,
+    patch_json: str = "",
+    format: str = ""
+) -> str:
+    """execute_workflow 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
+    try:
+        with phase("parse"):
+            if loop_iterations > runtime_max_loop_iterations:
+                raise ValueError(f"loop_iterations는 {runtime_max_loop_iterations} 이하여야 합니다 "
+                                 "(WORKFLOW_RUNTIME_MAX_LOOP_ITERATIONS)")
+            if time_scale > runtime_max_time_scale:
+                raise ValueError(f"time_scale은 {runtime_max_time_scale:g} 이하여야 합니다 "
+                                 "(WORKFLOW_RUNTIME_MAX_TIME_SCALE)")
+            workflow, stored = _load_workflow(workflow_json, workflow_id, version, patch_json)
+            inputs = json.loads(inputs_json) if inputs_json else None
+            stub_model = json.loads(stub_model_json) if stub_model_json else None
+            conditions = json.loads(conditions_json) if conditions_json else None
+            arguments = json.loads(arguments_json) if arguments_json else None
+        with phase("service"):
+            # 실행기 풀의 작업 스레드/프로세스에는 이벤트 루프가 없으므로 새 루프에서 실행
+            result = get_runtime().run_sync(
+                workflow,
+                inputs=inputs,
+                stub_model=stub_model,
+                loop_iterations=loop_iterations,
+                conditions=conditions,
+                time_scale=time_scale,
+                arguments=arguments,
+                memoize=memoize
+            )
+            if stored is not None:
+                result["workflow_store"] = stored
+        with phase("serialize"):
+            return dumps(result, format)
+    except json.JSONDecodeError:
+        return json.dumps({
+            "error": "Invalid JSON format",
+            "message": "워크플로우, 패치, 입력, stub 설정, 조건 또는 인자 JSON 형식이 올바르지 않습니다"
+        }, ensure_ascii=False)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "message": "워크플로우 실행 중 오류 발생"
+        }, ensure_ascii=False)
+
+# ============================================================================
+# 도구 3-4: 저장된 워크플로우 조회 (버전 기록)
+# ============================================================================
+
+@mcp.tool()
+async def get_workflow(
+    workflow_id: str,
+    version: int = 0,
+    history: bool = False,
+    history_limit: int = 50,
+    format: str = "",
+    profile: bool = False
+) -> str:
+    """
+    저장소에 있는 워크플로우 버전이나 버전 기록을 조회합니다.
+    
+    Args:
+        workflow_id: 워크플로우 id (recommend_nodes/optimize_workflow 결과의 workflow_store.workflow_id)
+        version: 조회할 버전 (0이면 최신)
+        history: True이면 문서 대신 최신 버전부터의 버전 기록(만든 곳, 부모 버전, 노드 수)을 반환
+        history_limit: 버전 기록 최대 개수
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        profile: 이번 호출을 프로파일링 (PROFILE_ALLOW_REQUESTS=true일 때만, 결과는 profile://summary 리소스)
+        
+    Returns:
+        {"workflow_store": 버전 정보, "workflow": 문서} 또는 {"workflow_id", "versions": [...]} JSON 문자열
+    """
+    return await _run_tool(
+        "get_workflow",
+        _get_workflow,
+        workflow_id,
+        version,
+        history,
+        history_limit,
+        format,
+        profile=profile
+    )
+
+def _get_workflow(
+    workflow_id: str,
+    version: int = 0,
+    history: bool = False,
+    history_limit: int = 50,
+    format: str = ""
+) -> str:
+    """get_workflow 도구의 처리 함수 (도구 실행기 풀에서 실행)"""
+    try:
+        with phase("service"):
+            store = _require_workflow_store()
+            if history:
+                result = {"workflow_id": workflow_id, "versions": store.history(workflow_id, history_limit)}
+            else:
+                workflow, stored = store.load(workflow_id, version or None)
+                result = {"workflow_store": stored, "workflow": workflow}
+        with phase("serialize"):
+            return dumps(result, format)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "message": "워크플로우 조회 중 오류 발생"
+        }, ensure_ascii=False)
+
 # ============================================================================
 # 도구 4: 사용 가능한 도구 목록 조회
 # ============================================================================
 
 @mcp.tool()
-def get_available_tools() -> str:
+async def get_available_tools(if_none_match: str = "", format: str = "") -> str:
     """
     사용 가능한 모든 도구와 그 설정을 반환합니다.
     
+    Args:
+        if_none_match: 이전 응답에서 받은 ETag (같으면 본문 없이 not_modified 응답,
+            다르면 {"etag", "not_modified": false, "tools": ...} 응답, 비우면 도구 목록만 반환)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        
     Returns:
         사용 가능한 도구 목록 JSON 문자열
     """
+    # 이미 직렬화된 응답이므로 실행기를 거치지 않고 바로 반환 (처리 시간은 직렬화 단계로 기록)
+    started = time.perf_counter()
+    error = None
     try:
-        tools_with_ids = {}
-        for tool_name, tool_info in AVAILABLE_TOOLS.items():
-            tool_copy = tool_info.copy()
-            tool_copy["id"] = tool_name
-            tools_with_ids[tool_name] = tool_copy
-        
-        return json.dumps(tools_with_ids, ensure_ascii=False, indent=2)
+        # 카탈로그 버전마다 한 번만 직렬화된 응답을 그대로 반환
+        result = tools_payload.render(format, if_none_match)
     except Exception as e:
-        return json.dumps({
+        error = type(e).__name__
+        result = json.dumps({
             "error": str(e),
             "message": "도구 목록 조회 중 오류 발생"
         }, ensure_ascii=False)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _record_call("get_available_tools", started, (if_none_match, format), result, {"serialize": elapsed_ms}, error)
+    return result
 
 # ============================================================================
 # 도구 5: 노드 패턴 정보 조회
 # ============================================================================
 
 @mcp.tool()
-def get_node_patterns() -> str:
+async def get_node_patterns(if_none_match: str = "", format: str = "") -> str:
     """
     사용 가능한 노드 패턴과 각 패턴의 설명을 반환합니다.
     
+    Args:
+        if_none_match: 이전 응답에서 받은 ETag (같으면 본문 없이 not_modified 응답,
+            다르면 {"etag", "not_modified": false, "patterns": ...} 응답, 비우면 패턴 정보만 반환)
+        format: 응답 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+        
     Returns:
         노드 패턴 정보 JSON 문자열
     """
+    # 이미 직렬화된 응답이므로 실행기를 거치지 않고 바로 반환 (처리 시간은 직렬화 단계로 기록)
+    started = time.perf_counter()
+    error = None
     try:
-        return json.dumps(NODE_PATTERNS, ensure_ascii=False, indent=2)
+        result = patterns_payload.render(format, if_none_match)
     except Exception as e:
-        return json.dumps({
+        error = type(e).__name__
+        result = json.dumps({
             "error": str(e),
             "message": "패턴 정보 조회 중 오류 발생"
         }, ensure_ascii=False)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _record_call("get_node_patterns", started, (if_none_match, format), result, {"serialize": elapsed_ms}, error)
+    return result
 
 # ============================================================================
 # 리소스: 서버 정보
 # ============================================================================
 
-@mcp.resource("info://server")
-def get_server_info() -> dict:
+@mcp.resource("info://server", mime_type="application/json")
+def get_server_info() -> str:
     """Agent Builder 서버의 정보를 제공합니다."""
-    return {
-        "name": "AgentBuilder MCP Server",
-        "version": "1.0.0",
-        "description": "에이전트 흐름 설계 및 노드 추천 시스템",
-        "tools_available": list(AVAILABLE_TOOLS.keys()),
-        "patterns_available": list(NODE_PATTERNS.keys())
-    }
+    return server_info_payload.render("compact")
 
 @mcp.resource("info://capabilities")
 def get_capabilities() -> dict:
@@ -215,21 +1194,160 @@ def get_capabilities() -> dict:
         "prompt_analysis": "사용자 프롬프트 분석",
         "node_recommendation": "최적 노드 구조 추천",
         "workflow_optimization": "워크플로우 최적화",
+        "workflow_design": "분석 → 추천 → 최적화 단일 호출 파이프라인",
+        "workflow_simulation": "워크플로우 지연 시뮬레이션 (p50/p95/p99)",
         "tool_discovery": "사용 가능한 도구 조회",
         "pattern_information": "노드 패턴 정보 제공"
     }
 
+@mcp.resource("executor://stats")
+def get_executor_stats() -> dict:
+    """도구 실행기의 도구별 동시 실행/대기/거부 통계를 제공합니다."""
+    return tool_executor.stats()
+
+@mcp.resource("metrics://server", mime_type="application/json")
+def get_metrics() -> str:
+    """도구별 호출 수, 오류 수, 처리 시간(전체/단계별)과 요청/응답 크기 백분위수를 제공합니다."""
+    return dumps(metrics.snapshot(), "compact")
+
+@mcp.resource("profile://summary", mime_type="application/json")
+def get_profile_summary() -> str:
+    """가장 느린 프로파일링 호출들의 상위 함수, 메모리 최대 사용량, 덤프 경로를 제공합니다."""
+    return dumps(profiler.summary(), "compact")
+
+@mcp.resource("catalog://status", mime_type="application/json")
+def get_catalog_status() -> str:
+    """도구 카탈로그의 현재 버전, 출처(파일/스냅샷), 다시 읽기 통계와 마지막 검증 오류를 제공합니다."""
+    return dumps(catalog_status(), "compact")
+
+@mcp.resource("store://stats")
+def get_store_stats() -> dict:
+    """워크플로우 저장소의 워크플로우/버전 수, 저장 크기, 문서 캐시, 증분 최적화 세션 통계를 제공합니다."""
+    store = get_workflow_store()
+    if store is None:
+        return {"name": "workflow_store", "enabled": False}
+    return dict(store.stats(), incremental_optimizer=get_incremental_optimizer().stats())
+
+@mcp.resource("cache://stats")
+def get_cache_stats() -> dict:
+    """분석/추천 결과 캐시와 도구 호출 메모이제이션의 히트/미스 통계를 제공합니다."""
+    return {
+        "catalog_version": get_catalog_version(),
+        "caches": [analysis_cache.stats(), recommendation_cache.stats(), get_tool_memo().stats()]
+    }
+
+# ============================================================================
+# HTTP 전송: 상태 확인 엔드포인트와 다중 작업자 실행
+# ============================================================================
+
+HTTP_TRANSPORTS = ("http", "streamable-http", "sse")
+server_started_at = time.time()
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health_check(request: Request) -> JSONResponse:
+    """로드 밸런서용 상태 확인 (작업자 프로세스별 응답)"""
+    return JSONResponse({
+        "status": "ok",
+        "pid": os.getpid(),
+        "uptime_s": round(time.time() - server_started_at, 3),
+        "catalog_version": get_catalog_version(),
+        "executor": {
+            tool_name: {"active": stats["active"], "queued": stats["queued"]}
+            for tool_name, stats in tool_executor.stats()["tools"].items()
+        }
+    })
+
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Prometheus 수집용 도구 지표 (작업자 프로세스별 값)"""
+    return PlainTextResponse(metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+# Prometheus 엔드포인트는 설정한 경우에만 등록
+if os.getenv("METRICS_PROMETHEUS", "false").lower() == "true":
+    mcp.custom_route(os.getenv("METRICS_PROMETHEUS_PATH", "/metrics"), methods=["GET"])(prometheus_metrics)
+
+def _http_settings() -> dict:
+    """환경 변수에서 HTTP 전송 설정을 읽습니다."""
+    transport = os.getenv("SERVER_TRANSPORT", "stdio")
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    # 작업자가 여러 개면 요청이 어느 작업자로 갈지 모르므로 세션 없는(stateless) 모드가 기본
+    stateless_default = "true" if workers > 1 and transport != "sse" else "false"
+    return {
+        "transport": transport,
+        "host": os.getenv("SERVER_HOST", "127.0.0.1"),
+        "port": int(os.getenv("SERVER_PORT", "8000")),
+        "path": os.getenv("SERVER_PATH", "/mcp"),
+        "workers": workers,
+        "stateless_http": (os.getenv("SERVER_STATELESS_HTTP") or stateless_default).lower() == "true",
+        "json_response": os.getenv("SERVER_JSON_RESPONSE", "false").lower() == "true",
+        "graceful_timeout": float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "10"))
+    }
+
+def create_http_app():
+    """
+    HTTP 전송용 ASGI 앱을 생성합니다.
+    다중 작업자 모드에서는 uvicorn이 작업자 프로세스마다 이 함수를 호출합니다.
+    """
+    settings = _http_settings()
+    if settings["transport"] not in HTTP_TRANSPORTS:
+        raise ValueError(f"HTTP 전송이 아닙니다: {settings['transport']} (가능: {', '.join(HTTP_TRANSPORTS)})")
+    
+    # 작업자 종료 시 도구 실행기 풀도 정리
+    atexit.register(tool_executor.shutdown)
+    if retrieval_settings["retrieval_top_k"] > 0:
+        # 오래 실행되는 HTTP 서버는 요청을 받기 전에 검색 인덱스를 준비 (디스크에 있으면 읽기만 함)
+        _prepare_retrieval_index(get_catalog())
+    start_catalog_watcher(catalog_watch_seconds)
+    return mcp.http_app(
+        path=settings["path"],
+        transport=settings["transport"],
+        stateless_http=settings["stateless_http"] if settings["transport"] != "sse" else None,
+        json_response=settings["json_response"]
+    )
+
+def run_http_server() -> None:
+    """
+    uvicorn으로 HTTP 서버를 실행합니다.
+    SIGTERM/SIGINT를 받으면 새 연결을 받지 않고 진행 중인 요청을
+    SERVER_GRACEFUL_TIMEOUT초까지 기다린 뒤 종료합니다.
+    """
+    import uvicorn
+    
+    settings = _http_settings()
+    config = {
+        "host": settings["host"],
+        "port": settings["port"],
+        "timeout_graceful_shutdown": settings["graceful_timeout"],
+        "log_level": os.getenv("LOG_LEVEL", "info").lower()
+    }
+    if settings["workers"] > 1:
+        # 작업자 프로세스가 각자 앱을 만들 수 있도록 import 문자열로 전달
+        uvicorn.run(
+            "server:create_http_app",
+            factory=True,
+            workers=settings["workers"],
+            app_dir=str(Path(__file__).parent),
+            **config
+        )
+    else:
+        uvicorn.run(create_http_app(), **config)
+
 # ============================================================================
 # 서버 시작
 # ============================================================================
 
 if __name__ == "__main__":
-    import sys
-    
     # 디버그 모드 설정
     debug = os.getenv("SERVER_DEBUG", "false").lower() == "true"
+    transport = os.getenv("SERVER_TRANSPORT", "stdio")
     
     if debug:
-        print("Agent Builder MCP Server 시작 (디버그 모드)", file=sys.stderr)
+        print(f"Agent Builder MCP Server 시작 (디버그 모드, 전송: {transport})", file=sys.stderr)
     
-    mcp.run(transport="stdio")
+    try:
+        if transport == "stdio":
+            start_catalog_watcher(catalog_watch_seconds)
+            mcp.run(transport="stdio")
+        else:
+            run_http_server()
+    finally:
+        tool_executor.shutdown()
@@ -1,9 +1,51 @@
 # src/services/__init__.py
 """Services module for Agent Builder MCP Server"""
 
-from .prompt_analyzer import PromptAnalyzer
-from .node_recommender import NodeRecommender
-from .workflow_optimizer import WorkflowOptimizer
+import importlib
 
-__all__ = ["PromptAnalyzer", "NodeRecommender", "WorkflowOptimizer"]
+# 공개 이름 → 정의된 하위 모듈 (처음 접근할 때 import)
+_EXPORTS = {
+    "PromptAnalyzer": ".prompt_analyzer",
+    "NodeRecommender": ".node_recommender",
+    "PatternMatcher": ".pattern_matcher",
+    "WorkflowOptimizer": ".workflow_optimizer",
+    "IncrementalOptimizer": ".incremental_optimizer",
+    "OptimizationSession": ".incremental_optimizer",
+    "ParetoOptimizer": ".pareto_optimizer",
+    "WorkflowSimulator": ".workflow_simulator",
+    "WorkflowDesigner": ".workflow_designer",
+    "WorkflowRuntime": ".workflow_runtime",
+    "StubToolHandler": ".workflow_runtime",
+    "ToolCallMemo": ".tool_memo",
+    "ToolArgumentError": ".tool_memo",
+    "WorkflowStore": ".workflow_store",
+    "WorkflowNotFoundError": ".workflow_store",
+    "WorkflowConflictError": ".workflow_store",
+    "ResultCache": ".result_cache",
+    "ToolExecutor": ".tool_executor",
+    "ToolBusyError": ".tool_executor",
+    "StaticPayload": ".static_payloads",
+    "MetricsRegistry": ".metrics",
+    "ToolProfiler": ".profiler",
+    "CatalogIndex": ".catalog_index",
+    "ToolView": ".catalog_index",
+    "get_catalog_index": ".catalog_index",
+    "HashingEmbedder": ".tool_retrieval",
+    "ToolRetrievalIndex": ".tool_retrieval",
+    "get_tool_index": ".tool_retrieval",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
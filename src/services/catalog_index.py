@@ -0,0 +1,115 @@
+# src/services/catalog_index.py
+"""
+도구 카탈로그 인덱스
+카테고리/의존성 역색인과 읽기 전용 도구 뷰를 한 번만 구성하여 공유합니다.
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Mapping, Optional, Tuple
+
+from config.tools_config import get_catalog
+
+
+class ToolView(dict):
+    """
+    "id"가 포함된 읽기 전용 도구 정보
+
+    dict를 상속하므로 그대로 JSON 직렬화할 수 있습니다.
+    중첩된 inputSchema 등은 카탈로그와 공유되므로 수정하면 안 되며,
+    수정이 필요하면 dict(view) 또는 copy.copy(view)로 일반 dict 사본을 만듭니다.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("도구 뷰는 읽기 전용입니다. dict(view)로 사본을 만들어 수정하세요")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self):
+        # pickle/copy 시에는 일반 dict로 복원 (프로세스 간 전달, 수정 가능한 사본)
+        return (dict, (dict(self),))
+
+
+class CatalogIndex:
+    """불변 도구 카탈로그 인덱스"""
+
+    def __init__(self, tools: Mapping[str, Dict[str, Any]], version: Any = None):
+        """
+        Args:
+            tools: {도구 id: 도구 정보} 형태의 카탈로그
+            version: 인덱스를 만든 카탈로그 버전
+        """
+        self.version = version
+
+        views: Dict[str, ToolView] = {}
+        by_category: Dict[str, List[str]] = {}
+        dependents: Dict[str, List[str]] = {}
+
+        for tool_id, tool_info in tools.items():
+            view = dict(tool_info)
+            view["id"] = tool_id
+            views[tool_id] = ToolView(view)
+            by_category.setdefault(tool_info.get("category", ""), []).append(tool_id)
+            for dependency in tool_info.get("dependencies", []):
+                dependents.setdefault(dependency, []).append(tool_id)
+
+        # 카테고리 내부는 우선순위 순 (같은 우선순위는 카탈로그 정의 순서 유지)
+        for tool_ids in by_category.values():
+            tool_ids.sort(key=lambda tool_id: views[tool_id].get("priority", 999))
+
+        self.views: Mapping[str, ToolView] = MappingProxyType(views)
+        self.by_category: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {category: tuple(tool_ids) for category, tool_ids in by_category.items()}
+        )
+        self.category_views: Mapping[str, Tuple[ToolView, ...]] = MappingProxyType(
+            {
+                category: tuple(views[tool_id] for tool_id in tool_ids)
+                for category, tool_ids in by_category.items()
+            }
+        )
+        self.dependents: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {dependency: tuple(tool_ids) for dependency, tool_ids in dependents.items()}
+        )
+
+    def __len__(self) -> int:
+        return len(self.views)
+
+    def get(self, tool_id: str) -> Optional[ToolView]:
+        """도구 id로 읽기 전용 뷰를 조회합니다."""
+        return self.views.get(tool_id)
+
+    def tools_for_capabilities(self, capabilities: Iterable[str]) -> List[ToolView]:
+        """
+        기능(카테고리) 순서대로 해당 카테고리의 도구 뷰를 우선순위 순으로 모아 반환합니다.
+
+        Args:
+            capabilities: 기능(카테고리) 목록
+
+        Returns:
+            읽기 전용 도구 뷰 목록 (복사 없음)
+        """
+        selected: List[ToolView] = []
+        category_views = self.category_views
+        for capability in capabilities:
+            selected.extend(category_views.get(capability, ()))
+        return selected
+
+
+def get_catalog_index() -> CatalogIndex:
+    """
+    현재(호출 중 고정된) 카탈로그 버전의 인덱스를 반환합니다.
+    인덱스는 카탈로그 버전마다 한 번만 구성되어 그 카탈로그와 함께 보관됩니다.
+    """
+    catalog = get_catalog()
+    index = catalog.derived.get("index")
+    if index is None:
+        index = catalog.derived["index"] = CatalogIndex(catalog.tools, catalog.version)
+    return index
@@ -0,0 +1,216 @@
+# src/services/dag_scheduler.py
+"""
+DAG 스케줄러
+노드/연결 그래프를 위상 정렬하여 동시에 실행 가능한 단계(stage)와
+임계 경로, 예상 소요 시간을 계산합니다.
+"""
+
+from collections import deque
+from typing import Dict, List, Any, Tuple
+
+# 반복 구간을 되돌아가는 연결 타입 (DAG 스케줄링에서는 제외하고 별도로 보고)
+LOOP_BACK = "loop_back"
+
+
+def node_duration_ms(node: Dict[str, Any]) -> float:
+    """노드의 예상 소요 시간(ms)을 반환합니다 (시작/종료 노드는 0)."""
+    if node.get("type") in ("start", "end"):
+        return 0.0
+    return float(node.get("estimated_time_ms", 0) or 0)
+
+
+def build_graph(nodes: List[Dict[str, Any]],
+                connections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    노드/연결 목록에서 인접 리스트를 구성합니다.
+
+    Returns:
+        {"node_ids", "durations", "predecessors", "successors", "loop_back_edges"}
+        연결에만 등장하는 노드 id도 소요 시간 0인 노드로 포함됩니다.
+    """
+    node_ids: List[str] = []
+    durations: Dict[str, float] = {}
+    for node in nodes:
+        node_id = node["id"]
+        if node_id not in durations:
+            node_ids.append(node_id)
+        durations[node_id] = node_duration_ms(node)
+
+    predecessors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    successors: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    loop_back_edges: List[Dict[str, Any]] = []
+
+    for connection in connections:
+        source = connection.get("from_node")
+        target = connection.get("to_node")
+        for node_id in (source, target):
+            if node_id not in durations:
+                node_ids.append(node_id)
+                durations[node_id] = 0.0
+                predecessors[node_id] = []
+                successors[node_id] = []
+
+        if connection.get("type") == LOOP_BACK:
+            loop_back_edges.append(connection)
+            continue
+        if target not in successors[source]:
+            successors[source].append(target)
+            predecessors[target].append(source)
+
+    return {
+        "node_ids": node_ids,
+        "durations": durations,
+        "predecessors": predecessors,
+        "successors": successors,
+        "loop_back_edges": loop_back_edges
+    }
+
+
+def topological_levels(node_ids: List[str],
+                       predecessors: Dict[str, List[str]],
+                       successors: Dict[str, List[str]]) -> Tuple[List[List[str]], List[str]]:
+    """
+    Kahn 알고리즘으로 노드를 단계별로 나눕니다.
+
+    Returns:
+        (단계 목록, 순환에 걸려 스케줄되지 못한 노드 목록)
+        각 단계 안의 노드 순서는 입력 노드 순서를 따릅니다.
+    """
+    position = {node_id: i for i, node_id in enumerate(node_ids)}
+    remaining = {node_id: len(predecessors[node_id]) for node_id in node_ids}
+    current = [node_id for node_id in node_ids if remaining[node_id] == 0]
+    stages: List[List[str]] = []
+
+    while current:
+        stages.append(current)
+        following = []
+        for node_id in current:
+            for successor in successors[node_id]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    following.append(successor)
+        following.sort(key=position.__getitem__)
+        current = following
+
+    scheduled = sum(len(stage) for stage in stages)
+    cyclic = [] if scheduled == len(node_ids) else [
+        node_id for node_id in node_ids if remaining[node_id] > 0
+    ]
+    return stages, cyclic
+
+
+def _loop_body(target: str, source: str, node_ids: List[str],
+               successors: Dict[str, List[str]],
+               predecessors: Dict[str, List[str]]) -> List[str]:
+    """loop_back 연결(source → target)이 반복하는 구간의 노드들을 찾습니다."""
+    def reachable(start: str, edges: Dict[str, List[str]]) -> set:
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for neighbor in edges.get(queue.popleft(), []):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    body = reachable(target, successors) & reachable(source, predecessors)
+    return [node_id for node_id in node_ids if node_id in body]
+
+
+def build_execution_plan(nodes: List[Dict[str, Any]],
+                         connections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    단계별 병렬 실행 계획을 계산합니다.
+
+    Args:
+        nodes: 워크플로우 노드 목록 (estimated_time_ms 사용)
+        connections: 노드 간 연결 목록 (loop_back 연결은 DAG에서 제외)
+
+    Returns:
+        단계, 임계 경로, 예상 총 소요 시간(1회 반복 기준), 노드별 시작/종료 시각과 여유 시간
+    """
+    graph = build_graph(nodes, connections)
+    node_ids = graph["node_ids"]
+    durations = graph["durations"]
+    predecessors = graph["predecessors"]
+    successors = graph["successors"]
+
+    stages, cyclic = topological_levels(node_ids, predecessors, successors)
+    order = [node_id for stage in stages for node_id in stage]
+
+    # 전방 패스: 가장 이른 시작/종료 시각
+    earliest_start: Dict[str, float] = {}
+    earliest_finish: Dict[str, float] = {}
+    critical_predecessor: Dict[str, str] = {}
+    for node_id in order:
+        start = 0.0
+        for predecessor in predecessors[node_id]:
+            finish = earliest_finish[predecessor]
+            if node_id not in critical_predecessor or finish > start:
+                critical_predecessor[node_id] = predecessor
+                start = finish
+        earliest_start[node_id] = start
+        earliest_finish[node_id] = start + durations[node_id]
+
+    makespan = max(earliest_finish.values(), default=0.0)
+
+    # 후방 패스: 가장 늦은 종료 시각과 여유 시간
+    latest_finish: Dict[str, float] = {}
+    for node_id in reversed(order):
+        following = [latest_finish[s] - durations[s] for s in successors[node_id] if s in latest_finish]
+        latest_finish[node_id] = min(following) if following else makespan
+
+    # 임계 경로: 가장 늦게 끝나는 노드에서 임계 선행 노드를 따라 역추적
+    critical_path: List[str] = []
+    if order:
+        # 동률이면 나중에 스케줄된 노드(출력 쪽)를 선택
+        node_id = order[0]
+        for candidate in order:
+            if earliest_finish[candidate] >= earliest_finish[node_id]:
+                node_id = candidate
+        while node_id is not None:
+            critical_path.append(node_id)
+            node_id = critical_predecessor.get(node_id)
+        critical_path.reverse()
+
+    node_timing = {
+        node_id: {
+            "stage": stage_index,
+            "duration_ms": durations[node_id],
+            "earliest_start_ms": earliest_start[node_id],
+            "earliest_finish_ms": earliest_finish[node_id],
+            "slack_ms": latest_finish[node_id] - earliest_finish[node_id]
+        }
+        for stage_index, stage in enumerate(stages)
+        for node_id in stage
+    }
+
+    loops = [
+        {
+            "connection_id": edge.get("id"),
+            "from_node": edge.get("from_node"),
+            "to_node": edge.get("to_node"),
+            "condition": edge.get("condition"),
+            "body": _loop_body(edge.get("to_node"), edge.get("from_node"), node_ids,
+                               successors, predecessors)
+        }
+        for edge in graph["loop_back_edges"]
+    ]
+
+    return {
+        "stages": stages,
+        "stage_count": len(stages),
+        "max_parallelism": max((len(stage) for stage in stages), default=0),
+        "critical_path": critical_path,
+        "makespan_ms": makespan,
+        "sequential_time_ms": sum(durations.values()),
+        "node_timing": node_timing,
+        "loops": loops,
+        "has_cycle": bool(cyclic),
+        "cyclic_nodes": cyclic
+    }
+
+
+def flatten_stages(plan: Dict[str, Any]) -> List[str]:
+    """실행 계획을 단일 실행 순서로 펼칩니다 (순환 노드는 마지막에 추가)."""
+    return [node_id for stage in plan["stages"] for node_id in stage] + list(plan["cyclic_nodes"])
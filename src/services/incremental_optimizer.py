@@ -0,0 +1,879 @@
+# src/services/incremental_optimizer.py
+"""
+증분 워크플로우 최적화
+UI가 노드를 하나씩 편집할 때마다 최적화를 다시 요청하는 경우를 위해, 이전 최적화 결과의 그래프와
+실행 일정(단계, 가장 이른 시작/종료, 여유 시간, 임계 경로)을 세션에 보관하고
+변경분(diff)이 닿는 부분만 재작성 패스와 일정 계산을 다시 합니다.
+
+- 위상 순서는 순서를 거스르는 연결이 추가될 때 그 사이 구간만 다시 정렬합니다 (Pearce-Kelly).
+- 단계와 가장 이른 시작/종료는 바뀐 노드에서 후속 방향으로, 출력까지 남은 경로 길이는
+  선행 방향으로, 값이 달라지는 동안만 전파합니다.
+- 여유 시간은 makespan - 남은 경로 길이 - 가장 이른 종료로 계산하므로 makespan이 바뀌어도
+  다른 노드는 다시 계산하지 않습니다 (모든 노드의 여유 시간이 같은 만큼 이동).
+
+diff 형식:
+    {"added_nodes": [노드], "removed_nodes": [노드 id],
+     "changed_nodes": [{"id": 노드 id, 필드: 새 값 (null이면 필드 삭제)}],
+     "added_connections": [연결], "removed_connections": [{"from_node", "to_node"}]}
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from .dag_scheduler import LOOP_BACK, node_duration_ms
+from .workflow_graph import WorkflowGraph
+from .workflow_optimizer import OPTIMIZATION_PASSES, WorkflowOptimizer
+
+DIFF_KEYS = ("added_nodes", "removed_nodes", "changed_nodes", "added_connections", "removed_connections")
+
+
+class TrackedGraph(WorkflowGraph):
+    """
+    편집 내역과 동적 위상 순서를 유지하는 WorkflowGraph
+
+    재작성 패스가 호출하는 편집 메서드를 그대로 쓰면서, 일정을 다시 계산할 노드와
+    저장할 변경분(노드 정의, 나가는 연결 목록)을 기록합니다.
+    """
+
+    _tracking = False
+
+    def __init__(self, workflow: Dict[str, Any]):
+        super().__init__(workflow)
+        order = super().topological_order()
+        if len(order) != len(self.nodes):
+            cyclic = [node_id for node_id in self.nodes if node_id not in set(order)]
+            raise ValueError(f"순환 연결이 있는 워크플로우는 증분 최적화할 수 없습니다: {', '.join(cyclic)}")
+
+        # position: 노드 정의 순서 (단계 안 정렬, 동률 처리), order_pos: 위상 순서상의 위치
+        self.position = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self.order_pos = {node_id: i for i, node_id in enumerate(order)}
+        self._next_position = len(self.nodes)
+
+        self._by_tool: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._indexed: Dict[str, Tuple[Optional[str], Tuple[str, ...], bool]] = {}
+        self.process_count = 0
+        for node in self.nodes.values():
+            self._index(node)
+
+        # 일정 재계산용 (_reschedule이 비움)
+        self.schedule_dirty: Set[str] = set()
+        self.duration_changed: Set[str] = set()
+        self.unscheduled_removals: Set[str] = set()
+        # 패스 범위 확장용 (패스마다 비움)
+        self.touched: Set[str] = set()
+        self.reset_changes()
+        self._tracking = True
+
+    def reset_changes(self) -> None:
+        """저장할 변경분 기록을 비웁니다."""
+        self.content_changed: Set[str] = set()
+        self.out_changed: Set[str] = set()
+        self.removed: Set[str] = set()
+        self._loop_back_snapshot = [dict(edge) for edge in self.loop_back_edges]
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+
+    def _index(self, node: Dict[str, Any]) -> None:
+        node_id = node["id"]
+        entry = (node.get("tool_id"), tuple(node.get("depends_on", [])), node.get("type") == "process")
+        self._indexed[node_id] = entry
+        self.process_count += entry[2]
+        if entry[0]:
+            self._by_tool.setdefault(entry[0], set()).add(node_id)
+        for upstream in entry[1]:
+            self._dependents.setdefault(upstream, set()).add(node_id)
+
+    def _unindex(self, node_id: str) -> None:
+        tool_id, depends_on, is_process = self._indexed.pop(node_id, (None, (), False))
+        self.process_count -= is_process
+        if tool_id:
+            self._by_tool[tool_id].discard(node_id)
+        for upstream in depends_on:
+            self._dependents[upstream].discard(node_id)
+
+    def nodes_with_tool(self, tool_id: str) -> List[str]:
+        return sorted(self._by_tool.get(tool_id, ()), key=self.order_pos.__getitem__)
+
+    def dependents_of(self, node_id: str) -> List[Dict[str, Any]]:
+        return [self.nodes[n] for n in sorted(self._dependents.get(node_id, ()), key=self.position.__getitem__)]
+
+    # ------------------------------------------------------------------
+    # 위상 순서
+    # ------------------------------------------------------------------
+
+    def topological_order(self, node_ids: Optional[Iterable[str]] = None) -> List[str]:
+        if node_ids is None:
+            return sorted(self.nodes, key=self.order_pos.__getitem__)
+        return sorted({n for n in node_ids if n in self.nodes}, key=self.order_pos.__getitem__)
+
+    def _may_reach(self, node_id: str, target: str) -> bool:
+        # 위상 순서상 target보다 뒤에 있는 노드에서는 target에 닿을 수 없음
+        return self.order_pos[node_id] < self.order_pos[target]
+
+    def _reorder(self, source: str, target: str) -> None:
+        """source → target 연결이 순서를 거스를 때 그 사이 구간만 다시 정렬합니다 (Pearce-Kelly)."""
+        lower, upper = self.order_pos[target], self.order_pos[source]
+        forward, stack = [], [target]
+        seen = {target}
+        while stack:
+            node_id = stack.pop()
+            forward.append(node_id)
+            for successor in self.out_edges[node_id]:
+                if successor == source:
+                    raise ValueError(f"순환 연결이 생깁니다: {source} → {target}")
+                if successor not in seen and self.order_pos[successor] < upper:
+                    seen.add(successor)
+                    stack.append(successor)
+        backward, stack = [], [source]
+        seen = {source}
+        while stack:
+            node_id = stack.pop()
+            backward.append(node_id)
+            for predecessor in self.in_edges[node_id]:
+                if predecessor not in seen and self.order_pos[predecessor] > lower:
+                    seen.add(predecessor)
+                    stack.append(predecessor)
+
+        key = self.order_pos.__getitem__
+        moved = sorted(backward, key=key) + sorted(forward, key=key)
+        for node_id, slot in zip(moved, sorted(map(key, moved))):
+            self.order_pos[node_id] = slot
+
+    # ------------------------------------------------------------------
+    # 편집 (기록)
+    # ------------------------------------------------------------------
+
+    def _insert_edge(self, connection: Dict[str, Any]) -> None:
+        source, target = connection["from_node"], connection["to_node"]
+        if target in self.out_edges[source]:
+            return
+        if self._tracking:
+            if self.order_pos[source] > self.order_pos[target]:
+                self._reorder(source, target)
+            self._edge_changed(source, target)
+        super()._insert_edge(connection)
+
+    def remove_edge(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        edge = super().remove_edge(source, target)
+        if edge is not None and self._tracking:
+            self._edge_changed(source, target)
+        return edge
+
+    def _edge_changed(self, source: str, target: str) -> None:
+        self.schedule_dirty.update((source, target))
+        self.touched.update((source, target))
+        self.out_changed.add(source)
+
+    def add_node(self, node: Dict[str, Any]) -> None:
+        super().add_node(node)
+        node_id = node["id"]
+        self.position[node_id] = self.order_pos[node_id] = self._next_position
+        self._next_position += 1
+        self._index(self.nodes[node_id])
+        self._node_edited(node_id, duration=True)
+
+    def replace_node(self, node: Dict[str, Any]) -> None:
+        node_id = node["id"]
+        before = node_duration_ms(self.nodes[node_id])
+        self._unindex(node_id)
+        super().replace_node(node)
+        self._index(self.nodes[node_id])
+        self._node_edited(node_id, duration=node_duration_ms(self.nodes[node_id]) != before)
+
+    def update_node(self, node_id: str, fields: Dict[str, Any]) -> None:
+        """노드 필드를 바꿉니다 (값이 None인 필드는 삭제)."""
+        node = dict(self.nodes[node_id])
+        for key, value in fields.items():
+            if key == "id":
+                continue
+            if value is None:
+                node.pop(key, None)
+            else:
+                node[key] = value
+        self.replace_node(node)
+
+    def node_changed(self, node_id: str) -> None:
+        self._unindex(node_id)
+        self._index(self.nodes[node_id])
+        self._node_edited(node_id, duration=False)
+
+    def _node_edited(self, node_id: str, duration: bool) -> None:
+        self.content_changed.add(node_id)
+        self.touched.add(node_id)
+        if duration:
+            self.schedule_dirty.add(node_id)
+            self.duration_changed.add(node_id)
+
+    def remove_node(self, node_id: str) -> None:
+        super().remove_node(node_id)
+        self._unindex(node_id)
+        del self.position[node_id]
+        del self.order_pos[node_id]
+        for pending in (self.schedule_dirty, self.duration_changed, self.touched,
+                        self.content_changed, self.out_changed):
+            pending.discard(node_id)
+        self.removed.add(node_id)
+        self.unscheduled_removals.add(node_id)
+
+    def retype_edges(self, node_ids: Optional[Iterable[str]] = None) -> None:
+        if node_ids is None:
+            self.out_changed.update(self.nodes)
+        else:
+            node_ids = [n for n in node_ids if n in self.nodes]
+            for node_id in node_ids:
+                self.out_changed.add(node_id)
+                self.out_changed.update(self.in_edges[node_id])
+        super().retype_edges(node_ids)
+
+    def take_delta(self, optimization_goal: str) -> Dict[str, Any]:
+        """마지막 reset_changes() 이후의 변경분을 apply_graph_delta 형식으로 반환하고 기록을 비웁니다."""
+        upserts = sorted((n for n in self.content_changed if n in self.nodes), key=self.position.__getitem__)
+        sources = sorted((n for n in self.out_changed if n in self.nodes), key=self.position.__getitem__)
+        delta = {
+            "optimization_goal": optimization_goal,
+            "nodes": [[node_id, None] for node_id in sorted(n for n in self.removed if n not in self.nodes)]
+                     + [[node_id, dict(self.nodes[node_id])] for node_id in upserts],
+            "edges": [[source, [dict(edge) for edge in self.out_edges[source].values()]] for source in sources]
+        }
+        if self.loop_back_edges != self._loop_back_snapshot:
+            delta["loop_back_edges"] = [dict(edge) for edge in self.loop_back_edges]
+        self.reset_changes()
+        return delta
+
+
+def apply_graph_delta(graph: WorkflowGraph, delta: Dict[str, Any]) -> None:
+    """TrackedGraph.take_delta()가 만든 변경분을 그래프에 적용합니다."""
+    for node_id, node in delta.get("nodes", []):
+        if node is None and node_id in graph.nodes:
+            graph.remove_node(node_id)
+    for node_id, node in delta.get("nodes", []):
+        if node is None:
+            continue
+        if node_id in graph.nodes:
+            graph.replace_node(node)
+        else:
+            graph.add_node(node)
+    # 나가는 연결을 모두 지운 뒤 추가해야 중간 상태에 순환이 생기지 않음 (항상 최종 그래프의 부분 그래프)
+    for source, connections in delta.get("edges", []):
+        for target in list(graph.out_edges[source]):
+            graph.remove_edge(source, target)
+    for source, connections in delta.get("edges", []):
+        for connection in connections:
+            for node_id in (connection["from_node"], connection["to_node"]):
+                if node_id not in graph.nodes:
+                    graph.add_node({"id": node_id, "type": "unknown"})
+            graph._insert_edge(dict(connection))
+    if "loop_back_edges" in delta:
+        graph.loop_back_edges = [dict(edge) for edge in delta["loop_back_edges"]]
+
+
+def apply_workflow_delta(workflow: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """저장된 워크플로우 문서에 변경분을 적용한 새 문서 (WorkflowStore의 delta_applier)"""
+    graph = WorkflowGraph(workflow)
+    apply_graph_delta(graph, delta)
+    goal = delta.get("optimization_goal") or workflow.get("metadata", {}).get("optimized_for", "speed")
+    return WorkflowOptimizer()._build_workflow(workflow, graph, goal)
+
+
+class OptimizationSession:
+    """이전 최적화 결과의 그래프와 실행 일정을 보관하고 diff만큼 다시 최적화하는 세션 (스레드 안전하지 않음)"""
+
+    def __init__(self,
+                 workflow: Dict[str, Any],
+                 optimization_goal: str = "speed",
+                 optimizer: Optional[WorkflowOptimizer] = None,
+                 version: Optional[int] = None):
+        """
+        Args:
+            workflow: 이전 최적화 결과의 optimized_workflow (또는 optimize() 결과 전체)
+            optimization_goal: 기본 최적화 목표
+            optimizer: 재작성 패스를 제공하는 WorkflowOptimizer
+            version: 저장소의 바탕 버전 (저장소와 함께 쓸 때)
+        """
+        if "optimized_workflow" in workflow:
+            workflow = workflow["optimized_workflow"]
+        self.optimizer = optimizer or WorkflowOptimizer()
+        self.optimization_goal = optimization_goal
+        self.version = version
+        self.base_document = {
+            key: value for key, value in workflow.items()
+            if key not in ("nodes", "connections", "execution_order", "execution_plan")
+        }
+        self.graph = TrackedGraph(workflow)
+        self.last_delta: Optional[Dict[str, Any]] = None
+        # 편집 도중 실패해 그래프와 일정이 어긋났으면 True (세션을 다시 구성해야 함)
+        self.broken = False
+
+        self.duration: Dict[str, float] = {}
+        self.level: Dict[str, int] = {}
+        self.earliest_start: Dict[str, float] = {}
+        self.earliest_finish: Dict[str, float] = {}
+        self.critical_predecessor: Dict[str, Optional[str]] = {}
+        self.tail: Dict[str, float] = {}  # 노드가 끝난 뒤 출력까지 남은 가장 긴 경로 (ms)
+        self.stage_sizes: Dict[int, int] = {}
+        self.total_work_ms = 0.0
+        self._finish_heap: List[tuple] = []
+
+        self.graph.schedule_dirty.update(self.graph.nodes)
+        self.graph.duration_changed.update(self.graph.nodes)
+        self._reschedule()
+
+    # ------------------------------------------------------------------
+    # 일정
+    # ------------------------------------------------------------------
+
+    def _reschedule(self) -> Dict[str, Any]:
+        """기록된 편집이 닿는 노드만 일정을 다시 계산하고 값이 바뀐 노드를 반환합니다."""
+        graph = self.graph
+        for node_id in graph.unscheduled_removals:
+            if node_id in graph.nodes:
+                continue  # 같은 id로 다시 추가됨
+            self.total_work_ms -= self.duration.pop(node_id, 0.0)
+            self._set_level(node_id, None)
+            for table in (self.earliest_start, self.earliest_finish, self.critical_predecessor, self.tail):
+                table.pop(node_id, None)
+        for node_id in graph.duration_changed:
+            if node_id in graph.nodes:
+                duration = node_duration_ms(graph.nodes[node_id])
+                self.total_work_ms += duration - self.duration.get(node_id, 0.0)
+                self.duration[node_id] = duration
+
+        dirty = {node_id for node_id in graph.schedule_dirty if node_id in graph.nodes}
+        backward_seeds = set(dirty)
+        for node_id in graph.duration_changed:
+            if node_id in graph.nodes:
+                backward_seeds.update(graph.in_edges[node_id])
+        graph.schedule_dirty.clear()
+        graph.duration_changed.clear()
+        graph.unscheduled_removals.clear()
+
+        schedule, stages, paths, slack = set(), set(), set(), set()
+        order_pos, position = graph.order_pos, graph.position
+
+        # 전방: 단계, 가장 이른 시작/종료, 임계 선행 노드 (위상 순서대로, 값이 바뀐 동안만 전파)
+        heap = [(order_pos[n], n) for n in dirty]
+        heapq.heapify(heap)
+        queued = set(dirty)
+        visited = 0
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            visited += 1
+            level, start, best = 0, 0.0, None
+            for predecessor in graph.in_edges[node_id]:
+                finish = self.earliest_finish[predecessor]
+                level = max(level, self.level[predecessor] + 1)
+                if best is None or finish > start or (finish == start and position[predecessor] < position[best]):
+                    best, start = predecessor, finish
+            finish = start + self.duration[node_id]
+
+            if self.critical_predecessor.get(node_id, node_id) != best:
+                self.critical_predecessor[node_id] = best
+                paths.add(node_id)
+            if (self.level.get(node_id), self.earliest_start.get(node_id),
+                    self.earliest_finish.get(node_id)) == (level, start, finish):
+                continue
+            if self.level.get(node_id) != level:
+                self._set_level(node_id, level)
+                stages.add(node_id)
+            self.earliest_start[node_id] = start
+            self.earliest_finish[node_id] = finish
+            schedule.add(node_id)
+            heapq.heappush(self._finish_heap, (-finish, -level, -position[node_id], node_id))
+            for successor in graph.out_edges[node_id]:
+                if successor not in queued:
+                    queued.add(successor)
+                    heapq.heappush(heap, (order_pos[successor], successor))
+
+        # 후방: 출력까지 남은 경로 길이 (역위상 순서대로, 값이 바뀐 동안만 전파)
+        heap = [(-order_pos[n], n) for n in backward_seeds if n in graph.nodes]
+        heapq.heapify(heap)
+        queued = {node_id for _, node_id in heap}
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            visited += 1
+            tail = max((self.duration[s] + self.tail[s] for s in graph.out_edges[node_id]), default=0.0)
+            if self.tail.get(node_id) == tail:
+                continue
+            self.tail[node_id] = tail
+            slack.add(node_id)
+            for predecessor in graph.in_edges[node_id]:
+                if predecessor not in queued:
+                    queued.add(predecessor)
+                    heapq.heappush(heap, (-order_pos[predecessor], predecessor))
+
+        if len(self._finish_heap) > 2 * len(graph.nodes) + 1024:
+            self._finish_heap = [(-self.earliest_finish[n], -self.level[n], -position[n], n) for n in graph.nodes]
+            heapq.heapify(self._finish_heap)
+
+        return {"schedule": schedule, "stages": stages, "critical_predecessor": paths,
+                "slack": slack | schedule, "visited": visited}
+
+    def _set_level(self, node_id: str, level: Optional[int]) -> None:
+        previous = self.level.pop(node_id, None)
+        if previous is not None:
+            self.stage_sizes[previous] -= 1
+            if not self.stage_sizes[previous]:
+                del self.stage_sizes[previous]
+        if level is not None:
+            self.level[node_id] = level
+            self.stage_sizes[level] = self.stage_sizes.get(level, 0) + 1
+
+    def _last_node(self) -> Optional[str]:
+        """가장 늦게 끝나는 노드 (동률이면 나중 단계, 같은 단계면 나중에 정의된 노드)"""
+        heap = self._finish_heap
+        position = self.graph.position
+        while heap:
+            finish, level, order, node_id = heap[0]
+            if node_id in self.level and self.earliest_finish[node_id] == -finish \
+                    and self.level[node_id] == -level and position[node_id] == -order:
+                return node_id
+            heapq.heappop(heap)
+        return None
+
+    def makespan_ms(self) -> float:
+        last = self._last_node()
+        return self.earliest_finish[last] if last is not None else 0.0
+
+    def critical_path(self) -> List[str]:
+        path = []
+        node_id = self._last_node()
+        while node_id is not None:
+            path.append(node_id)
+            node_id = self.critical_predecessor[node_id]
+        path.reverse()
+        return path
+
+    def node_timing(self, node_id: str, makespan: Optional[float] = None) -> Dict[str, Any]:
+        """build_execution_plan의 node_timing 항목과 같은 형식의 노드 일정"""
+        if makespan is None:
+            makespan = self.makespan_ms()
+        finish = self.earliest_finish[node_id]
+        return {
+            "stage": self.level[node_id],
+            "duration_ms": self.duration[node_id],
+            "earliest_start_ms": self.earliest_start[node_id],
+            "earliest_finish_ms": finish,
+            "slack_ms": makespan - self.tail[node_id] - finish
+        }
+
+    # ------------------------------------------------------------------
+    # diff
+    # ------------------------------------------------------------------
+
+    def _validate_diff(self, diff: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """그래프를 바꾸기 전에 diff 전체를 검사합니다 (실패하면 아무것도 적용하지 않음)."""
+        if not isinstance(diff, dict):
+            raise ValueError("diff는 객체여야 합니다")
+        unknown = sorted(set(diff) - set(DIFF_KEYS))
+        if unknown:
+            raise ValueError(f"알 수 없는 diff 항목: {', '.join(unknown)}")
+        parts = {key: diff.get(key) or [] for key in DIFF_KEYS}
+        for key, items in parts.items():
+            if not isinstance(items, list):
+                raise ValueError(f"{key}는 목록이어야 합니다")
+
+        graph = self.graph
+        removed = set()
+        for node_id in parts["removed_nodes"]:
+            if node_id not in graph.nodes or node_id in removed:
+                raise ValueError(f"삭제할 노드가 없습니다: {node_id}")
+            removed.add(node_id)
+        added = {}
+        for node in parts["added_nodes"]:
+            if not isinstance(node, dict) or not isinstance(node.get("id"), str):
+                raise ValueError("추가할 노드에는 문자열 id가 필요합니다")
+            if node["id"] in graph.nodes or node["id"] in added:
+                raise ValueError(f"이미 있는 노드입니다: {node['id']}")
+            added[node["id"]] = node
+        for change in parts["changed_nodes"]:
+            if not isinstance(change, dict) or change.get("id") not in graph.nodes or change["id"] in removed:
+                raise ValueError(f"변경할 노드가 없습니다: {change.get('id') if isinstance(change, dict) else change}")
+
+        def exists(node_id: Any) -> bool:
+            return (node_id in graph.nodes and node_id not in removed) or node_id in added
+
+        removed_pairs = set()
+        for connection in parts["removed_connections"]:
+            if not isinstance(connection, dict):
+                raise ValueError("삭제할 연결은 from_node/to_node 객체여야 합니다")
+            pair = (connection.get("from_node"), connection.get("to_node"))
+            is_loop = any((e.get("from_node"), e.get("to_node")) == pair for e in graph.loop_back_edges)
+            if graph.edge(*pair) is None and not is_loop:
+                raise ValueError(f"삭제할 연결이 없습니다: {pair[0]} → {pair[1]}")
+            removed_pairs.add(pair)
+
+        added_out: Dict[str, List[str]] = {}
+        added_pairs = set()
+        for connection in parts["added_connections"]:
+            if not isinstance(connection, dict):
+                raise ValueError("추가할 연결은 from_node/to_node 객체여야 합니다")
+            source, target = connection.get("from_node"), connection.get("to_node")
+            if not exists(source) or not exists(target):
+                raise ValueError(f"연결할 노드가 없습니다: {source} → {target}")
+            if connection.get("type") == LOOP_BACK:
+                continue
+            if source == target:
+                raise ValueError(f"자기 자신으로의 연결은 loop_back이어야 합니다: {source}")
+            if (source, target) in added_pairs or \
+                    (graph.edge(source, target) is not None and (source, target) not in removed_pairs):
+                raise ValueError(f"이미 있는 연결입니다: {source} → {target}")
+            added_pairs.add((source, target))
+            added_out.setdefault(source, []).append(target)
+
+        self._check_acyclic(added_out, removed_pairs, removed, list(added))
+        parts["_removed"] = removed
+        return parts
+
+    def _check_acyclic(self,
+                       added_out: Dict[str, List[str]],
+                       removed_pairs: Set[tuple],
+                       removed: Set[str],
+                       added_ids: List[str]) -> None:
+        """
+        추가할 연결로 순환이 생기는지 확인합니다.
+        현재 위상 순서를 거스르는 연결(u → v)만 v에서 u로 가는 경로를 찾으며,
+        순서를 거스르는 연결의 출발 노드보다 뒤에 있는 노드는 탐색하지 않습니다.
+        """
+        graph = self.graph
+        added_position = {node_id: graph._next_position + offset for offset, node_id in enumerate(added_ids)}
+
+        def position(node_id: str) -> int:
+            return graph.order_pos[node_id] if node_id in graph.order_pos else added_position[node_id]
+
+        backward = [(u, v) for u, targets in added_out.items() for v in targets if position(u) > position(v)]
+        if not backward:
+            return
+        limit = max(position(u) for u, _ in backward)
+
+        def successors(node_id: str) -> List[str]:
+            following = [s for s in graph.out_edges.get(node_id, {})
+                         if (node_id, s) not in removed_pairs and s not in removed]
+            return following + added_out.get(node_id, [])
+
+        for source, target in backward:
+            stack, seen = [target], {target}
+            while stack:
+                for successor in successors(stack.pop()):
+                    if successor == source:
+                        raise ValueError(f"순환 연결이 생깁니다: {source} → {target}")
+                    if successor not in seen and position(successor) <= limit:
+                        seen.add(successor)
+                        stack.append(successor)
+
+    def _apply_diff(self, parts: Dict[str, Any]) -> Set[str]:
+        """검사를 마친 diff를 그래프에 적용하고 재작성 패스를 다시 볼 노드를 반환합니다."""
+        graph = self.graph
+        scope = set()
+        for connection in parts["removed_connections"]:
+            source, target = connection["from_node"], connection["to_node"]
+            if graph.remove_edge(source, target) is None:
+                graph.loop_back_edges = [
+                    e for e in graph.loop_back_edges if (e.get("from_node"), e.get("to_node")) != (source, target)
+                ]
+            scope.update((source, target))
+        for node_id in parts["removed_nodes"]:
+            scope.update(graph.in_edges[node_id])
+            scope.update(graph.out_edges[node_id])
+            graph.remove_node(node_id)
+        for node in parts["added_nodes"]:
+            graph.add_node(node)
+            scope.add(node["id"])
+        for change in parts["changed_nodes"]:
+            graph.update_node(change["id"], change)
+            scope.add(change["id"])
+        for connection in parts["added_connections"]:
+            source, target = connection["from_node"], connection["to_node"]
+            connection = dict({"id": f"conn_{source}_to_{target}", "type": "direct", "condition": None},
+                              **connection)
+            if connection["type"] == LOOP_BACK:
+                graph.loop_back_edges.append(connection)
+            else:
+                graph._insert_edge(connection)
+            scope.update((source, target))
+        return {node_id for node_id in scope if node_id in graph.nodes}
+
+    # ------------------------------------------------------------------
+    # 증분 최적화
+    # ------------------------------------------------------------------
+
+    def apply(self,
+              diff: Dict[str, Any],
+              optimization_goal: Optional[str] = None,
+              passes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        diff를 적용하고 닿는 부분만 다시 최적화합니다.
+
+        Args:
+            diff: 그래프 변경분 (모듈 설명 참고)
+            optimization_goal: 최적화 목표 (None이면 세션의 목표)
+            passes: 적용할 재작성 패스 목록 (None이면 목표별 기본 패스)
+
+        Returns:
+            바뀐 노드의 일정, 무효화된 항목, 패스별 결과를 담은 보고서
+            (전체 문서는 workflow(), 저장할 변경분은 last_delta)
+
+        Raises:
+            ValueError: diff 형식 오류, 없는 노드/연결, 순환 연결, 알 수 없는 패스
+        """
+        started = time.perf_counter()
+        goal = optimization_goal or self.optimization_goal
+        if passes is None:
+            passes = OPTIMIZATION_PASSES.get(goal, [])
+        unknown = [name for name in passes if name not in self.optimizer.PASSES]
+        if unknown:
+            raise ValueError(f"알 수 없는 최적화 패스: {', '.join(unknown)}")
+        parts = self._validate_diff(diff)
+
+        graph = self.graph
+        before_ms = self.makespan_ms()
+        before_path = self.critical_path()
+        before_counts = (len(graph.nodes), graph.process_count)
+        invalidated = {"schedule": set(), "stages": set(), "slack": set(), "critical_predecessor": set()}
+        visited = 0
+
+        def reschedule() -> None:
+            nonlocal visited
+            changed = self._reschedule()
+            visited += changed.pop("visited")
+            for key, nodes in changed.items():
+                invalidated[key] |= nodes
+
+        pass_reports = []
+        try:
+            graph.touched.clear()
+            scope = self._apply_diff(parts) | {n for n in graph.touched if n in graph.nodes}
+            reschedule()
+            diff_ms = self.makespan_ms()
+
+            for name in passes:
+                graph.touched.clear()
+                pass_before = self.makespan_ms()
+                changes = getattr(self.optimizer, self.optimizer.PASSES[name])(graph, scope=set(scope))
+                reschedule()
+                pass_after = self.makespan_ms()
+                pass_reports.append({
+                    "name": name,
+                    "applied": bool(changes),
+                    "changes": changes,
+                    "critical_path_before_ms": pass_before,
+                    "critical_path_after_ms": pass_after,
+                    "improvement_ms": pass_before - pass_after
+                })
+                scope |= {n for n in graph.touched if n in graph.nodes}
+        except BaseException:
+            self.broken = True
+            raise
+
+        self.optimization_goal = goal
+        self.last_delta = graph.take_delta(goal)
+        removed = sorted(node_id for node_id, node in self.last_delta["nodes"] if node is None)
+        after_ms = self.makespan_ms()
+        after_path = self.critical_path()
+        changed = sorted(
+            (n for n in invalidated["schedule"] | invalidated["slack"] | invalidated["stages"] if n in graph.nodes),
+            key=graph.order_pos.__getitem__
+        )
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "mode": "incremental",
+            "original_workflow_id": self.base_document.get("workflow_id"),
+            "optimization_goal": goal,
+            "diff": {key: len(parts[key]) for key in DIFF_KEYS},
+            "analysis_scope": self._existing(scope),
+            "invalidated": {
+                "removed_nodes": removed,
+                "schedule": self._existing(invalidated["schedule"]),
+                "stages": self._existing(invalidated["stages"]),
+                "slack": self._existing(invalidated["slack"]),
+                "critical_path": after_path != before_path,
+                "slack_shift_ms": after_ms - before_ms
+            },
+            "recomputed_nodes": visited,
+            "critical_path": after_path,
+            "makespan_ms": after_ms,
+            "node_timing": {node_id: self.node_timing(node_id, after_ms) for node_id in changed},
+            "optimization_passes": pass_reports,
+            "recommendations": [self.optimizer._pass_recommendation(r) for r in pass_reports if r["applied"]],
+            "improvement_metrics": {
+                "critical_path_before_ms": before_ms,
+                "critical_path_after_diff_ms": diff_ms,
+                "critical_path_after_ms": after_ms,
+                "latency_reduction_pct": round((diff_ms - after_ms) / diff_ms * 100, 1) if diff_ms else 0.0,
+                "stage_count_after": len(self.stage_sizes),
+                "max_parallelism_after": max(self.stage_sizes.values(), default=0),
+                "node_count_before": before_counts[0],
+                "node_count_after": len(graph.nodes),
+                "tool_invocations_before": before_counts[1],
+                "tool_invocations_after": graph.process_count,
+                "total_work_after_ms": self.total_work_ms
+            },
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    def _existing(self, node_ids: Set[str]) -> List[str]:
+        return sorted((n for n in node_ids if n in self.graph.nodes), key=self.graph.order_pos.__getitem__)
+
+    def replay(self, delta: Dict[str, Any], version: Optional[int] = None) -> None:
+        """다른 작업자가 저장한 변경분을 재작성 패스 없이 그대로 따라 적용합니다."""
+        self.broken = True
+        apply_graph_delta(self.graph, delta)
+        self.broken = False
+        self._reschedule()
+        self.graph.reset_changes()
+        self.optimization_goal = delta.get("optimization_goal") or self.optimization_goal
+        if version is not None:
+            self.version = version
+
+    def workflow(self) -> Dict[str, Any]:
+        """현재 그래프의 전체 워크플로우 문서 (optimize()의 optimized_workflow와 같은 형식, 노드 수에 비례하는 비용)"""
+        workflow = self.optimizer._build_workflow(self.base_document, self.graph, self.optimization_goal)
+        # 세션이 이후 편집에서 노드/연결을 제자리에서 바꾸므로 복사해서 반환
+        workflow["nodes"] = [dict(node) for node in workflow["nodes"]]
+        workflow["connections"] = [dict(connection) for connection in workflow["connections"]]
+        return workflow
+
+
+class IncrementalOptimizer:
+    """
+    저장소의 workflow_id별 최적화 세션을 보관하는 서비스
+
+    세션은 저장소의 최신 버전을 바탕으로 하며, 다른 작업자 프로세스가 그 사이 저장한 delta 버전은
+    따라 적용하고(전체 문서 버전이 끼어 있으면 다시 구성), 증분 최적화 결과는 delta 버전으로 저장합니다.
+    """
+
+    def __init__(self, store, optimizer: Optional[WorkflowOptimizer] = None, max_sessions: int = 64):
+        """
+        Args:
+            store: WorkflowStore (delta_applier=apply_workflow_delta로 만든 것)
+            optimizer: 재작성 패스를 제공하는 WorkflowOptimizer
+            max_sessions: 메모리에 보관할 세션 수 (가장 오래 쓰지 않은 세션부터 버림)
+        """
+        self.store = store
+        self.optimizer = optimizer or WorkflowOptimizer()
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, OptimizationSession]" = OrderedDict()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        self.builds = 0
+        self.replays = 0
+        self.runs = 0
+
+    def optimize(self,
+                 workflow_id: str,
+                 diff: Dict[str, Any],
+                 optimization_goal: Optional[str] = None,
+                 expected_version: Optional[int] = None,
+                 include_workflow: bool = False) -> Dict[str, Any]:
+        """
+        저장된 최신 버전에 diff를 적용해 증분 최적화하고 결과를 새 delta 버전으로 저장합니다.
+
+        Args:
+            workflow_id: 저장소의 워크플로우 id (최신 버전이 이전 최적화 결과)
+            diff: 그래프 변경분
+            optimization_goal: 최적화 목표 (None이면 세션의 목표)
+            expected_version: 클라이언트가 편집한 바탕 버전 (최신 버전이 아니면 충돌)
+            include_workflow: 전체 최적화 워크플로우도 반환 (노드 수에 비례하는 비용)
+
+        Raises:
+            WorkflowNotFoundError: 없는 id
+            WorkflowConflictError: expected_version 이후 다른 버전이 저장됨
+            ValueError: diff 오류 (세션은 바뀌지 않음)
+        """
+        from .workflow_store import WorkflowConflictError
+
+        with self._lock:
+            lock = self._locks.setdefault(workflow_id, threading.Lock())
+        with lock:
+            latest = self.store.latest_version(workflow_id)
+            if expected_version and expected_version != latest:
+                raise WorkflowConflictError(
+                    f"v{expected_version}을 편집했지만 최신 버전은 v{latest}입니다: {workflow_id}"
+                )
+            session, sync = self._session(workflow_id, latest, optimization_goal)
+            try:
+                report = session.apply(diff, optimization_goal)
+            finally:
+                if session.broken:
+                    self._drop(workflow_id)
+            delta = session.last_delta
+            if not delta["nodes"] and not delta["edges"] and "loop_back_edges" not in delta:
+                # 그래프가 그대로이면 새 버전을 만들지 않음
+                info = dict(self.store.history(workflow_id, 1)[0], deduplicated=True)
+            else:
+                try:
+                    info = self.store.save_delta(
+                        workflow_id, delta, f"optimize_workflow:incremental:{session.optimization_goal}",
+                        parent_version=latest, node_count=len(session.graph.nodes)
+                    )
+                except BaseException:
+                    self._drop(workflow_id)
+                    raise
+            session.version = info["version"]
+            self.runs += 1
+
+            report["session"] = sync
+            report["workflow_store"] = info
+            if include_workflow:
+                report["optimized_workflow"] = session.workflow()
+            return report
+
+    def _session(self, workflow_id: str, latest: int,
+                 optimization_goal: Optional[str]) -> Tuple[OptimizationSession, Dict[str, Any]]:
+        """최신 버전에 맞춘 세션과 동기화 방식 ({"built"|"replayed"|"reused", ...})"""
+        with self._lock:
+            session = self._sessions.get(workflow_id)
+            if session is not None:
+                self._sessions.move_to_end(workflow_id)
+
+        if session is not None and session.version is not None and session.version < latest:
+            deltas = self.store.deltas_since(workflow_id, session.version)
+            if deltas is not None and (not deltas or deltas[-1][0] == latest):
+                try:
+                    for version, delta in deltas:
+                        session.replay(delta, version)
+                except BaseException:
+                    self._drop(workflow_id)
+                    raise
+                self.replays += len(deltas)
+                return session, {"sync": "replayed", "base_version": latest, "replayed_versions": len(deltas)}
+            session = None
+        if session is not None and session.version == latest:
+            return session, {"sync": "reused", "base_version": latest}
+
+        workflow, _ = self.store.load(workflow_id, latest)
+        goal = optimization_goal or workflow.get("metadata", {}).get("optimized_for", "speed")
+        session = OptimizationSession(workflow, goal, self.optimizer, version=latest)
+        self.builds += 1
+        with self._lock:
+            self._sessions[workflow_id] = session
+            self._sessions.move_to_end(workflow_id)
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                self._locks.pop(evicted, None)
+        return session, {"sync": "built", "base_version": latest}
+
+    def _drop(self, workflow_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(workflow_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """세션 수와 세션 구성/따라 적용/증분 최적화 횟수"""
+        with self._lock:
+            sessions = len(self._sessions)
+        return {
+            "name": "incremental_optimizer",
+            "sessions": sessions,
+            "max_sessions": self.max_sessions,
+            "builds": self.builds,
+            "replayed_versions": self.replays,
+            "runs": self.runs
+        }
@@ -0,0 +1,174 @@
+# src/services/json_patch.py
+"""
+JSON Patch (RFC 6902)
+저장된 워크플로우에 클라이언트가 보낸 변경분(add, remove, replace, move, copy, test)을 적용합니다.
+원본 문서는 수정하지 않고, 바뀌는 경로의 컨테이너만 얕은 복사해 나머지는 원본과 공유합니다.
+"""
+
+from typing import Dict, List, Any, Callable
+
+
+class JsonPatchError(ValueError):
+    """패치 형식이 잘못되었거나 문서에 적용할 수 없을 때 발생하는 예외"""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """JSON Pointer ("/nodes/0/id")를 토큰 목록으로 나눕니다."""
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"경로는 문자열이어야 합니다: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"경로는 /로 시작해야 합니다: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"배열 위치가 올바르지 않습니다: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"배열 범위를 벗어났습니다: {index} (길이 {len(container)})")
+    return index
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"없는 키입니다: {token!r}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token)]
+    raise JsonPatchError(f"객체나 배열이 아닌 값 아래를 참조합니다: {token!r}")
+
+
+def resolve(document: Any, pointer: str) -> Any:
+    """JSON Pointer가 가리키는 값을 반환합니다."""
+    node = document
+    for token in parse_pointer(pointer):
+        node = _child(node, token)
+    return node
+
+
+def _rewrite(document: Any, tokens: List[str], change: Callable[[Any, str], None]) -> Any:
+    """경로의 부모 컨테이너까지 얕은 복사한 새 문서에서 부모를 change(부모, 마지막 토큰)로 바꿉니다."""
+    def walk(node: Any, depth: int) -> Any:
+        if not isinstance(node, (dict, list)):
+            raise JsonPatchError(f"객체나 배열이 아닌 값 아래를 참조합니다: {tokens[depth]!r}")
+        copy = dict(node) if isinstance(node, dict) else list(node)
+        token = tokens[depth]
+        if depth == len(tokens) - 1:
+            change(copy, token)
+        elif isinstance(copy, dict):
+            copy[token] = walk(_child(node, token), depth + 1)
+        else:
+            copy[_index(copy, token)] = walk(_child(node, token), depth + 1)
+        return copy
+    return walk(document, 0)
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            parent[token] = value
+        else:
+            parent.insert(_index(parent, token, allow_end=True), value)
+    return _rewrite(document, tokens, change)
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JsonPatchError("문서 전체는 삭제할 수 없습니다")
+
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JsonPatchError(f"없는 키입니다: {token!r}")
+            del parent[token]
+        else:
+            del parent[_index(parent, token)]
+    return _rewrite(document, tokens, change)
+
+
+def _replace(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def change(parent: Any, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JsonPatchError(f"없는 키입니다: {token!r}")
+            parent[token] = value
+        else:
+            parent[_index(parent, token)] = value
+    return _rewrite(document, tokens, change)
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    """RFC 6902 test 비교 (true와 1처럼 JSON 타입이 다른 값은 다름, 1과 1.0은 같은 수)"""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_json_equal(left[k], right[k]) for k in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(_json_equal(a, b) for a, b in zip(left, right))
+    return type(left) is type(right) and left == right
+
+
+def _apply_operation(document: Any, operation: Dict[str, Any]) -> Any:
+    if not isinstance(operation, dict):
+        raise JsonPatchError("연산은 객체여야 합니다")
+    op = operation.get("op")
+    if "path" not in operation:
+        raise JsonPatchError("path가 없습니다")
+    tokens = parse_pointer(operation["path"])
+
+    if op in ("add", "replace", "test") and "value" not in operation:
+        raise JsonPatchError("value가 없습니다")
+    if op == "add":
+        return _add(document, tokens, operation["value"])
+    if op == "remove":
+        return _remove(document, tokens)
+    if op == "replace":
+        return _replace(document, tokens, operation["value"])
+    if op == "test":
+        actual = resolve(document, operation["path"])
+        if not _json_equal(actual, operation["value"]):
+            raise JsonPatchError(f"test 실패: {operation['path']} 값이 다릅니다")
+        return document
+    if op in ("move", "copy"):
+        if "from" not in operation:
+            raise JsonPatchError("from이 없습니다")
+        source = parse_pointer(operation["from"])
+        value = resolve(document, operation["from"])
+        if op == "move":
+            if tokens[:len(source)] == source and len(tokens) > len(source):
+                raise JsonPatchError("값을 자기 자신의 하위 경로로 옮길 수 없습니다")
+            document = _remove(document, source)
+        # 복사한 값은 원본과 공유해도 이후 연산이 경로를 복사하므로 안전함
+        return _add(document, tokens, value)
+    raise JsonPatchError(f"알 수 없는 연산입니다: {op!r}")
+
+
+def apply_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    JSON Patch 연산 목록을 차례로 적용한 새 문서를 반환합니다 (원본은 바뀌지 않음).
+
+    Raises:
+        JsonPatchError: 연산 형식 오류, 없는 경로, test 실패 (몇 번째 연산인지 포함)
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("패치는 연산 목록(JSON 배열)이어야 합니다")
+    for position, operation in enumerate(operations):
+        try:
+            document = _apply_operation(document, operation)
+        except JsonPatchError as e:
+            raise JsonPatchError(f"{position}번 연산 실패: {e}") from None
+    return document
@@ -0,0 +1,314 @@
+# src/services/metrics.py
+"""
+도구 호출 지표
+도구별 처리 시간(전체/파싱/서비스/직렬화), 요청/응답 크기, 오류 수를
+스레드별 로그 구간 히스토그램(HDR 방식)에 기록하고 요약/Prometheus 텍스트로 제공합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+# 2의 거듭제곱 구간마다 2^SUB_BUCKET_BITS개의 하위 구간 (상대 오차 약 3%)
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 48
+BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+# 처리 함수 안에서 측정하는 단계
+PHASES = ("parse", "service", "serialize")
+QUANTILES = (0.5, 0.9, 0.99)
+# Prometheus 히스토그램 구간 상한 (le): 지연은 초, 크기는 바이트
+LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS_BYTES = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _bucket_index(value: int) -> int:
+    """값(정수)을 로그 구간 히스토그램의 인덱스로 바꿉니다."""
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    index = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _bucket_value(index: int) -> float:
+    """인덱스가 나타내는 구간의 중앙값"""
+    if index < SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    low = mantissa << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class Histogram:
+    """
+    로그 구간 히스토그램 (HDR 방식)
+    기록은 O(1)이며 잠금을 사용하지 않으므로 한 스레드에서만 기록해야 합니다.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        if rank >= self.count:
+            # 가장 큰 값은 구간 중앙값이 아니라 기록한 최댓값
+            return float(self.max)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_value(index), float(self.max))
+        return float(self.max)
+
+    def cumulative_counts(self, bounds: Tuple[int, ...]) -> List[int]:
+        """
+        오름차순 상한(le)별 누적 기록 수
+        상한이 속한 구간까지 세므로 상한 바로 위의 값은 구간 오차(약 3%) 안에서 포함될 수 있습니다.
+        """
+        counts = self.counts
+        cumulative: List[int] = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            last = _bucket_index(bound)
+            while index <= last:
+                seen += counts[index]
+                index += 1
+            cumulative.append(seen)
+        return cumulative
+
+
+class _PhaseTimer:
+    """처리 함수 한 번의 단계별 소요 시간과 오류"""
+
+    __slots__ = ("phases", "error")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.error: Optional[str] = None
+
+
+_current = threading.local()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    처리 함수 안의 단계(parse/service/serialize) 소요 시간을 측정합니다.
+    call_with_phases 밖에서 호출되면 아무것도 기록하지 않습니다.
+    블록에서 예외가 발생하면 예외 이름을 호출 오류로 기록합니다.
+    """
+    timer = getattr(_current, "timer", None)
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        timer.error = type(e).__name__
+        raise
+    finally:
+        timer.phases[name] = timer.phases.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def call_with_phases(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, Dict[str, float], Optional[str]]:
+    """
+    처리 함수를 실행하고 (결과, 단계별 소요 시간(ms), 오류 이름)을 반환합니다.
+    프로세스 풀에서도 실행할 수 있도록 모듈 수준 함수로 둡니다.
+    """
+    timer = _PhaseTimer()
+    _current.timer = timer
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        _current.timer = None
+    return result, timer.phases, timer.error
+
+
+class _ToolShard:
+    """한 스레드가 기록하는 도구 하나의 지표"""
+
+    __slots__ = ("latency", "phases", "request_bytes", "response_bytes", "calls", "errors")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.phases = {name: Histogram() for name in PHASES}
+        self.request_bytes = Histogram()
+        self.response_bytes = Histogram()
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+
+
+class MetricsRegistry:
+    """
+    도구별 지표 저장소
+    각 스레드는 자신의 샤드에만 기록하고(잠금 없음), 조회할 때 샤드를 합칩니다.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._local = threading.local()
+        self._shards: List[Dict[str, _ToolShard]] = []
+        self._lock = threading.Lock()
+
+    def _thread_shards(self) -> Dict[str, _ToolShard]:
+        shards = getattr(self._local, "shards", None)
+        if shards is None:
+            shards = self._local.shards = {}
+            # 샤드 등록만 잠금 (스레드당 한 번)
+            with self._lock:
+                self._shards.append(shards)
+        return shards
+
+    def record(self,
+               tool_name: str,
+               total_ms: float,
+               phases: Optional[Dict[str, float]] = None,
+               request_bytes: int = 0,
+               response_bytes: int = 0,
+               error: Optional[str] = None) -> None:
+        """
+        도구 호출 한 번을 기록합니다.
+
+        Args:
+            tool_name: 도구 이름
+            total_ms: 대기 시간을 포함한 전체 처리 시간
+            phases: 단계별 소요 시간 (call_with_phases 결과)
+            request_bytes: 요청 인자 크기
+            response_bytes: 응답 크기
+            error: 오류 이름 (없으면 None)
+        """
+        shards = self._thread_shards()
+        shard = shards.get(tool_name)
+        if shard is None:
+            shard = shards[tool_name] = _ToolShard()
+
+        # 시간은 마이크로초 정수로 기록
+        shard.latency.record(int(total_ms * 1000))
+        for name, elapsed_ms in (phases or {}).items():
+            histogram = shard.phases.get(name)
+            if histogram is None:
+                histogram = shard.phases[name] = Histogram()
+            histogram.record(int(elapsed_ms * 1000))
+        shard.request_bytes.record(request_bytes)
+        shard.response_bytes.record(response_bytes)
+        shard.calls += 1
+        if error:
+            shard.errors[error] = shard.errors.get(error, 0) + 1
+
+    def _merged(self) -> Dict[str, _ToolShard]:
+        with self._lock:
+            thread_shards = [dict(shards) for shards in self._shards]
+        merged: Dict[str, _ToolShard] = {}
+        for shards in thread_shards:
+            for tool_name, shard in shards.items():
+                target = merged.get(tool_name)
+                if target is None:
+                    target = merged[tool_name] = _ToolShard()
+                target.latency.merge(shard.latency)
+                for name, histogram in shard.phases.items():
+                    target.phases.setdefault(name, Histogram()).merge(histogram)
+                target.request_bytes.merge(shard.request_bytes)
+                target.response_bytes.merge(shard.response_bytes)
+                target.calls += shard.calls
+                for error, count in shard.errors.items():
+                    target.errors[error] = target.errors.get(error, 0) + count
+        return merged
+
+    def snapshot(self) -> Dict[str, Any]:
+        """도구별 호출 수, 오류 수, 지연(ms)/크기(bytes) 백분위수 요약"""
+        def latency_summary(histogram: Histogram) -> Dict[str, float]:
+            summary = {f"p{int(q * 100)}": round(histogram.quantile(q) / 1000, 3) for q in QUANTILES}
+            summary["mean"] = round(histogram.total / histogram.count / 1000, 3) if histogram.count else 0.0
+            summary["max"] = round(histogram.max / 1000, 3)
+            return summary
+
+        def bytes_summary(histogram: Histogram) -> Dict[str, float]:
+            summary = {f"p{int(q * 100)}": round(histogram.quantile(q)) for q in QUANTILES}
+            summary["total"] = histogram.total
+            summary["max"] = histogram.max
+            return summary
+
+        tools = {}
+        for tool_name, shard in sorted(self._merged().items()):
+            tools[tool_name] = {
+                "calls": shard.calls,
+                "errors": sum(shard.errors.values()),
+                "errors_by_type": dict(shard.errors),
+                "latency_ms": latency_summary(shard.latency),
+                "phases_ms": {
+                    name: latency_summary(histogram)
+                    for name, histogram in shard.phases.items() if histogram.count
+                },
+                "request_bytes": bytes_summary(shard.request_bytes),
+                "response_bytes": bytes_summary(shard.response_bytes)
+            }
+        return {
+            "uptime_s": round(time.time() - self.started_at, 3),
+            "tools": tools
+        }
+
+    def prometheus(self, prefix: str = "agent_builder") -> str:
+        """Prometheus 텍스트 형식 (히스토그램은 초/바이트 단위, 인스턴스 사이에서 합칠 수 있음)"""
+        merged = sorted(self._merged().items())
+        lines: List[str] = []
+
+        def histogram_family(name: str, help_text: str, unit_scale: float, bounds: Tuple[float, ...], pick) -> None:
+            # 기록 단위(마이크로초/바이트)로 바꾼 상한으로 누적 개수를 구함
+            recorded_bounds = tuple(int(round(bound / unit_scale)) for bound in bounds)
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for tool_name, shard in merged:
+                for labels, histogram in pick(tool_name, shard):
+                    for bound, count in zip(bounds, histogram.cumulative_counts(recorded_bounds)):
+                        lines.append(f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{prefix}_{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.total * unit_scale:.6g}")
+                    lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        histogram_family("tool_latency_seconds", "도구 호출 전체 처리 시간", 1e-6, LATENCY_BUCKETS_S,
+                         lambda tool_name, shard: [(f'tool="{tool_name}"', shard.latency)])
+        histogram_family("tool_phase_latency_seconds", "도구 처리 단계별 소요 시간", 1e-6, LATENCY_BUCKETS_S,
+                         lambda tool_name, shard: [
+                             (f'tool="{tool_name}",phase="{name}"', histogram)
+                             for name, histogram in shard.phases.items() if histogram.count
+                         ])
+        histogram_family("tool_request_bytes", "도구 요청 인자 크기", 1, SIZE_BUCKETS_BYTES,
+                         lambda tool_name, shard: [(f'tool="{tool_name}"', shard.request_bytes)])
+        histogram_family("tool_response_bytes", "도구 응답 크기", 1, SIZE_BUCKETS_BYTES,
+                         lambda tool_name, shard: [(f'tool="{tool_name}"', shard.response_bytes)])
+
+        lines.append(f"# HELP {prefix}_tool_errors_total 도구 호출 오류 수")
+        lines.append(f"# TYPE {prefix}_tool_errors_total counter")
+        for tool_name, shard in merged:
+            for error, count in sorted(shard.errors.items()):
+                lines.append(f'{prefix}_tool_errors_total{{tool="{tool_name}",error="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -5,27 +5,50 @@
 """
 
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from uuid import uuid4
 from datetime import datetime
 
 # 상대 import 수정
-from config.tools_config import AVAILABLE_TOOLS
-from config.patterns import NODE_PATTERNS
+from config.tools_config import get_catalog
+from config.patterns import NODE_PATTERNS, WORKFLOW_PATTERNS
+from .catalog_index import get_catalog_index
+from .dag_scheduler import build_execution_plan, flatten_stages
+from .pattern_matcher import PatternMatcher
+from .result_cache import ResultCache, copy_result
+
+# 프로세스 노드의 도구 입력 스키마(tool_schema) 표현 방식
+#   inline: 노드마다 스키마 전체를 포함 (기본값)
+#   ref: 최상위 schemas 표(도구 id → 스키마)에 한 번만 두고 노드는 {"$ref": "#/schemas/<도구 id>"}로 참조
+#   omit: 스키마를 포함하지 않음
+SCHEMA_MODES = ("inline", "ref", "omit")
 
 class NodeRecommender:
     """노드 구조를 추천하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None, template_min_score: float = 0.5):
+        """
+        Args:
+            cache: (의도, 정렬된 기능, 복잡도, 워크플로우 타입) 기준으로 추천 결과를 보관할 캐시
+            template_min_score: 워크플로우 템플릿에서 시작할 최소 Jaccard 유사도 (1보다 크면 템플릿 사용 안 함)
+        """
         self.node_patterns = NODE_PATTERNS
-        self.tools = AVAILABLE_TOOLS
+        self.pattern_matcher = PatternMatcher(WORKFLOW_PATTERNS)
+        self.template_min_score = template_min_score
+        self.cache = cache
+    
+    @property
+    def tools(self) -> Dict[str, Dict[str, Any]]:
+        """현재(호출 중 고정된) 카탈로그의 도구 정의"""
+        return get_catalog().tools
     
     def recommend(self,
                   intent: str,
                   required_capabilities: List[str],
                   recommended_tools: List[Dict[str, Any]],
                   complexity_level: str,
-                  workflow_type: str) -> Dict[str, Any]:
+                  workflow_type: str,
+                  schema_mode: str = "inline") -> Dict[str, Any]:
         """
         분석 결과에 따라 노드 구조를 추천합니다.
         
@@ -35,10 +58,48 @@ class NodeRecommender:
             recommended_tools: 추천 도구 목록
             complexity_level: 복잡도 (low, medium, high)
             workflow_type: 워크플로우 타입
+            schema_mode: 도구 입력 스키마 표현 방식 (inline, ref, omit)
             
         Returns:
             노드 추천 결과
         """
+        if schema_mode not in SCHEMA_MODES:
+            raise ValueError(f"지원하지 않는 schema_mode입니다: {schema_mode} (가능: {', '.join(SCHEMA_MODES)})")
+        
+        if self.cache is None:
+            return self._recommend(intent, required_capabilities, recommended_tools,
+                                   complexity_level, workflow_type, schema_mode)
+        
+        # 도구 id 순서도 키에 포함하여 직접 도구 목록을 넘기는 호출끼리 충돌하지 않도록 함
+        key = (
+            intent,
+            tuple(sorted(required_capabilities)),
+            complexity_level,
+            workflow_type,
+            tuple(tool.get("id") for tool in recommended_tools),
+            schema_mode
+        )
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._recommend(intent, required_capabilities, recommended_tools,
+                                     complexity_level, workflow_type, schema_mode)
+            self.cache.put(key, cached)
+        
+        # 캐시 항목과 중첩 객체(nodes, connections, metadata 등)를 공유하지 않는 사본에
+        # 호출마다 고유해야 하는 필드만 새로 발급
+        recommendation = copy_result(cached)
+        recommendation["timestamp"] = datetime.now().isoformat()
+        recommendation["workflow_id"] = str(uuid4())
+        return recommendation
+    
+    def _recommend(self,
+                   intent: str,
+                   required_capabilities: List[str],
+                   recommended_tools: List[Dict[str, Any]],
+                   complexity_level: str,
+                   workflow_type: str,
+                   schema_mode: str = "inline") -> Dict[str, Any]:
+        """캐시를 거치지 않고 노드 구조를 추천합니다."""
         recommendation = {
             "timestamp": datetime.now().isoformat(),
             "workflow_id": str(uuid4()),
@@ -59,9 +120,25 @@ class NodeRecommender:
         # 기본 노드 생성
         nodes = self._create_base_nodes()
         
-        # 도구 기반 프로세스 노드 생성
-        process_nodes = self._create_process_nodes(recommended_tools)
+        # 가장 잘 맞는 워크플로우 템플릿이 있으면 템플릿의 기능 순서로 도구를 배치하고 빠진 기능을 채움
+        template = self.pattern_matcher.best(required_capabilities, self.template_min_score)
+        template_tool_ids: set = set()
+        if template is not None:
+            recommended_tools, added_tools, unfilled = self._start_from_template(template, recommended_tools)
+            template_tool_ids = {item["tool_id"] for item in added_tools}
+            # 분석이 추천하지 않았는데 템플릿 때문에 들어간 도구와 카탈로그에 도구가 없어 채우지 못한 기능
+            template["added_tools"] = added_tools
+            template["unfilled_capabilities"] = unfilled
+            recommendation["workflow_template"] = template
+            recommendation["metadata"]["template_tool_count"] = len(template_tool_ids)
+        
+        # 전이 의존 도구를 포함하여 도구 기반 프로세스 노드 생성
+        tools, dependency_tool_ids, missing_dependencies = self._resolve_dependencies(recommended_tools)
+        process_nodes = self._create_process_nodes(tools, dependency_tool_ids, schema_mode, template_tool_ids)
         nodes.extend(process_nodes)
+        recommendation["metadata"]["dependency_tool_count"] = len(dependency_tool_ids)
+        if missing_dependencies:
+            recommendation["metadata"]["missing_dependencies"] = missing_dependencies
         
         # 최종 출력 노드
         nodes.append(self._create_output_node())
@@ -69,13 +146,20 @@ class NodeRecommender:
         # 패턴에 따른 연결 생성
         connections = self._create_connections(nodes, workflow_type)
         
-        # 실행 순서 결정
-        execution_order = self._determine_execution_order(nodes, connections, workflow_type)
+        # 연결 그래프 기반 단계별 실행 계획
+        execution_plan = build_execution_plan(nodes, connections)
         
         recommendation["nodes"] = nodes
         recommendation["connections"] = connections
         recommendation["tool_mappings"] = {n["id"]: n.get("tool_id") for n in process_nodes}
-        recommendation["execution_order"] = execution_order
+        recommendation["execution_order"] = flatten_stages(execution_plan)
+        recommendation["execution_plan"] = execution_plan
+        recommendation["metadata"]["schema_mode"] = schema_mode
+        if schema_mode == "ref":
+            # 노드가 참조하는 도구의 스키마를 도구당 한 번만 포함
+            recommendation["schemas"] = {
+                tool.get("id"): tool.get("inputSchema", {}) for tool in tools
+            }
         
         return recommendation
     
@@ -91,25 +175,119 @@ class NodeRecommender:
             }
         ]
     
-    def _create_process_nodes(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _start_from_template(self,
+                             template: Dict[str, Any],
+                             tools: List[Dict[str, Any]]):
+        """
+        템플릿의 필요 기능 순서대로 도구를 배치합니다.
+        추천 도구에 없는 기능은 카탈로그에서 그 기능의 최우선 도구를 가져와 채웁니다.
+        
+        Returns:
+            (템플릿 기능 순 → 나머지 도구 순의 도구 목록,
+             템플릿 때문에 추가된 도구 [{"capability", "tool_id"}], 카탈로그에 도구가 없어 채우지 못한 기능 목록)
+        """
+        index = get_catalog_index()
+        ordered: List[Dict[str, Any]] = []
+        placed = set()
+        added: List[Dict[str, str]] = []
+        unfilled: List[str] = []
+        
+        for capability in self.pattern_matcher.patterns[template["id"]].get("required_capabilities", []):
+            in_category = [tool for tool in tools if tool.get("category") == capability]
+            if not in_category:
+                in_category = list(index.category_views.get(capability, ())[:1])
+                added.extend({"capability": capability, "tool_id": tool.get("id")} for tool in in_category)
+                if not in_category:
+                    unfilled.append(capability)
+            for tool in in_category:
+                if id(tool) not in placed:
+                    placed.add(id(tool))
+                    ordered.append(tool)
+        
+        ordered.extend(tool for tool in tools if id(tool) not in placed)
+        return ordered, added, unfilled
+    
+    def _resolve_dependencies(self, tools: List[Dict[str, Any]]):
+        """
+        도구의 전이 의존성을 카탈로그에서 찾아 추가합니다.
+        
+        Returns:
+            (의존 도구가 선행 도구 앞에 삽입된 도구 목록,
+             자동 추가된 도구 id 집합, 카탈로그에 없는 의존성 목록)
+        """
+        index = get_catalog_index()
+        requested_ids = {tool.get("id") for tool in tools}
+        added_ids = set()
+        missing = []
+        resolved = []
+        
+        def add_dependencies(tool: Dict[str, Any], visiting: set) -> None:
+            for dependency_id in tool.get("dependencies", []):
+                if dependency_id in requested_ids or dependency_id in added_ids:
+                    continue
+                if dependency_id in visiting:
+                    continue  # 순환 의존성은 한 번만 추가
+                dependency = index.get(dependency_id)
+                if dependency is None:
+                    if dependency_id not in missing:
+                        missing.append(dependency_id)
+                    continue
+                visiting.add(dependency_id)
+                add_dependencies(dependency, visiting)
+                added_ids.add(dependency_id)
+                resolved.append(dependency)
+        
+        for tool in tools:
+            add_dependencies(tool, {tool.get("id")})
+            resolved.append(tool)
+        
+        return resolved, added_ids, missing
+    
+    def _create_process_nodes(self,
+                              tools: List[Dict[str, Any]],
+                              dependency_tool_ids: Optional[set] = None,
+                              schema_mode: str = "inline",
+                              template_tool_ids: Optional[set] = None) -> List[Dict[str, Any]]:
         """도구에 기반한 프로세스 노드를 생성합니다."""
         process_nodes = []
+        dependency_tool_ids = dependency_tool_ids or set()
+        template_tool_ids = template_tool_ids or set()
+        
+        # 도구 id → 해당 도구를 실행하는 노드 id들
+        nodes_by_tool: Dict[str, List[str]] = {}
+        for idx, tool in enumerate(tools, 1):
+            nodes_by_tool.setdefault(tool.get("id"), []).append(f"process_node_{idx}")
         
         for idx, tool in enumerate(tools, 1):
+            depends_on = [
+                node_id
+                for dependency_id in tool.get("dependencies", [])
+                for node_id in nodes_by_tool.get(dependency_id, [])
+            ]
             node = {
                 "id": f"process_node_{idx}",
                 "name": tool.get("name", "처리"),
                 "type": "process",
                 "description": tool.get("description", ""),
                 "tool_id": tool.get("id"),
-                "tool_schema": tool.get("inputSchema", {}),
+                "tool_schema": (
+                    tool.get("inputSchema", {}) if schema_mode == "inline"
+                    else {"$ref": f"#/schemas/{tool.get('id')}"}
+                ),
                 "category": tool.get("category", ""),
                 "priority": tool.get("priority", 999),
                 "estimated_time_ms": tool.get("estimated_time_ms", 1000),
                 "status": "pending",
                 "retry_count": 3,
-                "timeout_ms": 30000
+                "timeout_ms": 30000,
+                "depends_on": depends_on
             }
+            if schema_mode == "omit":
+                del node["tool_schema"]
+            if tool.get("id") in dependency_tool_ids:
+                node["added_as_dependency"] = True
+            if tool.get("id") in template_tool_ids:
+                node["added_from_template"] = True
             process_nodes.append(node)
         
         return process_nodes
@@ -127,116 +305,110 @@ class NodeRecommender:
     def _create_connections(self,
                            nodes: List[Dict[str, Any]],
                            workflow_type: str) -> List[Dict[str, Any]]:
-        """노드 간 연결을 생성합니다."""
-        connections = []
-        
-        if workflow_type == "sequential":
-            connections = self._create_sequential_connections(nodes)
-        elif workflow_type == "parallel":
-            connections = self._create_parallel_connections(nodes)
-        elif workflow_type == "conditional":
-            connections = self._create_conditional_connections(nodes)
-        elif workflow_type == "loop":
-            connections = self._create_loop_connections(nodes)
-        else:
-            connections = self._create_sequential_connections(nodes)
+        """
+        노드 간 연결을 생성합니다.
         
-        return connections
-    
-    def _create_sequential_connections(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """순차 연결을 생성합니다."""
-        connections = []
+        모든 워크플로우 타입은 도구 의존성 그래프를 기반으로 연결되어
+        독립 도구는 병렬로, 의존 도구는 체인으로 실행됩니다.
+        조건부/반복 타입은 그 위에 조건 분기와 반복 연결을 덧붙입니다.
+        """
+        connections = self._create_dependency_connections(nodes)
         
-        for i in range(len(nodes) - 1):
-            connections.append({
-                "id": f"conn_{i}",
-                "from_node": nodes[i]["id"],
-                "to_node": nodes[i + 1]["id"],
-                "type": "direct",
-                "condition": None
-            })
+        if workflow_type == "conditional":
+            connections = self._create_conditional_connections(connections)
+        elif workflow_type == "loop":
+            connections = self._create_loop_connections(nodes, connections)
         
         return connections
     
-    def _create_parallel_connections(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """병렬 연결을 생성합니다."""
-        connections = []
+    def _create_dependency_connections(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """의존성 그래프에 따른 연결을 생성합니다 (입력 → 독립 노드, 최종 노드 → 출력)."""
         process_nodes = [n for n in nodes if n["type"] == "process"]
+        edges = []
         
-        # 입력에서 모든 프로세스로 연결
-        for process_node in process_nodes:
-            connections.append({
-                "id": f"conn_input_to_{process_node['id']}",
-                "from_node": "input_node",
-                "to_node": process_node["id"],
-                "type": "parallel"
-            })
+        if not process_nodes:
+            edges.append(("input_node", "output_node"))
+        else:
+            has_dependents = set()
+            for node in process_nodes:
+                for dependency_node_id in node.get("depends_on", []):
+                    edges.append((dependency_node_id, node["id"]))
+                    has_dependents.add(dependency_node_id)
+            
+            roots = [("input_node", n["id"]) for n in process_nodes if not n.get("depends_on")]
+            sinks = [(n["id"], "output_node") for n in process_nodes if n["id"] not in has_dependents]
+            edges = roots + edges + sinks
         
-        # 모든 프로세스에서 출력으로 연결
-        for process_node in process_nodes:
-            connections.append({
-                "id": f"conn_{process_node['id']}_to_output",
-                "from_node": process_node["id"],
-                "to_node": "output_node",
-                "type": "parallel"
-            })
+        # 분기(fan-out) 또는 합류(fan-in) 지점의 연결은 병렬, 나머지는 직접 연결
+        out_degree: Dict[str, int] = {}
+        in_degree: Dict[str, int] = {}
+        for source, target in edges:
+            out_degree[source] = out_degree.get(source, 0) + 1
+            in_degree[target] = in_degree.get(target, 0) + 1
         
-        return connections
+        return [
+            {
+                "id": f"conn_{source}_to_{target}",
+                "from_node": source,
+                "to_node": target,
+                "type": "parallel" if out_degree[source] > 1 or in_degree[target] > 1 else "direct",
+                "condition": None
+            }
+            for source, target in edges
+        ]
     
-    def _create_conditional_connections(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """조건부 연결을 생성합니다."""
-        connections = []
-        
-        # 이 부분은 더 복잡한 로직이 필요하므로
-        # 여기서는 기본 구조만 제공
-        if len(nodes) > 2:
-            connections.append({
-                "id": "conn_input_decision",
-                "from_node": "input_node",
-                "to_node": nodes[1]["id"],
-                "type": "conditional",
-                "condition": "if_condition"
-            })
+    def _create_conditional_connections(self, connections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """입력에서 시작하는 연결을 조건부 분기로 바꿉니다."""
+        for connection in connections:
+            if connection["from_node"] == "input_node" and connection["to_node"] != "output_node":
+                connection["type"] = "conditional"
+                connection["condition"] = "if_condition"
         
         return connections
     
-    def _create_loop_connections(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """반복 연결을 생성합니다."""
-        connections = []
+    def _create_loop_connections(self,
+                                 nodes: List[Dict[str, Any]],
+                                 connections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        처리 구간 전체를 반복하도록 반복 조건 노드와 되돌아가는 연결을 추가합니다.
         
-        if len(nodes) >= 2:
+        최종 처리 노드들은 출력 대신 반복 조건 노드로 합류하고,
+        반복 조건 노드에서 각 시작 처리 노드로 loop_back 연결이 생성됩니다.
+        반복 조건 노드는 nodes 목록의 출력 노드 앞에 삽입됩니다.
+        """
+        roots = [c["to_node"] for c in connections
+                 if c["from_node"] == "input_node" and c["to_node"] != "output_node"]
+        if not roots:
+            return connections
+        
+        nodes.insert(len(nodes) - 1, {
+            "id": "loop_check_node",
+            "name": "반복 조건 확인",
+            "type": "condition",
+            "description": "반복 조건을 확인하여 처리 구간을 다시 실행하거나 종료",
+            "status": "pending"
+        })
+        
+        sinks = [c for c in connections if c["to_node"] == "output_node"]
+        for connection in sinks:
+            connection["id"] = f"conn_{connection['from_node']}_to_loop_check_node"
+            connection["to_node"] = "loop_check_node"
+            connection["type"] = "parallel" if len(sinks) > 1 else "direct"
+        
+        connections.append({
+            "id": "conn_loop_check_node_to_output_node",
+            "from_node": "loop_check_node",
+            "to_node": "output_node",
+            "type": "direct",
+            "condition": None
+        })
+        for root in roots:
             connections.append({
-                "id": "conn_loop_start",
-                "from_node": "input_node",
-                "to_node": nodes[1]["id"],
-                "type": "direct"
+                "id": f"conn_loop_back_to_{root}",
+                "from_node": "loop_check_node",
+                "to_node": root,
+                "type": "loop_back",
+                "condition": "while_condition"
             })
-            
-            # 반복 루프
-            if len(nodes) > 2:
-                connections.append({
-                    "id": "conn_loop_back",
-                    "from_node": nodes[-2]["id"],
-                    "to_node": nodes[1]["id"],
-                    "type": "loop_back",
-                    "condition": "while_condition"
-                })
         
         return connections
-    
-    def _determine_execution_order(self,
-                                  nodes: List[Dict[str, Any]],
-                                  connections: List[Dict[str, Any]],
-                                  workflow_type: str) -> List[str]:
-        """노드 실행 순서를 결정합니다."""
-        
-        if workflow_type == "parallel":
-            # 병렬: 입력 → 모든 프로세스 동시 → 출력
-            process_ids = [n["id"] for n in nodes if n["type"] == "process"]
-            return ["input_node"] + process_ids + ["output_node"]
-        elif workflow_type == "sequential":
-            # 순차: 입력 → 프로세스1 → 프로세스2 → ... → 출력
-            return [n["id"] for n in nodes]
-        else:
-            # 기타: 입력 → 모든 프로세스 → 출력
-            return [n["id"] for n in nodes]
@@ -0,0 +1,1139 @@
+# src/services/pareto_optimizer.py
+"""
+파레토 다중 목표 최적화 서비스
+도구별 비용/지연/실패 모델로 워크플로우 재작성 후보(재작성 패스 조합, 노드별 재시도/타임아웃,
+대체 도구)를 시간 예산 안에서 탐색하여 p95 지연·기대 비용·성공률의 파레토 프론티어를 구하고,
+가중치 또는 제약 조건(예: "p95 < 5s, minimize cost")으로 하나를 선택합니다.
+
+후보 점수는 해석적으로 계산합니다. 노드 소요 시간은 lognormal 지연에 타임아웃/재시도를 반영한
+평균·분산으로 요약하고, 합류 지점의 max는 Clark 근사(정규 분포 두 개의 max)로 전파합니다.
+해석적 p95는 꼬리가 긴 분포에서 낮게 나오는 편이므로, verify_trials를 주면 프론티어 후보를
+WorkflowSimulator 몬테카를로로 다시 측정해 선택에 사용합니다. loop_back 구간은 한 번 실행한 것으로 계산합니다.
+"""
+
+import math
+import random
+import re
+import time
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from datetime import datetime
+
+from .catalog_index import get_catalog_index
+from .workflow_graph import WorkflowGraph
+
+# 도구 모델 기본값 (카탈로그 도구 정의의 cost_per_call/cost_per_second/failure_probability가 있으면 그 값 사용)
+DEFAULT_TOOL_MODEL = {
+    "sigma": 0.3,                  # lognormal 형태 모수 (중앙값은 노드/카탈로그의 estimated_time_ms)
+    "failure_probability": 0.01,   # 시도당 실패 확률
+    "cost_per_call": 1.0,          # 시도마다 드는 비용 (실패한 시도 포함)
+    "cost_per_second": 0.0,        # 실행 시간에 비례하는 비용
+    "retry_backoff_ms": 100.0      # 재시도 대기 (n번째 재시도 전 backoff * 2^(n-1))
+}
+
+MODEL_FIELDS = set(DEFAULT_TOOL_MODEL) | {"median_ms"}
+MODEL_SECTIONS = ("default", "tools", "nodes", "substitutes")
+
+# 노드의 원래 타임아웃 외에 시도할 타임아웃 후보 (도구 지연 중앙값의 배수)
+TIMEOUT_FACTORS = (2.0, 1.5)
+
+# 목표 지표 (모두 작을수록 좋음) 와 가중치/제약 조건에서 쓰는 이름
+OBJECTIVES = ("p95_ms", "expected_cost", "failure_rate")
+METRIC_ALIASES = {
+    "p95": "p95_ms", "p95_ms": "p95_ms", "latency": "p95_ms", "speed": "p95_ms",
+    "p50": "p50_ms", "p50_ms": "p50_ms", "median": "p50_ms",
+    "p99": "p99_ms", "p99_ms": "p99_ms",
+    "mean": "mean_ms", "mean_ms": "mean_ms",
+    "cost": "expected_cost", "expected_cost": "expected_cost",
+    "success": "success_rate", "success_rate": "success_rate", "reliability": "success_rate",
+    "failure": "failure_rate", "failure_rate": "failure_rate"
+}
+TIME_METRICS = ("p50_ms", "p95_ms", "p99_ms", "mean_ms")
+RATE_METRICS = ("success_rate", "failure_rate")
+TIME_UNITS = {"": 1.0, "ms": 1.0, "s": 1000.0, "sec": 1000.0, "m": 60000.0, "min": 60000.0}
+
+DEFAULT_WEIGHTS = {"p95_ms": 1.0, "expected_cost": 1.0, "failure_rate": 1.0}
+DEFAULT_TIME_BUDGET_MS = 2000.0
+# 구조 변형(재작성 패스 조합)을 만드는 데 쓸 수 있는 시간 예산 비율 (나머지는 노드 설정 탐색)
+STRUCTURE_BUDGET_SHARE = 0.5
+# 선택한 변형의 워크플로우와 지표를 만드는 데 남겨 둘 시간: 기준 그래프 지표 계산 시간의 배수와
+# 프론티어 후보마다 기준 변형 요약 시간의 배수 (한 번 잰 짧은 시간이므로 여유를 둠),
+# 전체 예산 대비 최소 비율과 남은 예산 대비 최대 비율
+FINALIZE_COST_FACTOR = 8.0
+FINALIZE_SUMMARY_FACTOR = 2.0
+FINALIZE_MIN_SHARE = 0.02
+FINALIZE_MAX_SHARE = 0.5
+
+_CONSTRAINT = re.compile(r"^([a-z_0-9]+)\s*(<=|>=|<|>)\s*([0-9]*\.?[0-9]+)\s*([a-z%]*)$")
+_OBJECTIVE = re.compile(r"^(minimi[sz]e|maximi[sz]e|min|max)\s+([a-z_0-9]+)$")
+
+_Z50, _Z95, _Z99 = 0.0, 1.6448536269514722, 2.3263478740408408
+_SQRT2 = math.sqrt(2.0)
+_SQRT2PI = math.sqrt(2.0 * math.pi)
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1.0 + math.erf(x / _SQRT2))
+
+
+def _clark_max(m1: float, v1: float, m2: float, v2: float) -> Tuple[float, float]:
+    """독립 정규 분포 두 개의 max를 평균/분산으로 근사합니다 (Clark, 1961)."""
+    theta2 = v1 + v2
+    if theta2 <= 1e-12:
+        return (m1, v1) if m1 >= m2 else (m2, v2)
+    theta = math.sqrt(theta2)
+    alpha = (m1 - m2) / theta
+    if alpha > 6.0:
+        return m1, v1
+    if alpha < -6.0:
+        return m2, v2
+    cdf = _normal_cdf(alpha)
+    pdf = math.exp(-0.5 * alpha * alpha) / _SQRT2PI
+    mean = m1 * cdf + m2 * (1.0 - cdf) + theta * pdf
+    second = (m1 * m1 + v1) * cdf + (m2 * m2 + v2) * (1.0 - cdf) + (m1 + m2) * theta * pdf
+    return mean, max(second - mean * mean, 0.0)
+
+
+def node_stats(spec: Dict[str, Any], retry_count: int, timeout_ms: Optional[float]) -> Tuple[float, float, float, float]:
+    """
+    재시도/타임아웃을 반영한 노드 하나의 소요 시간 평균·분산, 성공 확률, 기대 비용을 계산합니다.
+
+    시도마다 lognormal 지연을 따르며, timeout_ms를 넘긴 시도는 timeout_ms에서 끊기고 실패로 처리됩니다.
+
+    Returns:
+        (평균 ms, 분산, 성공 확률, 기대 비용)
+    """
+    median = float(spec["median_ms"])
+    sigma = float(spec["sigma"])
+    within = 1.0
+    if median <= 0:
+        m1 = m2 = 0.0
+    elif sigma <= 0:
+        m1 = median if not timeout_ms or median <= timeout_ms else float(timeout_ms)
+        m2 = m1 * m1
+        within = 1.0 if not timeout_ms or median <= timeout_ms else 0.0
+    else:
+        mu = math.log(median)
+        e1 = math.exp(mu + sigma * sigma / 2)
+        e2 = math.exp(2 * mu + 2 * sigma * sigma)
+        if timeout_ms:
+            z = (math.log(timeout_ms) - mu) / sigma
+            within = _normal_cdf(z)
+            m1 = e1 * _normal_cdf(z - sigma) + timeout_ms * (1.0 - within)
+            m2 = e2 * _normal_cdf(z - 2 * sigma) + timeout_ms * timeout_ms * (1.0 - within)
+        else:
+            m1, m2 = e1, e2
+
+    # 시도당 실패 확률과 시도 횟수 분포 (마지막 시도는 실패해도 멈춤)
+    q = 1.0 - (1.0 - float(spec["failure_probability"])) * within
+    attempts = int(retry_count) + 1
+    backoff = float(spec["retry_backoff_ms"])
+    attempt_var = max(m2 - m1 * m1, 0.0)
+    mean = second = expected_attempts = 0.0
+    for k in range(1, attempts + 1):
+        p = q ** (k - 1) * ((1.0 - q) if k < attempts else 1.0)
+        duration = k * m1 + backoff * (2 ** (k - 1) - 1)
+        mean += p * duration
+        second += p * (k * attempt_var + duration * duration)
+        expected_attempts += p * k
+
+    cost = expected_attempts * (float(spec["cost_per_call"]) + float(spec["cost_per_second"]) * m1 / 1000)
+    return mean, max(second - mean * mean, 0.0), 1.0 - q ** attempts, cost
+
+
+def parse_constraints(constraints: Any) -> Dict[str, Any]:
+    """
+    "p95 < 5s, success >= 99%, minimize cost" 형태의 제약 조건을 해석합니다.
+
+    Args:
+        constraints: 쉼표/세미콜론/and로 구분한 문자열 또는 문자열 목록
+
+    Returns:
+        {"constraints": [{"metric", "op", "value"}], "objective": {"metric", "direction"} 또는 None}
+    """
+    if not constraints:
+        return {"constraints": [], "objective": None}
+    if isinstance(constraints, str):
+        items = re.split(r"\s*(?:,|;|\band\b)\s*", constraints.strip().lower())
+    elif isinstance(constraints, list) and all(isinstance(item, str) for item in constraints):
+        items = [item.strip().lower() for item in constraints]
+    else:
+        raise ValueError("constraints는 문자열 또는 문자열 목록이어야 합니다")
+
+    parsed: List[Dict[str, Any]] = []
+    objective = None
+    for item in filter(None, items):
+        matched = _OBJECTIVE.match(item)
+        if matched:
+            if objective is not None:
+                raise ValueError("최소화/최대화 목표는 하나만 지정할 수 있습니다")
+            objective = {"metric": _metric(matched.group(2)),
+                         "direction": "maximize" if matched.group(1).startswith("max") else "minimize"}
+            continue
+        matched = _CONSTRAINT.match(item)
+        if not matched:
+            raise ValueError(f"제약 조건을 해석할 수 없습니다: {item}")
+        metric = _metric(matched.group(1))
+        value, unit = float(matched.group(3)), matched.group(4)
+        if metric in TIME_METRICS:
+            if unit not in TIME_UNITS:
+                raise ValueError(f"시간 단위를 해석할 수 없습니다: {item}")
+            value *= TIME_UNITS[unit]
+        elif unit == "%" and metric in RATE_METRICS:
+            value /= 100
+        elif unit:
+            raise ValueError(f"{metric}에는 단위 {unit}를 쓸 수 없습니다: {item}")
+        parsed.append({"metric": metric, "op": matched.group(2), "value": value})
+    return {"constraints": parsed, "objective": objective}
+
+
+def _metric(name: str) -> str:
+    metric = METRIC_ALIASES.get(name)
+    if metric is None:
+        raise ValueError(f"알 수 없는 지표입니다: {name} (사용 가능: {', '.join(sorted(METRIC_ALIASES))})")
+    return metric
+
+
+def _satisfies(value: float, op: str, bound: float) -> bool:
+    if op == "<":
+        return value < bound
+    if op == "<=":
+        return value <= bound
+    if op == ">":
+        return value > bound
+    return value >= bound
+
+
+class ParetoOptimizer:
+    """도구별 비용/지연/실패 모델로 워크플로우 변형의 파레토 프론티어를 탐색하는 클래스"""
+
+    def __init__(self, optimizer: Optional[Any] = None):
+        """
+        Args:
+            optimizer: 재작성 패스를 실행할 WorkflowOptimizer (None이면 새로 생성)
+        """
+        if optimizer is None:
+            from .workflow_optimizer import WorkflowOptimizer
+            optimizer = WorkflowOptimizer()
+        self.optimizer = optimizer
+
+    def optimize(self,
+                 workflow: Dict[str, Any],
+                 tool_model: Optional[Dict[str, Any]] = None,
+                 constraints: Any = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                 max_retries: int = 3,
+                 max_frontier: int = 32,
+                 seed: int = 0,
+                 verify_trials: int = 0) -> Dict[str, Any]:
+        """
+        워크플로우 변형을 탐색해 파레토 프론티어를 구하고 하나를 선택합니다.
+
+        Args:
+            workflow: 워크플로우 정보
+            tool_model: 도구별 비용/지연/실패 모델
+                {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}},
+                 "substitutes": {도구 id: [대체 가능한 도구 id]}}
+                항목: median_ms, sigma, failure_probability, cost_per_call, cost_per_second, retry_backoff_ms
+            constraints: 선택 제약 조건 (예: "p95 < 5s, minimize cost")
+            weights: 선택 가중치 (latency/cost/reliability, 지연·비용은 프론티어 최솟값 대비 증가율,
+                신뢰성은 실패율에 곱한 합이 가장 작은 후보 선택)
+            time_budget_ms: 전체 시간 예산 (결과를 만드는 시간을 남겨 두고 탐색, verify_trials 시뮬레이션 제외).
+                예산 안에 제약을 만족하는 후보를 찾지 못하면 위반이 가장 작은 후보를 선택하고
+                selection.feasible=False와 fallback_reason으로 알림
+            max_retries: 노드별 재시도 횟수 후보의 최댓값
+            max_frontier: 보관할 프론티어 최대 크기 (넘으면 밀집 구간의 후보부터 제외)
+            seed: 탐색 난수 시드 (같은 입력과 시드면 같은 결과)
+            verify_trials: 0보다 크면 프론티어 후보를 이 시행 수로 몬테카를로 시뮬레이션하고
+                선택에는 시뮬레이션한 지연 백분위수와 성공률을 사용
+
+        Returns:
+            선택한 변형의 최적화 결과 (optimize()와 같은 형식)와 pareto 보고서
+        """
+        started = time.perf_counter()
+        if time_budget_ms <= 0:
+            raise ValueError("time_budget_ms는 0보다 커야 합니다")
+        if not 0 <= max_retries <= 5:
+            raise ValueError("max_retries는 0에서 5 사이여야 합니다")
+        if max_frontier < 2:
+            raise ValueError("max_frontier는 2 이상이어야 합니다")
+        if verify_trials < 0:
+            raise ValueError("verify_trials는 0 이상이어야 합니다")
+        deadline = started + time_budget_ms / 1000
+        model = self._validate_model(tool_model or {})
+        criteria = parse_constraints(constraints)
+        weights = self._normalize_weights(weights)
+
+        search = _Search(self, workflow, model, max_retries, max_frontier, random.Random(seed),
+                         started, deadline, started + time_budget_ms * STRUCTURE_BUDGET_SHARE / 1000)
+        search.run()
+        search_elapsed_ms = (time.perf_counter() - started) * 1000
+        frontier = sorted(search.archive, key=lambda entry: entry["objectives"])
+        for number, entry in enumerate(frontier, 1):
+            entry["variant_id"] = f"v{number}"
+            entry["selection_scores"] = entry["scores"]
+            if verify_trials:
+                # 시뮬레이션한 지연 백분위수와 성공률로 선택 (기대 비용은 해석적 값)
+                entry["simulated"] = search.simulate(entry, verify_trials, seed)
+                simulated = {key: value for key, value in entry["simulated"].items() if key != "trials"}
+                simulated["failure_rate"] = round(1.0 - simulated["success_rate"], 9)
+                entry["selection_scores"] = dict(entry["scores"], **simulated)
+
+        selected, selection = self._select(frontier, criteria, weights)
+        selection["score_source"] = "simulated" if verify_trials else "analytic"
+        if not selection["feasible"]:
+            # 제약을 만족하는 후보가 없어도 위반이 가장 작은 후보로 결과를 만들고 그 이유를 알림
+            selection["fallback_reason"] = ("time_budget_exhausted" if search.budget_exhausted
+                                            else "no_feasible_candidate")
+        variant = search.variants[selected["variant"]]
+        graph = search.apply_genome(variant, selected["genome"])
+        optimized_workflow = self.optimizer._build_workflow(workflow, graph, "pareto")
+        before = search.baseline_metrics
+        after = self.optimizer._measure(graph)
+
+        frontier_report = []
+        for entry in frontier:
+            item = {
+                "variant_id": entry["variant_id"],
+                "selected": entry is selected,
+                "scores": entry["scores"],
+                "passes": search.variants[entry["variant"]]["passes"],
+                "changes": search.summarize_changes(entry)
+            }
+            if verify_trials:
+                item["simulated"] = entry["simulated"]
+            frontier_report.append(item)
+        selection["node_changes"] = search.node_changes(selected)
+
+        improvement = self.optimizer._improvement_metrics(before, after)
+        improvement["focus"] = "p95 지연·비용·성공률 균형 (파레토 선택)"
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "original_workflow_id": workflow.get("workflow_id"),
+            "optimization_goal": "pareto",
+            "recommendations": self._recommendations(search, variant, selected),
+            "optimized_workflow": optimized_workflow,
+            "optimization_passes": variant["pass_reports"],
+            "improvement_metrics": improvement,
+            "pareto": {
+                "baseline": search.baseline["scores"],
+                "selection": selection,
+                "frontier": frontier_report,
+                "search": {
+                    "time_budget_ms": time_budget_ms,
+                    "finalize_reserve_ms": round(search.finalize_reserve_ms, 3),
+                    "elapsed_ms": round(search_elapsed_ms, 3),
+                    "evaluated": search.evaluated,
+                    "structural_variants": len(search.variants),
+                    "abandoned_variants": search.abandoned_variants,
+                    "frontier_size": len(frontier),
+                    "budget_exhausted": search.budget_exhausted,
+                    "converged": search.converged,
+                    "score_model": "analytic (lognormal + Clark max)",
+                    "seed": seed
+                },
+                "model": {
+                    "default": dict(DEFAULT_TOOL_MODEL, **model.get("default", {})),
+                    "substitutes": model.get("substitutes", {})
+                }
+            }
+        }
+
+    # ------------------------------------------------------------------
+    # 입력 검증
+    # ------------------------------------------------------------------
+
+    def _validate_model(self, tool_model: Dict[str, Any]) -> Dict[str, Any]:
+        """도구 모델의 구조와 값을 검증합니다."""
+        if not isinstance(tool_model, dict):
+            raise ValueError("tool_model은 객체여야 합니다")
+        unknown = [key for key in tool_model if key not in MODEL_SECTIONS]
+        if unknown:
+            raise ValueError(f"알 수 없는 tool_model 항목: {', '.join(unknown)}")
+
+        specs = [("default", tool_model.get("default", {}))]
+        for section in ("tools", "nodes"):
+            entries = tool_model.get(section, {})
+            if not isinstance(entries, dict):
+                raise ValueError(f"tool_model.{section}는 객체여야 합니다")
+            specs.extend((f"{section}.{key}", spec) for key, spec in entries.items())
+        for where, spec in specs:
+            if not isinstance(spec, dict):
+                raise ValueError(f"tool_model.{where}는 객체여야 합니다")
+            fields = [field for field in spec if field not in MODEL_FIELDS]
+            if fields:
+                raise ValueError(f"tool_model.{where}: 알 수 없는 항목 {', '.join(fields)}")
+            self._check_spec(spec, f"tool_model.{where}")
+
+        substitutes = tool_model.get("substitutes", {})
+        index = get_catalog_index()
+        if not isinstance(substitutes, dict):
+            raise ValueError("tool_model.substitutes는 {도구 id: [도구 id]} 객체여야 합니다")
+        for tool_id, alternatives in substitutes.items():
+            if not (isinstance(alternatives, list) and all(isinstance(item, str) for item in alternatives)):
+                raise ValueError(f"tool_model.substitutes.{tool_id}는 도구 id 목록이어야 합니다")
+            missing = [item for item in alternatives
+                       if index.get(item) is None and "median_ms" not in tool_model.get("tools", {}).get(item, {})]
+            if missing:
+                raise ValueError(f"알 수 없는 대체 도구: {', '.join(missing)} "
+                                 "(카탈로그에 없으면 tool_model.tools에 median_ms 필요)")
+        return tool_model
+
+    def _check_spec(self, spec: Dict[str, Any], where: str) -> None:
+        for field, value in spec.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{where}.{field}는 0 이상의 숫자여야 합니다")
+        if spec.get("failure_probability", 0) > 1:
+            raise ValueError(f"{where}.failure_probability는 0과 1 사이여야 합니다")
+
+    def _normalize_weights(self, weights: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """가중치 이름을 목표 지표로 바꾸고 합이 1이 되도록 정규화합니다."""
+        if not weights:
+            weights = DEFAULT_WEIGHTS
+        if not isinstance(weights, dict):
+            raise ValueError("weights는 {지표: 가중치} 객체여야 합니다")
+        normalized = {objective: 0.0 for objective in OBJECTIVES}
+        for name, value in weights.items():
+            metric = _metric(str(name).lower())
+            if metric == "success_rate":
+                metric = "failure_rate"
+            if metric not in normalized:
+                raise ValueError(f"가중치에는 {', '.join(OBJECTIVES)}(또는 latency/cost/reliability)만 쓸 수 있습니다")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"가중치는 0 이상의 숫자여야 합니다: {name}")
+            normalized[metric] += float(value)
+        total = sum(normalized.values())
+        if total <= 0:
+            raise ValueError("가중치의 합은 0보다 커야 합니다")
+        return {metric: round(value / total, 6) for metric, value in normalized.items()}
+
+    # ------------------------------------------------------------------
+    # 선택
+    # ------------------------------------------------------------------
+
+    def _select(self,
+                frontier: List[Dict[str, Any]],
+                criteria: Dict[str, Any],
+                weights: Dict[str, float]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """제약 조건을 만족하는 후보 중 목표 지표 또는 가중 합이 가장 좋은 후보를 고릅니다."""
+        constraints = criteria["constraints"]
+        objective = criteria["objective"]
+        feasible = [entry for entry in frontier
+                    if all(_satisfies(entry["selection_scores"][c["metric"]], c["op"], c["value"]) for c in constraints)]
+
+        # 지연과 비용은 프론티어 최솟값 대비 증가율, 실패율은 그대로 더함
+        # (1% 느려짐 = 1% 비싸짐 = 실패율 1%p를 같은 무게로 봄)
+        lowest = {metric: min(entry["selection_scores"][metric] for entry in frontier) for metric in OBJECTIVES}
+
+        def weighted(entry: Dict[str, Any]) -> float:
+            total = 0.0
+            for metric, weight in weights.items():
+                value = entry["selection_scores"][metric]
+                if metric != "failure_rate":
+                    value = value / lowest[metric] - 1.0 if lowest[metric] > 0 else 0.0
+                total += weight * value
+            return total
+
+        def violation(entry: Dict[str, Any]) -> float:
+            total = 0.0
+            for c in constraints:
+                value = entry["selection_scores"][c["metric"]]
+                if not _satisfies(value, c["op"], c["value"]):
+                    total += max(abs(value - c["value"]), 1e-9) / max(abs(c["value"]), 1e-9)
+            return total
+
+        if feasible:
+            if objective is not None:
+                sign = -1.0 if objective["direction"] == "maximize" else 1.0
+                selected = min(feasible, key=lambda e: (sign * e["selection_scores"][objective["metric"]], weighted(e)))
+                method = "objective"
+            else:
+                selected = min(feasible, key=weighted)
+                method = "weights"
+        else:
+            # 제약을 모두 만족하는 후보가 없으면 위반 정도가 가장 작은 후보
+            selected = min(frontier, key=lambda e: (violation(e), weighted(e)))
+            method = "least_violation"
+
+        return selected, {
+            "variant_id": selected["variant_id"],
+            "method": method,
+            "feasible": bool(feasible),
+            "feasible_count": len(feasible),
+            "constraints": constraints,
+            "objective": objective,
+            "weights": weights,
+            "scores": selected["selection_scores"]
+        }
+
+    def _recommendations(self,
+                         search: "_Search",
+                         variant: Dict[str, Any],
+                         selected: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """선택한 변형의 재작성 패스와 노드 설정 변경을 추천 항목으로 요약합니다."""
+        recommendations = [self.optimizer._pass_recommendation(report)
+                           for report in variant["pass_reports"] if report.get("applied")]
+        changes = search.summarize_changes(selected)
+        baseline, scores = search.baseline["scores"], selected["scores"]
+        effect = (f"p95 {baseline['p95_ms']} → {scores['p95_ms']} ms, "
+                  f"비용 {baseline['expected_cost']} → {scores['expected_cost']}, "
+                  f"성공률 {baseline['success_rate']} → {scores['success_rate']}")
+        if changes["retry_changed"]:
+            recommendations.append({
+                "type": "retry_policy",
+                "priority": "high",
+                "description": "노드별 재시도 횟수 조정 (재시도 분포: " +
+                               ", ".join(f"{k}회 {v}개" for k, v in changes["retry_count"].items()) + ")",
+                "implementation": f"optimized_workflow의 retry_count에 적용됨 ({changes['retry_changed']}개 노드)",
+                "estimated_improvement": effect,
+                "applied": True
+            })
+        if changes["timeout_changed"]:
+            recommendations.append({
+                "type": "timeout_policy",
+                "priority": "medium",
+                "description": "느린 시도를 끊고 재시도하도록 노드별 타임아웃 조정",
+                "implementation": f"optimized_workflow의 timeout_ms에 적용됨 ({changes['timeout_changed']}개 노드)",
+                "estimated_improvement": effect,
+                "applied": True
+            })
+        if changes["tool_substitutions"]:
+            recommendations.append({
+                "type": "tool_substitution",
+                "priority": "medium",
+                "description": "tool_model.substitutes의 대체 도구로 교체 (" +
+                               ", ".join(f"{k} {v}개" for k, v in changes["tool_substitutions"].items()) + ")",
+                "implementation": "optimized_workflow의 tool_id에 적용됨",
+                "estimated_improvement": effect,
+                "applied": True
+            })
+        return recommendations
+
+
+class _BudgetExceeded(Exception):
+    """구조 변형을 만드는 중에 시간 예산을 넘김"""
+
+
+class _BudgetedGraph(WorkflowGraph):
+    """재작성 패스가 자주 호출하는 조회에서 시간 예산을 확인하는 그래프"""
+
+    CHECK_EVERY = 16
+
+    def __init__(self, workflow: Dict[str, Any], deadline: float):
+        super().__init__(workflow)
+        self.deadline = deadline
+        self._calls = 0
+
+    def _check(self) -> None:
+        self._calls += 1
+        if self._calls % self.CHECK_EVERY == 0 and time.perf_counter() >= self.deadline:
+            raise _BudgetExceeded()
+
+    def depends_on(self, node_id: str, upstream_id: str) -> bool:
+        self._check()
+        return super().depends_on(node_id, upstream_id)
+
+    def _may_reach(self, node_id: str, target: str) -> bool:
+        self._check()
+        return True
+
+
+class _Search:
+    """구조 변형(재작성 패스 조합)과 노드 설정 유전형(genome)에 대한 파레토 지역 탐색"""
+
+    # 프론티어에 새 후보가 들어가지 못한 채 이만큼 연속으로 평가하면 수렴으로 보고 중단
+    STAGNATION_LIMIT = 1500
+
+    def __init__(self,
+                 owner: ParetoOptimizer,
+                 workflow: Dict[str, Any],
+                 model: Dict[str, Any],
+                 max_retries: int,
+                 max_frontier: int,
+                 rng: random.Random,
+                 started: float,
+                 deadline: float,
+                 structure_deadline: float):
+        self.owner = owner
+        self.optimizer = owner.optimizer
+        self.workflow = workflow
+        self.model = model
+        self.max_retries = max_retries
+        self.max_frontier = max_frontier
+        self.rng = rng
+        self.started = started
+        self.deadline = deadline
+        self.structure_deadline = structure_deadline
+        self.index = get_catalog_index()
+        self.variants: List[Dict[str, Any]] = []
+        self.archive: List[Dict[str, Any]] = []
+        self.seen: set = set()
+        self.evaluated = 0
+        self.budget_exhausted = False
+        self.abandoned_variants = 0
+        self.converged = False
+        self._spec_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._stats_cache: Dict[tuple, Tuple[float, float, float, float]] = {}
+        self.baseline: Dict[str, Any] = {}
+        self.baseline_metrics: Dict[str, Any] = {}
+        self.finalize_reserve_ms = 0.0
+        self.variant_cost = 0.0
+
+    def expired(self) -> bool:
+        if time.perf_counter() >= self.deadline:
+            self.budget_exhausted = True
+        return self.budget_exhausted
+
+    # ------------------------------------------------------------------
+    # 탐색
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        """기준 → 구조 변형 → 일괄 정책 → 파레토 지역 탐색 순으로 시간 예산 안에서 후보를 평가합니다."""
+        variant_started = time.perf_counter()
+        original = self._add_variant(WorkflowGraph(self.workflow), [], [])
+        self.variant_cost = time.perf_counter() - variant_started
+        if len(original["ids"]) < len(original["graph"].nodes):
+            cyclic = sorted(set(original["graph"].nodes) - set(original["ids"]))
+            raise ValueError(f"순환 연결이 있어 파레토 최적화를 할 수 없습니다: {', '.join(cyclic)}")
+        self.baseline = self._evaluate(0, tuple([0] * len(original["ids"])))
+        self.seen.add((0, self.baseline["genome"]))
+        self._insert(self.baseline)
+        self._reserve_finalize(original["graph"])
+        # 구조 변형을 만들기 전에 기준 변형의 일괄 재시도 정책부터 평가
+        # (시간 예산이 짧아 구조 변형에서 예산을 다 써도 기준 말고 고를 후보가 남도록)
+        for genome in self._retry_genomes(0):
+            if self.expired():
+                return
+            self._try(0, genome)
+        self._build_variants(original)
+
+        for variant_index in range(len(self.variants)):
+            for genome in self._policy_genomes(variant_index):
+                if self.expired():
+                    return
+                self._try(variant_index, genome)
+
+        stagnant = 0
+        while not self.expired():
+            parent = self.rng.choice(self.archive)
+            variant_index, genome = self._neighbor(parent)
+            if genome is None:
+                stagnant += 1
+            else:
+                stagnant = 0 if self._try(variant_index, genome, parent) else stagnant + 1
+            if stagnant >= self.STAGNATION_LIMIT:
+                self.converged = True
+                return
+
+    def _reserve_finalize(self, graph: WorkflowGraph) -> None:
+        """
+        기준 그래프의 지표와 기준 변형의 요약을 계산하고, 걸린 시간으로 선택한 변형의 결과와
+        프론티어 보고서를 만드는 시간을 어림해 탐색 마감 시각을 그만큼 앞당깁니다
+        (결과 생성까지 전체 시간 예산 안에 끝나도록).
+        """
+        measure_started = time.perf_counter()
+        self.baseline_metrics = self.optimizer._measure(graph)
+        summary_started = time.perf_counter()
+        self.summarize_changes(self.baseline)
+        now = time.perf_counter()
+        estimate = max((summary_started - measure_started) * FINALIZE_COST_FACTOR
+                       + (now - summary_started) * FINALIZE_SUMMARY_FACTOR * self.max_frontier,
+                       (self.deadline - self.started) * FINALIZE_MIN_SHARE)
+        reserve = min(estimate, max(self.deadline - now, 0.0) * FINALIZE_MAX_SHARE)
+        self.deadline -= reserve
+        self.structure_deadline = min(self.structure_deadline, self.deadline)
+        self.finalize_reserve_ms = reserve * 1000
+
+    def _build_variants(self, original: Dict[str, Any]) -> None:
+        """
+        재작성 패스 조합마다 구조 변형을 만듭니다.
+
+        패스 순서(OPTIMIZATION_PASSES["speed"])를 지키는 부분 집합을 깊이 우선으로 방문하며
+        앞 조합의 결과 그래프를 복사해 패스 하나만 더 적용하므로 조합마다 패스를 한 번씩만 실행하고,
+        패스를 모두 적용한 변형도 일찍 만들어집니다. 구조 변형에 배정한 시간 예산을 넘기면 실행 중인 패스도
+        중단하고 남은 조합은 건너뜁니다 (abandoned_variants).
+        """
+        from .workflow_optimizer import OPTIMIZATION_PASSES
+
+        names = list(OPTIMIZATION_PASSES["speed"])
+        signatures = {self._signature(original["graph"])}
+        # (추가할 패스 위치, 앞 조합의 패스 목록, 그래프, 패스 보고서)
+        stack = [(position, [], original["graph"], []) for position in range(len(names) - 1, -1, -1)]
+        while stack:
+            position, applied, parent, parent_reports = stack.pop()
+            if time.perf_counter() >= self.structure_deadline:
+                self.abandoned_variants += 1
+                continue
+            graph = _BudgetedGraph({"nodes": parent.to_nodes(), "connections": parent.to_connections()},
+                                   self.structure_deadline)
+            try:
+                reports = parent_reports + [self._run_pass(graph, names[position])]
+            except _BudgetExceeded:
+                self.abandoned_variants += 1
+                continue
+            subset = applied + [names[position]]
+            stack.extend((following, subset, graph, reports)
+                         for following in range(len(names) - 1, position, -1))
+            signature = self._signature(graph)
+            if signature not in signatures:
+                signatures.add(signature)
+                # 노드 선택지 계산은 중간에 멈출 수 없으므로 기준 변형에서 잰 시간으로 예산 안에 끝날지 판단
+                if time.perf_counter() + self.variant_cost >= self.structure_deadline:
+                    self.abandoned_variants += 1
+                    continue
+                variant = self._add_variant(graph, subset, reports)
+                self._try(len(self.variants) - 1, tuple([0] * len(variant["ids"])))
+
+    def _run_pass(self, graph: WorkflowGraph, name: str) -> Dict[str, Any]:
+        """WorkflowOptimizer.optimize()와 같은 방식으로 패스 하나를 적용하고 보고서를 만듭니다."""
+        pass_before = self.optimizer._measure(graph)
+        changes = getattr(self.optimizer, self.optimizer.PASSES[name])(graph)
+        pass_after = self.optimizer._measure(graph)
+        return {
+            "name": name,
+            "applied": bool(changes),
+            "changes": changes,
+            "critical_path_before_ms": pass_before["makespan_ms"],
+            "critical_path_after_ms": pass_after["makespan_ms"],
+            "improvement_ms": pass_before["makespan_ms"] - pass_after["makespan_ms"]
+        }
+
+    def _signature(self, graph: WorkflowGraph) -> tuple:
+        return (tuple(sorted(graph.nodes)),
+                tuple(sorted((edge["from_node"], edge["to_node"]) for edge in graph.edges())))
+
+    def _try(self, variant_index: int, genome: tuple, parent: Optional[Dict[str, Any]] = None) -> bool:
+        """처음 보는 후보를 평가해 프론티어에 넣고, 들어갔으면 True를 반환합니다."""
+        key = (variant_index, genome)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return self._insert(self._evaluate(variant_index, genome, parent))
+
+    def _policy_genomes(self, variant_index: int) -> Iterator[tuple]:
+        """
+        모든 처리 노드에 같은 재시도/타임아웃/도구 선택 정책을 적용한 유전형을 차례로 만듭니다
+        (큰 워크플로우는 유전형 하나를 만드는 데도 시간이 걸리므로 평가할 때마다 하나씩).
+        """
+        variant = self.variants[variant_index]
+        tool_policies = ["keep"]
+        if any(len(tools) > 1 for tools in variant["tools"]):
+            tool_policies += ["cheapest", "fastest", "reliable"]
+        yield tuple([0] * len(variant["ids"]))
+        for tool_policy in tool_policies:
+            for retry in range(self.max_retries + 1):
+                for level in ("original",) + TIMEOUT_FACTORS:
+                    genome = []
+                    for i, tools in enumerate(variant["tools"]):
+                        if not tools:
+                            genome.append(0)
+                            continue
+                        tool_id = self._pick_tool(variant, i, tool_policy)
+                        genome.append(self._option(variant, i, tool_id, retry, level))
+                    yield tuple(genome)
+
+    def _retry_genomes(self, variant_index: int) -> List[tuple]:
+        """원래 도구와 타임아웃을 유지하고 모든 처리 노드의 재시도 횟수만 1~max_retries로 맞춘 유전형 목록"""
+        variant = self.variants[variant_index]
+        return [tuple(self._option(variant, i, tools[0], retry, "original") if tools else 0
+                      for i, tools in enumerate(variant["tools"]))
+                for retry in range(1, self.max_retries + 1)]
+
+    def _pick_tool(self, variant: Dict[str, Any], i: int, policy: str) -> str:
+        tools = variant["tools"][i]
+        if policy == "keep":
+            return tools[0]
+        specs = variant["specs"][i]
+        field = {"cheapest": "cost_per_call", "fastest": "median_ms", "reliable": "failure_probability"}[policy]
+        return min(tools, key=lambda tool_id: (specs[tool_id][field], tools.index(tool_id)))
+
+    def _option(self, variant: Dict[str, Any], i: int, tool_id: str, retry: int, level: Any) -> int:
+        """(도구, 재시도 횟수, 타임아웃 수준)에 해당하는 노드 선택지 번호 (없으면 가장 가까운 선택지)"""
+        lookup = variant["lookup"][i]
+        timeout = self._timeout(variant, i, tool_id, level)
+        option = lookup.get((tool_id, retry, timeout))
+        if option is None:
+            option = lookup.get((tool_id, retry, self._timeout(variant, i, tool_id, "original")), 0)
+        return option
+
+    def _timeout(self, variant: Dict[str, Any], i: int, tool_id: str, level: Any) -> Optional[float]:
+        """타임아웃 수준("original"이면 노드의 원래 값, 대체 도구는 없음; 숫자면 중앙값의 배수)의 ms 값"""
+        if level == "original":
+            original = variant["options"][i][0]
+            return original[2] if tool_id == original[0] else None
+        return float(round(variant["specs"][i][tool_id]["median_ms"] * level))
+
+    def _neighbor(self, parent: Dict[str, Any]) -> Tuple[int, Optional[tuple]]:
+        """부모 후보에서 노드 하나 또는 임계 경로 노드 묶음의 설정을 바꾼 이웃을 만듭니다."""
+        variant_index = parent["variant"]
+        variant = self.variants[variant_index]
+        genome = list(parent["genome"])
+        process = variant["process"]
+        if not process:
+            return variant_index, None
+        critical = parent["critical"] or process
+        move = self.rng.random()
+
+        if move < 0.05 and len(self.variants) > 1:
+            # 다른 구조 변형으로 같은 노드 설정을 옮김
+            target_index = self.rng.choice([i for i in range(len(self.variants)) if i != variant_index])
+            return target_index, self._transfer(variant, parent["genome"], self.variants[target_index])
+
+        if move < 0.55:
+            pool = critical if self.rng.random() < 0.7 else process
+            i = self.rng.choice(pool)
+            choices = len(variant["options"][i])
+            if choices < 2:
+                return variant_index, None
+            option = self.rng.randrange(choices - 1)
+            genome[i] = option if option < genome[i] else option + 1
+            return variant_index, tuple(genome)
+
+        # 임계 경로(또는 무작위 절반)의 노드 재시도/타임아웃을 한꺼번에 조정
+        pool = critical if self.rng.random() < 0.6 else self.rng.sample(process, max(1, len(process) // 2))
+        if move < 0.8:
+            step = self.rng.choice((-1, 1))
+            for i in pool:
+                tool_id, retry, timeout = variant["options"][i][genome[i]]
+                retry = min(max(retry + step, 0), self.max_retries)
+                genome[i] = variant["lookup"][i].get((tool_id, retry, timeout), genome[i])
+        else:
+            level = self.rng.choice(("original",) + TIMEOUT_FACTORS)
+            for i in pool:
+                tool_id, retry, _ = variant["options"][i][genome[i]]
+                genome[i] = self._option(variant, i, tool_id, retry, level)
+        return variant_index, tuple(genome)
+
+    def _transfer(self, source: Dict[str, Any], genome: tuple, target: Dict[str, Any]) -> tuple:
+        """노드 id가 같은 노드의 설정을 다른 구조 변형의 유전형으로 옮깁니다."""
+        configs = {source["ids"][i]: source["options"][i][option]
+                   for i, option in enumerate(genome) if source["options"][i][option] is not None}
+        transferred = []
+        for i, node_id in enumerate(target["ids"]):
+            config = configs.get(node_id)
+            transferred.append(target["lookup"][i].get(config, 0) if config is not None else 0)
+        return tuple(transferred)
+
+    # ------------------------------------------------------------------
+    # 구조 변형과 노드 선택지
+    # ------------------------------------------------------------------
+
+    def _add_variant(self,
+                     graph: WorkflowGraph,
+                     passes: List[str],
+                     pass_reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """그래프를 위상 순서의 번호 배열로 바꾸고 노드별 설정 선택지와 점수를 미리 계산합니다."""
+        ids = graph.topological_order()
+        position = {node_id: i for i, node_id in enumerate(ids)}
+        variant = {
+            "passes": passes,
+            "pass_reports": pass_reports,
+            "graph": graph,
+            "ids": ids,
+            "preds": [[position[p] for p in graph.in_edges[node_id] if p in position] for node_id in ids],
+            "sinks": [i for i, node_id in enumerate(ids) if not graph.out_edges[node_id]],
+            "process": [i for i, node_id in enumerate(ids) if graph.is_process(node_id)],
+            "tools": [], "specs": [], "options": [], "lookup": [], "stats": []
+        }
+        for node_id in ids:
+            self._add_node_options(variant, graph.nodes[node_id])
+        self.variants.append(variant)
+        return variant
+
+    def _add_node_options(self, variant: Dict[str, Any], node: Dict[str, Any]) -> None:
+        if node.get("type") != "process":
+            variant["tools"].append([])
+            variant["specs"].append({})
+            variant["options"].append([None])
+            variant["lookup"].append({})
+            variant["stats"].append([(0.0, 0.0, 1.0, 0.0)])
+            return
+
+        original_tool = node.get("tool_id")
+        tools = [original_tool] + [tool_id for tool_id in self.model.get("substitutes", {}).get(original_tool, [])
+                                   if tool_id != original_tool]
+        specs = {tool_id: self._spec(tool_id, node if tool_id == original_tool else None) for tool_id in tools}
+        original = (original_tool, int(node.get("retry_count", 0) or 0),
+                    float(node["timeout_ms"]) if node.get("timeout_ms") else None)
+
+        options = [original]
+        lookup = {original: 0}
+        for tool_id in tools:
+            # 원래 타임아웃(대체 도구는 없음)과 중앙값 배수의 타임아웃
+            timeouts = [original[2] if tool_id == original_tool else None]
+            timeouts += [float(round(specs[tool_id]["median_ms"] * f)) for f in TIMEOUT_FACTORS]
+            for retry in range(self.max_retries + 1):
+                for timeout in timeouts:
+                    config = (tool_id, retry, timeout)
+                    if timeout is not None and timeout <= 0:
+                        continue
+                    if config not in lookup:
+                        lookup[config] = len(options)
+                        options.append(config)
+
+        variant["tools"].append(tools)
+        variant["specs"].append(specs)
+        variant["options"].append(options)
+        variant["lookup"].append(lookup)
+        variant["stats"].append([self._stats(specs[tool_id], retry, timeout)
+                                 for tool_id, retry, timeout in options])
+
+    def _spec(self, tool_id: str, node: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """기본값 → 카탈로그 → 모델 default → 도구별 → 노드별 순서로 도구 모델을 병합합니다."""
+        node_spec = self.model.get("nodes", {}).get(node["id"]) if node is not None else None
+        estimated = node.get("estimated_time_ms") if node is not None else None
+        key = (tool_id, node["id"] if node_spec else None, estimated)
+        cached = self._spec_cache.get(key)
+        if cached is not None:
+            return cached
+
+        spec = dict(DEFAULT_TOOL_MODEL)
+        view = self.index.get(tool_id) if tool_id else None
+        if view is not None:
+            for field in ("failure_probability", "cost_per_call", "cost_per_second"):
+                if field in view:
+                    spec[field] = view[field]
+        spec.update(self.model.get("default", {}))
+        spec.update(self.model.get("tools", {}).get(tool_id, {}))
+        if node_spec:
+            spec.update(node_spec)
+        if "median_ms" not in spec:
+            if estimated is None and view is not None:
+                estimated = view.get("estimated_time_ms")
+            spec["median_ms"] = float(estimated or 0)
+        self._spec_cache[key] = spec
+        return spec
+
+    def _stats(self, spec: Dict[str, Any], retry: int, timeout: Optional[float]) -> Tuple[float, float, float, float]:
+        key = (tuple(sorted(spec.items())), retry, timeout)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = self._stats_cache[key] = node_stats(spec, retry, timeout)
+        return stats
+
+    # ------------------------------------------------------------------
+    # 평가와 프론티어
+    # ------------------------------------------------------------------
+
+    def _evaluate(self,
+                  variant_index: int,
+                  genome: tuple,
+                  parent: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        유전형의 완료 시간 분포(Clark 근사), 기대 비용, 성공률을 계산합니다.
+
+        같은 구조 변형의 부모 후보를 주면 부모의 노드별 완료 시간에서 시작해
+        설정이 바뀐 노드와 완료 시간이 달라진 노드의 후속 노드만 다시 계산합니다.
+        """
+        self.evaluated += 1
+        variant = self.variants[variant_index]
+        stats = variant["stats"]
+        preds = variant["preds"]
+        count = len(genome)
+        if parent is not None and parent["variant"] == variant_index:
+            means = list(parent["finish_means"])
+            variances = list(parent["finish_variances"])
+            critical = list(parent["critical_preds"])
+            dirty = bytearray(count)
+            start = count
+            for i, (before, after) in enumerate(zip(parent["genome"], genome)):
+                if before != after:
+                    dirty[i] = 1
+                    start = min(start, i)
+        else:
+            means = [0.0] * count
+            variances = [0.0] * count
+            critical = [-1] * count
+            dirty = bytearray(b"\x01" * count)
+            start = 0
+
+        for i in range(start, count):
+            node_preds = preds[i]
+            if not dirty[i] and not any(dirty[p] for p in node_preds):
+                continue
+            mean, var = stats[i][genome[i]][:2]
+            if node_preds:
+                best = node_preds[0]
+                start_mean, start_var = means[best], variances[best]
+                for p in node_preds[1:]:
+                    if means[p] > means[best]:
+                        best = p
+                    start_mean, start_var = _clark_max(start_mean, start_var, means[p], variances[p])
+                mean += start_mean
+                var += start_var
+                critical[i] = best
+            if mean != means[i] or var != variances[i]:
+                dirty[i] = 1
+                means[i] = mean
+                variances[i] = var
+
+        cost = 0.0
+        success = 1.0
+        for i, option in enumerate(genome):
+            _, _, node_success, node_cost = stats[i][option]
+            cost += node_cost
+            success *= node_success
+
+        sinks = variant["sinks"]
+        end = sinks[0]
+        makespan_mean, makespan_var = means[end], variances[end]
+        for i in sinks[1:]:
+            if means[i] > means[end]:
+                end = i
+            makespan_mean, makespan_var = _clark_max(makespan_mean, makespan_var, means[i], variances[i])
+
+        path = []
+        while end >= 0:
+            if variant["options"][end][0] is not None:
+                path.append(end)
+            end = critical[end]
+
+        sd = math.sqrt(makespan_var)
+        scores = {
+            "p50_ms": round(makespan_mean + _Z50 * sd, 3),
+            "p95_ms": round(makespan_mean + _Z95 * sd, 3),
+            "p99_ms": round(makespan_mean + _Z99 * sd, 3),
+            "mean_ms": round(makespan_mean, 3),
+            "expected_cost": round(cost, 6),
+            "success_rate": round(success, 9),
+            "failure_rate": round(1.0 - success, 9),
+            "tool_invocations": len(variant["process"])
+        }
+        return {
+            "variant": variant_index,
+            "genome": genome,
+            "scores": scores,
+            "objectives": tuple(scores[metric] for metric in OBJECTIVES),
+            "critical": path[::-1],
+            "change_count": len(variant["passes"]) + sum(1 for option in genome if option),
+            "finish_means": means,
+            "finish_variances": variances,
+            "critical_preds": critical
+        }
+
+    def _insert(self, entry: Dict[str, Any]) -> bool:
+        """지배되지 않는 후보면 프론티어에 넣고 그 후보가 지배하는 기존 후보를 제거합니다."""
+        objectives = entry["objectives"]
+        for other in self.archive:
+            bound = other["objectives"]
+            if all(a <= b for a, b in zip(bound, objectives)):
+                # 목표 값이 같으면 변경이 적은 후보를 유지
+                if bound != objectives or other["change_count"] <= entry["change_count"]:
+                    return False
+        self.archive = [other for other in self.archive
+                        if not all(a <= b for a, b in zip(objectives, other["objectives"]))]
+        self.archive.append(entry)
+        if len(self.archive) > self.max_frontier:
+            self._prune()
+        return any(other is entry for other in self.archive)
+
+    def _prune(self) -> None:
+        """crowding distance가 가장 작은 (이웃과 가장 가까운) 후보를 제거합니다."""
+        distance = {id(entry): 0.0 for entry in self.archive}
+        for k in range(len(OBJECTIVES)):
+            ordered = sorted(self.archive, key=lambda entry: entry["objectives"][k])
+            low, high = ordered[0]["objectives"][k], ordered[-1]["objectives"][k]
+            distance[id(ordered[0])] = distance[id(ordered[-1])] = math.inf
+            if high <= low:
+                continue
+            for previous, entry, following in zip(ordered, ordered[1:], ordered[2:]):
+                distance[id(entry)] += (following["objectives"][k] - previous["objectives"][k]) / (high - low)
+        self.archive.remove(min(self.archive, key=lambda entry: distance[id(entry)]))
+
+    # ------------------------------------------------------------------
+    # 결과 구성
+    # ------------------------------------------------------------------
+
+    def apply_genome(self, variant: Dict[str, Any], genome: tuple) -> WorkflowGraph:
+        """구조 변형 그래프의 복사본에 노드 설정(도구, 재시도, 타임아웃)을 적용합니다."""
+        source = variant["graph"]
+        graph = WorkflowGraph({"nodes": source.to_nodes(), "connections": source.to_connections()})
+        for i, option in enumerate(genome):
+            if not option:
+                continue
+            node = graph.nodes[variant["ids"][i]]
+            tool_id, retry, timeout = variant["options"][i][option]
+            if tool_id != node.get("tool_id"):
+                view = self.index.get(tool_id)
+                node["tool_id"] = tool_id
+                if view is not None:
+                    node["name"] = view["name"]
+                node["estimated_time_ms"] = variant["specs"][i][tool_id]["median_ms"]
+            if retry or "retry_count" in node:
+                node["retry_count"] = retry
+            if timeout is None:
+                node.pop("timeout_ms", None)
+            else:
+                node["timeout_ms"] = timeout
+        return graph
+
+    def node_changes(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """원래 노드 설정과 달라진 노드 목록"""
+        variant = self.variants[entry["variant"]]
+        changes = []
+        for i, option in enumerate(entry["genome"]):
+            if not option:
+                continue
+            (tool_before, retry_before, timeout_before), (tool_id, retry, timeout) = \
+                variant["options"][i][0], variant["options"][i][option]
+            change: Dict[str, Any] = {"node_id": variant["ids"][i]}
+            if tool_id != tool_before:
+                change["tool_id"] = [tool_before, tool_id]
+            if retry != retry_before:
+                change["retry_count"] = [retry_before, retry]
+            if timeout != timeout_before:
+                change["timeout_ms"] = [timeout_before, timeout]
+            changes.append(change)
+        return changes
+
+    def summarize_changes(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """변형의 노드 설정 변경을 개수와 분포로 요약합니다."""
+        variant = self.variants[entry["variant"]]
+        retry_counts: Dict[str, int] = {}
+        substitutions: Dict[str, int] = {}
+        retry_changed = timeout_changed = 0
+        for i in variant["process"]:
+            original = variant["options"][i][0]
+            tool_id, retry, timeout = variant["options"][i][entry["genome"][i]]
+            retry_counts[str(retry)] = retry_counts.get(str(retry), 0) + 1
+            retry_changed += retry != original[1]
+            timeout_changed += timeout != original[2]
+            if tool_id != original[0]:
+                name = f"{original[0]}→{tool_id}"
+                substitutions[name] = substitutions.get(name, 0) + 1
+        return {
+            "changed_nodes": sum(1 for option in entry["genome"] if option),
+            "retry_count": dict(sorted(retry_counts.items())),
+            "retry_changed": retry_changed,
+            "timeout_changed": timeout_changed,
+            "tool_substitutions": substitutions
+        }
+
+    def simulate(self, entry: Dict[str, Any], trials: int, seed: int) -> Dict[str, Any]:
+        """후보 변형을 WorkflowSimulator로 몬테카를로 시뮬레이션해 해석적 점수를 확인합니다."""
+        from .workflow_simulator import WorkflowSimulator
+
+        variant = self.variants[entry["variant"]]
+        graph = self.apply_genome(variant, entry["genome"])
+        latency_model: Dict[str, Any] = {"nodes": {}}
+        for i in variant["process"]:
+            tool_id = variant["options"][i][entry["genome"][i]][0]
+            spec = variant["specs"][i][tool_id]
+            latency_model["nodes"][variant["ids"][i]] = {
+                "median_ms": spec["median_ms"],
+                "sigma": spec["sigma"],
+                "failure_probability": spec["failure_probability"],
+                "retry_backoff_ms": spec["retry_backoff_ms"]
+            }
+        result = WorkflowSimulator().simulate(
+            {"nodes": graph.to_nodes(), "connections": graph.to_connections()},
+            trials=trials, latency_model=latency_model, seed=seed
+        )
+        return {
+            "trials": trials,
+            "p50_ms": result["makespan_ms"]["p50"],
+            "p95_ms": result["makespan_ms"]["p95"],
+            "p99_ms": result["makespan_ms"]["p99"],
+            "success_rate": result["success_rate"]
+        }
@@ -0,0 +1,192 @@
+# src/services/pattern_matcher.py
+"""
+워크플로우 템플릿 매칭
+WORKFLOW_PATTERNS의 required_capabilities를 비트마스크로 인코딩해
+분석 결과의 기능 집합과 모든 템플릿의 Jaccard 유사도/충족률을 한 번에 계산합니다.
+교집합 크기 popcount(a & p)는 비트를 0/1 벡터로 펼친 행렬 곱으로 모든 쌍을 한 번에 구합니다.
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+# 기능 64개마다 uint64 한 워드
+WORD_BITS = 64
+
+
+class PatternMatcher:
+    """워크플로우 템플릿의 필요 기능을 비트마스크로 보관하고 기능 집합과 비교하는 클래스"""
+
+    def __init__(self, patterns: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            patterns: {템플릿 id: 템플릿 정의} (WORKFLOW_PATTERNS 형식)
+        """
+        self.patterns = patterns
+        self.pattern_ids: List[str] = list(patterns)
+
+        # 템플릿에 나오는 기능만 비트를 배정 (그 밖의 기능은 교집합에 들어갈 수 없으므로 개수만 셈)
+        self.bits: Dict[str, int] = {}
+        for spec in patterns.values():
+            for capability in spec.get("required_capabilities", []):
+                self.bits.setdefault(capability, len(self.bits))
+        self.words = max(1, -(-len(self.bits) // WORD_BITS))
+
+        self.masks, self.sizes = self.encode_many(
+            spec.get("required_capabilities", []) for spec in patterns.values()
+        )
+        # 행렬 곱용 템플릿 비트 행렬 (기능 수 × 템플릿 수)와 충족률 계산용 1/필요 기능 수
+        self.bit_matrix = np.ascontiguousarray(self.unpack(self.masks).T)
+        self.pattern_sizes = self.sizes.astype(np.float32)
+        self.inverse_sizes = np.where(self.sizes > 0, 1.0 / np.maximum(self.sizes, 1), 0.0).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.pattern_ids)
+
+    def encode(self, capabilities: Iterable[str]) -> Tuple[np.ndarray, int]:
+        """
+        기능 목록을 (비트마스크 워드 배열, 중복 제거한 기능 수)로 인코딩합니다.
+        템플릿에 없는 기능은 비트 없이 기능 수에만 포함됩니다.
+        """
+        masks, sizes = self.encode_many([capabilities])
+        return masks[0], int(sizes[0])
+
+    def encode_many(self, capability_lists: Iterable[Iterable[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 기능 목록을 (N × 워드 수 마스크 행렬, N개 기능 수)로 인코딩합니다."""
+        bits = self.bits
+        values: List[int] = []
+        sizes: List[int] = []
+        # 파이썬 정수로 비트를 모은 뒤 워드 단위로 한 번에 나눔 (행마다 배열을 만들지 않음)
+        for capabilities in capability_lists:
+            unique = set(capabilities)
+            value = 0
+            for capability in unique:
+                bit = bits.get(capability)
+                if bit is not None:
+                    value |= 1 << bit
+            values.append(value)
+            sizes.append(len(unique))
+
+        word_mask = (1 << WORD_BITS) - 1
+        masks = np.empty((len(values), self.words), dtype=np.uint64)
+        for word in range(self.words):
+            shift = word * WORD_BITS
+            masks[:, word] = np.fromiter(((value >> shift) & word_mask for value in values),
+                                         dtype=np.uint64, count=len(values))
+        return masks, np.asarray(sizes, dtype=np.int64)
+
+    def unpack(self, masks: np.ndarray) -> np.ndarray:
+        """비트마스크 행렬을 0/1 float32 행렬(N × 기능 수)로 펼칩니다."""
+        as_bytes = np.ascontiguousarray(masks, dtype="<u8").view(np.uint8)
+        bits = np.unpackbits(as_bytes, axis=1, count=len(self.bits), bitorder="little")
+        return bits.astype(np.float32)
+
+    def score_masks(self, masks: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        기능 집합들과 모든 템플릿의 점수 행렬을 계산합니다.
+
+        Args:
+            masks: N × 워드 수 비트마스크
+            sizes: N개 기능 집합 크기
+
+        Returns:
+            (Jaccard 유사도 N × 템플릿 수, 템플릿 필요 기능 충족률 N × 템플릿 수)
+        """
+        intersection = self.unpack(masks) @ self.bit_matrix
+        # 큰 행렬을 여러 번 새로 만들지 않도록 제자리 연산
+        jaccard = np.add(sizes.astype(np.float32)[:, None], self.pattern_sizes[None, :])
+        jaccard -= intersection
+        # 합집합이 0이면 교집합도 0이므로 분모만 1로 바꿔 0을 만듦
+        np.maximum(jaccard, 1.0, out=jaccard)
+        np.divide(intersection, jaccard, out=jaccard)
+        coverage = np.multiply(intersection, self.inverse_sizes[None, :], out=intersection)
+        return jaccard, coverage
+
+    def best_many(self,
+                  masks: np.ndarray,
+                  sizes: np.ndarray,
+                  chunk_cells: int = 1 << 22) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        기능 집합마다 가장 잘 맞는 템플릿을 찾습니다.
+        같은 기능 집합은 한 번만 계산하고, 점수 행렬이 chunk_cells 칸을 넘지 않도록 나눠 계산합니다.
+
+        Returns:
+            (템플릿 번호, Jaccard 유사도, 충족률) 배열 (각 N개)
+        """
+        count = masks.shape[0]
+        if count == 0 or not self.pattern_ids:
+            return np.full(count, -1, dtype=np.int64), np.zeros(count), np.zeros(count)
+
+        keys = np.concatenate([masks, sizes.astype(np.uint64)[:, None]], axis=1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        unique_masks = np.ascontiguousarray(unique_keys[:, :-1])
+        unique_sizes = unique_keys[:, -1].astype(np.int64)
+
+        best = np.empty(len(unique_keys), dtype=np.int64)
+        best_jaccard = np.empty(len(unique_keys))
+        best_coverage = np.empty(len(unique_keys))
+        step = max(1, chunk_cells // len(self.pattern_ids))
+        for start in range(0, len(unique_keys), step):
+            end = start + step
+            jaccard, coverage = self.score_masks(unique_masks[start:end], unique_sizes[start:end])
+            # Jaccard 우선, 같으면 충족률이 높은 템플릿 (충족률 가중치는 Jaccard 값 차이보다 작음)
+            key = coverage * 1e-6
+            key += jaccard
+            chosen = np.argmax(key, axis=1)
+            rows = np.arange(len(chosen))
+            best[start:end] = chosen
+            best_jaccard[start:end] = jaccard[rows, chosen]
+            best_coverage[start:end] = coverage[rows, chosen]
+        return best[inverse], best_jaccard[inverse], best_coverage[inverse]
+
+    def match(self,
+              capabilities: List[str],
+              top_k: int = 3,
+              min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        기능 목록과 잘 맞는 템플릿을 점수 순으로 반환합니다.
+
+        Args:
+            capabilities: 분석 결과의 필요 기능 목록
+            top_k: 반환할 템플릿 수
+            min_score: 최소 Jaccard 유사도 (0보다 큰 점수만 반환)
+
+        Returns:
+            템플릿 정보와 score(Jaccard), coverage, 일치/부족 기능 목록
+        """
+        if not self.pattern_ids or top_k <= 0:
+            return []
+        mask, size = self.encode(capabilities)
+        jaccard, coverage = self.score_masks(mask[None, :], np.asarray([size], dtype=np.int64))
+        jaccard, coverage = jaccard[0], coverage[0]
+        # 정렬 우선순위: Jaccard, 충족률, 템플릿 정의 순서
+        order = np.lexsort((np.arange(len(jaccard)), -coverage, -jaccard))
+
+        present = set(capabilities)
+        matches = []
+        for position in order[:top_k]:
+            score = float(jaccard[position])
+            if score <= 0 or score < min_score:
+                break
+            pattern_id = self.pattern_ids[position]
+            spec = self.patterns[pattern_id]
+            required = spec.get("required_capabilities", [])
+            matches.append({
+                "id": pattern_id,
+                "name": spec.get("name", pattern_id),
+                "description": spec.get("description", ""),
+                "recommended_flow": spec.get("recommended_flow"),
+                "score": round(score, 4),
+                "coverage": round(float(coverage[position]), 4),
+                "matched_capabilities": [c for c in required if c in present],
+                "missing_capabilities": [c for c in required if c not in present],
+                "typical_nodes": spec.get("typical_nodes"),
+                "estimated_time_ms": spec.get("estimated_time_ms")
+            })
+        return matches
+
+    def best(self, capabilities: List[str], min_score: float = 0.0) -> Optional[Dict[str, Any]]:
+        """가장 잘 맞는 템플릿 하나 (min_score 미만이면 None)"""
+        matches = self.match(capabilities, top_k=1, min_score=min_score)
+        return matches[0] if matches else None
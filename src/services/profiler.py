@@ -0,0 +1,239 @@
+# src/services/profiler.py
+"""
+도구 호출 프로파일링
+설정한 도구 또는 profile 플래그를 켠 호출을 cProfile/tracemalloc으로 측정하고,
+가장 느린 N개 호출의 프로파일 덤프(.prof)와 요약(상위 함수, 메모리 최대 사용량)을 보관합니다.
+"""
+
+import cProfile
+import heapq
+import itertools
+import marshal
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+# tracemalloc은 프로세스 전역이므로 메모리 측정 호출은 한 번에 하나씩 실행
+_memory_lock = threading.Lock()
+# Python 3.12부터 cProfile은 프로세스에 하나뿐인 sys.monitoring 프로파일러 자리를 쓰므로
+# (두 번째 enable()은 "Another profiling tool is already active") 프로파일링하는 호출도 한 번에 하나씩 실행
+_profile_lock = threading.Lock()
+
+
+def _top_functions(profile: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+    """누적 시간 기준 상위 함수 목록"""
+    stats = pstats.Stats(profile).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3)
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in ranked
+    ]
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """호출이 끝난 뒤에도 남아 있는 할당 중 크기 기준 상위 위치"""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, __file__)
+    ])
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def profile_call(trace_memory: bool,
+                 top: int,
+                 func: Callable[..., Any],
+                 *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    처리 함수를 프로파일링하며 실행하고 (결과, 프로파일 기록)을 반환합니다.
+    프로세스 풀에서도 실행할 수 있도록 모듈 수준 함수로 두며,
+    기록에는 덤프 파일로 쓸 수 있는 marshal 형식의 통계가 포함됩니다.
+    같은 프로세스의 프로파일링 호출은 한 번에 하나씩 실행하고, 다른 도구가 프로파일러를 쓰고 있으면
+    프로파일 없이 실행한 뒤 기록의 profile.skipped에 이유를 남깁니다.
+
+    Args:
+        trace_memory: tracemalloc으로 메모리 최대 사용량과 남은 할당을 측정할지 여부
+        top: 요약에 포함할 상위 함수/할당 위치 수
+        func: 실행할 처리 함수
+        *args: 처리 함수 인자
+    """
+    memory_lock = _memory_lock if trace_memory else None
+    if memory_lock is not None:
+        memory_lock.acquire()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+
+    _profile_lock.acquire()
+    profile: Optional[cProfile.Profile] = cProfile.Profile()
+    skipped = None
+    started = time.perf_counter()
+    try:
+        try:
+            profile.enable()
+        except ValueError as e:
+            # 다른 프로파일링 도구(디버거, 프로세스 전체 프로파일러 등)가 사용 중이면 프로파일 없이 실행
+            profile, skipped = None, str(e)
+        try:
+            result = func(*args)
+        finally:
+            if profile is not None:
+                profile.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        record: Dict[str, Any] = {
+            "elapsed_ms": round(elapsed_ms, 3),
+            "pid": os.getpid()
+        }
+        if profile is not None:
+            record["top_functions"] = _top_functions(profile, top)
+        else:
+            record["profile"] = {"skipped": skipped}
+        if memory_lock is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            record["memory"] = {
+                "peak_kb": round(max(peak - memory_before, 0) / 1024, 1),
+                "top_allocations": _top_allocations(tracemalloc.take_snapshot(), top)
+            }
+    finally:
+        _profile_lock.release()
+        if memory_lock is not None:
+            if started_tracing:
+                tracemalloc.stop()
+            memory_lock.release()
+
+    if profile is not None:
+        profile.create_stats()
+        record["stats"] = marshal.dumps(profile.stats)
+    return result, record
+
+
+class ToolProfiler:
+    """프로파일링 대상 판단과 가장 느린 호출의 덤프/요약 보관"""
+
+    def __init__(self,
+                 dump_dir: str,
+                 keep_slowest: int = 10,
+                 tools: Iterable[str] = (),
+                 allow_requests: bool = False,
+                 trace_memory: bool = False,
+                 top: int = 20):
+        """
+        Args:
+            dump_dir: 프로파일 덤프(.prof)를 저장할 디렉터리
+            keep_slowest: 보관할 가장 느린 호출 수 (0이면 덤프/요약을 남기지 않음)
+            tools: 항상 프로파일링할 도구 이름 ("all"이면 모든 도구)
+            allow_requests: 호출별 profile 플래그 허용 여부
+            trace_memory: tracemalloc 측정 여부 (측정 중인 호출은 한 번에 하나씩 실행)
+            top: 요약에 포함할 상위 함수/할당 위치 수
+        """
+        self.dump_dir = dump_dir
+        self.keep_slowest = max(keep_slowest, 0)
+        self.tools = set(tools)
+        self.allow_requests = allow_requests
+        self.trace_memory = trace_memory
+        self.top = top
+        self.profiled_calls = 0
+        self.skipped_calls = 0
+        # (elapsed_ms, 순번, 요약)의 최소 힙: 가장 빠른 호출이 먼저 밀려남
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def should_profile(self, tool_name: str, requested: bool = False) -> bool:
+        """환경 설정 또는 호출 플래그에 따라 이번 호출을 프로파일링할지 결정합니다."""
+        if requested and self.allow_requests:
+            return True
+        return "all" in self.tools or tool_name in self.tools
+
+    def add(self, tool_name: str, record: Dict[str, Any]) -> Optional[str]:
+        """
+        프로파일 기록을 추가합니다.
+        가장 느린 N개에 들면 덤프를 저장하고, 밀려난 호출의 덤프는 삭제합니다.
+
+        Returns:
+            저장한 덤프 경로 (보관 대상이 아니면 None)
+        """
+        record = dict(record)
+        stats = record.pop("stats", None)
+        elapsed_ms = record["elapsed_ms"]
+        with self._lock:
+            self.profiled_calls += 1
+            if stats is None:
+                # 다른 프로파일링 도구 때문에 프로파일 없이 실행한 호출
+                self.skipped_calls += 1
+                return None
+            if self.keep_slowest == 0:
+                return None
+            if len(self._slowest) >= self.keep_slowest and elapsed_ms <= self._slowest[0][0]:
+                return None
+
+            record["tool"] = tool_name
+            record["timestamp"] = datetime.now().isoformat()
+            record["dump_path"] = self._write_dump(tool_name, elapsed_ms, stats)
+            entry = (elapsed_ms, next(self._sequence), record)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            else:
+                _, _, evicted = heapq.heapreplace(self._slowest, entry)
+                self._remove_dump(evicted.get("dump_path"))
+            return record["dump_path"]
+
+    def _write_dump(self, tool_name: str, elapsed_ms: float, stats: bytes) -> Optional[str]:
+        """pstats.Stats로 읽을 수 있는 덤프 파일을 저장합니다."""
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", tool_name)
+            filename = f"{safe_name}-{datetime.now():%Y%m%d-%H%M%S-%f}-{elapsed_ms:.0f}ms.prof"
+            path = os.path.join(self.dump_dir, filename)
+            with open(path, "wb") as file:
+                file.write(stats)
+            return path
+        except OSError:
+            # 덤프를 쓰지 못해도 요약은 보관
+            return None
+
+    def _remove_dump(self, path: Optional[str]) -> None:
+        if not path:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def summary(self) -> Dict[str, Any]:
+        """프로파일링 설정과 가장 느린 호출들의 요약 (느린 순)"""
+        with self._lock:
+            slowest = [record for _, _, record in sorted(self._slowest, reverse=True)]
+            profiled_calls = self.profiled_calls
+            skipped_calls = self.skipped_calls
+        return {
+            "tools": sorted(self.tools),
+            "allow_requests": self.allow_requests,
+            "trace_memory": self.trace_memory,
+            "dump_dir": self.dump_dir,
+            "keep_slowest": self.keep_slowest,
+            "profiled_calls": profiled_calls,
+            "skipped_calls": skipped_calls,
+            "slowest_calls": slowest
+        }
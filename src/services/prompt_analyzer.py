@@ -5,12 +5,45 @@
 """
 
 import json
-from typing import Dict, List, Any
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
 # 상대 import 수정
-from config.tools_config import AVAILABLE_TOOLS, TOOL_CATEGORIES
+from config.tools_config import get_catalog
 from config.patterns import NODE_PATTERNS
+from utils.keyword_matcher import KeywordMatcher
+from .catalog_index import get_catalog_index
+from .result_cache import ResultCache, copy_result, normalize_prompt
+from .tool_retrieval import get_tool_index
+
+# 배치 분석 기본 설정
+DEFAULT_BATCH_SIZE = 256
+
+# 워커 프로세스별 분석기 인스턴스 (프로세스마다 한 번만 생성)
+_worker_analyzer = None
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    """워커 프로세스의 분석기를 부모와 같은 도구 검색 설정으로 생성합니다."""
+    global _worker_analyzer
+    _worker_analyzer = PromptAnalyzer(**settings)
+
+
+def _analyze_batch(prompts: List[str]) -> Tuple[List[Dict[str, Any]], float]:
+    """워커 프로세스에서 프롬프트 묶음을 분석하고 소요 시간(ms)을 함께 반환합니다."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = PromptAnalyzer()
+    
+    started = time.perf_counter()
+    results = [_worker_analyzer.analyze(prompt) for prompt in prompts]
+    return results, (time.perf_counter() - started) * 1000
+
 
 class PromptAnalyzer:
     """사용자 프롬프트를 분석하는 클래스"""
@@ -27,9 +60,62 @@ class PromptAnalyzer:
         "forecast": ["예측", "예측하다", "추측", "예보", "forecast", "predict", "estimate"]
     }
     
-    def __init__(self):
-        self.tool_database = AVAILABLE_TOOLS
-        self.tool_categories = TOOL_CATEGORIES
+    # 기능(도구 카테고리)별 키워드 매핑
+    CAPABILITY_KEYWORDS = {
+        "information_retrieval": ["검색", "search", "찾다", "find", "정보", "information"],
+        "data_processing": ["분석", "analyze", "통계", "statistics", "계산", "calculate"],
+        "computation": ["코드", "code", "파이썬", "python", "실행", "execute"],
+        "data_access": ["데이터베이스", "database", "저장", "저장소", "query"],
+        "generation": ["생성", "generate", "작성", "write", "만들다", "create"]
+    }
+    
+    # 워크플로우 타입 신호 키워드 매핑
+    WORKFLOW_KEYWORDS = {
+        "parallel": ["동시에", "simultaneously", "동시", "parallel", "and"],
+        "conditional": ["만약", "if", "그러면", "조건", "경우에", "depending"],
+        "loop": ["반복", "loop", "계속", "매번", "각각", "all"]
+    }
+    
+    def __init__(self,
+                 cache: Optional[ResultCache] = None,
+                 retrieval_top_k: int = 5,
+                 retrieval_min_score: float = 0.12,
+                 retrieval_mode: str = "auto",
+                 retrieval_nprobe: int = 8):
+        """
+        Args:
+            cache: 정규화된 프롬프트를 키로 분석 결과를 보관할 캐시 (None이면 캐시 미사용)
+            retrieval_top_k: 프롬프트와 비슷한 도구를 검색 인덱스에서 찾을 개수 (0이면 키워드 방식만 사용)
+            retrieval_min_score: 검색 결과로 인정할 최소 코사인 유사도
+            retrieval_mode: 검색 방식 (auto, exact, approx)
+            retrieval_nprobe: 근사 검색에서 살펴볼 군집 수
+        """
+        self.cache = cache
+        self.retrieval_settings = {
+            "retrieval_top_k": retrieval_top_k,
+            "retrieval_min_score": retrieval_min_score,
+            "retrieval_mode": retrieval_mode,
+            "retrieval_nprobe": retrieval_nprobe
+        }
+        # 모든 키워드 테이블을 한 번만 컴파일 (의도는 토큰 단위 일치, 나머지는 부분 문자열 일치)
+        self.matcher = KeywordMatcher(
+            {
+                "intents": self.INTENT_KEYWORDS,
+                "capabilities": self.CAPABILITY_KEYWORDS,
+                "workflow": self.WORKFLOW_KEYWORDS
+            },
+            whole_token_tables=["intents"]
+        )
+    
+    @property
+    def tool_database(self) -> Dict[str, Dict[str, Any]]:
+        """현재(호출 중 고정된) 카탈로그의 도구 정의"""
+        return get_catalog().tools
+    
+    @property
+    def tool_categories(self) -> Dict[str, List[str]]:
+        """현재 카탈로그에서 파생된 카테고리별 도구 id 목록"""
+        return get_catalog().categories
     
     def analyze(self, user_prompt: str) -> Dict[str, Any]:
         """
@@ -41,6 +127,24 @@ class PromptAnalyzer:
         Returns:
             분석 결과 딕셔너리
         """
+        if self.cache is None:
+            return self._analyze(user_prompt)
+        
+        # 결과는 정규화된 프롬프트에서만 파생되므로 호출마다 달라지는 필드만 다시 기록
+        key = normalize_prompt(user_prompt)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._analyze(user_prompt)
+            self.cache.put(key, cached)
+        
+        # 캐시 항목과 중첩 객체를 공유하지 않는 사본을 반환
+        analysis = copy_result(cached)
+        analysis["timestamp"] = datetime.now().isoformat()
+        analysis["original_prompt"] = user_prompt
+        return analysis
+    
+    def _analyze(self, user_prompt: str) -> Dict[str, Any]:
+        """캐시를 거치지 않고 프롬프트를 분석합니다."""
         analysis = {
             "timestamp": datetime.now().isoformat(),
             "original_prompt": user_prompt,
@@ -56,12 +160,16 @@ class PromptAnalyzer:
             "analysis_details": {}
         }
         
-        # 프롬프트 전처리
+        # 프롬프트 전처리 (소문자 변환과 공백 정규화는 한 번만 수행)
         keywords = user_prompt.lower().split()
         prompt_length = len(keywords)
+        normalized_prompt = " ".join(keywords)
+        
+        # 모든 의도/기능/워크플로우 신호를 한 번의 스캔으로 수집
+        signals = self.matcher.scan(normalized_prompt)
         
         # 의도 감지
-        detected_intents = self._detect_intents(keywords)
+        detected_intents = self._detect_intents(signals)
         analysis["intent_analysis"]["primary_intent"] = detected_intents[0] if detected_intents else "unknown"
         analysis["intent_analysis"]["sub_intents"] = detected_intents[1:]
         analysis["intent_analysis"]["confidence"] = min(1.0, len(detected_intents) / 3)
@@ -77,19 +185,25 @@ class PromptAnalyzer:
             complexity = "low"
             analysis["intent_analysis"]["complexity_level"] = "low"
         
-        # 필요한 기능 식별
-        required_capabilities = self._identify_capabilities(keywords, user_prompt)
+        # 필요한 기능 식별 (키워드 신호 + 검색 인덱스에서 찾은 도구의 카테고리)
+        keyword_capabilities = self._identify_capabilities(signals)
+        retrieved_tools = self._retrieve_tools(user_prompt)
+        required_capabilities = keyword_capabilities + [
+            category for category in dict.fromkeys(tool["category"] for tool in retrieved_tools)
+            if category not in keyword_capabilities
+        ]
         analysis["required_capabilities"] = required_capabilities
+        analysis["retrieved_tools"] = retrieved_tools
         
         # 추천 도구 선택
-        recommended_tools = self._select_tools(required_capabilities)
+        recommended_tools = self._select_tools(keyword_capabilities, retrieved_tools)
         analysis["recommended_tools"] = recommended_tools
         
         # 워크플로우 타입 결정
         workflow_type = self._determine_workflow_type(
             len(recommended_tools),
             complexity,
-            user_prompt
+            signals
         )
         analysis["estimated_workflow_type"] = workflow_type
         
@@ -97,86 +211,190 @@ class PromptAnalyzer:
             "prompt_word_count": prompt_length,
             "detected_intent_keywords": detected_intents,
             "tool_count": len(recommended_tools),
-            "capability_count": len(required_capabilities)
+            "capability_count": len(required_capabilities),
+            "retrieved_tool_count": len(retrieved_tools),
+            "keyword_signals": signals
         }
         
         return analysis
     
-    def _detect_intents(self, keywords: List[str]) -> List[str]:
-        """키워드에서 의도를 감지합니다."""
-        detected = []
-        
-        for intent, words in self.INTENT_KEYWORDS.items():
-            if any(word in keywords for word in words):
-                detected.append(intent)
-        
-        return detected
-    
-    def _identify_capabilities(self, keywords: List[str], full_prompt: str) -> List[str]:
-        """필요한 기능을 식별합니다."""
-        capabilities = set()
-        
-        # 키워드 기반 기능 식별
-        search_keywords = ["검색", "search", "찾다", "find", "정보", "information"]
-        if any(word in full_prompt.lower() for word in search_keywords):
-            capabilities.add("information_retrieval")
-        
-        analysis_keywords = ["분석", "analyze", "통계", "statistics", "계산", "calculate"]
-        if any(word in full_prompt.lower() for word in analysis_keywords):
-            capabilities.add("data_processing")
+    def analyze_many(self,
+                     prompts: Iterable[str],
+                     workers: Optional[int] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        여러 프롬프트를 배치 단위로 분석하여 입력 순서대로 스트리밍합니다.
         
-        code_keywords = ["코드", "code", "파이썬", "python", "실행", "execute"]
-        if any(word in full_prompt.lower() for word in code_keywords):
-            capabilities.add("computation")
+        Args:
+            prompts: 분석할 프롬프트 이터러블 (지연 소비됨)
+            workers: 프로세스 풀 크기 (None이면 ANALYZER_BATCH_WORKERS 또는 CPU 수,
+                1 이하이면 현재 프로세스에서 순차 처리)
+            batch_size: 워커에 한 번에 전달할 프롬프트 수
+            
+        Yields:
+            배치 결과 딕셔너리 (batch_index, start, count, results, 처리량 정보)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size는 1 이상이어야 합니다")
+        if workers is None:
+            workers = int(os.getenv("ANALYZER_BATCH_WORKERS", "0")) or os.cpu_count() or 1
         
-        database_keywords = ["데이터베이스", "database", "저장", "저장소", "query"]
-        if any(word in full_prompt.lower() for word in database_keywords):
-            capabilities.add("data_access")
+        batches = self._iter_batches(prompts, batch_size)
         
-        generate_keywords = ["생성", "generate", "작성", "write", "만들다", "create"]
-        if any(word in full_prompt.lower() for word in generate_keywords):
-            capabilities.add("generation")
+        if workers <= 1:
+            for batch_index, start, batch in batches:
+                started = time.perf_counter()
+                results = [self.analyze(prompt) for prompt in batch]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                yield self._batch_result(batch_index, start, results, elapsed_ms, elapsed_ms)
+            return
         
-        return list(capabilities)
+        # 진행 중인 배치 수를 제한하여 대용량 입력에서도 메모리 사용량을 일정하게 유지
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.retrieval_settings,)) as executor:
+            pending = deque()
+            last_yield = time.perf_counter()
+            
+            for batch_index, start, batch in batches:
+                pending.append((batch_index, start, executor.submit(_analyze_batch, batch)))
+                if len(pending) >= max_in_flight:
+                    batch_index, start, future = pending.popleft()
+                    results, service_ms = future.result()
+                    now = time.perf_counter()
+                    yield self._batch_result(batch_index, start, results, service_ms, (now - last_yield) * 1000)
+                    last_yield = time.perf_counter()
+            
+            while pending:
+                batch_index, start, future = pending.popleft()
+                results, service_ms = future.result()
+                now = time.perf_counter()
+                yield self._batch_result(batch_index, start, results, service_ms, (now - last_yield) * 1000)
+                last_yield = time.perf_counter()
+    
+    def _iter_batches(self,
+                      prompts: Iterable[str],
+                      batch_size: int) -> Iterator[Tuple[int, int, List[str]]]:
+        """프롬프트를 (배치 번호, 시작 인덱스, 배치) 묶음으로 나눕니다."""
+        iterator = iter(prompts)
+        batch_index = 0
+        start = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            for offset, prompt in enumerate(batch):
+                if not isinstance(prompt, str):
+                    raise TypeError(f"프롬프트는 문자열이어야 합니다 (index {start + offset})")
+            yield batch_index, start, batch
+            batch_index += 1
+            start += len(batch)
+    
+    def _batch_result(self,
+                      batch_index: int,
+                      start: int,
+                      results: List[Dict[str, Any]],
+                      service_ms: float,
+                      wall_ms: float) -> Dict[str, Any]:
+        """배치 결과와 처리량 지표를 구성합니다."""
+        count = len(results)
+        return {
+            "batch_index": batch_index,
+            "start": start,
+            "count": count,
+            "results": results,
+            "service_ms": round(service_ms, 3),
+            "wall_ms": round(wall_ms, 3),
+            "prompts_per_sec": round(count / (wall_ms / 1000), 1) if wall_ms > 0 else None
+        }
+    
+    def _detect_intents(self, signals: Dict[str, Dict[str, Any]]) -> List[str]:
+        """키워드 신호에서 의도를 감지합니다."""
+        return list(signals["intents"])
+    
+    def _identify_capabilities(self, signals: Dict[str, Dict[str, Any]]) -> List[str]:
+        """필요한 기능을 식별합니다."""
+        return list(signals["capabilities"])
+    
+    def _retrieve_tools(self, query: str) -> List[Dict[str, Any]]:
+        """검색 인덱스에서 질의와 비슷한 도구를 찾습니다 (최소 유사도 이상만)."""
+        top_k = self.retrieval_settings["retrieval_top_k"]
+        if top_k <= 0:
+            return []
+        min_score = self.retrieval_settings["retrieval_min_score"]
+        catalog_index = get_catalog_index()
+        retrieved = []
+        for tool_id, score in get_tool_index().search(
+            query,
+            top_k,
+            mode=self.retrieval_settings["retrieval_mode"],
+            nprobe=self.retrieval_settings["retrieval_nprobe"]
+        ):
+            view = catalog_index.get(tool_id)
+            if score < min_score or view is None:
+                continue
+            retrieved.append({
+                "id": tool_id,
+                "name": view.get("name", ""),
+                "category": view.get("category", ""),
+                "score": score
+            })
+        return retrieved
     
-    def _select_tools(self, capabilities: List[str]) -> List[Dict[str, Any]]:
-        """필요한 도구를 선택합니다."""
-        selected_tools = []
+    def _select_tools(self,
+                      capabilities: List[str],
+                      retrieved_tools: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        필요한 도구를 선택합니다.
         
-        for capability in capabilities:
-            if capability in self.tool_categories:
-                tool_names = self.tool_categories[capability]
-                for tool_name in tool_names:
-                    if tool_name in self.tool_database:
-                        tool_info = self.tool_database[tool_name].copy()
-                        tool_info["id"] = tool_name
-                        selected_tools.append(tool_info)
+        키워드로 찾은 기능(카테고리)의 도구와 검색 인덱스에서 찾은 도구를 합칩니다.
+        검색을 사용할 때는 카탈로그가 커도 결과가 커지지 않도록 카테고리당
+        우선순위 상위 retrieval_top_k개만 포함합니다.
+        """
+        # 카테고리 역색인에서 읽기 전용 도구 뷰를 그대로 가져옴 (도구별 복사 없음)
+        catalog_index = get_catalog_index()
+        top_k = self.retrieval_settings["retrieval_top_k"]
+        if top_k <= 0:
+            selected_tools = catalog_index.tools_for_capabilities(capabilities)
+        else:
+            selected_tools = []
+            for capability in capabilities:
+                selected_tools.extend(catalog_index.category_views.get(capability, ())[:top_k])
+        
+        selected_ids = {tool["id"] for tool in selected_tools}
+        for tool in retrieved_tools or []:
+            if tool["id"] not in selected_ids:
+                selected_ids.add(tool["id"])
+                selected_tools.append(catalog_index.get(tool["id"]))
         
         # 우선순위로 정렬
         selected_tools.sort(key=lambda x: x.get("priority", 999))
         
         return selected_tools
     
-    def _determine_workflow_type(self, tool_count: int, complexity: str, prompt: str) -> str:
-        """워크플로우 타입을 결정합니다."""
-        
-        # 병렬 작업 키워드 감지
-        parallel_keywords = ["동시에", "simultaneously", "동시", "parallel", "and"]
-        has_parallel = any(word in prompt.lower() for word in parallel_keywords)
-        
-        # 조건부 처리 키워드 감지
-        conditional_keywords = ["만약", "if", "그러면", "조건", "경우에", "depending"]
-        has_conditional = any(word in prompt.lower() for word in conditional_keywords)
+    def select_tools(self, query: str, capabilities: List[str]) -> List[Dict[str, Any]]:
+        """
+        주어진 기능의 도구와 질의로 검색한 도구를 합쳐 반환합니다 (노드 추천용).
         
-        # 반복 처리 키워드 감지
-        loop_keywords = ["반복", "loop", "계속", "매번", "각각", "all"]
-        has_loop = any(word in prompt.lower() for word in loop_keywords)
+        Args:
+            query: 사용자 프롬프트 등 검색할 텍스트
+            capabilities: 필요한 기능(카테고리) 목록
+        """
+        return self._select_tools(capabilities, self._retrieve_tools(query))
+    
+    def _determine_workflow_type(self,
+                                 tool_count: int,
+                                 complexity: str,
+                                 signals: Dict[str, Dict[str, Any]]) -> str:
+        """워크플로우 타입을 결정합니다."""
+        workflow_signals = signals["workflow"]
         
-        if has_loop:
+        if "loop" in workflow_signals:
             return "loop"
-        elif has_conditional:
+        elif "conditional" in workflow_signals:
             return "conditional"
-        elif has_parallel and tool_count > 1:
+        elif "parallel" in workflow_signals and tool_count > 1:
             return "parallel"
         else:
             return "sequential"
@@ -0,0 +1,134 @@
+# src/services/result_cache.py
+"""
+결과 캐시 서비스
+분석/추천 결과를 크기(LRU)와 TTL 기준으로 보관합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional
+
+
+def normalize_prompt(user_prompt: str) -> str:
+    """캐시 키로 사용할 정규화된 프롬프트 (소문자 + 공백 정규화)를 반환합니다."""
+    return " ".join(user_prompt.lower().split())
+
+
+def copy_result(value: Any) -> Any:
+    """
+    캐시에 보관한 결과를 호출자가 수정해도 캐시 항목이 바뀌지 않도록 복사합니다.
+    일반 dict/list는 재귀적으로 복사하고, 문자열/숫자와 읽기 전용 도구 뷰(ToolView) 등은 공유합니다.
+    """
+    if type(value) is dict:
+        return {key: copy_result(item) for key, item in value.items()}
+    if type(value) is list:
+        return [copy_result(item) for item in value]
+    return value
+
+
+class ResultCache:
+    """스레드 안전한 LRU + TTL 결과 캐시"""
+
+    def __init__(self,
+                 name: str,
+                 maxsize: int = 1024,
+                 ttl_seconds: float = 300.0,
+                 version_source: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            name: 통계에 표시할 캐시 이름
+            maxsize: 최대 항목 수 (0이면 캐시 비활성화)
+            ttl_seconds: 항목 유효 시간 (0 이하이면 만료 없음)
+            version_source: 버전 값을 반환하는 함수. 값이 바뀌면 캐시 전체를 무효화
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.version_source = version_source
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = version_source() if version_source else None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        캐시된 값을 조회합니다.
+
+        Returns:
+            캐시된 값 (없거나 만료되었으면 None)
+        """
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """값을 캐시에 저장하고 용량을 초과하면 가장 오래 사용되지 않은 항목을 제거합니다."""
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        with self._lock:
+            self._check_version()
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _check_version(self) -> None:
+        """버전 값이 바뀌었으면 캐시를 비웁니다 (락을 보유한 상태에서 호출)."""
+        if self.version_source is None:
+            return
+        version = self.version_source()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스 카운터와 현재 크기를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "version": self._version
+            }
@@ -0,0 +1,108 @@
+# src/services/static_payloads.py
+"""
+정적 응답 사전 직렬화
+도구 카탈로그/노드 패턴처럼 설정 버전이 바뀔 때만 달라지는 응답을
+버전마다 한 번만 직렬화하고, 내용 해시(ETag)로 변경 여부를 확인할 수 있게 합니다.
+"""
+
+import hashlib
+import threading
+from typing import Dict, Any, Callable, Optional
+
+from utils.serialization import dumps, resolve_format
+
+
+class PayloadSnapshot:
+    """한 설정 버전에 대해 미리 직렬화된 응답들 (형식별로 처음 요청될 때 직렬화)"""
+
+    __slots__ = ("version", "data", "envelope_key", "etag", "bodies", "envelopes", "not_modified")
+
+    def __init__(self, version: Any, data: Any, envelope_key: str):
+        self.version = version
+        self.data = data
+        self.envelope_key = envelope_key
+        compact = dumps(data, "compact")
+        self.etag = hashlib.sha256(compact.encode("utf-8")).hexdigest()[:16]
+
+        # 기존 응답 형태 그대로의 본문
+        self.bodies: Dict[str, str] = {"compact": compact}
+        # 조건부 요청(if_none_match)에 대한 전체 응답: ETag와 본문을 함께 전달
+        self.envelopes: Dict[str, str] = {}
+        self.not_modified = dumps({"etag": self.etag, "not_modified": True}, "compact")
+
+    def body(self, format: str) -> str:
+        text = self.bodies.get(format)
+        if text is None:
+            text = self.bodies[format] = dumps(self.data, format)
+        return text
+
+    def envelope(self, format: str) -> str:
+        text = self.envelopes.get(format)
+        if text is None:
+            envelope = {"etag": self.etag, "not_modified": False, self.envelope_key: self.data}
+            text = self.envelopes[format] = dumps(envelope, format)
+        return text
+
+
+class StaticPayload:
+    """설정 버전별로 사전 직렬화된 응답을 보관하는 클래스"""
+
+    def __init__(self,
+                 name: str,
+                 builder: Callable[[], Any],
+                 version_source: Callable[[], Any],
+                 envelope_key: str = "data"):
+        """
+        Args:
+            name: 응답 이름 (통계/오류 메시지용)
+            builder: 응답 데이터를 만드는 함수 (버전이 바뀔 때만 호출)
+            version_source: 현재 설정 버전을 반환하는 함수
+            envelope_key: 조건부 응답에서 본문을 담을 키
+        """
+        self.name = name
+        self.builder = builder
+        self.version_source = version_source
+        self.envelope_key = envelope_key
+        self._snapshot: Optional[PayloadSnapshot] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> PayloadSnapshot:
+        """현재 버전의 스냅샷을 반환합니다 (버전이 바뀐 경우에만 다시 직렬화)."""
+        version = self.version_source()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._snapshot = PayloadSnapshot(version, self.builder(), self.envelope_key)
+            return snapshot
+
+    @property
+    def etag(self) -> str:
+        return self.snapshot().etag
+
+    def render(self, format: str = "", if_none_match: str = "") -> str:
+        """
+        응답 문자열을 반환합니다.
+
+        Args:
+            format: 직렬화 형식 (pretty, compact, msgpack; 비우면 서버 기본 형식)
+            if_none_match: 클라이언트가 알고 있는 ETag
+                비어 있으면 기존 형태의 본문만 반환하고,
+                현재 ETag와 같으면 {"etag", "not_modified": true}만 반환하며,
+                다르면 {"etag", "not_modified": false, <envelope_key>: 본문}을 반환합니다.
+                ("*" 등 임의 값을 보내 첫 응답에서 ETag를 받을 수 있음)
+        """
+        format = resolve_format(format)
+        snapshot = self.snapshot()
+        if not if_none_match:
+            return snapshot.body(format)
+        if if_none_match.strip('"') == snapshot.etag:
+            return snapshot.not_modified
+        return snapshot.envelope(format)
+
+    def info(self) -> Dict[str, Any]:
+        """현재 버전과 ETag"""
+        snapshot = self.snapshot()
+        return {"name": self.name, "version": snapshot.version, "etag": snapshot.etag}
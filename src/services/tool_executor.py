@@ -0,0 +1,240 @@
+# src/services/tool_executor.py
+"""
+도구 실행기
+MCP 도구 처리 함수를 스레드/프로세스 풀로 넘겨 이벤트 루프를 막지 않도록 하고,
+도구별 동시 실행 수와 대기열 길이를 제한합니다.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+EXECUTOR_MODES = ("thread", "process")
+
+
+class ToolBusyError(Exception):
+    """도구의 대기열이 가득 차서 요청을 받을 수 없을 때 발생하는 예외"""
+
+    def __init__(self, tool_name: str, details: Dict[str, Any]):
+        super().__init__(f"{tool_name} 도구의 대기열이 가득 찼습니다")
+        self.tool_name = tool_name
+        self.details = details
+
+    def to_dict(self) -> Dict[str, Any]:
+        """도구 응답으로 돌려줄 구조화된 오류"""
+        return {
+            "error": "busy",
+            "message": "서버가 요청을 처리 중입니다. 잠시 후 다시 시도하세요",
+            "tool": self.tool_name,
+            **self.details
+        }
+
+
+class _ToolSlot:
+    """도구 하나의 동시 실행 제한과 통계"""
+
+    def __init__(self, concurrency_limit: int, queue_limit: int):
+        self.concurrency_limit = concurrency_limit
+        self.queue_limit = queue_limit
+        # asyncio.Semaphore는 처음 사용한 이벤트 루프에 묶이므로 루프마다 따로 만듦
+        # (asyncio.run을 여러 번 부르거나 스레드마다 루프를 돌리는 경우, 닫힌 루프의 것은 함께 버려짐)
+        self.semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.average_ms = 0.0
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """"도구=값,도구=값" 형식의 환경 변수 값을 파싱합니다."""
+    limits: Dict[str, int] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"제한 설정 형식이 올바르지 않습니다: {item!r} (도구=값)")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class ToolExecutor:
+    """도구 처리 함수를 풀에서 실행하고 도구별 동시 실행/대기열을 제한하는 클래스"""
+
+    def __init__(self,
+                 mode: str = "thread",
+                 max_workers: Optional[int] = None,
+                 concurrency_limit: int = 4,
+                 queue_limit: int = 32,
+                 concurrency_limits: Optional[Dict[str, int]] = None,
+                 queue_limits: Optional[Dict[str, int]] = None,
+                 process_initializer: Optional[Callable[..., Any]] = None,
+                 process_initargs: tuple = ()):
+        """
+        Args:
+            mode: 처리 함수를 실행할 풀 종류 (thread, process)
+            max_workers: 풀 크기 (None이면 풀 기본값)
+            concurrency_limit: 도구별 기본 동시 실행 수
+            queue_limit: 도구별 기본 최대 대기 요청 수 (초과하면 ToolBusyError)
+            concurrency_limits: 도구별 동시 실행 수 재정의
+            queue_limits: 도구별 최대 대기 요청 수 재정의
+            process_initializer: process 모드에서 작업자 프로세스가 시작될 때 실행할 함수
+            process_initargs: process_initializer 인자
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"지원하지 않는 실행기 종류입니다: {mode} (가능: {', '.join(EXECUTOR_MODES)})")
+        if concurrency_limit < 1:
+            raise ValueError("concurrency_limit은 1 이상이어야 합니다")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.concurrency_limit = concurrency_limit
+        self.queue_limit = queue_limit
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.queue_limits = dict(queue_limits or {})
+        self.process_initializer = process_initializer
+        self.process_initargs = process_initargs
+
+        self._slots: Dict[str, _ToolSlot] = {}
+        self._lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _slot(self, tool_name: str) -> _ToolSlot:
+        slot = self._slots.get(tool_name)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.get(tool_name)
+                if slot is None:
+                    slot = self._slots[tool_name] = _ToolSlot(
+                        self.concurrency_limits.get(tool_name, self.concurrency_limit),
+                        self.queue_limits.get(tool_name, self.queue_limit)
+                    )
+        return slot
+
+    def _semaphore(self, slot: _ToolSlot) -> asyncio.Semaphore:
+        """실행 중인 이벤트 루프의 세마포어 (없으면 만듦)"""
+        loop = asyncio.get_running_loop()
+        semaphore = slot.semaphores.get(loop)
+        if semaphore is None:
+            with self._lock:
+                semaphore = slot.semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = slot.semaphores[loop] = asyncio.Semaphore(slot.concurrency_limit)
+        return semaphore
+
+    def _pool(self, thread_only: bool) -> Executor:
+        """풀은 처음 사용할 때 생성합니다."""
+        with self._lock:
+            if self.mode == "process" and not thread_only:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=self.process_initializer,
+                        initargs=self.process_initargs
+                    )
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tool"
+                )
+            return self._thread_pool
+
+    async def run(self,
+                  tool_name: str,
+                  func: Callable[..., Any],
+                  *args: Any,
+                  thread_only: bool = False,
+                  **kwargs: Any) -> Any:
+        """
+        처리 함수를 풀에서 실행하고 결과를 반환합니다.
+        동시 실행 수는 이벤트 루프마다 제한합니다 (서버는 프로세스마다 루프 하나).
+
+        Args:
+            tool_name: 제한과 통계를 구분할 도구 이름
+            func: 실행할 함수 (process 모드에서는 pickle 가능한 모듈 수준 함수)
+            thread_only: process 모드에서도 스레드 풀에서 실행
+                (자식 프로세스를 직접 만드는 함수 등 프로세스로 보낼 수 없는 작업)
+
+        Raises:
+            ToolBusyError: 동시 실행 수가 가득 찬 상태에서 대기 요청이 queue_limit에 도달한 경우
+        """
+        slot = self._slot(tool_name)
+        semaphore = self._semaphore(slot)
+
+        if semaphore.locked() and slot.queued >= slot.queue_limit:
+            slot.rejected += 1
+            raise ToolBusyError(tool_name, {
+                "active": slot.active,
+                "queued": slot.queued,
+                "concurrency_limit": slot.concurrency_limit,
+                "queue_limit": slot.queue_limit,
+                "retry_after_ms": self._retry_after_ms(slot)
+            })
+
+        slot.queued += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            slot.queued -= 1
+
+        slot.active += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(func, *args, **kwargs)
+            result = await loop.run_in_executor(self._pool(thread_only), call)
+            slot.completed += 1
+            return result
+        except Exception:
+            slot.failed += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # 최근 호출에 가중치를 둔 평균 소요 시간 (재시도 권장 시간 계산용)
+            slot.average_ms = elapsed_ms if slot.average_ms == 0 else slot.average_ms * 0.9 + elapsed_ms * 0.1
+            slot.active -= 1
+            semaphore.release()
+
+    def _retry_after_ms(self, slot: _ToolSlot) -> Optional[int]:
+        """대기열이 비워질 때까지의 예상 시간 (완료된 호출이 없어 추정할 수 없으면 None)"""
+        if slot.average_ms == 0:
+            return None
+        waves = (slot.queued + slot.active) / slot.concurrency_limit
+        return int(slot.average_ms * max(waves, 1.0))
+
+    def stats(self) -> Dict[str, Any]:
+        """실행기 설정과 도구별 실행 통계"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "tools": {
+                tool_name: {
+                    "active": slot.active,
+                    "queued": slot.queued,
+                    "completed": slot.completed,
+                    "failed": slot.failed,
+                    "rejected": slot.rejected,
+                    "concurrency_limit": slot.concurrency_limit,
+                    "queue_limit": slot.queue_limit,
+                    "average_ms": round(slot.average_ms, 3)
+                }
+                for tool_name, slot in self._slots.items()
+            }
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """풀을 종료합니다."""
+        with self._lock:
+            pools = [self._thread_pool, self._process_pool]
+            self._thread_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait)
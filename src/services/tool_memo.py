@@ -0,0 +1,482 @@
+# src/services/tool_memo.py
+"""
+도구 호출 메모이제이션
+도구 id + inputSchema로 검증/정규화한 인자(+ 처리기가 인자 외에 받는 값의 digest)의 해시를 키로
+도구 실행 결과를 보관합니다.
+메모리 LRU 계층과 선택적인 SQLite 디스크 계층(프로세스 간 공유)을 두고,
+TTL은 도구 카테고리별로 정하며, 같은 키의 동시 호출은 한 번만 실행해 결과를 나눠 받습니다 (single-flight).
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Tuple
+
+from config.tools_config import get_catalog
+
+# 결과를 얻은 곳 (call_traced 반환값)
+MEMORY_HIT = "memory"
+DISK_HIT = "disk"
+SHARED = "shared"
+MISS = "miss"
+
+_MISSING = object()
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None)
+}
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """"카테고리=초,카테고리=초" 형식의 환경 변수 값을 파싱합니다 (inf는 만료 없음, 0은 메모이제이션 안 함)."""
+    ttls: Dict[str, float] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"TTL 설정 형식이 올바르지 않습니다: {item!r} (카테고리=초)")
+        ttls[name.strip()] = float(value)
+    return ttls
+
+
+class ToolArgumentError(ValueError):
+    """도구 인자가 inputSchema와 맞지 않을 때 발생하는 예외"""
+
+    def __init__(self, tool_id: str, problems: List[str]):
+        self.tool_id = tool_id
+        self.problems = problems
+        super().__init__(f"{tool_id} 인자 오류: " + "; ".join(problems))
+
+
+class _Abandoned(RuntimeError):
+    """공유 실행을 맡은 호출이 취소됨 (기다리던 호출은 다시 실행을 맡음)"""
+
+
+def _matches_type(value: Any, expected: str) -> bool:
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool) or (
+            isinstance(value, float) and value.is_integer())
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    python_type = _JSON_TYPES.get(expected)
+    return python_type is None or isinstance(value, python_type)
+
+
+def normalize_arguments(schema: Dict[str, Any],
+                        value: Any,
+                        path: str = "",
+                        partial: bool = False) -> Tuple[Any, List[str]]:
+    """
+    inputSchema(type, properties, required, enum, items, default, additionalProperties)로
+    인자를 검증하고, 같은 의미의 인자가 같은 값이 되도록 정규화합니다.
+    기본값이 있는 생략된 속성은 기본값으로 채우고, 정수로 표현되는 실수는 정수로 바꿉니다.
+    partial이면 최상위 필수 인자가 없는 것은 문제로 보지 않습니다 (주어진 인자만 검증).
+
+    Returns:
+        (정규화된 값, 문제 목록)
+    """
+    where = path or "인자"
+    expected = schema.get("type")
+    types = expected if isinstance(expected, list) else [expected] if expected else []
+    if types and not any(_matches_type(value, t) for t in types):
+        return value, [f"{where}: {'/'.join(types)} 타입이어야 합니다"]
+    if "enum" in schema and value not in schema["enum"]:
+        return value, [f"{where}: {schema['enum']} 중 하나여야 합니다"]
+
+    if isinstance(value, float) and value.is_integer() and "number" not in types:
+        value = int(value)
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        problems = [f"{path + '.' if path else ''}{name}: 필수 인자가 없습니다"
+                    for name in ([] if partial else schema.get("required", [])) if name not in value]
+        normalized = {}
+        for name, item in value.items():
+            item_schema = properties.get(name)
+            if item_schema is None:
+                if schema.get("additionalProperties") is False:
+                    problems.append(f"{path + '.' if path else ''}{name}: 정의되지 않은 인자입니다")
+                normalized[name] = item
+                continue
+            normalized[name], item_problems = normalize_arguments(
+                item_schema, item, f"{path + '.' if path else ''}{name}")
+            problems.extend(item_problems)
+        for name, item_schema in properties.items():
+            if name not in normalized and "default" in item_schema:
+                normalized[name] = item_schema["default"]
+        return normalized, problems
+    if isinstance(value, list) and isinstance(schema.get("items"), dict):
+        normalized_items = []
+        problems = []
+        for i, item in enumerate(value):
+            normalized_item, item_problems = normalize_arguments(schema["items"], item, f"{where}[{i}]")
+            normalized_items.append(normalized_item)
+            problems.extend(item_problems)
+        return normalized_items, problems
+    return value, []
+
+
+def validate_arguments(tool_id: str,
+                       arguments: Optional[Dict[str, Any]],
+                       partial: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    도구 인자를 카탈로그의 inputSchema로 검증/정규화합니다.
+
+    Returns:
+        (도구 정의, 정규화된 인자)
+
+    Raises:
+        ToolArgumentError: 카탈로그에 없는 도구이거나 인자가 스키마와 맞지 않음
+    """
+    spec = get_catalog().tools.get(tool_id)
+    if spec is None:
+        raise ToolArgumentError(tool_id, ["카탈로그에 없는 도구입니다"])
+    normalized, problems = normalize_arguments(spec.get("inputSchema", {}), arguments or {}, partial=partial)
+    if problems:
+        raise ToolArgumentError(tool_id, problems)
+    return spec, normalized
+
+
+def canonical_json(value: Any) -> str:
+    """키 정렬, 공백 없는 JSON (같은 값이면 항상 같은 문자열)"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+
+
+def _spec_digest(tool_id: str, spec: Dict[str, Any]) -> str:
+    """도구 정의의 해시 (정의가 바뀌면 이전 결과를 쓰지 않도록 키에 포함, 카탈로그 버전마다 한 번 계산)"""
+    digests = get_catalog().derived.setdefault("memo_spec_digests", {})
+    digest = digests.get(tool_id)
+    if digest is None:
+        digest = digests[tool_id] = hashlib.sha256(canonical_json(spec).encode("utf-8")).hexdigest()[:16]
+    return digest
+
+
+class ToolCallMemo:
+    """메모리 LRU + 선택적 SQLite 계층의 도구 호출 결과 저장소 (스레드/이벤트 루프 간 안전)"""
+
+    def __init__(self,
+                 maxsize: int = 1024,
+                 default_ttl_seconds: float = 300.0,
+                 category_ttls: Optional[Dict[str, float]] = None,
+                 sqlite_path: Optional[str] = None):
+        """
+        Args:
+            maxsize: 메모리 계층 최대 항목 수 (0이면 메모리 계층 사용 안 함)
+            default_ttl_seconds: category_ttls에 없는 카테고리의 유효 시간
+            category_ttls: {카테고리: 유효 시간(초)} 0이면 그 카테고리는 메모이제이션하지 않음, inf이면 만료 없음
+            sqlite_path: SQLite 디스크 계층 파일 경로 (None이면 사용 안 함)
+        """
+        self.maxsize = maxsize
+        self.default_ttl_seconds = default_ttl_seconds
+        self.category_ttls = dict(category_ttls or {})
+        self.sqlite_path = sqlite_path
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._db_lock = threading.Lock()
+
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "shared": 0,
+            "misses": 0,
+            "stores": 0,
+            "uncacheable": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalid_arguments": 0,
+            "errors": 0
+        }
+
+    # ------------------------------------------------------------------
+    # 키
+    # ------------------------------------------------------------------
+
+    def key(self,
+            tool_id: str,
+            arguments: Optional[Dict[str, Any]],
+            context: Optional[str] = None) -> Tuple[str, Dict[str, Any], float]:
+        """
+        인자를 도구의 inputSchema로 검증/정규화하고 키를 만듭니다.
+
+        Args:
+            tool_id: 도구 id
+            arguments: 도구 인자
+            context: 처리기가 인자 외에 받는 값(입력, 선행 노드 결과 등)의 digest
+                주어지면 키에 포함하고, 필수 인자는 그 값으로 채워질 수 있으므로 주어진 인자만 검증
+
+        Returns:
+            (키, 정규화된 인자, 유효 시간(초))
+
+        Raises:
+            ToolArgumentError: 카탈로그에 없는 도구이거나 인자가 스키마와 맞지 않음
+        """
+        try:
+            spec, normalized = validate_arguments(tool_id, arguments, partial=context is not None)
+        except ToolArgumentError:
+            self._count("invalid_arguments")
+            raise
+
+        parts = [tool_id, _spec_digest(tool_id, spec), normalized]
+        if context is not None:
+            parts.append(context)
+        source = canonical_json(parts)
+        key = f"{tool_id}:{hashlib.sha256(source.encode('utf-8')).hexdigest()}"
+        ttl = float(self.category_ttls.get(spec.get("category"), self.default_ttl_seconds))
+        return key, normalized, ttl
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+
+    def call_sync(self,
+                  tool_id: str,
+                  arguments: Optional[Dict[str, Any]],
+                  compute: Callable[[], Any],
+                  context: Optional[str] = None) -> Any:
+        """저장된 결과가 있으면 반환하고, 없으면 compute()를 한 번만 실행해 저장합니다 (동기 호출용)."""
+        key, _, ttl = self.key(tool_id, arguments, context)
+        while True:
+            value, _ = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            future, leader = self._join(key)
+            if leader:
+                return self._lead_sync(key, tool_id, ttl, future, compute)
+            try:
+                return future.result()
+            except _Abandoned:
+                continue
+
+    async def call(self,
+                   tool_id: str,
+                   arguments: Optional[Dict[str, Any]],
+                   compute: Callable[[], Awaitable[Any]],
+                   context: Optional[str] = None) -> Any:
+        """call_traced()와 같지만 결과만 반환합니다."""
+        value, _ = await self.call_traced(tool_id, arguments, compute, context)
+        return value
+
+    async def call_traced(self,
+                          tool_id: str,
+                          arguments: Optional[Dict[str, Any]],
+                          compute: Callable[[], Awaitable[Any]],
+                          context: Optional[str] = None) -> Tuple[Any, str]:
+        """
+        저장된 결과가 있으면 반환하고, 없으면 await compute()를 한 번만 실행해 저장합니다.
+        다른 스레드/이벤트 루프에서 같은 키를 실행 중이면 그 결과를 기다려 함께 받습니다.
+        compute가 인자 외의 값도 쓰면 그 값의 digest를 context로 주어야 합니다 (key() 참고).
+
+        Returns:
+            (결과, 결과를 얻은 곳: memory, disk, shared, miss)
+        """
+        key, _, ttl = self.key(tool_id, arguments, context)
+        while True:
+            value, source = self._lookup(key)
+            if value is not _MISSING:
+                return value, source
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # 기다리던 호출이 취소되어도 공유 실행은 취소하지 않음
+                return await asyncio.shield(asyncio.wrap_future(future)), SHARED
+            except _Abandoned:
+                continue
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # 실행을 맡은 호출이 취소(타임아웃 등)되면 기다리던 호출 중 하나가 다시 실행을 맡음
+            self._finish(key, future, error=_Abandoned(f"{tool_id} 공유 호출이 취소되었습니다"))
+            raise
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._store(key, tool_id, value, ttl)
+        self._finish(key, future, value=value)
+        return value, MISS
+
+    def _lead_sync(self, key: str, tool_id: str, ttl: float,
+                   future: concurrent.futures.Future, compute: Callable[[], Any]) -> Any:
+        try:
+            value = compute()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._store(key, tool_id, value, ttl)
+        self._finish(key, future, value=value)
+        return value
+
+    def _join(self, key: str) -> Tuple[concurrent.futures.Future, bool]:
+        """실행 중인 같은 키의 호출에 합류하거나, 없으면 이 호출이 실행을 맡습니다."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.counters["shared"] += 1
+                return future, False
+            future = self._inflight[key] = concurrent.futures.Future()
+            self.counters["misses"] += 1
+            return future, True
+
+    def _finish(self, key: str, future: concurrent.futures.Future,
+                value: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is not None and not isinstance(error, _Abandoned):
+                self.counters["errors"] += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    # ------------------------------------------------------------------
+    # 계층
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: str) -> Tuple[Any, Optional[str]]:
+        """메모리 → 디스크 순으로 찾습니다 (디스크에서 찾으면 메모리로 올림)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return value, MEMORY_HIT
+                del self._entries[key]
+                self.counters["expirations"] += 1
+
+        row = self._disk_get(key, now)
+        if row is not None:
+            value, expires_at = row
+            self._memory_put(key, value, expires_at)
+            self._count("disk_hits")
+            return value, DISK_HIT
+        return _MISSING, None
+
+    def _store(self, key: str, tool_id: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            self._count("uncacheable")
+            return
+        expires_at = None if ttl == float("inf") else time.time() + ttl
+        self._memory_put(key, value, expires_at)
+        self._disk_put(key, tool_id, value, expires_at)
+        self._count("stores")
+
+    def _memory_put(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """프로세스마다 한 번 연결합니다 (fork된 자식은 부모의 연결을 쓰지 않음)."""
+        if not self.sqlite_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            directory = os.path.dirname(self.sqlite_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.sqlite_path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tool_memo ("
+                "key TEXT PRIMARY KEY, tool_id TEXT NOT NULL, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL)"
+            )
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[Any, Optional[float]]]:
+        if not self.sqlite_path:
+            return None
+        with self._db_lock:
+            db = self._connection()
+            row = db.execute("SELECT value, expires_at FROM tool_memo WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                db.execute("DELETE FROM tool_memo WHERE key = ?", (key,))
+                self._count("expirations")
+                return None
+        return json.loads(row[0]), row[1]
+
+    def _disk_put(self, key: str, tool_id: str, value: Any, expires_at: Optional[float]) -> None:
+        if not self.sqlite_path:
+            return
+        try:
+            payload = canonical_json(value)
+        except (TypeError, ValueError):
+            return  # JSON으로 표현할 수 없는 결과는 메모리 계층에만 보관
+        with self._db_lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO tool_memo (key, tool_id, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, tool_id, payload, time.time(), expires_at)
+            )
+
+    def purge_expired(self) -> int:
+        """만료된 항목을 두 계층에서 모두 지우고 지운 디스크 항목 수를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items()
+                       if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        if not self.sqlite_path:
+            return 0
+        with self._db_lock:
+            cursor = self._connection().execute(
+                "DELETE FROM tool_memo WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """두 계층의 모든 항목을 지웁니다."""
+        with self._lock:
+            self._entries.clear()
+        if self.sqlite_path:
+            with self._db_lock:
+                self._connection().execute("DELETE FROM tool_memo")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """계층별 히트, 공유된 동시 호출, 미스 수와 현재 크기를 반환합니다."""
+        with self._lock:
+            counters = dict(self.counters)
+            size = len(self._entries)
+            inflight = len(self._inflight)
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["shared"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["disk_hits"] + counters["shared"]
+        return {
+            "name": "tool_memo",
+            "size": size,
+            "maxsize": self.maxsize,
+            "inflight": inflight,
+            "default_ttl_seconds": self.default_ttl_seconds,
+            "category_ttls": self.category_ttls,
+            "sqlite_path": self.sqlite_path,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **counters
+        }
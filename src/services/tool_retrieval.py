@@ -0,0 +1,404 @@
+# src/services/tool_retrieval.py
+"""
+도구 검색 인덱스
+도구 이름/설명/카테고리를 해싱 TF-IDF 벡터로 바꿔 NumPy 행렬에 담고,
+프롬프트와 코사인 유사도가 높은 도구를 찾습니다 (네트워크/모델 다운로드 없음).
+도구가 많으면 k-means 군집(IVF)으로 일부 군집만 살펴보는 근사 검색을 사용할 수 있습니다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from config.tools_config import ToolCatalog, get_catalog, snapshot_path
+
+SEARCH_MODES = ("auto", "exact", "approx")
+
+# 인덱스 파일 형식이나 임베딩 방식이 바뀌면 올려서 기존 파일을 무효화
+INDEX_FORMAT = 1
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+
+# 같은 인덱스를 여러 스레드가 동시에 만들지 않도록 직렬화
+_build_lock = threading.Lock()
+
+
+class HashingEmbedder:
+    """
+    단어와 단어 내부 문자 n-gram을 해싱해 고정 차원 벡터로 바꾸는 임베더
+    한국어 조사/어미가 붙어도("검색해서"/"검색합니다") 문자 n-gram이 겹치도록 합니다.
+    해시는 프로세스와 무관하게 같은 값이 나오는 crc32를 사용합니다.
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (2, 3)):
+        """
+        Args:
+            dim: 벡터 차원 (해시 구간 수)
+            ngram_range: 단어 내부 문자 n-gram 길이 범위
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+        # 특징 문자열 → (구간, 부호) (같은 n-gram은 카탈로그 전체에서 반복되므로 한 번만 해싱)
+        self._hashes: Dict[str, Tuple[int, float]] = {}
+
+    def features(self, text: str) -> Dict[Tuple[int, float], int]:
+        """텍스트의 (구간, 부호)별 특징 빈도"""
+        counts: Dict[Tuple[int, float], int] = {}
+        hashes = self._hashes
+        low, high = self.ngram_range
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            grams = ["w:" + token]
+            if len(token) > 1:
+                padded = f"<{token}>"
+                for n in range(low, high + 1):
+                    grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+            for gram in grams:
+                hashed = hashes.get(gram)
+                if hashed is None:
+                    value = zlib.crc32(gram.encode("utf-8"))
+                    # 부호 해싱으로 충돌한 특징끼리 한쪽으로 치우치지 않게 함
+                    hashed = hashes[gram] = (value % self.dim, 1.0 if value & 0x80000000 else -1.0)
+                counts[hashed] = counts.get(hashed, 0) + 1
+        return counts
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """텍스트 목록을 로그 TF 가중 행렬로 바꿉니다 (정규화 전)."""
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        count = 0
+        for row, text in enumerate(texts):
+            count += 1
+            for (col, sign), frequency in self.features(text).items():
+                rows.append(row)
+                cols.append(col)
+                values.append(sign * (1.0 + math.log(frequency)))
+        matrix = np.zeros((count, self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+                  np.asarray(values, dtype=np.float32))
+        return matrix
+
+
+def tool_text(tool_id: str, spec: Dict[str, Any]) -> str:
+    """도구 하나를 색인할 텍스트 (이름은 두 번 넣어 가중치를 높임)"""
+    name = spec.get("name", "")
+    return " ".join([
+        name,
+        name,
+        spec.get("description", ""),
+        spec.get("category", "").replace("_", " "),
+        tool_id.replace("_", " ")
+    ])
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class ToolRetrievalIndex:
+    """도구 검색용 TF-IDF 행렬과 근사 검색용 군집"""
+
+    def __init__(self,
+                 tool_ids: List[str],
+                 matrix: np.ndarray,
+                 idf: np.ndarray,
+                 centroids: Optional[np.ndarray] = None,
+                 cluster_offsets: Optional[np.ndarray] = None,
+                 ngram_range: Tuple[int, int] = (2, 3)):
+        """
+        Args:
+            tool_ids: 행 순서의 도구 id (근사 검색용 군집이 있으면 군집 순으로 정렬됨)
+            matrix: 행 단위로 정규화된 TF-IDF 행렬 (도구 수 × 차원, float32)
+            idf: 구간별 IDF 가중치
+            centroids: 군집 중심 (군집 수 × 차원, None이면 근사 검색 불가)
+            cluster_offsets: 군집 i의 행 범위가 [offsets[i], offsets[i + 1])
+            ngram_range: 임베더 문자 n-gram 범위
+        """
+        self.tool_ids = tool_ids
+        self.matrix = matrix
+        self.idf = idf
+        self.centroids = centroids
+        self.cluster_offsets = cluster_offsets
+        self.embedder = HashingEmbedder(matrix.shape[1], ngram_range)
+
+    @classmethod
+    def build(cls,
+              tools: Dict[str, Dict[str, Any]],
+              dim: int = 512,
+              approx_min_tools: int = 4096,
+              clusters: Optional[int] = None,
+              seed: int = 0) -> "ToolRetrievalIndex":
+        """
+        도구 정의에서 인덱스를 만듭니다.
+
+        Args:
+            tools: {도구 id: 도구 정의}
+            dim: 벡터 차원
+            approx_min_tools: 도구가 이 수 이상이면 근사 검색용 군집을 만듦
+            clusters: 군집 수 (None이면 √도구 수)
+            seed: 군집 초기화 난수 시드
+        """
+        tool_ids = list(tools)
+        embedder = HashingEmbedder(dim)
+        tf = embedder.embed(tool_text(tool_id, tools[tool_id]) for tool_id in tool_ids)
+
+        # 문서 빈도 기반 평활 IDF
+        document_frequency = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1.0 + len(tool_ids)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        matrix = _normalize_rows(tf * idf)
+
+        centroids = cluster_offsets = None
+        if _use_clusters(len(tool_ids), approx_min_tools):
+            cluster_count = clusters or int(math.sqrt(len(tool_ids)))
+            centroids, assignments = _spherical_kmeans(matrix, cluster_count, seed)
+            # 같은 군집의 행이 연속되도록 정렬해 검색 때 슬라이스로 읽음
+            order = np.argsort(assignments, kind="stable")
+            matrix = np.ascontiguousarray(matrix[order])
+            tool_ids = [tool_ids[i] for i in order]
+            cluster_offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        return cls(tool_ids, matrix, idf, centroids, cluster_offsets, embedder.ngram_range)
+
+    def __len__(self) -> int:
+        return len(self.tool_ids)
+
+    @property
+    def approximate(self) -> bool:
+        return self.centroids is not None
+
+    def embed_query(self, query: str) -> np.ndarray:
+        vector = self.embedder.embed([query])[0] * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self,
+               query: str,
+               top_k: int = 5,
+               mode: str = "auto",
+               nprobe: int = 8) -> List[Tuple[str, float]]:
+        """
+        질의와 코사인 유사도가 높은 도구를 찾습니다.
+
+        Args:
+            query: 검색할 텍스트 (사용자 프롬프트 등)
+            top_k: 반환할 도구 수
+            mode: exact (전체 행렬 곱), approx (가까운 군집 nprobe개만 검색),
+                auto (군집이 있으면 approx, 없으면 exact)
+            nprobe: 근사 검색에서 살펴볼 군집 수
+
+        Returns:
+            (도구 id, 유사도) 목록 (유사도 내림차순, 유사도 0 이하 제외)
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {mode} (가능: {', '.join(SEARCH_MODES)})")
+        if top_k <= 0 or not self.tool_ids:
+            return []
+        vector = self.embed_query(query)
+        if not vector.any():
+            return []
+
+        if mode == "approx" or (mode == "auto" and self.approximate):
+            rows = self._probe_rows(vector, nprobe)
+        else:
+            rows = None
+        candidates = self.matrix if rows is None else self.matrix[rows]
+        scores = candidates @ vector
+
+        k = min(top_k, scores.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = []
+        for position in top:
+            score = float(scores[position])
+            if score <= 0:
+                break
+            row = position if rows is None else rows[position]
+            results.append((self.tool_ids[row], round(score, 4)))
+        return results
+
+    def _probe_rows(self, vector: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        """질의와 가까운 군집들의 행 번호 (군집이 없으면 None → 전체 검색)"""
+        if self.centroids is None:
+            return None
+        nprobe = min(max(nprobe, 1), len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ vector), nprobe - 1)[:nprobe]
+        offsets = self.cluster_offsets
+        return np.concatenate([np.arange(offsets[c], offsets[c + 1]) for c in nearest])
+
+    def save(self, path: str) -> None:
+        """인덱스를 .npz 파일로 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        arrays = {
+            "matrix": self.matrix,
+            "idf": self.idf,
+            "tool_ids": np.asarray(json.dumps(self.tool_ids, ensure_ascii=False)),
+            "meta": np.asarray(json.dumps({"format": INDEX_FORMAT, "ngram_range": self.embedder.ngram_range}))
+        }
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+            arrays["cluster_offsets"] = self.cluster_offsets
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ToolRetrievalIndex"]:
+        """저장된 인덱스를 읽습니다 (없거나 형식이 다르면 None)."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("format") != INDEX_FORMAT:
+                    return None
+                return cls(
+                    json.loads(str(data["tool_ids"])),
+                    data["matrix"],
+                    data["idf"],
+                    data["centroids"] if "centroids" in data else None,
+                    data["cluster_offsets"] if "cluster_offsets" in data else None,
+                    tuple(meta["ngram_range"])
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _spherical_kmeans(matrix: np.ndarray,
+                      clusters: int,
+                      seed: int,
+                      iterations: int = 8,
+                      sample_size: int = 20000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코사인 유사도 기준 k-means (중심은 표본으로 학습하고 전체 행을 한 번 배정)
+
+    Returns:
+        (정규화된 중심 행렬, 행별 군집 번호)
+    """
+    rng = np.random.default_rng(seed)
+    clusters = min(clusters, matrix.shape[0])
+    sample = matrix
+    if matrix.shape[0] > sample_size:
+        sample = matrix[rng.choice(matrix.shape[0], sample_size, replace=False)]
+    centroids = sample[rng.choice(sample.shape[0], clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        # 비어 있는 군집은 이전 중심 유지
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        centroids = _normalize_rows(sums)
+
+    # 전체 행 배정은 메모리를 아끼기 위해 나누어 계산
+    assignments = np.empty(matrix.shape[0], dtype=np.int64)
+    for start in range(0, matrix.shape[0], 8192):
+        block = matrix[start:start + 8192]
+        assignments[start:start + 8192] = np.argmax(block @ centroids.T, axis=1)
+    return centroids.astype(np.float32), assignments
+
+
+def _use_clusters(tool_count: int, approx_min_tools: int) -> bool:
+    """도구 수가 기준 이상이면 근사 검색용 군집을 만듦"""
+    return tool_count >= max(approx_min_tools, 2)
+
+
+def _approx_min_tools() -> int:
+    return int(os.getenv("TOOL_INDEX_APPROX_MIN_TOOLS", "4096"))
+
+
+def _index_cache_path(catalog: ToolCatalog, dim: int, approx_min_tools: int) -> Optional[str]:
+    """
+    카탈로그 스냅샷 옆에 둘 인덱스 파일 경로 (카탈로그 파일 지문, 차원, 군집 여부별)
+    TOOL_INDEX_APPROX_MIN_TOOLS를 바꿔 군집 여부가 달라지면 다른 파일을 사용합니다.
+    """
+    path = snapshot_path()
+    if not path:
+        return None
+    clustered = _use_clusters(len(catalog.tools), approx_min_tools)
+    key = hashlib.sha1(repr((INDEX_FORMAT, catalog.fingerprint, dim, clustered)).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.dirname(path), f"tool_index.{key}.npz")
+
+
+def get_tool_index(dim: Optional[int] = None) -> ToolRetrievalIndex:
+    """
+    현재(호출 중 고정된) 카탈로그의 검색 인덱스를 반환합니다.
+    카탈로그 버전마다 한 번만 만들며, 카탈로그 파일 지문별로 디스크에 저장해
+    다음 시작 때 다시 만들지 않습니다. 도구가 많으면 미리 만들어 두세요
+    (python -m services.tool_retrieval, hot reload는 prepare_tool_index로 교체 전에 만듦).
+
+    Args:
+        dim: 벡터 차원 (None이면 TOOL_INDEX_DIM 환경 변수, 기본 512)
+    """
+    return prepare_tool_index(get_catalog(), dim)
+
+
+def prepare_tool_index(catalog: ToolCatalog, dim: Optional[int] = None) -> ToolRetrievalIndex:
+    """
+    카탈로그의 검색 인덱스를 디스크에서 읽거나 만들어 catalog.derived에 보관합니다.
+    교체 전 카탈로그에도 쓸 수 있도록 현재 카탈로그 대신 인자로 받은 카탈로그를 사용하며,
+    같은 인덱스를 여러 스레드가 동시에 만들지 않도록 먼저 시작한 스레드의 결과를 기다립니다.
+    """
+    dim = dim or int(os.getenv("TOOL_INDEX_DIM", "512"))
+    key = f"tool_index:{dim}"
+    index = catalog.derived.get(key)
+    if index is not None:
+        return index
+
+    with _build_lock:
+        index = catalog.derived.get(key)
+        if index is not None:
+            return index
+        approx_min_tools = _approx_min_tools()
+        cache_path = _index_cache_path(catalog, dim, approx_min_tools)
+        if cache_path:
+            index = ToolRetrievalIndex.load(cache_path)
+            if index is not None and set(index.tool_ids) != set(catalog.tools):
+                # bump_catalog_version()으로 파일 없이 바뀐 카탈로그
+                index = None
+            if index is not None and index.approximate != _use_clusters(len(catalog.tools), approx_min_tools):
+                index = None
+        if index is None:
+            index = ToolRetrievalIndex.build(catalog.tools, dim=dim, approx_min_tools=approx_min_tools)
+            if cache_path:
+                try:
+                    index.save(cache_path)
+                except OSError:
+                    pass
+        catalog.derived[key] = index
+    return index
+
+
+def main() -> None:
+    """
+    현재 카탈로그 파일의 검색 인덱스를 미리 만들어 카탈로그 스냅샷 옆에 저장합니다 (배포/카탈로그 갱신 시 실행).
+    실행: cd src && python -m services.tool_retrieval [--dim 512]
+    """
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--dim", type=int, default=None, help="벡터 차원 (기본: TOOL_INDEX_DIM 또는 512)")
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    dim = args.dim or int(os.getenv("TOOL_INDEX_DIM", "512"))
+    cache_path = _index_cache_path(catalog, dim, _approx_min_tools())
+    if not cache_path:
+        raise SystemExit("TOOL_CATALOG_SNAPSHOT=off이면 인덱스를 디스크에 저장하지 않습니다")
+    started = time.perf_counter()
+    index = prepare_tool_index(catalog, dim)
+    print(f"도구 {len(index)}개 인덱스 ({'근사' if index.approximate else '전체'} 검색, {dim}차원): {cache_path} "
+          f"({(time.perf_counter() - started):.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# src/services/workflow_designer.py
+"""
+워크플로우 설계 파이프라인
+프롬프트 분석 → 노드 추천 → 워크플로우 최적화를 한 프로세스 안에서
+dict 그대로 이어서 실행합니다 (중간 JSON 직렬화 없음).
+저장소를 주면 추천/최적화된 워크플로우를 버전으로 저장해 이후 도구가 workflow_id로 참조할 수 있습니다.
+"""
+
+import time
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+
+from .prompt_analyzer import PromptAnalyzer
+from .node_recommender import NodeRecommender
+from .workflow_optimizer import WorkflowOptimizer
+from .workflow_store import WorkflowStore
+
+# 파이프라인 단계 (항상 이 순서로 실행되며, 앞 단계 결과가 다음 단계 입력이 됨)
+PIPELINE_STAGES = ("analyze", "recommend", "optimize")
+
+# 단계별 결과가 담기는 응답 키
+STAGE_RESULT_KEYS = {
+    "analyze": "analysis",
+    "recommend": "recommendation",
+    "optimize": "optimization"
+}
+
+
+class WorkflowDesigner:
+    """프롬프트에서 최적화된 워크플로우까지 한 번에 설계하는 클래스"""
+
+    def __init__(self,
+                 analyzer: PromptAnalyzer,
+                 recommender: NodeRecommender,
+                 optimizer: WorkflowOptimizer,
+                 store: Optional[WorkflowStore] = None):
+        """
+        Args:
+            analyzer: 프롬프트 분석 서비스
+            recommender: 노드 추천 서비스
+            optimizer: 워크플로우 최적화 서비스
+            store: design(save=True)에서 추천/최적화 결과를 저장할 워크플로우 저장소
+        """
+        self.analyzer = analyzer
+        self.recommender = recommender
+        self.optimizer = optimizer
+        self.store = store
+
+    def design(self,
+               user_prompt: str,
+               stages: Optional[List[str]] = None,
+               optimization_goal: str = "speed",
+               workflow_type: Optional[str] = None,
+               fields: Optional[List[str]] = None,
+               schema_mode: str = "inline",
+               save: bool = False) -> Dict[str, Any]:
+        """
+        분석/추천/최적화 단계를 이어서 실행합니다.
+
+        Args:
+            user_prompt: 사용자의 에이전트 요청 텍스트
+            stages: 실행할 마지막 단계까지의 단계 목록 (None이면 전체)
+                예: ["analyze"], ["analyze", "recommend"]
+            optimization_goal: 최적화 목표 (speed, cost, reliability, pareto)
+            workflow_type: 분석 결과의 워크플로우 타입 대신 사용할 타입
+            fields: 응답에 포함할 필드 목록 ("analysis", "recommendation.nodes" 등)
+                None이면 실행한 단계의 결과 전체를 반환
+            schema_mode: 추천 노드의 도구 입력 스키마 표현 방식 (inline, ref, omit)
+            save: 추천/최적화 결과를 저장소에 저장 (저장에 실패하면 workflow_store에 오류 정보)
+
+        Returns:
+            단계별 결과와 단계별 소요 시간
+        """
+        stages = self._resolve_stages(stages)
+        if save and self.store is None:
+            raise ValueError("워크플로우 저장소가 꺼져 있습니다 (WORKFLOW_STORE_PATH)")
+        result: Dict[str, Any] = {
+            "timestamp": datetime.now().isoformat(),
+            "stages": stages,
+            "timings_ms": {}
+        }
+
+        started = time.perf_counter()
+        analysis = self.analyzer.analyze(user_prompt)
+        result["analysis"] = analysis
+        result["timings_ms"]["analyze"] = self._elapsed_ms(started)
+
+        if "recommend" in stages:
+            started = time.perf_counter()
+            # 분석 단계에서 키워드와 도구 검색 인덱스로 고른 도구를 그대로 사용
+            recommendation = self.recommender.recommend(
+                intent=analysis["intent_analysis"]["primary_intent"],
+                required_capabilities=analysis["required_capabilities"],
+                recommended_tools=analysis["recommended_tools"],
+                complexity_level=analysis["intent_analysis"]["complexity_level"],
+                workflow_type=workflow_type or analysis["estimated_workflow_type"],
+                schema_mode=schema_mode
+            )
+            result["recommendation"] = recommendation
+            result["timings_ms"]["recommend"] = self._elapsed_ms(started)
+            if save:
+                result["workflow_store"] = [self.store.try_save(recommendation, "design_workflow")]
+
+            if "optimize" in stages:
+                started = time.perf_counter()
+                result["optimization"] = self.optimizer.optimize(recommendation, optimization_goal)
+                result["timings_ms"]["optimize"] = self._elapsed_ms(started)
+                stored = result["workflow_store"][0] if save else None
+                if stored is not None and "error" not in stored:
+                    result["workflow_store"].append(self.store.try_save(
+                        result["optimization"]["optimized_workflow"],
+                        f"design_workflow:{optimization_goal}",
+                        workflow_id=stored["workflow_id"],
+                        parent_version=stored["version"]
+                    ))
+
+        if fields:
+            result = self._select_fields(result, fields)
+        return result
+
+    def _resolve_stages(self, stages: Optional[List[str]]) -> List[str]:
+        """요청한 단계 목록을 검증하고 분석부터 마지막 단계까지의 목록으로 정규화합니다."""
+        if not stages:
+            return list(PIPELINE_STAGES)
+        unknown = [stage for stage in stages if stage not in PIPELINE_STAGES]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(PIPELINE_STAGES)})")
+
+        # 뒤 단계는 앞 단계 결과가 필요하므로 요청한 마지막 단계까지 모두 실행
+        last = max(PIPELINE_STAGES.index(stage) for stage in stages)
+        return list(PIPELINE_STAGES[:last + 1])
+
+    def _select_fields(self, result: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """
+        응답에서 요청한 필드만 남깁니다.
+
+        "analysis"처럼 단계 결과 전체나 "recommendation.nodes"처럼 한 단계 아래의
+        필드를 지정할 수 있습니다. timestamp/stages/timings_ms(저장했으면 workflow_store)는 항상 포함됩니다.
+        """
+        selected = {key: result[key] for key in ("timestamp", "stages", "timings_ms", "workflow_store")
+                    if key in result}
+        for field in fields:
+            section, _, key = field.partition(".")
+            if section not in result:
+                raise ValueError(f"응답에 없는 필드입니다: {field}")
+            if not key:
+                selected[section] = result[section]
+                continue
+            if not isinstance(result[section], dict) or key not in result[section]:
+                raise ValueError(f"응답에 없는 필드입니다: {field}")
+            part = selected.setdefault(section, {})
+            if part is not result[section]:
+                part[key] = result[section][key]
+        return selected
+
+    def _elapsed_ms(self, started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 3)
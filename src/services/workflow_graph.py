@@ -0,0 +1,283 @@
+# src/services/workflow_graph.py
+"""
+워크플로우 그래프 편집 도구
+노드/연결 목록을 인접 구조로 바꾸어 재작성(rewrite) 패스에서 사용합니다.
+"""
+
+import heapq
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+from .catalog_index import get_catalog_index
+from .dag_scheduler import LOOP_BACK
+
+# 재작성 패스가 자유롭게 다시 연결할 수 있는 연결 타입
+REWIRABLE_TYPES = ("direct", "parallel")
+
+
+class WorkflowGraph:
+    """노드와 연결을 편집 가능한 인접 구조로 보관하는 클래스"""
+
+    def __init__(self, workflow: Dict[str, Any]):
+        """
+        Args:
+            workflow: nodes/connections를 가진 워크플로우 (원본은 수정하지 않음)
+        """
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for node in workflow.get("nodes", []):
+            self.nodes[node["id"]] = dict(node)
+
+        # DAG 연결: source → {target: 연결}, loop_back 연결은 별도 보관
+        self.out_edges: Dict[str, Dict[str, Dict[str, Any]]] = {node_id: {} for node_id in self.nodes}
+        self.in_edges: Dict[str, Dict[str, Dict[str, Any]]] = {node_id: {} for node_id in self.nodes}
+        self.loop_back_edges: List[Dict[str, Any]] = []
+
+        for connection in workflow.get("connections", []):
+            connection = dict(connection)
+            for node_id in (connection.get("from_node"), connection.get("to_node")):
+                if node_id not in self.nodes:
+                    self.nodes[node_id] = {"id": node_id, "type": "unknown"}
+                    self.out_edges[node_id] = {}
+                    self.in_edges[node_id] = {}
+            if connection.get("type") == LOOP_BACK:
+                self.loop_back_edges.append(connection)
+            else:
+                self._insert_edge(connection)
+
+        self._tool_dependency_cache: Dict[str, Set[str]] = {}
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def is_process(self, node_id: str) -> bool:
+        """도구를 실행하는 처리 노드인지 확인합니다."""
+        return self.nodes[node_id].get("type") == "process"
+
+    def predecessors(self, node_id: str) -> List[str]:
+        return list(self.in_edges[node_id])
+
+    def successors(self, node_id: str) -> List[str]:
+        return list(self.out_edges[node_id])
+
+    def edge(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        return self.out_edges.get(source, {}).get(target)
+
+    def edges(self) -> List[Dict[str, Any]]:
+        """loop_back을 제외한 모든 연결을 반환합니다."""
+        return [edge for targets in self.out_edges.values() for edge in targets.values()]
+
+    def topological_order(self, node_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        노드 정의 순서를 최대한 유지하는 위상 순서를 반환합니다 (순환 노드는 제외).
+
+        Args:
+            node_ids: 이 노드들만 위상 순서로 반환 (None이면 전체)
+        """
+        if node_ids is not None:
+            wanted = set(node_ids)
+            return [node_id for node_id in self.topological_order() if node_id in wanted]
+        position = {node_id: i for i, node_id in enumerate(self.nodes)}
+        remaining = {node_id: len(self.in_edges[node_id]) for node_id in self.nodes}
+        ready = [(position[n], n) for n, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, node_id = heapq.heappop(ready)
+            order.append(node_id)
+            for successor in self.out_edges[node_id]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    heapq.heappush(ready, (position[successor], successor))
+        return order
+
+    def reachable(self, source: str, target: str, skip_edge: Optional[tuple] = None) -> bool:
+        """source에서 target까지 (skip_edge를 제외한) 경로가 있는지 확인합니다."""
+        stack = [source]
+        seen = {source}
+        while stack:
+            node_id = stack.pop()
+            for successor in self.out_edges[node_id]:
+                if (node_id, successor) == skip_edge or successor in seen:
+                    continue
+                if successor == target:
+                    return True
+                if not self._may_reach(successor, target):
+                    continue
+                seen.add(successor)
+                stack.append(successor)
+        return False
+
+    def _may_reach(self, node_id: str, target: str) -> bool:
+        """node_id에서 target에 닿을 수 있는지 탐색 전에 판단할 수 있으면 False (기본은 항상 탐색)"""
+        return True
+
+    def nodes_with_tool(self, tool_id: str) -> List[str]:
+        """tool_id 도구를 호출하는 노드 id 목록"""
+        return [node_id for node_id, node in self.nodes.items() if node.get("tool_id") == tool_id]
+
+    def dependents_of(self, node_id: str) -> List[Dict[str, Any]]:
+        """depends_on에 node_id를 가진 노드 목록"""
+        return [node for node in self.nodes.values() if node_id in node.get("depends_on", [])]
+
+    def tool_dependencies(self, tool_id: Optional[str]) -> Set[str]:
+        """카탈로그 기준 도구의 전이 의존 도구 id 집합을 반환합니다."""
+        if not tool_id:
+            return set()
+        cached = self._tool_dependency_cache.get(tool_id)
+        if cached is not None:
+            return cached
+
+        index = get_catalog_index()
+        result: Set[str] = set()
+        stack = [tool_id]
+        while stack:
+            tool = index.get(stack.pop())
+            if tool is None:
+                continue
+            for dependency in tool.get("dependencies", []):
+                if dependency not in result:
+                    result.add(dependency)
+                    stack.append(dependency)
+        self._tool_dependency_cache[tool_id] = result
+        return result
+
+    def depends_on(self, node_id: str, upstream_id: str) -> bool:
+        """
+        node_id가 upstream_id의 결과를 실제로 필요로 하는지 판단합니다.
+
+        노드의 depends_on 필드나 도구 의존성으로 판단할 수 없는 노드
+        (처리 노드가 아니거나 도구 정보가 없는 노드)는 의존하는 것으로 간주합니다.
+        """
+        node = self.nodes[node_id]
+        upstream = self.nodes[upstream_id]
+        if not self.is_process(node_id) or not self.is_process(upstream_id):
+            return True
+        if not node.get("tool_id") or not upstream.get("tool_id"):
+            return True
+        if upstream_id in node.get("depends_on", []):
+            return True
+        return upstream["tool_id"] in self.tool_dependencies(node["tool_id"])
+
+    # ------------------------------------------------------------------
+    # 편집
+    # ------------------------------------------------------------------
+
+    def add_node(self, node: Dict[str, Any]) -> None:
+        """연결이 없는 새 노드를 추가합니다."""
+        node_id = node["id"]
+        self.nodes[node_id] = dict(node)
+        self.out_edges[node_id] = {}
+        self.in_edges[node_id] = {}
+
+    def replace_node(self, node: Dict[str, Any]) -> None:
+        """연결은 그대로 두고 노드 정의를 바꿉니다."""
+        self.nodes[node["id"]] = dict(node)
+
+    def node_changed(self, node_id: str) -> None:
+        """노드 정의를 제자리에서 바꾼 뒤 호출합니다 (변경을 추적하는 하위 클래스용)."""
+
+    def _insert_edge(self, connection: Dict[str, Any]) -> None:
+        source = connection["from_node"]
+        target = connection["to_node"]
+        if target in self.out_edges[source]:
+            return
+        self.out_edges[source][target] = connection
+        self.in_edges[target][source] = connection
+
+    def add_edge(self, source: str, target: str, edge_type: str = "direct",
+                 condition: Any = None) -> bool:
+        """연결을 추가합니다. 이미 있거나 자기 자신으로의 연결이면 False를 반환합니다."""
+        if source == target or target in self.out_edges[source]:
+            return False
+        self._insert_edge({
+            "id": f"conn_{source}_to_{target}",
+            "from_node": source,
+            "to_node": target,
+            "type": edge_type,
+            "condition": condition
+        })
+        return True
+
+    def remove_edge(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """연결을 제거하고 제거된 연결을 반환합니다."""
+        edge = self.out_edges[source].pop(target, None)
+        if edge is not None:
+            del self.in_edges[target][source]
+        return edge
+
+    def remove_node(self, node_id: str) -> None:
+        """노드와 연결된 모든 연결을 제거합니다."""
+        for successor in list(self.out_edges[node_id]):
+            self.remove_edge(node_id, successor)
+        for predecessor in list(self.in_edges[node_id]):
+            self.remove_edge(predecessor, node_id)
+        del self.out_edges[node_id]
+        del self.in_edges[node_id]
+        del self.nodes[node_id]
+        self.loop_back_edges = [
+            edge for edge in self.loop_back_edges
+            if edge.get("from_node") != node_id and edge.get("to_node") != node_id
+        ]
+
+    def redirect_node(self, old_id: str, new_id: str) -> None:
+        """old_id로 들어오고 나가는 연결을 new_id로 옮긴 뒤 old_id를 제거합니다."""
+        for predecessor, edge in list(self.in_edges[old_id].items()):
+            if predecessor != new_id:
+                self.add_edge(predecessor, new_id, edge.get("type", "direct"), edge.get("condition"))
+        for successor, edge in list(self.out_edges[old_id].items()):
+            if successor != new_id:
+                self.add_edge(new_id, successor, edge.get("type", "direct"), edge.get("condition"))
+        loop_back_edges = []
+        seen = set()
+        for edge in self.loop_back_edges:
+            if edge.get("from_node") == old_id:
+                edge["from_node"] = new_id
+            if edge.get("to_node") == old_id:
+                edge["to_node"] = new_id
+            key = (edge.get("from_node"), edge.get("to_node"))
+            if key not in seen:
+                seen.add(key)
+                loop_back_edges.append(edge)
+        self.loop_back_edges = loop_back_edges
+        for node in self.dependents_of(old_id):
+            node["depends_on"] = list(dict.fromkeys(
+                new_id if dep == old_id else dep for dep in node["depends_on"]
+            ))
+            self.node_changed(node["id"])
+        self.remove_node(old_id)
+
+    def retype_edges(self, node_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        재배선 가능한 연결의 타입을 분기/합류 여부에 따라 parallel/direct로 다시 지정합니다.
+
+        Args:
+            node_ids: 이 노드들에 닿는 연결만 다시 지정 (None이면 전체)
+        """
+        if node_ids is None:
+            edges = self.edges()
+        else:
+            edges = []
+            seen = set()
+            for node_id in node_ids:
+                if node_id not in self.nodes:
+                    continue
+                for edge in list(self.out_edges[node_id].values()) + list(self.in_edges[node_id].values()):
+                    if id(edge) not in seen:
+                        seen.add(id(edge))
+                        edges.append(edge)
+
+        for edge in edges:
+            if edge.get("type") not in REWIRABLE_TYPES:
+                continue
+            fan = len(self.out_edges[edge["from_node"]]) > 1 or len(self.in_edges[edge["to_node"]]) > 1
+            edge["type"] = "parallel" if fan else "direct"
+
+    # ------------------------------------------------------------------
+    # 변환
+    # ------------------------------------------------------------------
+
+    def to_nodes(self) -> List[Dict[str, Any]]:
+        return [node for node in self.nodes.values() if node.get("type") != "unknown" or node.get("name")]
+
+    def to_connections(self) -> List[Dict[str, Any]]:
+        return self.edges() + list(self.loop_back_edges)
@@ -4,80 +4,506 @@
 생성된 워크플로우를 최적화합니다.
 """
 
+import heapq
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 
+from .dag_scheduler import build_execution_plan, flatten_stages
+from .workflow_graph import WorkflowGraph, REWIRABLE_TYPES
+
+# 최적화 목표별로 적용할 그래프 재작성 패스
+OPTIMIZATION_PASSES = {
+    "speed": ["parallelize_chains", "merge_duplicates", "reorder_cheap_first"],
+    "cost": ["merge_duplicates", "reorder_cheap_first"],
+    "reliability": ["merge_duplicates"]
+}
+
 class WorkflowOptimizer:
     """워크플로우를 최적화하는 클래스"""
     
+    # 패스 이름 → 구현 메서드
+    PASSES = {
+        "parallelize_chains": "_pass_parallelize_chains",
+        "merge_duplicates": "_pass_merge_duplicates",
+        "reorder_cheap_first": "_pass_reorder_cheap_first"
+    }
+    
+    def __init__(self, pareto_defaults: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            pareto_defaults: pareto 목표의 기본 옵션 (ParetoOptimizer.optimize() 인자, 예: {"time_budget_ms": 2000})
+        """
+        self.pareto_defaults = dict(pareto_defaults or {})
+    
     def optimize(self,
                 workflow: Dict[str, Any],
-                optimization_goal: str = "speed") -> Dict[str, Any]:
+                optimization_goal: str = "speed",
+                passes: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         워크플로우를 최적화합니다.
         
         Args:
             workflow: 워크플로우 정보
-            optimization_goal: 최적화 목표 (speed, cost, reliability)
+            optimization_goal: 최적화 목표 (speed, cost, reliability, pareto)
+            passes: 적용할 재작성 패스 목록 (None이면 목표별 기본 패스)
             
         Returns:
             최적화된 워크플로우
         """
+        if optimization_goal == "pareto":
+            if passes is not None:
+                raise ValueError("pareto 목표는 재작성 패스 조합을 직접 탐색하므로 passes를 지정할 수 없습니다")
+            return self.optimize_pareto(workflow)
+        if passes is None:
+            passes = OPTIMIZATION_PASSES.get(optimization_goal, [])
+        unknown = [name for name in passes if name not in self.PASSES]
+        if unknown:
+            raise ValueError(f"알 수 없는 최적화 패스: {', '.join(unknown)}")
+        
+        graph = WorkflowGraph(workflow)
+        before = self._measure(graph)
+        pass_reports = []
+        
+        if before["has_cycle"]:
+            pass_reports.append({
+                "name": "all",
+                "applied": False,
+                "reason": f"순환 연결이 있어 재작성을 건너뜀: {', '.join(before['cyclic_nodes'])}"
+            })
+        else:
+            for name in passes:
+                pass_before = self._measure(graph)
+                changes = getattr(self, self.PASSES[name])(graph)
+                pass_after = self._measure(graph)
+                pass_reports.append({
+                    "name": name,
+                    "applied": bool(changes),
+                    "changes": changes,
+                    "critical_path_before_ms": pass_before["makespan_ms"],
+                    "critical_path_after_ms": pass_after["makespan_ms"],
+                    "improvement_ms": pass_before["makespan_ms"] - pass_after["makespan_ms"]
+                })
+        
+        optimized_workflow = self._build_workflow(workflow, graph, optimization_goal)
+        after = self._measure(graph)
+        
         optimized = {
             "timestamp": datetime.now().isoformat(),
             "original_workflow_id": workflow.get("workflow_id"),
             "optimization_goal": optimization_goal,
             "recommendations": [],
-            "optimized_workflow": workflow.copy(),
-            "improvement_metrics": {}
+            "optimized_workflow": optimized_workflow,
+            "optimization_passes": pass_reports,
+            "improvement_metrics": self._improvement_metrics(before, after)
         }
         
+        applied = [self._pass_recommendation(report) for report in pass_reports if report.get("applied")]
+        
         if optimization_goal == "speed":
-            optimized["recommendations"] = self._optimize_for_speed(workflow)
-            optimized["improvement_metrics"] = {
-                "potential_speedup": "30-50%",
-                "focus": "병렬 처리 및 캐싱"
-            }
+            optimized["recommendations"] = applied + self._optimize_for_speed(optimized_workflow)
+            optimized["improvement_metrics"]["focus"] = "병렬 처리 및 캐싱"
         
         elif optimization_goal == "cost":
-            optimized["recommendations"] = self._optimize_for_cost(workflow)
-            optimized["improvement_metrics"] = {
-                "potential_savings": "20-40%",
-                "focus": "API 호출 수 감소"
-            }
+            optimized["recommendations"] = applied + self._optimize_for_cost(optimized_workflow)
+            optimized["improvement_metrics"]["focus"] = "API 호출 수 감소"
         
         elif optimization_goal == "reliability":
-            optimized["recommendations"] = self._optimize_for_reliability(workflow)
-            optimized["improvement_metrics"] = {
-                "reliability_improvement": "99%+",
-                "focus": "오류 처리 및 재시도"
-            }
+            optimized["recommendations"] = applied + self._optimize_for_reliability(optimized_workflow)
+            optimized["improvement_metrics"]["focus"] = "오류 처리 및 재시도"
         
         return optimized
+
+    def optimize_incremental(self,
+                             previous: Dict[str, Any],
+                             diff: Dict[str, Any],
+                             optimization_goal: Optional[str] = None) -> Dict[str, Any]:
+        """
+        이전 최적화 결과에 그래프 변경분만 반영해 다시 최적화합니다.
+        편집을 반복할 때는 OptimizationSession을 유지하면 세션 구성 비용 없이 변경 크기에 비례해 처리됩니다.
+
+        Args:
+            previous: optimize() 결과 (또는 그 optimized_workflow)
+            diff: 그래프 변경분 (services.incremental_optimizer 참고)
+            optimization_goal: 최적화 목표 (None이면 이전 결과의 목표)
+
+        Returns:
+            증분 최적화 보고서 (optimized_workflow 포함)
+        """
+        from .incremental_optimizer import OptimizationSession
+
+        goal = optimization_goal or previous.get("optimization_goal") \
+            or previous.get("metadata", {}).get("optimized_for", "speed")
+        session = OptimizationSession(previous, goal, self)
+        report = session.apply(diff)
+        report["optimized_workflow"] = session.workflow()
+        return report
+
+    def optimize_pareto(self, workflow: Dict[str, Any], **options: Any) -> Dict[str, Any]:
+        """
+        속도(p95)·비용·신뢰성을 함께 고려해 재작성 후보를 탐색하고 파레토 프론티어에서 하나를 선택합니다.
+
+        Args:
+            workflow: 워크플로우 정보
+            **options: ParetoOptimizer.optimize() 인자 (tool_model, constraints, weights, time_budget_ms,
+                max_retries, max_frontier, seed, verify_trials)
+
+        Returns:
+            선택한 변형의 최적화 결과 (pareto 항목에 프론티어와 선택 근거 포함)
+        """
+        from .pareto_optimizer import ParetoOptimizer
+
+        return ParetoOptimizer(self).optimize(workflow, **dict(self.pareto_defaults, **options))
+
+    def _measure(self, graph: WorkflowGraph) -> Dict[str, Any]:
+        """그래프의 임계 경로 지연과 작업량을 측정합니다."""
+        plan = build_execution_plan(graph.to_nodes(), graph.to_connections())
+        process_nodes = [n for n in graph.nodes.values() if n.get("type") == "process"]
+        return {
+            "plan": plan,
+            "makespan_ms": plan["makespan_ms"],
+            "has_cycle": plan["has_cycle"],
+            "cyclic_nodes": plan["cyclic_nodes"],
+            "node_count": len(graph.nodes),
+            "tool_invocations": len(process_nodes),
+            "total_work_ms": plan["sequential_time_ms"]
+        }
+    
+    def _improvement_metrics(self, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """최적화 전후의 측정값으로 개선 지표를 계산합니다."""
+        before_ms = before["makespan_ms"]
+        after_ms = after["makespan_ms"]
+        return {
+            "critical_path_before_ms": before_ms,
+            "critical_path_after_ms": after_ms,
+            "latency_reduction_pct": round((before_ms - after_ms) / before_ms * 100, 1) if before_ms else 0.0,
+            "speedup": round(before_ms / after_ms, 3) if after_ms else None,
+            "stage_count_before": before["plan"]["stage_count"],
+            "stage_count_after": after["plan"]["stage_count"],
+            "node_count_before": before["node_count"],
+            "node_count_after": after["node_count"],
+            "tool_invocations_before": before["tool_invocations"],
+            "tool_invocations_after": after["tool_invocations"],
+            "total_work_before_ms": before["total_work_ms"],
+            "total_work_after_ms": after["total_work_ms"]
+        }
+    
+    def _build_workflow(self,
+                        workflow: Dict[str, Any],
+                        graph: WorkflowGraph,
+                        optimization_goal: str) -> Dict[str, Any]:
+        """재작성된 그래프로 실행 가능한 워크플로우 문서를 구성합니다."""
+        nodes = graph.to_nodes()
+        connections = graph.to_connections()
+        execution_plan = build_execution_plan(nodes, connections)
+        
+        optimized_workflow = dict(workflow)
+        optimized_workflow["nodes"] = nodes
+        optimized_workflow["connections"] = connections
+        optimized_workflow["execution_order"] = flatten_stages(execution_plan)
+        optimized_workflow["execution_plan"] = execution_plan
+        if "tool_mappings" in workflow:
+            optimized_workflow["tool_mappings"] = {
+                n["id"]: n.get("tool_id") for n in nodes if n.get("type") == "process"
+            }
+        metadata = dict(workflow.get("metadata", {}))
+        metadata["optimized_for"] = optimization_goal
+        optimized_workflow["metadata"] = metadata
+        return optimized_workflow
+    
+    def _pass_recommendation(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """적용된 패스를 추천 항목 형태로 요약합니다."""
+        descriptions = {
+            "parallelize_chains": ("parallelization", "독립적인 순차 노드를 병렬 분기/합류로 재작성"),
+            "merge_duplicates": ("duplicate_merge", "같은 입력으로 같은 도구를 호출하는 노드를 하나로 병합"),
+            "reorder_cheap_first": ("reordering", "순차 구간에서 빠른 노드를 느린 노드보다 먼저 실행")
+        }
+        rec_type, description = descriptions[report["name"]]
+        before_ms = report["critical_path_before_ms"]
+        improvement_pct = round(report["improvement_ms"] / before_ms * 100, 1) if before_ms else 0.0
+        return {
+            "type": rec_type,
+            "priority": "high",
+            "description": description,
+            "implementation": f"optimized_workflow에 적용됨 ({len(report['changes'])}건 변경)",
+            "estimated_improvement": f"{improvement_pct}%",
+            "critical_path_before_ms": before_ms,
+            "critical_path_after_ms": report["critical_path_after_ms"],
+            "applied": True
+        }
+    
+    # ------------------------------------------------------------------
+    # 재작성 패스
+    # ------------------------------------------------------------------
+    
+    def _pass_parallelize_chains(self,
+                                 graph: WorkflowGraph,
+                                 scope: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        실제 의존성이 없는 direct 연결(u → v)을 끊고 v가 u와 같은 시점에 시작하도록 재배선합니다.
+        
+        u의 선행 노드를 v의 선행 노드로, v의 후속 노드를 u의 후속 노드로 추가하므로
+        u → v 를 제외한 모든 실행 순서 제약은 유지됩니다.
+        scope가 있으면 그 노드들에 닿는 연결에서만 시작합니다 (증분 최적화).
+        """
+        changes = []
+        added = []
+        removed = set()
+        touched = set()
+        if scope is None:
+            order = graph.topological_order()
+            candidates = [(u, v) for u in order for v in graph.successors(u)]
+        else:
+            candidates = []
+            for node_id in graph.topological_order(scope):
+                candidates += [(p, node_id) for p in graph.predecessors(node_id)]
+                candidates += [(node_id, s) for s in graph.successors(node_id)]
+            candidates = list(dict.fromkeys(candidates))
+        worklist = [(u, v) for u, v in candidates if graph.edge(u, v).get("type") == "direct"]
+        
+        while worklist:
+            u, v = worklist.pop(0)
+            edge = graph.edge(u, v)
+            if edge is None or edge.get("type") != "direct":
+                continue
+            if not (graph.is_process(u) and graph.is_process(v)) or graph.depends_on(v, u):
+                continue
+            
+            graph.remove_edge(u, v)
+            removed.add((u, v))
+            touched.update((u, v))
+            rewired = [(predecessor, v, graph.edge(predecessor, u)) for predecessor in graph.predecessors(u)]
+            rewired += [(u, successor, graph.edge(v, successor)) for successor in graph.successors(v)]
+            for source, target, template in rewired:
+                # 이미 의존성이 없다고 판정된 연결은 다시 만들지 않음
+                if (source, target) in removed:
+                    continue
+                if graph.add_edge(source, target, template.get("type", "direct"), template.get("condition")):
+                    added.append((source, target))
+                    worklist.append((source, target))
+                    touched.update((source, target))
+            changes.append({"removed_edge": [u, v], "reason": f"{v}는 {u}의 결과를 사용하지 않음"})
+        
+        # 재배선으로 생긴 중복 경로(다른 경로로 이미 보장되는 순서) 제거
+        for source, target in added:
+            edge = graph.edge(source, target)
+            if edge is not None and edge.get("type") in REWIRABLE_TYPES \
+                    and graph.reachable(source, target, skip_edge=(source, target)):
+                graph.remove_edge(source, target)
+        
+        if changes:
+            graph.retype_edges(None if scope is None else touched)
+        return changes
+    
+    def _pass_merge_duplicates(self,
+                               graph: WorkflowGraph,
+                               scope: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        같은 선행 노드와 같은 인자로 같은 도구를 호출하는 처리 노드를 병합합니다.
+        scope가 있으면 그 노드들과 선행 노드가 같은 형제 노드만 비교합니다 (증분 최적화).
+        """
+        changes = []
+        
+        if scope is None:
+            kept_by_key: Dict[Any, str] = {}
+            for node_id in graph.topological_order():
+                key = self._merge_key(graph, node_id)
+                if key is None:
+                    continue
+                kept_id = kept_by_key.get(key)
+                if kept_id is None:
+                    kept_by_key[key] = node_id
+                    continue
+                changes.append(self._merge_node(graph, node_id, kept_id))
+            if changes:
+                graph.retype_edges()
+            return changes
+        
+        touched = set()
+        worklist = graph.topological_order(scope)
+        queued = set(worklist)
+        while worklist:
+            node_id = worklist.pop(0)
+            queued.discard(node_id)
+            key = self._merge_key(graph, node_id)
+            if key is None:
+                continue
+            predecessors = graph.predecessors(node_id)
+            if predecessors:
+                siblings = graph.successors(min(predecessors, key=lambda p: len(graph.out_edges[p])))
+            else:
+                siblings = graph.nodes_with_tool(key[0])
+            duplicate = next((other for other in siblings
+                              if other != node_id and self._merge_key(graph, other) == key), None)
+            if duplicate is None:
+                continue
+            
+            # 위상 순서상 앞선 노드를 남김 (전체 패스와 같은 규칙)
+            kept_id, merged_id = graph.topological_order([node_id, duplicate])
+            successors = graph.successors(merged_id)
+            touched.update([kept_id] + predecessors + successors)
+            changes.append(self._merge_node(graph, merged_id, kept_id))
+            queued.discard(merged_id)
+            for successor in successors:
+                if successor not in queued:
+                    queued.add(successor)
+                    worklist.append(successor)
+        
+        if changes:
+            graph.retype_edges(touched)
+        return changes
+    
+    def _merge_key(self, graph: WorkflowGraph, node_id: str) -> Optional[tuple]:
+        """병합 비교 키 (도구, 선행 노드 집합, 인자), 병합 대상이 아니면 None"""
+        node = graph.nodes.get(node_id)
+        if node is None or node.get("type") != "process" or not node.get("tool_id"):
+            return None
+        return (
+            node["tool_id"],
+            frozenset(graph.predecessors(node_id)),
+            json.dumps(node.get("arguments"), sort_keys=True, default=str)
+        )
+    
+    def _merge_node(self, graph: WorkflowGraph, node_id: str, kept_id: str) -> Dict[str, Any]:
+        """node_id를 kept_id로 병합하고 변경 내역을 반환합니다."""
+        node = graph.nodes[node_id]
+        kept = graph.nodes[kept_id]
+        kept["retry_count"] = max(kept.get("retry_count", 0), node.get("retry_count", 0))
+        kept["timeout_ms"] = max(kept.get("timeout_ms", 0), node.get("timeout_ms", 0))
+        kept["merged_from"] = kept.get("merged_from", []) + [node_id]
+        graph.node_changed(kept_id)
+        graph.redirect_node(node_id, kept_id)
+        return {"merged_node": node_id, "into": kept_id, "tool_id": node["tool_id"]}
+    
+    def _pass_reorder_cheap_first(self,
+                                  graph: WorkflowGraph,
+                                  scope: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """
+        순차(direct) 처리 체인 안에서 의존성이 허용하는 한 빠른 노드를 먼저 실행하도록 재정렬합니다.
+        
+        체인 전체 소요 시간은 같지만 앞 노드의 결과가 더 빨리 나오고,
+        느린 노드보다 먼저 실패를 감지할 수 있습니다.
+        scope가 있으면 그 노드들이 속한 체인만 재정렬합니다 (증분 최적화).
+        """
+        changes = []
+        
+        for chain in self._find_direct_chains(graph, scope):
+            reordered = self._cheap_first_order(graph, chain)
+            if reordered == chain:
+                continue
+            
+            first, last = chain[0], chain[-1]
+            incoming = [(p, dict(graph.edge(p, first))) for p in graph.predecessors(first)]
+            outgoing = [(s, dict(graph.edge(last, s))) for s in graph.successors(last)]
+            for p, _ in incoming:
+                graph.remove_edge(p, first)
+            for s, _ in outgoing:
+                graph.remove_edge(last, s)
+            for u, v in zip(chain, chain[1:]):
+                graph.remove_edge(u, v)
+            
+            for p, edge in incoming:
+                graph.add_edge(p, reordered[0], edge.get("type", "direct"), edge.get("condition"))
+            for u, v in zip(reordered, reordered[1:]):
+                graph.add_edge(u, v, "direct")
+            for s, edge in outgoing:
+                graph.add_edge(reordered[-1], s, edge.get("type", "direct"), edge.get("condition"))
+            for edge in graph.loop_back_edges:
+                if edge.get("to_node") == first:
+                    edge["to_node"] = reordered[0]
+                if edge.get("from_node") == last:
+                    edge["from_node"] = reordered[-1]
+            
+            changes.append({"chain": chain, "reordered": reordered})
+        
+        return changes
+    
+    def _find_direct_chains(self,
+                            graph: WorkflowGraph,
+                            scope: Optional[Set[str]] = None) -> List[List[str]]:
+        """direct 연결로만 이어진 2개 이상 처리 노드의 최대 체인을 찾습니다 (scope가 있으면 그 노드가 속한 체인만)."""
+        def chain_link(u: str) -> Optional[str]:
+            successors = graph.successors(u)
+            if len(successors) != 1:
+                return None
+            v = successors[0]
+            if not graph.is_process(v) or len(graph.predecessors(v)) != 1:
+                return None
+            if graph.edge(u, v).get("type") != "direct":
+                return None
+            return v
+        
+        def chain_middle(v: str) -> Optional[str]:
+            """v가 체인 중간 노드이면 체인상의 앞 노드를 반환"""
+            predecessors = graph.predecessors(v)
+            if len(predecessors) == 1 and graph.is_process(predecessors[0]) \
+                    and chain_link(predecessors[0]) == v:
+                return predecessors[0]
+            return None
+        
+        if scope is None:
+            heads = [node_id for node_id in graph.topological_order()
+                     if graph.is_process(node_id) and chain_middle(node_id) is None]
+        else:
+            heads = []
+            for node_id in graph.topological_order(scope):
+                if not graph.is_process(node_id):
+                    continue
+                previous = chain_middle(node_id)
+                while previous is not None:
+                    node_id, previous = previous, chain_middle(previous)
+                heads.append(node_id)
+            heads = list(dict.fromkeys(heads))
+        
+        chains = []
+        for node_id in heads:
+            chain = [node_id]
+            while True:
+                following = chain_link(chain[-1])
+                if following is None:
+                    break
+                chain.append(following)
+            if len(chain) > 1:
+                chains.append(chain)
+        return chains
+    
+    def _cheap_first_order(self, graph: WorkflowGraph, chain: List[str]) -> List[str]:
+        """체인 내부 의존성을 지키면서 소요 시간이 짧은 노드부터 나열합니다."""
+        position = {node_id: i for i, node_id in enumerate(chain)}
+        blockers = {
+            node_id: {other for other in chain[:position[node_id]] if graph.depends_on(node_id, other)}
+            for node_id in chain
+        }
+        ready = []
+        for node_id in chain:
+            if not blockers[node_id]:
+                heapq.heappush(ready, (graph.nodes[node_id].get("estimated_time_ms", 0), position[node_id], node_id))
+        
+        order = []
+        while ready:
+            _, _, node_id = heapq.heappop(ready)
+            order.append(node_id)
+            for other in chain:
+                if node_id in blockers[other]:
+                    blockers[other].discard(node_id)
+                    if not blockers[other]:
+                        heapq.heappush(ready, (graph.nodes[other].get("estimated_time_ms", 0), position[other], other))
+        return order
+    
+    # ------------------------------------------------------------------
+    # 추가 권장 사항
+    # ------------------------------------------------------------------
     
     def _optimize_for_speed(self, workflow: Dict[str, Any]) -> List[Dict[str, Any]]:
         """속도 최적화 추천사항을 반환합니다."""
         recommendations = []
         
-        connections = workflow.get("connections", [])
-        sequential_count = sum(1 for c in connections if c.get("type") == "direct")
-        
-        if sequential_count > 1:
-            recommendations.append({
-                "type": "parallelization",
-                "priority": "high",
-                "description": "독립적인 노드들을 병렬 처리로 변경",
-                "implementation": "현재 순차 노드 중 독립적인 노드를 병렬 실행",
-                "estimated_improvement": "30-50%",
-                "implementation_complexity": "medium"
-            })
-        
         recommendations.append({
             "type": "caching",
             "priority": "high",
-            "description": "자주 사용되는 데이터 캐싱",
-            "implementation": "반복 요청 데이터에 메모리 캐시 추가",
+            "description": "같은 인자의 도구 호출 결과 재사용",
+            "implementation": "execute_workflow의 memoize=true로 도구 id + 인자 + 입력 해시 기준 메모이제이션 "
+                              "(TTL은 TOOL_MEMO_CATEGORY_TTLS, 프로세스 간 공유는 TOOL_MEMO_SQLITE_PATH)",
             "estimated_improvement": "20-40% (반복 요청 시)",
             "implementation_complexity": "low"
         })
@@ -0,0 +1,560 @@
+# src/services/workflow_runtime.py
+"""
+워크플로우 실행 런타임
+recommend_nodes/optimize_workflow 결과의 노드와 연결을 asyncio로 실제 실행합니다.
+선행 노드가 모두 끝난 노드를 바로 시작하므로 병렬 연결은 동시에 실행되며(전역 동시 실행 수 제한),
+노드별 타임아웃, 지수 backoff 재시도, loop_back 반복을 지원하고 실제 노드별 소요 시간을 보고합니다.
+도구는 도구 id별로 등록한 로컬 처리기로 실행하며, 등록되지 않은 카탈로그 도구는 결정적 stub으로 실행합니다.
+주어진 도구 인자는 카탈로그의 inputSchema로 검증하고, memoize를 켜면 도구 호출을 ToolCallMemo
+(도구 id + 인자 + 처리기가 받는 노드/입력/선행 결과/반복 차수의 해시)로 실행해 같은 호출의 결과를 재사용합니다.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import time
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
+
+from config.tools_config import get_catalog
+from .dag_scheduler import build_execution_plan, build_graph, LOOP_BACK
+from .tool_memo import ToolArgumentError, ToolCallMemo, canonical_json, validate_arguments
+
+# 노드 실행 상태
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+# 메모이제이션할 수 없는 호출의 시도별 memo 표시 (카탈로그에 없는 도구, JSON으로 표현할 수 없는 입력)
+UNCACHEABLE = "uncacheable"
+
+# stub 처리기 동작 기본값 (stub_model의 default/tools/nodes 항목으로 변경)
+DEFAULT_STUB_SPEC = {
+    "latency_ms": None,       # None이면 노드(없으면 카탈로그)의 estimated_time_ms
+    "fail_attempts": 0,       # 처음 N번의 시도는 오류를 냄 (재시도 동작 확인용)
+    "error": "stub 도구 오류"
+}
+
+
+class StubToolError(RuntimeError):
+    """stub 처리기가 fail_attempts 설정에 따라 내는 오류"""
+
+
+class StubToolHandler:
+    """
+    카탈로그 도구의 결정적 stub 처리기
+    설정된 지연만큼 기다린 뒤, 도구 id/입력/선행 노드 결과에서 만든 해시를 결과로 반환합니다.
+    같은 입력에는 항상 같은 결과와 같은 지연을 냅니다 (난수 없음).
+    """
+
+    def __init__(self,
+                 tool_id: str,
+                 spec: Dict[str, Any],
+                 stub_model: Optional[Dict[str, Any]] = None,
+                 time_scale: float = 1.0):
+        """
+        Args:
+            tool_id: 도구 id
+            spec: 카탈로그의 도구 정의
+            stub_model: {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}}}
+                항목: latency_ms, fail_attempts, error
+            time_scale: 지연에 곱할 배율 (런타임과 같은 값)
+        """
+        self.tool_id = tool_id
+        self.spec = spec
+        self.stub_model = stub_model or {}
+        self.time_scale = time_scale
+
+    def settings(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """기본값 → 도구별 → 노드별 순서로 stub 설정을 병합합니다."""
+        settings = dict(DEFAULT_STUB_SPEC)
+        settings.update(self.stub_model.get("default", {}))
+        settings.update(self.stub_model.get("tools", {}).get(self.tool_id, {}))
+        settings.update(self.stub_model.get("nodes", {}).get(node.get("id"), {}))
+        if settings["latency_ms"] is None:
+            settings["latency_ms"] = node.get("estimated_time_ms", self.spec.get("estimated_time_ms", 0))
+        return settings
+
+    async def __call__(self, node: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+        settings = self.settings(node)
+        await asyncio.sleep(max(float(settings["latency_ms"] or 0), 0.0) * self.time_scale / 1000)
+        if payload["attempt"] <= int(settings["fail_attempts"]):
+            raise StubToolError(settings["error"])
+
+        upstream = {node_id: (output or {}).get("digest") if isinstance(output, dict) else output
+                    for node_id, output in sorted(payload["upstream"].items())}
+        source = json.dumps([self.tool_id, payload["inputs"], payload.get("arguments", {}), upstream], sort_keys=True,
+                            ensure_ascii=False, default=str)
+        return {
+            "tool_id": self.tool_id,
+            "node_id": node.get("id"),
+            "iteration": payload["iteration"],
+            "digest": hashlib.sha1(source.encode("utf-8")).hexdigest()[:16],
+            "summary": f"{self.spec.get('name', self.tool_id)} 결과 (stub)"
+        }
+
+
+class _Loop:
+    """loop_back 연결의 출발 노드 하나가 제어하는 반복 구간"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.targets: List[str] = []
+        self.body: Set[str] = set()
+        self.condition: Optional[str] = None
+        self.iteration = 1
+
+
+class WorkflowRuntime:
+    """워크플로우를 asyncio로 실행하는 클래스"""
+
+    def __init__(self,
+                 handlers: Optional[Dict[str, Callable[..., Any]]] = None,
+                 concurrency_limit: int = 8,
+                 default_timeout_ms: float = 30000.0,
+                 retry_backoff_ms: float = 100.0,
+                 memo: Optional[ToolCallMemo] = None):
+        """
+        Args:
+            handlers: {도구 id: 처리기} 처리기는 handler(node, payload)를 받는 async 함수
+                (일반 함수는 스레드에서 실행) payload는 {"inputs", "arguments", "upstream", "attempt", "iteration"}
+            concurrency_limit: 동시에 실행할 수 있는 도구 호출 수 (전체 워크플로우 기준)
+            default_timeout_ms: 노드에 timeout_ms가 없을 때의 시도당 제한 시간
+            retry_backoff_ms: n번째 재시도 전 대기 시간 backoff * 2^(n-1)
+            memo: run(memoize=True)에서 사용할 도구 호출 결과 저장소 (없으면 런타임 전용 저장소를 만듦)
+        """
+        if concurrency_limit < 1:
+            raise ValueError("concurrency_limit는 1 이상이어야 합니다")
+        self.handlers: Dict[str, Callable[..., Any]] = dict(handlers or {})
+        self.concurrency_limit = concurrency_limit
+        self.default_timeout_ms = default_timeout_ms
+        self.retry_backoff_ms = retry_backoff_ms
+        self.memo = memo
+
+    def register(self, tool_id: str, handler: Callable[..., Any]) -> None:
+        """도구 id의 로컬 처리기를 등록합니다 (stub 대신 사용)."""
+        self.handlers[tool_id] = handler
+
+    def handler_for(self,
+                    tool_id: Optional[str],
+                    stub_model: Optional[Dict[str, Any]] = None,
+                    time_scale: float = 1.0) -> Optional[Callable[..., Any]]:
+        """등록된 처리기, 없으면 카탈로그 도구의 stub 처리기 (카탈로그에도 없으면 None)"""
+        handler = self.handlers.get(tool_id)
+        if handler is not None:
+            return handler
+        spec = get_catalog().tools.get(tool_id)
+        if spec is None:
+            return None
+        return StubToolHandler(tool_id, spec, stub_model, time_scale)
+
+    def run_sync(self, workflow: Dict[str, Any], **options: Any) -> Dict[str, Any]:
+        """이벤트 루프가 없는 스레드(도구 실행기 풀 등)에서 run()을 실행합니다."""
+        return asyncio.run(self.run(workflow, **options))
+
+    async def run(self,
+                  workflow: Dict[str, Any],
+                  inputs: Optional[Dict[str, Any]] = None,
+                  stub_model: Optional[Dict[str, Any]] = None,
+                  loop_iterations: int = 1,
+                  conditions: Optional[Dict[str, bool]] = None,
+                  time_scale: float = 1.0,
+                  arguments: Optional[Dict[str, Dict[str, Any]]] = None,
+                  memoize: bool = False) -> Dict[str, Any]:
+        """
+        워크플로우를 실행합니다.
+
+        Args:
+            workflow: nodes/connections를 가진 워크플로우 (recommend_nodes 결과 등)
+            inputs: 모든 처리기에 전달할 실행 입력
+            stub_model: stub 처리기 설정 (StubToolHandler 참고)
+            loop_iterations: loop_back 구간의 최대 반복 횟수
+            conditions: {조건 이름: 참/거짓} 연결의 condition 평가 결과 (없는 조건은 참)
+                loop_back 연결의 조건이 거짓이면 반복을 멈춤
+            time_scale: 지연, 타임아웃, backoff에 곱할 배율 (예: 0.01이면 100배 빠르게 실행,
+                0이면 기다리지 않고 타임아웃도 적용하지 않음)
+            arguments: {노드 id 또는 도구 id: 도구 인자} 노드 id 항목이 도구 id 항목보다 우선
+                카탈로그 도구의 인자는 memoize와 관계없이 inputSchema로 검증 (필수 인자는 inputs/선행 결과로
+                채워질 수 있으므로 주어진 인자만 검증, 맞지 않으면 invalid_arguments로 실패)
+            memoize: 도구 호출을 도구 id + 인자 + 처리기가 받는 노드/입력/선행 결과/반복 차수 기준으로 메모이제이션
+                (같은 호출은 저장된 결과를 쓰거나 실행 중인 호출의 결과를 함께 받음)
+
+        Returns:
+            실행 상태, 실제 총 소요 시간, 노드별 실행(반복/시도) 시각과 소요 시간, 처리 노드 결과
+        """
+        if loop_iterations < 1:
+            raise ValueError("loop_iterations는 1 이상이어야 합니다")
+        if time_scale < 0:
+            raise ValueError("time_scale은 0 이상이어야 합니다")
+        nodes = workflow.get("nodes", [])
+        connections = workflow.get("connections", [])
+        if not nodes:
+            raise ValueError("실행할 노드가 없습니다")
+
+        plan = build_execution_plan(nodes, connections)
+        if plan["has_cycle"]:
+            raise ValueError(f"순환 연결이 있는 워크플로우는 실행할 수 없습니다: {plan['cyclic_nodes']}")
+
+        memo = None
+        if memoize:
+            if self.memo is None:
+                self.memo = ToolCallMemo()
+            memo = self.memo
+        execution = _Execution(self, workflow, plan, inputs or {}, stub_model, loop_iterations,
+                               conditions or {}, time_scale, arguments or {}, memo)
+        return await execution.run()
+
+
+class _Execution:
+    """워크플로우 한 번의 실행 상태"""
+
+    def __init__(self,
+                 runtime: WorkflowRuntime,
+                 workflow: Dict[str, Any],
+                 plan: Dict[str, Any],
+                 inputs: Dict[str, Any],
+                 stub_model: Optional[Dict[str, Any]],
+                 loop_iterations: int,
+                 conditions: Dict[str, bool],
+                 time_scale: float,
+                 arguments: Dict[str, Dict[str, Any]],
+                 memo: Optional[ToolCallMemo]):
+        self.runtime = runtime
+        self.workflow = workflow
+        self.plan = plan
+        self.inputs = inputs
+        self.stub_model = stub_model
+        self.loop_iterations = loop_iterations
+        self.conditions = conditions
+        self.time_scale = time_scale
+        self.arguments = arguments
+        self.memo = memo
+
+        connections = workflow.get("connections", [])
+        graph = build_graph(workflow["nodes"], connections)
+        self.node_ids: List[str] = graph["node_ids"]
+        self.predecessors: Dict[str, List[str]] = graph["predecessors"]
+        self.successors: Dict[str, List[str]] = graph["successors"]
+        self.nodes: Dict[str, Dict[str, Any]] = {node_id: {"id": node_id, "type": "unknown"}
+                                                 for node_id in self.node_ids}
+        for node in workflow["nodes"]:
+            self.nodes[node["id"]] = node
+        self.edge_conditions: Dict[Tuple[str, str], Any] = {
+            (c.get("from_node"), c.get("to_node")): c.get("condition")
+            for c in connections if c.get("type") != LOOP_BACK
+        }
+
+        # loop_back 출발 노드별 반복 구간 (같은 출발 노드의 연결은 한 구간으로 합침)
+        self.loops: Dict[str, _Loop] = {}
+        for loop in plan["loops"]:
+            entry = self.loops.setdefault(loop["from_node"], _Loop(loop["from_node"]))
+            entry.targets.append(loop["to_node"])
+            entry.body.update(loop["body"])
+            entry.condition = entry.condition or loop.get("condition")
+        self.loop_of: Dict[str, _Loop] = {}
+        for loop in self.loops.values():
+            for node_id in loop.body:
+                self.loop_of.setdefault(node_id, loop)
+
+        self.status: Dict[str, Optional[str]] = {node_id: None for node_id in self.node_ids}
+        self.remaining: Dict[str, int] = {}
+        self.taken: Dict[str, bool] = {}
+        self.blocked: Dict[str, bool] = {}
+        self.outputs: Dict[str, Any] = {}
+        self.runs: Dict[str, List[Dict[str, Any]]] = {node_id: [] for node_id in self.node_ids}
+
+        self.semaphore = asyncio.Semaphore(runtime.concurrency_limit)
+        self.tasks: Set[asyncio.Task] = set()
+        self.active = 0
+        self.max_active = 0
+        self.started = 0.0
+
+    # ------------------------------------------------------------------
+    # 스케줄링
+    # ------------------------------------------------------------------
+
+    async def run(self) -> Dict[str, Any]:
+        self.started = time.perf_counter()
+        for node_id in self.node_ids:
+            self.remaining[node_id] = len(self.predecessors[node_id])
+            self.taken[node_id] = False
+            self.blocked[node_id] = False
+        for node_id in self.node_ids:
+            if self.remaining[node_id] == 0:
+                self._launch(node_id)
+
+        try:
+            while self.tasks:
+                done, _ = await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self.tasks.discard(task)
+                    node_id, status = task.result()
+                    self._resolve(node_id, status)
+        finally:
+            for task in self.tasks:
+                task.cancel()
+
+        return self._report((time.perf_counter() - self.started) * 1000)
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def _condition(self, condition: Any) -> bool:
+        return condition is None or bool(self.conditions.get(condition, True))
+
+    def _launch(self, node_id: str) -> None:
+        self.status[node_id] = "running"
+        self.tasks.add(asyncio.ensure_future(self._run_node(node_id)))
+
+    def _resolve(self, node_id: str, status: str) -> None:
+        """노드가 끝나면(건너뜀/취소 포함) 후속 노드에 알리고, 반복 구간의 끝이면 반복 여부를 정합니다."""
+        self.status[node_id] = status
+        loop = self.loops.get(node_id)
+        if loop is not None:
+            if (status == SUCCEEDED and loop.iteration < self.loop_iterations
+                    and self._condition(loop.condition)):
+                self._restart(loop)
+                return
+            # 반복을 마치면 구간 밖으로 나가는 연결을 마지막 반복 결과로 알림
+            for body_node in self.node_ids:
+                if body_node in loop.body:
+                    for successor in self.successors[body_node]:
+                        if successor not in loop.body:
+                            self._notify(body_node, successor)
+
+        own_loop = self.loop_of.get(node_id)
+        for successor in self.successors[node_id]:
+            if own_loop is not None and successor not in own_loop.body:
+                continue  # 반복이 끝날 때 알림
+            self._notify(node_id, successor)
+
+    def _notify(self, source: str, target: str) -> None:
+        self.remaining[target] -= 1
+        status = self.status[source]
+        if status in (FAILED, CANCELLED):
+            self.blocked[target] = True
+        elif status == SUCCEEDED and self._condition(self.edge_conditions.get((source, target))):
+            self.taken[target] = True
+        if self.remaining[target] == 0:
+            self._decide(target)
+
+    def _decide(self, node_id: str) -> None:
+        """선행 노드가 모두 끝난 노드를 실행하거나, 건너뛰거나, 취소합니다."""
+        if self.blocked[node_id]:
+            self._finish_without_running(node_id, CANCELLED)
+        elif self.taken[node_id] or not self.predecessors[node_id]:
+            self._launch(node_id)
+        else:
+            self._finish_without_running(node_id, SKIPPED)
+
+    def _finish_without_running(self, node_id: str, status: str) -> None:
+        self.runs[node_id].append({
+            "iteration": self._iteration(node_id),
+            "status": status,
+            "start_ms": round(self._elapsed_ms(), 3)
+        })
+        self._resolve(node_id, status)
+
+    def _restart(self, loop: _Loop) -> None:
+        """반복 구간의 노드를 초기화하고 loop_back 도착 노드부터 다시 실행합니다."""
+        loop.iteration += 1
+        for node_id in loop.body:
+            self.status[node_id] = None
+            inside = [p for p in self.predecessors[node_id] if p in loop.body]
+            outside = [p for p in self.predecessors[node_id] if p not in loop.body]
+            self.remaining[node_id] = len(inside)
+            # 구간 밖 선행 노드의 결과는 그대로 유지
+            self.blocked[node_id] = any(self.status[p] in (FAILED, CANCELLED) for p in outside)
+            self.taken[node_id] = any(
+                self.status[p] == SUCCEEDED and self._condition(self.edge_conditions.get((p, node_id)))
+                for p in outside
+            )
+        for target in loop.targets:
+            self.taken[target] = True
+        for node_id in self.node_ids:
+            if node_id in loop.body and self.remaining[node_id] == 0:
+                self._decide(node_id)
+
+    def _iteration(self, node_id: str) -> int:
+        loop = self.loop_of.get(node_id)
+        return loop.iteration if loop is not None else 1
+
+    # ------------------------------------------------------------------
+    # 노드 실행
+    # ------------------------------------------------------------------
+
+    async def _run_node(self, node_id: str) -> Tuple[str, str]:
+        node = self.nodes[node_id]
+        record: Dict[str, Any] = {
+            "iteration": self._iteration(node_id),
+            "start_ms": round(self._elapsed_ms(), 3)
+        }
+        self.runs[node_id].append(record)
+
+        if node.get("type") != "process":
+            # 시작/종료/조건 노드는 바로 통과
+            record.update({"status": SUCCEEDED, "end_ms": record["start_ms"], "duration_ms": 0.0})
+            return node_id, SUCCEEDED
+
+        tool_id = node.get("tool_id")
+        handler = self.runtime.handler_for(tool_id, self.stub_model, self.time_scale)
+        if handler is None:
+            record.update({
+                "status": FAILED,
+                "end_ms": record["start_ms"],
+                "duration_ms": 0.0,
+                "error": f"처리기가 없는 도구입니다: {tool_id}"
+            })
+            return node_id, FAILED
+
+        timeout_ms = float(node.get("timeout_ms") or self.runtime.default_timeout_ms)
+        # time_scale이 0이면 시간을 흘려보내지 않으므로 타임아웃도 적용하지 않음
+        timeout_s = timeout_ms * self.time_scale / 1000 if self.time_scale > 0 else None
+        max_attempts = int(node.get("retry_count", 0) or 0) + 1
+        arguments = self.arguments.get(node_id, self.arguments.get(tool_id, {}))
+        attempts: List[Dict[str, Any]] = []
+        record["attempts"] = attempts
+        cataloged = tool_id in get_catalog().tools
+        if cataloged:
+            try:
+                validate_arguments(tool_id, arguments, partial=True)
+            except ToolArgumentError as e:
+                # 인자가 스키마와 맞지 않으면 실행(재시도)해도 같으므로 바로 실패 (memoize와 관계없이 검사)
+                attempts.append({"attempt": 1, "outcome": "invalid_arguments", "error": str(e),
+                                 "problems": e.problems, "duration_ms": 0.0})
+                record.update({"status": FAILED, "end_ms": record["start_ms"], "duration_ms": 0.0})
+                return node_id, FAILED
+
+        payload = {
+            "inputs": self.inputs,
+            "arguments": arguments,
+            "upstream": {p: self.outputs[p] for p in self.predecessors[node_id] if p in self.outputs},
+            "iteration": record["iteration"]
+        }
+        # 처리기는 인자 외에 노드/입력/선행 결과/반복 차수도 받으므로 모두 메모이제이션 키에 포함
+        # (JSON으로 표현할 수 없는 값이 있거나 카탈로그에 없는 도구면 메모이제이션하지 않음)
+        memo_context = self._memo_context(node, payload) if self.memo is not None and cataloged else None
+        status = FAILED
+
+        for attempt in range(1, max_attempts + 1):
+            if attempt > 1:
+                await asyncio.sleep(self.runtime.retry_backoff_ms * (2 ** (attempt - 2)) * self.time_scale / 1000)
+            queued = time.perf_counter()
+            async with self.semaphore:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+                attempt_started = time.perf_counter()
+                entry: Dict[str, Any] = {
+                    "attempt": attempt,
+                    "queue_ms": round((attempt_started - queued) * 1000, 3),
+                    "start_ms": round((attempt_started - self.started) * 1000, 3)
+                }
+                call = self._call(handler, node, dict(payload, attempt=attempt))
+                if memo_context is not None:
+                    call = self._call_memoized(tool_id, arguments, memo_context, call)
+                elif self.memo is not None:
+                    entry["memo"] = UNCACHEABLE
+                try:
+                    output = await asyncio.wait_for(call, timeout_s)
+                    if memo_context is not None:
+                        output, entry["memo"] = output
+                    entry["outcome"] = "ok"
+                except asyncio.TimeoutError:
+                    entry["outcome"] = "timeout"
+                except Exception as e:
+                    entry["outcome"] = "error"
+                    entry["error"] = str(e) or type(e).__name__
+                finally:
+                    self.active -= 1
+                    entry["duration_ms"] = round((time.perf_counter() - attempt_started) * 1000, 3)
+                    attempts.append(entry)
+            if entry["outcome"] == "ok":
+                self.outputs[node_id] = output
+                status = SUCCEEDED
+                break
+            if attempt >= max_attempts:
+                break
+
+        end_ms = self._elapsed_ms()
+        record.update({
+            "status": status,
+            "end_ms": round(end_ms, 3),
+            "duration_ms": round(end_ms - record["start_ms"], 3)
+        })
+        return node_id, status
+
+    @staticmethod
+    def _memo_context(node: Dict[str, Any], payload: Dict[str, Any]) -> Optional[str]:
+        """처리기가 인자 외에 받는 값의 digest (JSON으로 표현할 수 없으면 None)"""
+        try:
+            source = canonical_json([node, payload["inputs"], payload["upstream"], payload["iteration"]])
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    async def _call_memoized(self,
+                             tool_id: str,
+                             arguments: Dict[str, Any],
+                             context: str,
+                             call: Any) -> Tuple[Any, str]:
+        """도구 호출을 메모이제이션 저장소를 거쳐 실행합니다 (결과를 얻은 곳과 함께 반환)."""
+        async def compute() -> Any:
+            return await call
+
+        try:
+            return await self.memo.call_traced(tool_id, arguments, compute, context)
+        finally:
+            # 저장된 결과를 쓰면 만든 호출은 실행하지 않으므로 닫아 경고를 막음
+            call.close()
+
+    async def _call(self, handler: Callable[..., Any], node: Dict[str, Any], payload: Dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(getattr(handler, "__call__", None)):
+            return await handler(node, payload)
+        result = await asyncio.to_thread(handler, node, payload)
+        return await result if inspect.isawaitable(result) else result
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+
+    def _report(self, elapsed_ms: float) -> Dict[str, Any]:
+        node_reports = []
+        busy_ms = 0.0
+        for node_id in self.node_ids:
+            node = self.nodes[node_id]
+            runs = self.runs[node_id]
+            attempts = sum(len(run.get("attempts", [])) for run in runs)
+            tool_ms = sum(a["duration_ms"] for run in runs for a in run.get("attempts", []))
+            busy_ms += tool_ms
+            node_reports.append({
+                "node_id": node_id,
+                "type": node.get("type"),
+                "tool_id": node.get("tool_id"),
+                "status": self.status[node_id],
+                "estimated_time_ms": node.get("estimated_time_ms"),
+                "run_count": len(runs),
+                "attempt_count": attempts,
+                "total_tool_ms": round(tool_ms, 3),
+                "runs": runs
+            })
+
+        failed = [r["node_id"] for r in node_reports if r["status"] in (FAILED, CANCELLED)]
+        return {
+            "workflow_id": self.workflow.get("workflow_id"),
+            "status": FAILED if failed else SUCCEEDED,
+            "failed_nodes": failed,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "time_scale": self.time_scale,
+            "concurrency_limit": self.runtime.concurrency_limit,
+            "max_concurrency": self.max_active,
+            # 도구 실행 시간 합 / 실제 총 소요 시간 (병렬 실행으로 얻은 배율)
+            "parallel_speedup": round(busy_ms / elapsed_ms, 3) if elapsed_ms else None,
+            "estimated_makespan_ms": round(self.plan["makespan_ms"] * self.time_scale, 3),
+            "loops": [
+                {"from_node": loop.source, "to_nodes": loop.targets, "iterations": loop.iteration}
+                for loop in self.loops.values()
+            ],
+            "nodes": node_reports,
+            "outputs": {node_id: output for node_id, output in self.outputs.items()}
+        }
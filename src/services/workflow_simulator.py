@@ -0,0 +1,408 @@
+# src/services/workflow_simulator.py
+"""
+워크플로우 지연 시뮬레이션 서비스
+노드 그래프에 대해 NumPy 벡터화 몬테카를로 시뮬레이션을 수행하여
+전체 소요 시간 분포와 노드별 지연 기여도를 계산합니다.
+"""
+
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from .dag_scheduler import build_execution_plan, build_graph, topological_levels, LOOP_BACK
+
+# 노드별 지연 모델 기본값
+DEFAULT_LATENCY_SPEC = {
+    "distribution": "lognormal",   # lognormal, normal, exponential, uniform, fixed
+    "sigma": 0.3,                  # lognormal 형태 모수
+    "cv": 0.3,                     # normal 분포의 변동 계수 (std = mean * cv)
+    "failure_probability": 0.0,    # 시도당 실패 확률
+    "retry_backoff_ms": 100.0      # 재시도 대기 (n번째 재시도 전 backoff * 2^(n-1))
+}
+
+DISTRIBUTIONS = ("lognormal", "normal", "exponential", "uniform", "fixed")
+
+# 한 번에 시뮬레이션할 최대 시행 수 (메모리 사용량 제한)
+DEFAULT_CHUNK_SIZE = 25000
+
+
+class WorkflowSimulator:
+    """워크플로우 지연을 몬테카를로 방식으로 시뮬레이션하는 클래스"""
+
+    def simulate(self,
+                 workflow: Dict[str, Any],
+                 trials: int = 10000,
+                 latency_model: Optional[Dict[str, Any]] = None,
+                 seed: Optional[int] = None,
+                 loop_iterations: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        워크플로우 실행 시간을 시뮬레이션합니다.
+
+        Args:
+            workflow: nodes/connections를 가진 워크플로우 (recommend_nodes 결과 등)
+            trials: 시행 횟수
+            latency_model: 지연 모델
+                {"default": {...}, "tools": {도구 id: {...}}, "nodes": {노드 id: {...}}}
+                각 항목은 distribution, median_ms/mean_ms, sigma, cv, low_ms/high_ms,
+                failure_probability, retry_count, timeout_ms, retry_backoff_ms를 가질 수 있음
+            seed: 난수 시드 (재현용)
+            loop_iterations: loop_back 구간의 반복 횟수
+            chunk_size: 한 번에 처리할 시행 수
+
+        Returns:
+            p50/p95/p99 소요 시간, 성공률, 노드별 지연 기여도
+        """
+        if trials < 1:
+            raise ValueError("trials는 1 이상이어야 합니다")
+        if loop_iterations < 1:
+            raise ValueError("loop_iterations는 1 이상이어야 합니다")
+
+        started = time.perf_counter()
+        latency_model = latency_model or {}
+        nodes = workflow.get("nodes", [])
+        connections = workflow.get("connections", [])
+        if not nodes:
+            raise ValueError("시뮬레이션할 노드가 없습니다")
+
+        plan = build_execution_plan(nodes, connections)
+        if plan["has_cycle"]:
+            raise ValueError(f"순환 연결이 있는 워크플로우는 시뮬레이션할 수 없습니다: {plan['cyclic_nodes']}")
+
+        sim_graph = self._unroll_loops(nodes, connections, plan["loops"], loop_iterations)
+        specs = [self._node_spec(node, latency_model) for node in sim_graph["nodes"]]
+
+        rng = np.random.default_rng(seed)
+        node_count = len(specs)
+        makespans = np.empty(trials)
+        failed_any = np.zeros(trials, dtype=bool)
+        on_path_total = np.zeros(node_count)
+        contribution_total = np.zeros(node_count)
+        duration_total = np.zeros(node_count)
+        attempts_total = np.zeros(node_count)
+        failures_total = np.zeros(node_count)
+        timeouts_total = np.zeros(node_count)
+
+        for offset in range(0, trials, chunk_size):
+            size = min(chunk_size, trials - offset)
+            chunk = self._simulate_chunk(sim_graph, specs, size, rng)
+            makespans[offset:offset + size] = chunk["makespan"]
+            failed_any[offset:offset + size] = chunk["failed"]
+            on_path_total += chunk["on_path"].sum(axis=1)
+            contribution_total += (chunk["durations"] * chunk["on_path"]).sum(axis=1)
+            duration_total += chunk["durations"].sum(axis=1)
+            attempts_total += chunk["attempts"]
+            failures_total += chunk["node_failures"]
+            timeouts_total += chunk["timeouts"]
+
+        blame = self._node_blame(
+            sim_graph, specs, trials, makespans.sum(),
+            on_path_total, contribution_total, duration_total,
+            attempts_total, failures_total, timeouts_total
+        )
+        successful = makespans[~failed_any]
+
+        return {
+            "trials": trials,
+            "seed": seed,
+            "loop_iterations": loop_iterations,
+            "success_rate": round(float(successful.size) / trials, 6),
+            "failure_rate": round(float(failed_any.sum()) / trials, 6),
+            "deterministic_makespan_ms": plan["makespan_ms"],
+            "makespan_ms": self._summarize(makespans),
+            "makespan_successful_ms": self._summarize(successful) if successful.size else None,
+            "node_blame": blame,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    # ------------------------------------------------------------------
+    # 그래프 준비
+    # ------------------------------------------------------------------
+
+    def _unroll_loops(self,
+                      nodes: List[Dict[str, Any]],
+                      connections: List[Dict[str, Any]],
+                      loops: List[Dict[str, Any]],
+                      iterations: int) -> Dict[str, Any]:
+        """
+        loop_back 구간을 반복 횟수만큼 펼친 DAG를 구성합니다.
+
+        반복 구간 안의 노드는 "노드id#2" 형태로 복제되고, loop_back 연결은
+        이전 반복의 출발 노드 → 다음 반복의 도착 노드 연결이 됩니다.
+        구간 밖으로 나가는 연결은 마지막 반복에서 나갑니다.
+        """
+        body = set()
+        for loop in loops:
+            body.update(loop["body"])
+
+        nodes_by_id = {node["id"]: node for node in nodes}
+        forward = [c for c in connections if c.get("type") != LOOP_BACK]
+        loop_backs = [c for c in connections if c.get("type") == LOOP_BACK]
+
+        def copy_id(node_id: str, iteration: int) -> str:
+            if iteration == 1 or node_id not in body:
+                return node_id
+            return f"{node_id}#{iteration}"
+
+        sim_nodes = []
+        origin = []
+        for node in nodes:
+            sim_nodes.append(node)
+            origin.append(node["id"])
+        if body and iterations > 1:
+            for iteration in range(2, iterations + 1):
+                for node_id in [n["id"] for n in nodes if n["id"] in body]:
+                    copied = dict(nodes_by_id[node_id])
+                    copied["id"] = copy_id(node_id, iteration)
+                    sim_nodes.append(copied)
+                    origin.append(node_id)
+
+        last = iterations if body else 1
+        sim_connections = []
+        for connection in forward:
+            source, target = connection["from_node"], connection["to_node"]
+            if source in body and target in body:
+                for iteration in range(1, last + 1):
+                    sim_connections.append({"from_node": copy_id(source, iteration),
+                                            "to_node": copy_id(target, iteration)})
+            elif source in body:
+                sim_connections.append({"from_node": copy_id(source, last), "to_node": target})
+            else:
+                sim_connections.append({"from_node": source, "to_node": target})
+        for connection in loop_backs:
+            for iteration in range(1, last):
+                sim_connections.append({"from_node": copy_id(connection["from_node"], iteration),
+                                        "to_node": copy_id(connection["to_node"], iteration + 1)})
+
+        graph = build_graph(sim_nodes, sim_connections)
+        stages, _ = topological_levels(graph["node_ids"], graph["predecessors"], graph["successors"])
+        order = [node_id for stage in stages for node_id in stage]
+
+        # 연결에만 등장하는 노드도 소요 시간 0 노드로 포함
+        known = {node["id"] for node in sim_nodes}
+        for node_id in graph["node_ids"]:
+            if node_id not in known:
+                sim_nodes.append({"id": node_id, "type": "unknown"})
+                origin.append(node_id)
+
+        index = {node["id"]: i for i, node in enumerate(sim_nodes)}
+        return {
+            "nodes": sim_nodes,
+            "origin": origin,
+            "order": [index[node_id] for node_id in order],
+            "predecessors": [[index[p] for p in graph["predecessors"][node["id"]]] for node in sim_nodes]
+        }
+
+    def _node_spec(self, node: Dict[str, Any], latency_model: Dict[str, Any]) -> Dict[str, Any]:
+        """기본값 → 도구별 → 노드별 순서로 지연 모델을 병합합니다."""
+        spec = dict(DEFAULT_LATENCY_SPEC)
+        spec.update(latency_model.get("default", {}))
+        spec.update(latency_model.get("tools", {}).get(node.get("tool_id"), {}))
+        base_id = node["id"].split("#", 1)[0]
+        spec.update(latency_model.get("nodes", {}).get(base_id, {}))
+
+        if node.get("type") != "process":
+            # 시작/종료/조건 노드는 default 모델의 지연·재시도·타임아웃을 적용하지 않음
+            spec.update(distribution="fixed", median_ms=0.0, mean_ms=0.0, failure_probability=0.0,
+                        retry_count=0, timeout_ms=None)
+            return spec
+
+        estimated = float(node.get("estimated_time_ms", 0) or 0)
+        spec.setdefault("median_ms", estimated)
+        spec.setdefault("mean_ms", spec["median_ms"])
+        spec.setdefault("retry_count", node.get("retry_count", 0))
+        spec.setdefault("timeout_ms", node.get("timeout_ms"))
+
+        if spec["distribution"] not in DISTRIBUTIONS:
+            raise ValueError(f"지원하지 않는 분포입니다: {spec['distribution']}")
+        if not 0.0 <= spec["failure_probability"] <= 1.0:
+            raise ValueError("failure_probability는 0과 1 사이여야 합니다")
+        return spec
+
+    # ------------------------------------------------------------------
+    # 시뮬레이션
+    # ------------------------------------------------------------------
+
+    def _sample(self, spec: Dict[str, Any], size: int, rng: np.random.Generator) -> np.ndarray:
+        """지연 분포에서 size개의 표본(ms)을 추출합니다."""
+        distribution = spec["distribution"]
+        if distribution == "fixed" or (distribution == "lognormal" and spec["median_ms"] <= 0):
+            return np.full(size, float(spec["median_ms"]))
+        if distribution == "lognormal":
+            return rng.lognormal(np.log(spec["median_ms"]), spec["sigma"], size)
+        if distribution == "normal":
+            mean = float(spec["mean_ms"])
+            return np.maximum(rng.normal(mean, mean * spec["cv"], size), 0.0)
+        if distribution == "exponential":
+            return rng.exponential(float(spec["mean_ms"]), size)
+        low = float(spec.get("low_ms", spec["median_ms"] * 0.5))
+        high = float(spec.get("high_ms", spec["median_ms"] * 1.5))
+        return rng.uniform(low, high, size)
+
+    def _simulate_node(self, spec: Dict[str, Any], size: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """한 노드의 재시도/타임아웃을 포함한 소요 시간을 시뮬레이션합니다."""
+        timeout = spec.get("timeout_ms")
+        failure_probability = spec["failure_probability"]
+        max_attempts = int(spec["retry_count"]) + 1
+
+        duration = np.zeros(size)
+        attempts = np.zeros(size, dtype=np.int32)
+        timed_out = np.zeros(size, dtype=bool)
+        pending = np.arange(size)
+
+        # 첫 시도는 전체, 이후 재시도는 실패한 시행에 대해서만 표본 추출
+        for attempt in range(max_attempts):
+            latency = self._sample(spec, pending.size, rng)
+            failed = np.zeros(pending.size, dtype=bool)
+            if timeout:
+                attempt_timed_out = latency > timeout
+                latency = np.where(attempt_timed_out, float(timeout), latency)
+                failed |= attempt_timed_out
+                timed_out[pending[attempt_timed_out]] = True
+            if failure_probability > 0:
+                failed |= rng.random(pending.size) < failure_probability
+            if attempt > 0:
+                latency = latency + spec["retry_backoff_ms"] * (2 ** (attempt - 1))
+
+            duration[pending] += latency
+            attempts[pending] += 1
+            pending = pending[failed]
+            if pending.size == 0:
+                break
+
+        node_failed = np.zeros(size, dtype=bool)
+        node_failed[pending] = True
+        return {"duration": duration, "attempts": attempts, "failed": node_failed, "timed_out": timed_out}
+
+    def _simulate_chunk(self,
+                        sim_graph: Dict[str, Any],
+                        specs: List[Dict[str, Any]],
+                        size: int,
+                        rng: np.random.Generator) -> Dict[str, Any]:
+        """시행 묶음 하나를 시뮬레이션하고 임계 경로를 역추적합니다."""
+        node_count = len(specs)
+        durations = np.zeros((node_count, size))
+        finish = np.zeros((node_count, size))
+        critical_predecessor = np.full((node_count, size), -1, dtype=np.int32)
+        attempts = np.zeros(node_count)
+        node_failures = np.zeros(node_count)
+        timeouts = np.zeros(node_count)
+        failed = np.zeros(size, dtype=bool)
+        columns = np.arange(size)
+
+        for node_index in sim_graph["order"]:
+            result = self._simulate_node(specs[node_index], size, rng)
+            durations[node_index] = result["duration"]
+            attempts[node_index] = result["attempts"].sum()
+            node_failures[node_index] = result["failed"].sum()
+            timeouts[node_index] = result["timed_out"].sum()
+            failed |= result["failed"]
+
+            predecessors = sim_graph["predecessors"][node_index]
+            if predecessors:
+                # 선행 노드를 하나씩 비교 (작은 축에 대한 argmax보다 빠름)
+                start = finish[predecessors[0]].copy()
+                best = critical_predecessor[node_index]
+                best[:] = predecessors[0]
+                for predecessor in predecessors[1:]:
+                    later = finish[predecessor] > start
+                    np.copyto(start, finish[predecessor], where=later)
+                    best[later] = predecessor
+                start += result["duration"]
+                finish[node_index] = start
+            else:
+                finish[node_index] = result["duration"]
+
+        # 가장 늦게 끝난 노드에서 임계 선행 노드를 따라 시행별 임계 경로 표시
+        # (동률이면 위상 순서상 나중 노드, 즉 출력 쪽 노드를 선택)
+        reversed_order = np.asarray(sim_graph["order"][::-1])
+        current = reversed_order[finish[reversed_order].argmax(axis=0)]
+        makespan = finish[current, columns]
+        on_path = np.zeros((node_count, size), dtype=bool)
+        active = np.ones(size, dtype=bool)
+        for _ in range(node_count):
+            on_path[current[active], columns[active]] = True
+            current = np.where(active, critical_predecessor[current, columns], -1)
+            active = current >= 0
+            if not active.any():
+                break
+
+        return {
+            "makespan": makespan,
+            "failed": failed,
+            "durations": durations,
+            "on_path": on_path,
+            "attempts": attempts,
+            "node_failures": node_failures,
+            "timeouts": timeouts
+        }
+
+    # ------------------------------------------------------------------
+    # 결과 요약
+    # ------------------------------------------------------------------
+
+    def _summarize(self, values: np.ndarray) -> Dict[str, float]:
+        """소요 시간 분포를 백분위수로 요약합니다."""
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "mean": round(float(values.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "min": round(float(values.min()), 3),
+            "max": round(float(values.max()), 3)
+        }
+
+    def _node_blame(self,
+                    sim_graph: Dict[str, Any],
+                    specs: List[Dict[str, Any]],
+                    trials: int,
+                    makespan_sum: float,
+                    on_path_total: np.ndarray,
+                    contribution_total: np.ndarray,
+                    duration_total: np.ndarray,
+                    attempts_total: np.ndarray,
+                    failures_total: np.ndarray,
+                    timeouts_total: np.ndarray) -> List[Dict[str, Any]]:
+        """반복으로 복제된 노드를 원래 노드로 합쳐 노드별 지연 기여도를 계산합니다."""
+        blame: Dict[str, Dict[str, Any]] = {}
+        for index, node in enumerate(sim_graph["nodes"]):
+            node_id = sim_graph["origin"][index]
+            entry = blame.get(node_id)
+            if entry is None:
+                entry = blame[node_id] = {
+                    "node_id": node_id,
+                    "tool_id": node.get("tool_id"),
+                    "on_path": 0.0,
+                    "contribution": 0.0,
+                    "duration": 0.0,
+                    "attempts": 0.0,
+                    "failures": 0.0,
+                    "timeouts": 0.0,
+                    "copies": 0
+                }
+            entry["on_path"] = max(entry["on_path"], on_path_total[index])
+            entry["contribution"] += contribution_total[index]
+            entry["duration"] += duration_total[index]
+            entry["attempts"] += attempts_total[index]
+            entry["failures"] += failures_total[index]
+            entry["timeouts"] += timeouts_total[index]
+            entry["copies"] += 1
+
+        report = []
+        for entry in blame.values():
+            executions = trials * entry["copies"]
+            report.append({
+                "node_id": entry["node_id"],
+                "tool_id": entry["tool_id"],
+                "criticality": round(entry["on_path"] / trials, 4),
+                "mean_duration_ms": round(entry["duration"] / trials, 3),
+                "mean_critical_contribution_ms": round(entry["contribution"] / trials, 3),
+                "share_of_makespan": round(entry["contribution"] / makespan_sum, 4) if makespan_sum else 0.0,
+                "mean_attempts": round(entry["attempts"] / executions, 4),
+                "failure_rate": round(entry["failures"] / executions, 6),
+                "timeout_rate": round(entry["timeouts"] / executions, 6)
+            })
+        report.sort(key=lambda item: item["share_of_makespan"], reverse=True)
+        return report
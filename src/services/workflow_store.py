@@ -0,0 +1,515 @@
+# src/services/workflow_store.py
+"""
+워크플로우 저장소
+recommend_nodes/optimize_workflow/design_workflow가 만든 워크플로우를 workflow_id별 버전 기록과 함께
+로컬 SQLite에 보관합니다. 클라이언트는 전체 워크플로우 JSON 대신 id(+버전, JSON Patch 변경분)로 참조합니다.
+버전 문서는 만든 뒤 바뀌지 않으므로 파싱한 문서를 캐시하며, 반환한 문서는 읽기 전용으로 다뤄야 합니다.
+
+증분 최적화 결과는 전체 문서 대신 직전 버전에서 바뀐 부분(delta)만 저장하고(delta 버전),
+조회할 때 가장 가까운 전체 문서(snapshot)에 delta_applier로 차례로 적용해 복원합니다.
+새 워크플로우를 저장할 때 보관 개수(max_workflows)와 보관 기간(max_age_seconds)을 넘은 워크플로우를 지웁니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from uuid import uuid4
+
+from .json_patch import apply_patch
+from .result_cache import copy_result
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowNotFoundError(LookupError):
+    """저장소에 없는 workflow_id나 버전을 요청했을 때 발생하는 예외"""
+
+
+class WorkflowConflictError(RuntimeError):
+    """바탕 버전 이후에 다른 버전이 먼저 저장되어 변경분을 저장할 수 없을 때 발생하는 예외"""
+
+
+class WorkflowStore:
+    """SQLite 기반 워크플로우 버전 저장소 (스레드/프로세스 간 안전)"""
+
+    def __init__(self,
+                 path: str,
+                 cache_size: int = 256,
+                 max_versions: int = 0,
+                 delta_applier: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None,
+                 compact_after: int = 16,
+                 max_workflows: int = 0,
+                 max_age_seconds: float = 0.0):
+        """
+        Args:
+            path: SQLite 파일 경로
+            cache_size: 파싱한 버전 문서를 보관할 개수
+            max_versions: 워크플로우별로 남길 최근 버전 수 (0이면 모두 보관)
+            delta_applier: (바탕 문서, 변경분) → 새 문서, delta 버전을 복원할 때 사용
+            compact_after: delta를 이만큼 이상 적용해 복원한 버전은 전체 문서도 함께 저장
+            max_workflows: 최근에 저장한 순서로 남길 워크플로우 수 (0이면 제한 없음)
+            max_age_seconds: 마지막 저장 후 이 시간이 지난 워크플로우를 지움 (0이면 제한 없음)
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self.max_versions = max_versions
+        self.delta_applier = delta_applier
+        self.compact_after = compact_after
+        self.max_workflows = max_workflows
+        self.max_age_seconds = max_age_seconds
+
+        self._cache: "OrderedDict[Tuple[str, int], tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._db_lock = threading.Lock()
+
+        self.saves = 0
+        self.delta_saves = 0
+        self.compactions = 0
+        self.deduplicated = 0
+        self.expired = 0
+        self.save_errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    _VERSIONS_TABLE = (
+        "CREATE TABLE IF NOT EXISTS {name} ("
+        "workflow_id TEXT NOT NULL, version INTEGER NOT NULL, parent_version INTEGER, "
+        "source TEXT NOT NULL, digest TEXT NOT NULL, node_count INTEGER NOT NULL, "
+        "document TEXT, delta TEXT, created_at REAL NOT NULL, "
+        "PRIMARY KEY (workflow_id, version));"
+    )
+
+    def _connection(self) -> sqlite3.Connection:
+        """프로세스마다 한 번 연결합니다 (fork된 자식은 부모의 연결을 쓰지 않음)."""
+        if self._db is None or self._db_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS workflows ("
+                "workflow_id TEXT PRIMARY KEY, latest_version INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS workflows_updated_at ON workflows (updated_at);"
+                + self._VERSIONS_TABLE.format(name="workflow_versions")
+            )
+            columns = [row[1] for row in db.execute("PRAGMA table_info(workflow_versions)")]
+            if "delta" not in columns:
+                # delta 버전 도입 전 스키마 (document NOT NULL)를 옮겨 담음
+                shared = "workflow_id, version, parent_version, source, digest, node_count, document, created_at"
+                db.executescript(
+                    "BEGIN IMMEDIATE;"
+                    + self._VERSIONS_TABLE.format(name="workflow_versions_migrated")
+                    + f"INSERT INTO workflow_versions_migrated ({shared}) SELECT {shared} FROM workflow_versions;"
+                    "DROP TABLE workflow_versions;"
+                    "ALTER TABLE workflow_versions_migrated RENAME TO workflow_versions;"
+                    "COMMIT;"
+                )
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+
+    def save(self,
+             workflow: Dict[str, Any],
+             source: str,
+             workflow_id: Optional[str] = None,
+             parent_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        워크플로우를 새 버전으로 저장합니다.
+        최신 버전과 내용이 같으면 새 버전을 만들지 않고 최신 버전 정보를 반환합니다.
+
+        Args:
+            workflow: 저장할 워크플로우 (workflow_id가 없거나 다르면 workflow_id를 채워 저장)
+            source: 버전을 만든 곳 (recommend_nodes, optimize_workflow:speed, patch 등)
+            workflow_id: 저장할 id (None이면 워크플로우의 workflow_id, 그것도 없으면 새로 발급)
+            parent_version: 이 버전의 바탕이 된 버전 (None이면 저장 시점의 최신 버전)
+
+        Returns:
+            {"workflow_id", "version", "parent_version", "source", "digest", "node_count", "kind",
+             "created_at", "deduplicated"}
+        """
+        workflow_id = workflow_id or workflow.get("workflow_id") or str(uuid4())
+        if workflow.get("workflow_id") != workflow_id:
+            workflow = dict(workflow, workflow_id=workflow_id)
+        document = json.dumps(workflow, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(document.encode("utf-8")).hexdigest()[:16]
+        node_count = len(workflow.get("nodes", []))
+        now = time.time()
+
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT v.version, v.parent_version, v.source, v.digest, v.node_count, v.created_at, "
+                    "CASE WHEN v.delta IS NULL THEN 'snapshot' ELSE 'delta' END FROM workflows w JOIN workflow_versions v "
+                    "ON v.workflow_id = w.workflow_id AND v.version = w.latest_version "
+                    "WHERE w.workflow_id = ?", (workflow_id,)
+                ).fetchone()
+                if row is not None and row[3] == digest:
+                    db.execute("COMMIT")
+                    self.deduplicated += 1
+                    return dict(self._info(workflow_id, row), deduplicated=True)
+
+                latest = row[0] if row is not None else 0
+                version = latest + 1
+                if parent_version is None and latest:
+                    parent_version = latest
+                db.execute(
+                    "INSERT INTO workflow_versions (workflow_id, version, parent_version, source, digest, "
+                    "node_count, document, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (workflow_id, version, parent_version, source, digest, node_count, document, now)
+                )
+                db.execute(
+                    "INSERT INTO workflows (workflow_id, latest_version, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(workflow_id) DO UPDATE SET "
+                    "latest_version = excluded.latest_version, updated_at = excluded.updated_at",
+                    (workflow_id, version, now, now)
+                )
+                self._prune(db, workflow_id, version)
+                expired = self._expire(db, workflow_id, now) if row is None else []
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self.saves += 1
+
+        if expired:
+            self._cache_drop(expired)
+        info = self._info(workflow_id, (version, parent_version, source, digest, node_count, now, "snapshot"))
+        # 호출자가 저장 후 문서를 수정해도 캐시된 버전이 바뀌지 않도록 사본을 캐시
+        self._cache_put((workflow_id, version), copy_result(workflow), info)
+        return dict(info, deduplicated=False)
+
+    def try_save(self,
+                 workflow: Dict[str, Any],
+                 source: str,
+                 workflow_id: Optional[str] = None,
+                 parent_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        save()와 같지만 저장에 실패하면(디스크, 권한, 잠금 등) 로그를 남기고 오류 정보를 반환합니다.
+        저장이 부가 기능인 호출(추천/최적화 결과 저장)에서 사용합니다.
+
+        Returns:
+            save()의 버전 정보 또는 {"error", "message"}
+        """
+        try:
+            return self.save(workflow, source, workflow_id=workflow_id, parent_version=parent_version)
+        except (sqlite3.Error, OSError) as e:
+            self.save_errors += 1
+            logger.warning("워크플로우 저장 실패 (%s, %s): %s", self.path, source, e)
+            return {"error": str(e), "message": "워크플로우를 저장하지 못했습니다"}
+
+    def save_delta(self,
+                   workflow_id: str,
+                   delta: Dict[str, Any],
+                   source: str,
+                   parent_version: int,
+                   node_count: int) -> Dict[str, Any]:
+        """
+        parent_version에서 바뀐 부분만 새 버전(delta 버전)으로 저장합니다.
+        전체 문서를 직렬화하지 않으므로 저장 비용이 워크플로우 크기가 아니라 변경 크기에 비례합니다.
+
+        Args:
+            workflow_id: 워크플로우 id
+            delta: delta_applier가 이해하는 변경분
+            source: 새 버전을 만든 곳
+            parent_version: 변경분의 바탕 버전 (최신 버전이어야 함)
+            node_count: 새 버전의 노드 수
+
+        Raises:
+            WorkflowNotFoundError: 없는 id
+            WorkflowConflictError: parent_version 이후 다른 버전이 먼저 저장됨
+        """
+        document = json.dumps(delta, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        now = time.time()
+
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT w.latest_version, v.digest FROM workflows w JOIN workflow_versions v "
+                    "ON v.workflow_id = w.workflow_id AND v.version = w.latest_version "
+                    "WHERE w.workflow_id = ?", (workflow_id,)
+                ).fetchone()
+                if row is None:
+                    raise WorkflowNotFoundError(f"저장된 워크플로우가 없습니다: {workflow_id}")
+                if row[0] != parent_version:
+                    raise WorkflowConflictError(
+                        f"v{parent_version} 이후 v{row[0]}이 먼저 저장되었습니다: {workflow_id}"
+                    )
+                version = parent_version + 1
+                digest = hashlib.sha256((row[1] + document).encode("utf-8")).hexdigest()[:16]
+                db.execute(
+                    "INSERT INTO workflow_versions (workflow_id, version, parent_version, source, digest, "
+                    "node_count, delta, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (workflow_id, version, parent_version, source, digest, node_count, document, now)
+                )
+                db.execute("UPDATE workflows SET latest_version = ?, updated_at = ? WHERE workflow_id = ?",
+                           (version, now, workflow_id))
+                self._prune(db, workflow_id, version)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self.delta_saves += 1
+
+        info = self._info(workflow_id, (version, parent_version, source, digest, node_count, now, "delta"))
+        return dict(info, deduplicated=False)
+
+    def _prune(self, db: sqlite3.Connection, workflow_id: str, version: int) -> None:
+        """보관 개수를 넘은 옛 버전을 지웁니다 (남은 delta 버전이 복원에 쓰는 전체 문서는 남김)."""
+        if self.max_versions <= 0:
+            return
+        oldest_kept = version - self.max_versions + 1
+        base = db.execute(
+            "SELECT MAX(version) FROM workflow_versions "
+            "WHERE workflow_id = ? AND version <= ? AND document IS NOT NULL", (workflow_id, oldest_kept)
+        ).fetchone()[0]
+        cutoff = min(oldest_kept, base) if base is not None else 0
+        db.execute("DELETE FROM workflow_versions WHERE workflow_id = ? AND version < ?", (workflow_id, cutoff))
+
+    def _expire(self, db: sqlite3.Connection, keep: str, now: float) -> List[str]:
+        """보관 개수/기간을 넘은 워크플로우를 지우고 지운 id 목록을 반환합니다 (keep은 남김)."""
+        expired = set()
+        if self.max_age_seconds > 0:
+            expired.update(row[0] for row in db.execute(
+                "SELECT workflow_id FROM workflows WHERE updated_at < ?", (now - self.max_age_seconds,)
+            ))
+        if self.max_workflows > 0:
+            expired.update(row[0] for row in db.execute(
+                "SELECT workflow_id FROM workflows ORDER BY updated_at DESC, workflow_id LIMIT -1 OFFSET ?",
+                (self.max_workflows,)
+            ))
+        expired.discard(keep)
+        if expired:
+            ids = [(workflow_id,) for workflow_id in expired]
+            db.executemany("DELETE FROM workflow_versions WHERE workflow_id = ?", ids)
+            db.executemany("DELETE FROM workflows WHERE workflow_id = ?", ids)
+            self.expired += len(ids)
+        return list(expired)
+
+    def patch(self,
+              workflow_id: str,
+              operations: List[Dict[str, Any]],
+              version: Optional[int] = None,
+              source: str = "patch") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        저장된 버전에 JSON Patch를 적용해 새 버전으로 저장합니다.
+
+        Args:
+            workflow_id: 워크플로우 id
+            operations: JSON Patch 연산 목록
+            version: 패치를 적용할 버전 (None이면 최신 버전)
+            source: 새 버전을 만든 곳
+
+        Returns:
+            (패치를 적용한 워크플로우, 새 버전 정보)
+
+        Raises:
+            WorkflowNotFoundError: 없는 id/버전
+            JsonPatchError: 패치를 적용할 수 없음
+        """
+        base, base_info = self.load(workflow_id, version)
+        patched = apply_patch(base, operations)
+        if not isinstance(patched, dict):
+            raise ValueError("패치 결과가 워크플로우 객체가 아닙니다")
+        info = self.save(patched, source, workflow_id=workflow_id, parent_version=base_info["version"])
+        return patched, info
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def load(self, workflow_id: str, version: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        저장된 워크플로우와 버전 정보를 반환합니다 (version이 None이면 최신 버전).
+
+        Raises:
+            WorkflowNotFoundError: 없는 id/버전 (보관 개수를 넘어 지워진 버전 포함)
+        """
+        if version is None:
+            version = self.latest_version(workflow_id)
+        cached = self._cache_get((workflow_id, version))
+        if cached is not None:
+            return cached
+
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT version, parent_version, source, digest, node_count, created_at, " + self._KIND + ", "
+                "document FROM workflow_versions WHERE workflow_id = ? AND version = ?", (workflow_id, version)
+            ).fetchone()
+        if row is None:
+            raise WorkflowNotFoundError(f"저장된 워크플로우 버전이 없습니다: {workflow_id} v{version}")
+        workflow = json.loads(row[7]) if row[7] is not None else self._restore(workflow_id, version)
+        info = self._info(workflow_id, row[:7])
+        self._cache_put((workflow_id, version), workflow, info)
+        return workflow, info
+
+    def _restore(self, workflow_id: str, version: int) -> Dict[str, Any]:
+        """가장 가까운 전체 문서에 delta를 차례로 적용해 delta 버전을 복원합니다."""
+        if self.delta_applier is None:
+            raise ValueError("delta 버전을 복원할 delta_applier가 설정되지 않았습니다")
+        with self._db_lock:
+            db = self._connection()
+            base = db.execute(
+                "SELECT MAX(version) FROM workflow_versions "
+                "WHERE workflow_id = ? AND version < ? AND document IS NOT NULL", (workflow_id, version)
+            ).fetchone()[0]
+            if base is None:
+                raise WorkflowNotFoundError(f"복원할 전체 문서가 없습니다: {workflow_id} v{version}")
+            deltas = db.execute(
+                "SELECT version, delta FROM workflow_versions "
+                "WHERE workflow_id = ? AND version > ? AND version <= ? ORDER BY version",
+                (workflow_id, base, version)
+            ).fetchall()
+        if len(deltas) != version - base:
+            raise WorkflowNotFoundError(f"delta 기록이 끊겨 복원할 수 없습니다: {workflow_id} v{version}")
+
+        workflow = self.load(workflow_id, base)[0]
+        for _, delta in deltas:
+            workflow = self.delta_applier(workflow, json.loads(delta))
+
+        if len(deltas) >= self.compact_after:
+            document = json.dumps(workflow, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            with self._db_lock:
+                self._connection().execute(
+                    "UPDATE workflow_versions SET document = ? WHERE workflow_id = ? AND version = ?",
+                    (document, workflow_id, version)
+                )
+            self.compactions += 1
+        return workflow
+
+    def deltas_since(self, workflow_id: str, version: int) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """
+        version 다음부터 최신 버전까지의 변경분 목록 [(버전, delta)]을 반환합니다.
+        사이에 전체 문서로 저장된 버전이 있거나 기록이 지워졌으면 None (전체 문서를 다시 읽어야 함).
+        """
+        with self._db_lock:
+            db = self._connection()
+            latest = db.execute(
+                "SELECT latest_version FROM workflows WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+            if latest is None:
+                raise WorkflowNotFoundError(f"저장된 워크플로우가 없습니다: {workflow_id}")
+            rows = db.execute(
+                "SELECT version, delta FROM workflow_versions "
+                "WHERE workflow_id = ? AND version > ? ORDER BY version", (workflow_id, version)
+            ).fetchall()
+        if len(rows) != latest[0] - version or any(delta is None for _, delta in rows):
+            return None
+        return [(row_version, json.loads(delta)) for row_version, delta in rows]
+
+    def get(self, workflow_id: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """저장된 워크플로우를 반환합니다 (load()에서 버전 정보를 뺀 것)."""
+        return self.load(workflow_id, version)[0]
+
+    def latest_version(self, workflow_id: str) -> int:
+        """최신 버전 번호 (다른 작업자 프로세스가 저장한 버전도 반영)"""
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT latest_version FROM workflows WHERE workflow_id = ?", (workflow_id,)
+            ).fetchone()
+        if row is None:
+            raise WorkflowNotFoundError(f"저장된 워크플로우가 없습니다: {workflow_id}")
+        return row[0]
+
+    def history(self, workflow_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """최신 버전부터 limit개의 버전 정보 (문서 제외)"""
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT version, parent_version, source, digest, node_count, created_at, " + self._KIND + " "
+                "FROM workflow_versions WHERE workflow_id = ? ORDER BY version DESC LIMIT ?",
+                (workflow_id, limit)
+            ).fetchall()
+        if not rows:
+            raise WorkflowNotFoundError(f"저장된 워크플로우가 없습니다: {workflow_id}")
+        return [self._info(workflow_id, row) for row in rows]
+
+    # 버전 종류: 전체 문서(snapshot) 또는 변경분(delta)
+    _KIND = "CASE WHEN delta IS NULL THEN 'snapshot' ELSE 'delta' END"
+
+    def _info(self, workflow_id: str, row: tuple) -> Dict[str, Any]:
+        version, parent_version, source, digest, node_count, created_at, kind = row
+        return {
+            "workflow_id": workflow_id,
+            "version": version,
+            "parent_version": parent_version,
+            "source": source,
+            "digest": digest,
+            "node_count": node_count,
+            "kind": kind,
+            "created_at": created_at
+        }
+
+    def _cache_get(self, key: Tuple[str, int]) -> Optional[tuple]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+
+    def _cache_put(self, key: Tuple[str, int], workflow: Dict[str, Any], info: Dict[str, Any]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (workflow, info)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_drop(self, workflow_ids: List[str]) -> None:
+        removed = set(workflow_ids)
+        with self._cache_lock:
+            for key in [key for key in self._cache if key[0] in removed]:
+                del self._cache[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 워크플로우/버전 수와 문서 캐시 통계를 반환합니다."""
+        with self._db_lock:
+            db = self._connection()
+            workflows = db.execute("SELECT COUNT(*) FROM workflows").fetchone()[0]
+            versions, stored_bytes = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(document)), 0) + COALESCE(SUM(LENGTH(delta)), 0) "
+                "FROM workflow_versions"
+            ).fetchone()
+        with self._cache_lock:
+            cached = len(self._cache)
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "name": "workflow_store",
+            "path": self.path,
+            "workflows": workflows,
+            "versions": versions,
+            "stored_bytes": stored_bytes,
+            "max_versions": self.max_versions,
+            "max_workflows": self.max_workflows,
+            "max_age_seconds": self.max_age_seconds,
+            "saves": self.saves,
+            "save_errors": self.save_errors,
+            "expired": self.expired,
+            "delta_saves": self.delta_saves,
+            "compactions": self.compactions,
+            "deduplicated": self.deduplicated,
+            "cache_size": cached,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0
+        }
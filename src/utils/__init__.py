@@ -1,6 +1,27 @@
 # src/utils/__init__.py
 """Utility functions for Agent Builder MCP Server"""
 
-from .helpers import safe_json_dumps, safe_json_loads, merge_dicts
+from .helpers import safe_json_dumps, safe_json_loads, merge_dicts, iter_jsonl
+from .keyword_matcher import KeywordMatcher
+from .serialization import (
+    OUTPUT_FORMATS,
+    dumps,
+    get_default_format,
+    set_default_format,
+    get_json_backend,
+    set_json_backend,
+)
 
-__all__ = ["safe_json_dumps", "safe_json_loads", "merge_dicts"]
+__all__ = [
+    "safe_json_dumps",
+    "safe_json_loads",
+    "merge_dicts",
+    "iter_jsonl",
+    "KeywordMatcher",
+    "OUTPUT_FORMATS",
+    "dumps",
+    "get_default_format",
+    "set_default_format",
+    "get_json_backend",
+    "set_json_backend",
+]
@@ -4,11 +4,13 @@
 """
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
 
-def safe_json_dumps(obj: Any) -> str:
-    """안전한 JSON 직렬화"""
-    return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+from .serialization import dumps
+
+def safe_json_dumps(obj: Any, format: Optional[str] = None) -> str:
+    """안전한 JSON 직렬화 (format을 비우면 서버 기본 형식)"""
+    return dumps(obj, format)
 
 def safe_json_loads(json_str: str) -> Dict[str, Any]:
     """안전한 JSON 역직렬화"""
@@ -22,3 +24,15 @@ def merge_dicts(dict1: Dict, dict2: Dict) -> Dict:
     result = dict1.copy()
     result.update(dict2)
     return result
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """JSONL 파일을 한 줄씩 파싱하여 반환합니다 (빈 줄은 건너뜀)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSONL 파싱 실패 ({path}:{line_number}): {str(e)}") from e
@@ -0,0 +1,167 @@
+# src/utils/keyword_matcher.py
+"""
+다중 키워드 매처
+여러 키워드 테이블을 하나의 트라이 오토마톤으로 컴파일하여 텍스트를 한 번만 스캔합니다.
+"""
+
+import re
+from typing import Dict, List, Any, Iterable, Tuple
+
+
+class KeywordMatcher:
+    """키워드 테이블들을 하나의 오토마톤으로 컴파일한 매처"""
+
+    def __init__(self,
+                 tables: Dict[str, Dict[str, List[str]]],
+                 whole_token_tables: Iterable[str] = ()):
+        """
+        Args:
+            tables: {테이블 이름: {레이블: [키워드, ...]}} 형태의 키워드 테이블
+            whole_token_tables: 공백으로 구분된 토큰 전체가 일치해야만
+                매치로 인정하는 테이블 이름 목록
+        """
+        self.whole_token_tables = frozenset(whole_token_tables)
+        # 테이블/레이블 순서를 보존하여 결과 순서를 결정적으로 유지
+        self.label_order: Dict[str, List[str]] = {
+            table: list(labels) for table, labels in tables.items()
+        }
+
+        # 같은 키워드가 여러 테이블/레이블에 등장할 수 있으므로 키워드는 한 번만 등록
+        self._targets: Dict[str, List[Tuple[str, str]]] = {}
+        for table, labels in tables.items():
+            for label, words in labels.items():
+                for word in words:
+                    word = word.lower()
+                    if not word:
+                        continue
+                    targets = self._targets.setdefault(word, [])
+                    if (table, label) not in targets:
+                        targets.append((table, label))
+
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """
+        키워드 트라이를 정규식으로 컴파일합니다.
+
+        트라이 형태의 패턴은 C 정규식 엔진이 첫 글자 집합으로 후보 위치까지 건너뛸 수 있어
+        순수 파이썬 상태 전이 루프보다 훨씬 빠르게 동작합니다.
+        위치마다 가장 긴 키워드를 찾고, 같은 위치에서 시작하는
+        더 짧은 키워드는 접두사 테이블로 복원합니다.
+        """
+        trie: Dict[str, Any] = {}
+        for word in self._targets:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        # 위치마다 가장 긴 매치 → 같은 위치의 모든 키워드 (긴 것부터)
+        self._prefixes: Dict[str, List[str]] = {
+            word: sorted(
+                (other for other in self._targets if word.startswith(other)),
+                key=len,
+                reverse=True
+            )
+            for word in self._targets
+        }
+
+        self._pattern = re.compile(self._trie_to_pattern(trie) if trie else "(?!)")
+
+    def _trie_to_pattern(self, node: Dict[str, Any]) -> str:
+        """트라이 노드를 정규식 조각으로 변환합니다 (긴 매치 우선)."""
+        branches = [
+            re.escape(char) + self._trie_to_pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    def iter_matches(self, text: str):
+        """
+        텍스트에서 겹치는 매치를 포함한 모든 키워드 매치를 (시작, 끝, 키워드) 형태로 생성합니다.
+
+        Args:
+            text: 이미 소문자로 정규화된 텍스트
+        """
+        prefixes = self._prefixes
+        for start, longest in self._iter_longest(text):
+            for keyword in prefixes[longest]:
+                yield start, start + len(keyword), keyword
+
+    def _iter_longest(self, text: str):
+        """시작 위치마다 가장 긴 키워드 매치를 생성합니다 (겹치는 매치 포함)."""
+        search = self._pattern.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                return
+            start = match.start()
+            yield start, match.group()
+            # 매치 내부에서 시작하는 다른 키워드도 찾기 위해 한 글자만 전진
+            position = start + 1
+
+    def scan(self, text: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        텍스트를 한 번 스캔하여 테이블/레이블별 매치 위치와 횟수를 반환합니다.
+
+        Args:
+            text: 이미 소문자로 정규화된 텍스트
+
+        Returns:
+            {테이블: {레이블: {"count": 매치 수, "keywords": [...], "positions": [[시작, 끝], ...]}}}
+            매치가 없는 레이블은 포함되지 않으며, 레이블 순서는 테이블 정의 순서를 따릅니다.
+        """
+        # 1단계: 키워드별 시작 위치 수집 (매치당 파이썬 작업 최소화)
+        starts_by_keyword: Dict[str, List[int]] = {}
+        prefixes = self._prefixes
+        for start, longest in self._iter_longest(text):
+            for keyword in prefixes[longest]:
+                starts = starts_by_keyword.get(keyword)
+                if starts is None:
+                    starts_by_keyword[keyword] = [start]
+                else:
+                    starts.append(start)
+
+        # 2단계: 키워드 단위로 테이블/레이블에 귀속
+        hits: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        text_length = len(text)
+        for keyword, starts in starts_by_keyword.items():
+            length = len(keyword)
+            bounded = None
+            for table, label in self._targets[keyword]:
+                if table in self.whole_token_tables:
+                    if bounded is None:
+                        bounded = [
+                            start for start in starts
+                            if (start == 0 or text[start - 1].isspace())
+                            and (start + length == text_length or text[start + length].isspace())
+                        ]
+                    label_starts = bounded
+                else:
+                    label_starts = starts
+                if not label_starts:
+                    continue
+                hit = hits.get((table, label))
+                if hit is None:
+                    hit = hits[(table, label)] = {"count": 0, "keywords": [], "positions": []}
+                hit["count"] += len(label_starts)
+                hit["keywords"].append(keyword)
+                hit["positions"].extend([start, start + length] for start in label_starts)
+
+        for hit in hits.values():
+            if len(hit["keywords"]) > 1:
+                hit["positions"].sort()
+
+        signals: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for table, labels in self.label_order.items():
+            signals[table] = {
+                label: hits[(table, label)] for label in labels if (table, label) in hits
+            }
+        return signals
@@ -0,0 +1,105 @@
+# src/utils/serialization.py
+"""
+응답 직렬화
+도구 응답을 pretty/compact JSON 또는 MessagePack(base64)으로 직렬화합니다.
+orjson이 설치되어 있으면 JSON 직렬화에 사용하고, 없으면 표준 json 모듈을 사용합니다.
+"""
+
+import base64
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+# 지원하는 응답 형식
+OUTPUT_FORMATS = ("pretty", "compact", "msgpack")
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+_default_format = "pretty"
+_use_orjson = orjson is not None
+
+
+def set_default_format(format: str) -> None:
+    """format을 지정하지 않은 호출에 사용할 서버 전체 기본 형식을 설정합니다."""
+    global _default_format
+    _default_format = resolve_format(format)
+
+
+def get_default_format() -> str:
+    return _default_format
+
+
+def set_json_backend(backend: str) -> None:
+    """
+    JSON 직렬화 백엔드를 설정합니다.
+
+    Args:
+        backend: auto (orjson이 있으면 사용), orjson, json (표준 라이브러리)
+    """
+    global _use_orjson
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"지원하지 않는 JSON 백엔드입니다: {backend} (가능: {', '.join(JSON_BACKENDS)})")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("orjson 백엔드를 사용하려면 orjson 패키지가 필요합니다")
+    _use_orjson = orjson is not None and backend != "json"
+
+
+def get_json_backend() -> str:
+    return "orjson" if _use_orjson else "json"
+
+
+def resolve_format(format: Optional[str]) -> str:
+    """빈 값이면 기본 형식을, 아니면 검증된 형식을 반환합니다."""
+    if not format:
+        return _default_format
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {format} (가능: {', '.join(OUTPUT_FORMATS)})")
+    if format == "msgpack" and msgpack is None:
+        raise ValueError("msgpack 형식을 사용하려면 msgpack 패키지가 필요합니다")
+    return format
+
+
+def _orjson_dumps(obj: Any, pretty: bool) -> Optional[str]:
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=str, option=option).decode("utf-8")
+    except TypeError:
+        # 64비트를 넘는 정수 등 orjson이 처리하지 못하는 값은 표준 json으로 처리
+        return None
+
+
+def dumps(obj: Any, format: Optional[str] = None) -> str:
+    """
+    객체를 지정한 형식의 문자열로 직렬화합니다.
+
+    Args:
+        obj: 직렬화할 객체
+        format: pretty (들여쓰기 JSON), compact (공백 없는 JSON),
+            msgpack (MessagePack을 base64로 인코딩한 문자열), 비우면 서버 기본 형식
+
+    Returns:
+        직렬화된 문자열
+    """
+    format = resolve_format(format)
+    if format == "msgpack":
+        packed = msgpack.packb(obj, default=str, use_bin_type=True)
+        return base64.b64encode(packed).decode("ascii")
+
+    pretty = format == "pretty"
+    if _use_orjson:
+        text = _orjson_dumps(obj, pretty)
+        if text is not None:
+            return text
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""테스트에서 src 아래의 config/services/utils 패키지를 서버와 같은 방식으로 import하도록 경로를 설정합니다."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
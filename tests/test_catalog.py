@@ -0,0 +1,159 @@
+# tests/test_catalog.py
+"""도구 카탈로그 로더/hot reload 테스트 (검증, marshal 스냅샷 재사용과 무효화, 파생 구조 준비, 카탈로그 고정)"""
+
+import json
+import os
+import threading
+
+import pytest
+
+import config.tools_config as tools_config
+from config.catalog_loader import CatalogError, load_catalog
+
+
+def _tool(name, **fields):
+    return dict({"category": "search", "name": name, "description": f"{name} 도구",
+                 "inputSchema": {"type": "object", "properties": {}}}, **fields)
+
+
+def _write(directory, filename, tools):
+    path = directory / filename
+    path.write_text(json.dumps(tools, ensure_ascii=False), encoding="utf-8")
+    # 같은 크기로 빠르게 다시 써도 지문이 바뀌도록 수정 시각을 올림
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    return path
+
+
+@pytest.fixture
+def catalog_dir(tmp_path, monkeypatch):
+    """임시 카탈로그 디렉터리를 쓰고, 테스트가 끝나면 모듈의 현재 카탈로그/상태를 되돌림"""
+    directory = tmp_path / "tools"
+    directory.mkdir()
+    _write(directory, "10_search.json", {"web_search": _tool("웹 검색")})
+    monkeypatch.setenv("TOOL_CATALOG_DIR", str(directory))
+    monkeypatch.setenv("TOOL_CATALOG_SNAPSHOT", str(tmp_path / "snapshot" / "catalog.marshal"))
+    monkeypatch.setattr(tools_config, "_current", None)
+    monkeypatch.setattr(tools_config, "_catalog_version", 0)
+    monkeypatch.setattr(tools_config, "_failed_fingerprint", None)
+    monkeypatch.setattr(tools_config, "_preparers", [])
+    monkeypatch.setattr(tools_config, "_status", dict(tools_config._status, reloads=0, failed_reloads=0,
+                                                       last_error=None, last_error_at=None))
+    return directory
+
+
+def test_load_catalog_reports_every_problem(tmp_path):
+    _write(tmp_path, "a.json", {"ok": _tool("정상"),
+                                "bad_schema": _tool("스키마", inputSchema={"type": "array"}),
+                                "bad_priority": _tool("우선순위", priority="high")})
+    _write(tmp_path, "b.json", {"ok": _tool("중복"), "needs": _tool("의존", dependencies=["missing"])})
+    with pytest.raises(CatalogError) as error:
+        load_catalog(str(tmp_path))
+    problems = error.value.problems
+    assert "a.json: bad_schema: inputSchema는 type이 object인 JSON 스키마여야 합니다" in problems
+    assert "a.json: bad_priority: priority는 정수여야 합니다" in problems
+    assert "b.json: 도구 id가 중복됩니다: ok (a.json에도 정의됨)" in problems
+    assert "b.json: needs: 알 수 없는 의존 도구입니다: missing" in problems
+
+
+def test_bad_file_is_rejected_and_old_catalog_kept(catalog_dir):
+    before = tools_config.get_catalog()
+    _write(catalog_dir, "20_bad.json", {"broken": _tool("깨짐", inputSchema={"type": "string"})})
+
+    with pytest.raises(CatalogError, match="inputSchema"):
+        tools_config.reload_catalog()
+    assert tools_config.get_catalog() is before
+    status = tools_config.catalog_status()
+    assert (status["version"], status["failed_reloads"], status["reloads"]) == (0, 1, 0)
+    assert "broken" in status["last_error"][0]
+    # 실패한 지문은 감시 스레드가 다시 시도하지 않음
+    assert tools_config.check_for_changes() is False
+    assert tools_config.catalog_status()["failed_reloads"] == 1
+
+    # 파일을 고치면 교체
+    _write(catalog_dir, "20_bad.json", {"fixed": _tool("수정됨")})
+    assert tools_config.check_for_changes() is True
+    assert set(tools_config.get_catalog().tools) == {"web_search", "fixed"}
+
+
+def test_snapshot_is_reused_while_fingerprint_is_unchanged(catalog_dir, monkeypatch):
+    first = tools_config.get_catalog()
+    assert first.source == "files"
+    assert os.path.exists(tools_config.snapshot_path())
+
+    # 다음 시작: 파일을 다시 읽고 검증하지 않고 스냅샷을 읽음
+    monkeypatch.setattr(tools_config, "_current", None)
+    monkeypatch.setattr(tools_config, "load_catalog", lambda directory: pytest.fail("파일을 다시 읽음"))
+    second = tools_config.get_catalog()
+    assert second.source == "snapshot"
+    assert second.tools == first.tools
+    assert tools_config.reload_catalog() is second
+
+
+def test_snapshot_is_rebuilt_after_file_edit(catalog_dir, monkeypatch):
+    first = tools_config.get_catalog()
+    _write(catalog_dir, "10_search.json", {"web_search": _tool("웹 검색 (수정)"), "news": _tool("뉴스")})
+
+    reloaded = tools_config.reload_catalog()
+    assert reloaded.source == "files" and reloaded.version == first.version + 1
+    assert reloaded.tools["web_search"]["name"] == "웹 검색 (수정)"
+    assert reloaded.categories == {"search": ["web_search", "news"]}
+
+    # 다시 쓴 스냅샷은 새 지문과 함께 저장됨
+    monkeypatch.setattr(tools_config, "_current", None)
+    restarted = tools_config.get_catalog()
+    assert restarted.source == "snapshot" and set(restarted.tools) == {"web_search", "news"}
+
+
+def test_failing_preparer_leaves_catalog_unswapped(catalog_dir):
+    before = tools_config.get_catalog()
+    prepared = []
+
+    def prepare_index(catalog):
+        # 교체 전에 새 카탈로그로 호출되며 요청은 여전히 기존 카탈로그를 봄
+        prepared.append(catalog)
+        assert tools_config.get_catalog() is before
+        catalog.derived["index"] = len(catalog.tools)
+
+    def failing(catalog):
+        raise RuntimeError("index build failed")
+
+    tools_config.add_catalog_preparer(prepare_index)
+    tools_config.add_catalog_preparer(prepare_index)
+    tools_config.add_catalog_preparer(failing)
+    _write(catalog_dir, "20_more.json", {"news": _tool("뉴스")})
+
+    with pytest.raises(CatalogError, match="파생 구조를 만들지 못했습니다 \\(failing\\): index build failed"):
+        tools_config.reload_catalog()
+    assert tools_config.get_catalog() is before
+    assert len(prepared) == 1
+    assert tools_config.catalog_status()["failed_reloads"] == 1
+
+    tools_config._preparers.remove(failing)
+    reloaded = tools_config.reload_catalog(force=True)
+    assert tools_config.get_catalog() is reloaded and reloaded.derived["index"] == 2
+
+
+def test_pinned_catalog_is_stable_across_reload(catalog_dir):
+    before = tools_config.get_catalog()
+    seen = []
+
+    def handler():
+        seen.append(tools_config.get_catalog())
+        reloader = threading.Thread(target=tools_config.reload_catalog)
+        _write(catalog_dir, "20_more.json", {"news": _tool("뉴스")})
+        reloader.start()
+        reloader.join()
+        seen.append(tools_config.get_catalog())
+        return tools_config.get_catalog().tools
+
+    tools = tools_config.call_with_catalog(handler)
+    assert seen == [before, before]
+    assert set(tools) == {"web_search"}
+    # 고정이 끝나면 새 카탈로그
+    assert set(tools_config.get_catalog().tools) == {"web_search", "news"}
+
+    with tools_config.pinned_catalog() as outer:
+        with tools_config.pinned_catalog() as inner:
+            assert inner is outer
+        assert tools_config.get_catalog() is outer
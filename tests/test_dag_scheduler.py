@@ -0,0 +1,118 @@
+# tests/test_dag_scheduler.py
+"""DAG 스케줄러(단계, 임계 경로, loop_back 처리) 테스트"""
+
+from services.dag_scheduler import build_execution_plan, flatten_stages
+
+
+def _node(node_id, time_ms=0, node_type="process"):
+    return {"id": node_id, "type": node_type, "estimated_time_ms": time_ms}
+
+
+def _conn(source, target, conn_type="direct"):
+    return {"id": f"{source}->{target}", "from_node": source, "to_node": target, "type": conn_type}
+
+
+def _diamond():
+    # start → a(100) → c(50) → end, start → b(300) → c
+    nodes = [_node("start", 999, "start"), _node("a", 100), _node("b", 300), _node("c", 50),
+             _node("end", 999, "end")]
+    connections = [_conn("start", "a"), _conn("start", "b"), _conn("a", "c"), _conn("b", "c"),
+                   _conn("c", "end")]
+    return nodes, connections
+
+
+def test_stages_group_independent_nodes():
+    plan = build_execution_plan(*_diamond())
+    assert plan["stages"] == [["start"], ["a", "b"], ["c"], ["end"]]
+    assert plan["stage_count"] == 4
+    assert plan["max_parallelism"] == 2
+    assert flatten_stages(plan) == ["start", "a", "b", "c", "end"]
+
+
+def test_stage_order_follows_node_order():
+    nodes = [_node("start", 0, "start"), _node("z", 10), _node("y", 10), _node("x", 10)]
+    connections = [_conn("start", "x"), _conn("start", "y"), _conn("start", "z")]
+    plan = build_execution_plan(nodes, connections)
+    assert plan["stages"][1] == ["z", "y", "x"]
+
+
+def test_critical_path_and_timing():
+    plan = build_execution_plan(*_diamond())
+    # 시작/종료 노드는 estimated_time_ms와 관계없이 0ms
+    assert plan["critical_path"] == ["start", "b", "c", "end"]
+    assert plan["makespan_ms"] == 350
+    assert plan["sequential_time_ms"] == 450
+
+    timing = plan["node_timing"]
+    assert timing["a"]["earliest_finish_ms"] == 100
+    assert timing["a"]["slack_ms"] == 200
+    assert timing["c"]["earliest_start_ms"] == 300
+    for node_id in plan["critical_path"]:
+        assert timing[node_id]["slack_ms"] == 0
+    assert {node_id: t["stage"] for node_id, t in timing.items()} == {
+        "start": 0, "a": 1, "b": 1, "c": 2, "end": 3
+    }
+
+
+def test_loop_back_is_excluded_from_dag_and_reported():
+    nodes = [_node("start", 0, "start"), _node("fetch", 100), _node("check", 20), _node("report", 50),
+             _node("end", 0, "end")]
+    connections = [_conn("start", "fetch"), _conn("fetch", "check"), _conn("check", "report"),
+                   _conn("report", "end"), _conn("check", "fetch", "loop_back")]
+    plan = build_execution_plan(nodes, connections)
+
+    assert not plan["has_cycle"]
+    assert plan["stages"] == [["start"], ["fetch"], ["check"], ["report"], ["end"]]
+    # makespan은 반복 1회 기준
+    assert plan["makespan_ms"] == 170
+    assert len(plan["loops"]) == 1
+    loop = plan["loops"][0]
+    assert (loop["from_node"], loop["to_node"]) == ("check", "fetch")
+    assert loop["body"] == ["fetch", "check"]
+
+
+def test_cycle_without_loop_back_is_reported():
+    nodes = [_node("start", 0, "start"), _node("a", 10), _node("b", 10)]
+    connections = [_conn("start", "a"), _conn("a", "b"), _conn("b", "a")]
+    plan = build_execution_plan(nodes, connections)
+
+    assert plan["has_cycle"]
+    assert plan["cyclic_nodes"] == ["a", "b"]
+    assert plan["stages"] == [["start"]]
+    assert flatten_stages(plan) == ["start", "a", "b"]
+
+
+def test_connection_only_nodes_and_duplicate_edges():
+    nodes = [_node("a", 10)]
+    connections = [_conn("a", "ghost"), _conn("a", "ghost")]
+    plan = build_execution_plan(nodes, connections)
+
+    assert plan["stages"] == [["a"], ["ghost"]]
+    assert plan["node_timing"]["ghost"]["duration_ms"] == 0
+    assert plan["makespan_ms"] == 10
+
+
+def test_empty_workflow():
+    plan = build_execution_plan([], [])
+    assert plan["stages"] == []
+    assert plan["critical_path"] == []
+    assert plan["makespan_ms"] == 0
+    assert plan["max_parallelism"] == 0
+
+
+def test_recommendation_execution_order_follows_plan():
+    from services import NodeRecommender, get_catalog_index
+
+    tools = get_catalog_index().tools_for_capabilities(["web_search", "text_generation"])
+    recommendation = NodeRecommender().recommend(
+        intent="search",
+        required_capabilities=["web_search", "text_generation"],
+        recommended_tools=tools,
+        complexity_level="medium",
+        workflow_type="parallel"
+    )
+    plan = recommendation["execution_plan"]
+    assert recommendation["execution_order"] == flatten_stages(plan)
+    assert not plan["has_cycle"]
+    node_ids = {node["id"] for node in recommendation["nodes"]}
+    assert set(recommendation["execution_order"]) == node_ids
@@ -0,0 +1,121 @@
+# tests/test_incremental_optimizer.py
+"""증분 최적화 세션의 일정이 전체 다시 계산한 build_execution_plan과 같은지 확인하는 무작위 편집 테스트"""
+
+import random
+
+import pytest
+
+from services.dag_scheduler import build_execution_plan
+from services.incremental_optimizer import OptimizationSession, apply_workflow_delta
+from services.workflow_optimizer import WorkflowOptimizer
+
+TOOLS = ["web_search", "document_retrieve", "data_analysis", "content_generation"]
+DURATIONS = [100, 250, 400, 700, 1500]
+
+
+def _random_workflow(rng, node_count):
+    nodes = [{"id": "start", "type": "start"}]
+    connections = []
+    for i in range(node_count):
+        node_id = f"n{i}"
+        nodes.append({"id": node_id, "type": "process", "tool_id": rng.choice(TOOLS),
+                      "estimated_time_ms": rng.choice(DURATIONS), "arguments": {"item": i}})
+        sources = rng.sample([node["id"] for node in nodes[:-1]], min(len(nodes) - 1, rng.randint(1, 2)))
+        connections += [{"id": f"{s}->{node_id}", "from_node": s, "to_node": node_id, "type": "direct"}
+                        for s in sources]
+    nodes.append({"id": "end", "type": "end"})
+    sinks = [node["id"] for node in nodes[1:-1]
+             if not any(c["from_node"] == node["id"] for c in connections)]
+    connections += [{"id": f"{s}->end", "from_node": s, "to_node": "end", "type": "direct"} for s in sinks]
+    return {"workflow_id": "random", "nodes": nodes, "connections": connections}
+
+
+def _random_diff(rng, session, step):
+    graph = session.graph
+    process = [n for n, node in graph.nodes.items() if node.get("type") == "process"]
+    order = sorted(graph.nodes, key=graph.order_pos.__getitem__)
+    kind = rng.choice(["duration", "arguments", "add_node", "remove_node", "add_edge", "remove_edge"])
+    node_id = rng.choice(process)
+    if kind == "duration":
+        return {"changed_nodes": [{"id": node_id, "estimated_time_ms": rng.choice(DURATIONS)}]}
+    if kind == "arguments":
+        return {"changed_nodes": [{"id": node_id, "arguments": {"item": -step}}]}
+    if kind == "add_node":
+        added = f"added_{step}"
+        later = [n for n in order if graph.order_pos[n] > graph.order_pos[node_id]]
+        connections = [{"from_node": node_id, "to_node": added}]
+        if later:
+            connections.append({"from_node": added, "to_node": rng.choice(later)})
+        return {"added_nodes": [{"id": added, "type": "process", "tool_id": rng.choice(TOOLS),
+                                 "estimated_time_ms": rng.choice(DURATIONS)}],
+                "added_connections": connections}
+    if kind == "remove_node" and len(process) > 3:
+        return {"removed_nodes": [node_id]}
+    if kind == "add_edge":
+        source, target = sorted(rng.sample(order, 2), key=graph.order_pos.__getitem__)
+        if graph.edge(source, target) is None and target != "start" and source != "end":
+            return {"added_connections": [{"from_node": source, "to_node": target}]}
+    edges = [(u, v) for u in graph.nodes for v in graph.out_edges[u]]
+    if kind == "remove_edge" and edges:
+        source, target = rng.choice(edges)
+        return {"removed_connections": [{"from_node": source, "to_node": target}]}
+    return {"changed_nodes": [{"id": node_id, "estimated_time_ms": rng.choice(DURATIONS)}]}
+
+
+def _assert_matches_full_plan(session):
+    workflow = session.workflow()
+    plan = build_execution_plan(workflow["nodes"], workflow["connections"])
+    assert not plan["has_cycle"]
+    assert session.makespan_ms() == plan["makespan_ms"]
+    assert session.critical_path() == plan["critical_path"]
+    assert session.total_work_ms == plan["sequential_time_ms"]
+    assert sorted(session.stage_sizes.items()) == [(i, len(stage)) for i, stage in enumerate(plan["stages"])]
+    timings = {node_id: session.node_timing(node_id) for node_id in session.graph.nodes}
+    assert timings == plan["node_timing"]
+    return plan
+
+
+@pytest.mark.parametrize("goal", ["speed", "cost", "reliability"])
+@pytest.mark.parametrize("seed", range(6))
+def test_random_edits_match_full_schedule(seed, goal):
+    rng = random.Random(seed)
+    optimizer = WorkflowOptimizer()
+    optimized = optimizer.optimize(_random_workflow(rng, rng.randint(8, 30)), goal)
+    session = OptimizationSession(optimized, goal, optimizer)
+    _assert_matches_full_plan(session)
+
+    replica = OptimizationSession(optimized, goal, optimizer)
+    document = optimized["optimized_workflow"]
+    for step in range(25):
+        report = session.apply(_random_diff(rng, session, step))
+        plan = _assert_matches_full_plan(session)
+        assert report["makespan_ms"] == plan["makespan_ms"]
+        assert report["critical_path"] == plan["critical_path"]
+        for node_id, timing in report["node_timing"].items():
+            assert timing == plan["node_timing"][node_id]
+
+        # 저장한 변경분을 따라 적용한 다른 작업자의 세션과 저장소 복원 결과도 같아야 함
+        replica.replay(session.last_delta)
+        assert replica.critical_path() == session.critical_path()
+        document = apply_workflow_delta(document, session.last_delta)
+        assert document["nodes"] == session.workflow()["nodes"]
+        assert sorted(c["id"] for c in document["connections"]) == \
+            sorted(c["id"] for c in session.workflow()["connections"])
+
+
+def test_cycle_creating_diff_is_rejected_without_changes():
+    optimizer = WorkflowOptimizer()
+    workflow = {"nodes": [{"id": "start", "type": "start"},
+                          {"id": "a", "type": "process", "tool_id": "web_search", "estimated_time_ms": 100},
+                          {"id": "b", "type": "process", "tool_id": "data_analysis", "estimated_time_ms": 200},
+                          {"id": "end", "type": "end"}],
+                "connections": [{"from_node": "start", "to_node": "a"}, {"from_node": "a", "to_node": "b"},
+                                {"from_node": "b", "to_node": "end"}]}
+    session = OptimizationSession(optimizer.optimize(workflow, "reliability"), "reliability", optimizer)
+    before = session.workflow()
+    with pytest.raises(ValueError):
+        session.apply({"changed_nodes": [{"id": "a", "estimated_time_ms": 5}],
+                       "added_connections": [{"from_node": "b", "to_node": "a"}]})
+    assert session.workflow() == before
+    assert not session.broken
+    _assert_matches_full_plan(session)
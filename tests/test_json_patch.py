@@ -0,0 +1,108 @@
+# tests/test_json_patch.py
+"""JSON Patch (RFC 6902) 적용 테스트 (RFC 부록 A의 예시와 경계 사례)"""
+
+import copy
+
+import pytest
+
+from services.json_patch import JsonPatchError, apply_patch, parse_pointer, resolve
+
+
+def test_pointer_escapes_are_decoded_in_order():
+    assert parse_pointer("") == []
+    assert parse_pointer("/") == [""]
+    assert parse_pointer("/a~1b/m~0n/~01") == ["a/b", "m~n", "~1"]
+    with pytest.raises(JsonPatchError):
+        parse_pointer("a/b")
+    assert resolve({"a/b": {"": 1}}, "/a~1b/") == 1
+
+
+def test_add_object_member_array_insert_and_append():
+    document = {"foo": ["bar", "baz"]}
+    assert apply_patch(document, [{"op": "add", "path": "/baz", "value": "qux"}]) == {
+        "foo": ["bar", "baz"], "baz": "qux"}
+    assert apply_patch(document, [{"op": "add", "path": "/foo/1", "value": "qux"}]) == {
+        "foo": ["bar", "qux", "baz"]}
+    assert apply_patch(document, [{"op": "add", "path": "/foo/2", "value": "end"}]) == {
+        "foo": ["bar", "baz", "end"]}
+    assert apply_patch(document, [{"op": "add", "path": "/foo/-", "value": ["abc"]}]) == {
+        "foo": ["bar", "baz", ["abc"]]}
+    # 있는 멤버에 add하면 값을 바꿈, 빈 경로는 문서 전체를 바꿈
+    assert apply_patch(document, [{"op": "add", "path": "/foo", "value": 1}]) == {"foo": 1}
+    assert apply_patch(document, [{"op": "add", "path": "", "value": [1]}]) == [1]
+
+
+@pytest.mark.parametrize("path", ["/foo/3", "/foo/01", "/foo/-1", "/foo/x", "/missing/child", "/foo/0/x"])
+def test_add_rejects_invalid_targets(path):
+    with pytest.raises(JsonPatchError):
+        apply_patch({"foo": ["bar", "baz"]}, [{"op": "add", "path": path, "value": 1}])
+
+
+def test_remove_and_replace_require_existing_target():
+    document = {"foo": "bar", "list": [1, 2, 3]}
+    assert apply_patch(document, [{"op": "remove", "path": "/list/1"}]) == {"foo": "bar", "list": [1, 3]}
+    assert apply_patch(document, [{"op": "replace", "path": "/foo", "value": None}]) == {
+        "foo": None, "list": [1, 2, 3]}
+    for operation in ({"op": "remove", "path": "/baz"}, {"op": "remove", "path": "/list/3"},
+                      {"op": "remove", "path": "/list/-"}, {"op": "remove", "path": ""},
+                      {"op": "replace", "path": "/baz", "value": 1},
+                      {"op": "replace", "path": "/list/3", "value": 1}):
+        with pytest.raises(JsonPatchError):
+            apply_patch(document, [operation])
+
+
+def test_move_and_copy():
+    document = {"foo": {"bar": "baz", "waldo": "fred"}, "qux": {"corge": "grault"}, "list": [1, 2, 3, 4]}
+    moved = apply_patch(document, [{"op": "move", "from": "/foo/waldo", "path": "/qux/thud"}])
+    assert moved["foo"] == {"bar": "baz"}
+    assert moved["qux"] == {"corge": "grault", "thud": "fred"}
+    assert apply_patch(document, [{"op": "move", "from": "/list/1", "path": "/list/3"}])["list"] == [1, 3, 4, 2]
+    assert apply_patch(document, [{"op": "move", "from": "/foo", "path": "/foo"}]) == document
+    with pytest.raises(JsonPatchError):
+        apply_patch(document, [{"op": "move", "from": "/foo", "path": "/foo/child"}])
+
+    # 복사한 값을 바꿔도 원래 위치의 값은 바뀌지 않음
+    copied = apply_patch(document, [{"op": "copy", "from": "/foo", "path": "/copy"},
+                                    {"op": "add", "path": "/copy/extra", "value": 1}])
+    assert copied["copy"] == {"bar": "baz", "waldo": "fred", "extra": 1}
+    assert copied["foo"] == {"bar": "baz", "waldo": "fred"}
+
+
+def test_test_operation_compares_json_values():
+    document = {"a": 1, "b": [1, {"c": "x"}], "d": True, "e": None}
+    apply_patch(document, [{"op": "test", "path": "/a", "value": 1.0},
+                           {"op": "test", "path": "/b", "value": [1, {"c": "x"}]},
+                           {"op": "test", "path": "/e", "value": None}])
+    for path, value in (("/a", True), ("/d", 1), ("/a", "1"), ("/b", [1]), ("/e", 0)):
+        with pytest.raises(JsonPatchError):
+            apply_patch(document, [{"op": "test", "path": path, "value": value}])
+    with pytest.raises(JsonPatchError):
+        apply_patch(document, [{"op": "test", "path": "/missing", "value": 1}])
+
+
+def test_failed_patch_reports_operation_and_leaves_original_untouched():
+    document = {"nodes": [{"id": "a", "config": {"x": 1}}], "connections": [], "metadata": {"name": "w"}}
+    original = copy.deepcopy(document)
+    patched = apply_patch(document, [{"op": "replace", "path": "/nodes/0/config/x", "value": 2},
+                                     {"op": "add", "path": "/connections/-", "value": {"from_node": "a"}}])
+    assert patched["nodes"][0]["config"]["x"] == 2
+    assert document == original
+    # 바뀌지 않은 경로는 원본과 공유
+    assert patched["metadata"] is document["metadata"]
+
+    with pytest.raises(JsonPatchError, match="1번 연산"):
+        apply_patch(document, [{"op": "add", "path": "/x", "value": 1}, {"op": "test", "path": "/x", "value": 2}])
+    assert document == original
+
+
+@pytest.mark.parametrize("operations", [
+    {"op": "add", "path": "/a", "value": 1},
+    [{"op": "add", "value": 1}],
+    [{"op": "add", "path": "/a"}],
+    [{"op": "copy", "path": "/a"}],
+    [{"op": "unknown", "path": "/a"}],
+    ["add"],
+])
+def test_malformed_operations_are_rejected(operations):
+    with pytest.raises(JsonPatchError):
+        apply_patch({"a": 0}, operations)
@@ -0,0 +1,149 @@
+# tests/test_keyword_matcher.py
+"""KeywordMatcher.scan 테스트 (위치별 최장 매치, 겹치는 키워드, 토큰 단위/부분 문자열 일치, 한영 혼합 텍스트)"""
+
+import random
+
+from utils.keyword_matcher import KeywordMatcher
+
+
+def _brute_force(tables, whole_token_tables, text):
+    """모든 위치에서 모든 키워드를 직접 비교한 기준 결과"""
+    signals = {}
+    for table, labels in tables.items():
+        signals[table] = {}
+        for label, words in labels.items():
+            positions = []
+            keywords = []
+            for word in dict.fromkeys(word.lower() for word in words if word):
+                found = []
+                for start in range(len(text) - len(word) + 1):
+                    end = start + len(word)
+                    if text[start:end] != word:
+                        continue
+                    if table in whole_token_tables and not (
+                            (start == 0 or text[start - 1].isspace())
+                            and (end == len(text) or text[end].isspace())):
+                        continue
+                    found.append([start, end])
+                if found:
+                    keywords.append(word)
+                    positions.extend(found)
+            if positions:
+                signals[table][label] = {"count": len(positions), "keywords": sorted(keywords),
+                                         "positions": sorted(positions)}
+    return signals
+
+
+def _normalized(signals):
+    """키워드 목록은 등록 순서와 무관하게 비교"""
+    return {table: {label: dict(hit, keywords=sorted(hit["keywords"])) for label, hit in labels.items()}
+            for table, labels in signals.items()}
+
+
+def test_longest_match_and_shorter_prefixes_at_same_position():
+    matcher = KeywordMatcher({"t": {"short": ["data"], "long": ["database"], "longest": ["databases"]}})
+    assert list(matcher._iter_longest("database")) == [(0, "database")]
+    assert list(matcher.iter_matches("databases")) == [(0, 9, "databases"), (0, 8, "database"), (0, 4, "data")]
+
+    signals = matcher.scan("a database and data")
+    assert signals["t"] == {
+        "short": {"count": 2, "keywords": ["data"], "positions": [[2, 6], [15, 19]]},
+        "long": {"count": 1, "keywords": ["database"], "positions": [[2, 10]]}
+    }
+
+
+def test_overlapping_keywords_starting_inside_a_match():
+    matcher = KeywordMatcher({"t": {"ab": ["abc"], "bc": ["bcd"], "c": ["c"]}})
+    assert matcher.scan("abcd")["t"] == {
+        "ab": {"count": 1, "keywords": ["abc"], "positions": [[0, 3]]},
+        "bc": {"count": 1, "keywords": ["bcd"], "positions": [[1, 4]]},
+        "c": {"count": 1, "keywords": ["c"], "positions": [[2, 3]]}
+    }
+    # 같은 문자가 반복되면 겹치는 매치를 모두 셈
+    assert KeywordMatcher({"t": {"aa": ["aa"]}}).scan("aaaa")["t"]["aa"]["positions"] == [[0, 2], [1, 3], [2, 4]]
+
+
+def test_same_keyword_in_several_labels_and_label_order():
+    matcher = KeywordMatcher({
+        "capabilities": {"generation": ["작성", "write"], "documentation": ["문서 작성", "write"]},
+        "workflow": {"parallel": ["동시에"]}
+    })
+    signals = _normalized(matcher.scan("write the 문서 작성 report"))
+    assert list(signals["capabilities"]) == ["generation", "documentation"]
+    assert signals["capabilities"]["generation"] == {
+        "count": 2, "keywords": ["write", "작성"], "positions": [[0, 5], [13, 15]]}
+    assert signals["capabilities"]["documentation"] == {
+        "count": 2, "keywords": ["write", "문서 작성"], "positions": [[0, 5], [10, 15]]}
+    # 매치가 없는 레이블은 빠지지만 테이블은 항상 포함
+    assert signals["workflow"] == {}
+
+
+def test_whole_token_tables_ignore_substrings():
+    tables = {"intents": {"search": ["search", "검색"], "analysis": ["분석"]},
+              "capabilities": {"information_retrieval": ["search", "검색"]}}
+    matcher = KeywordMatcher(tables, whole_token_tables=["intents"])
+
+    text = "research 검색해줘 그리고 search 검색"
+    signals = _normalized(matcher.scan(text))
+    token_search, token_korean = text.index(" search") + 1, text.rindex("검색")
+    # 의도는 공백으로 나눈 토큰 전체가 같아야 하고, 기능은 부분 문자열도 인정
+    assert signals["intents"] == {"search": {
+        "count": 2, "keywords": ["search", "검색"],
+        "positions": [[token_search, token_search + 6], [token_korean, token_korean + 2]]}}
+    assert signals["capabilities"]["information_retrieval"] == {
+        "count": 4, "keywords": ["search", "검색"],
+        "positions": [[2, 8], [9, 11], [token_search, token_search + 6], [token_korean, token_korean + 2]]}
+
+    # 토큰 경계는 공백만 인정 (구두점이 붙은 토큰은 일치하지 않음)
+    assert matcher.scan("분석, 결과")["intents"] == {}
+    assert matcher.scan("분석")["intents"]["analysis"]["positions"] == [[0, 2]]
+
+
+def test_mixed_korean_and_english_text():
+    tables = {
+        "intents": {"analysis": ["분석", "analyze"], "generation": ["요약", "summarize"]},
+        "capabilities": {"information_retrieval": ["검색", "웹", "web search"],
+                         "data_processing": ["데이터", "csv"], "generation": ["요약"]},
+        "workflow": {"parallel": ["동시에", "parallel"]}
+    }
+    matcher = KeywordMatcher(tables, whole_token_tables=["intents"])
+    text = "web search로 csv 데이터를 찾아서 동시에 analyze 하고 요약"
+    signals = matcher.scan(text)
+
+    def span(word):
+        start = text.index(word)
+        return [start, start + len(word)]
+
+    # 공백을 포함한 영어 키워드("web search")는 조사가 붙어도 기능 키워드로 일치
+    assert signals["intents"] == {
+        "analysis": {"count": 1, "keywords": ["analyze"], "positions": [span("analyze")]},
+        "generation": {"count": 1, "keywords": ["요약"], "positions": [span("요약")]}
+    }
+    assert signals["capabilities"]["information_retrieval"] == {
+        "count": 1, "keywords": ["web search"], "positions": [[0, 10]]}
+    assert signals["capabilities"]["data_processing"]["positions"] == [span("csv"), span("데이터")]
+    assert signals["workflow"]["parallel"]["positions"] == [span("동시에")]
+    for table, labels in signals.items():
+        for hit in labels.values():
+            for start, end in hit["positions"]:
+                assert text[start:end] in hit["keywords"]
+
+
+def test_scan_matches_brute_force_on_random_text():
+    rng = random.Random(11)
+    alphabet = "ab검색 "
+    words = sorted({"".join(rng.choice(alphabet[:-1]) for _ in range(rng.randint(1, 4))) for _ in range(30)})
+    tables = {
+        "intents": {f"i{i}": words[i::5] for i in range(5)},
+        "capabilities": {f"c{i}": words[i::3] for i in range(3)}
+    }
+    matcher = KeywordMatcher(tables, whole_token_tables=["intents"])
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert _normalized(matcher.scan(text)) == _brute_force(tables, {"intents"}, text)
+
+
+def test_empty_tables_and_keywords():
+    matcher = KeywordMatcher({"t": {"empty": [""]}})
+    assert matcher.scan("anything") == {"t": {}}
+    assert list(matcher.iter_matches("anything")) == []
@@ -0,0 +1,125 @@
+# tests/test_metrics.py
+"""로그 구간 히스토그램(백분위수 정확도, 스레드별 샤드 합치기)과 Prometheus 텍스트 형식 테스트"""
+
+import random
+import re
+import statistics
+import threading
+
+import pytest
+
+from services.metrics import (
+    BUCKET_COUNT,
+    LATENCY_BUCKETS_S,
+    Histogram,
+    MetricsRegistry,
+    _bucket_index,
+    _bucket_value,
+)
+
+
+def _histogram(values):
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_bucket_value_stays_within_relative_error():
+    assert [_bucket_index(value) for value in range(32)] == list(range(32))
+    for value in [32, 33, 63, 64, 100, 1000, 12345, 10 ** 6, 2 ** 40 + 7]:
+        index = _bucket_index(value)
+        assert abs(_bucket_value(index) - value) / value <= 1 / 32
+        assert _bucket_index(value + 1) in (index, index + 1)
+    assert _bucket_index(-5) == 0
+    assert _bucket_index(2 ** 60) == BUCKET_COUNT - 1
+
+
+def test_quantiles_match_statistics_module():
+    rng = random.Random(7)
+    # 마이크로초 단위 지연처럼 꼬리가 긴 분포
+    values = [int(rng.lognormvariate(9, 1.2)) for _ in range(20000)]
+    histogram = _histogram(values)
+    expected = statistics.quantiles(values, n=100, method="inclusive")
+
+    for percentile in (1, 10, 25, 50, 75, 90, 95, 99):
+        assert histogram.quantile(percentile / 100) == pytest.approx(expected[percentile - 1], rel=0.04)
+    assert histogram.quantile(1.0) == max(values)
+    assert (histogram.count, histogram.total, histogram.max) == (len(values), sum(values), max(values))
+
+
+def test_small_values_and_empty_histogram_are_exact():
+    assert Histogram().quantile(0.5) == 0.0
+    histogram = _histogram([3, 1, 2, 5, 4])
+    assert [histogram.quantile(q) for q in (0.0, 0.2, 0.5, 0.99)] == [1.0, 1.0, 3.0, 5.0]
+
+
+def test_merged_shards_equal_single_histogram():
+    rng = random.Random(3)
+    parts = [[rng.randint(0, 500000) for _ in range(2000)] for _ in range(4)]
+    merged = Histogram()
+    for part in parts:
+        merged.merge(_histogram(part))
+    single = _histogram([value for part in parts for value in part])
+    assert merged.counts == single.counts
+    assert (merged.count, merged.total, merged.max) == (single.count, single.total, single.max)
+
+
+def test_registry_merges_shards_from_threads():
+    registry = MetricsRegistry()
+    barrier = threading.Barrier(4)
+    latencies = {worker: [(i * 4 + worker) / 10 for i in range(500)] for worker in range(4)}
+
+    def work(worker):
+        barrier.wait()
+        for i, latency in enumerate(latencies[worker]):
+            registry.record("search", latency, {"service": latency / 2}, request_bytes=10, response_bytes=100,
+                            error="ValueError" if i % 100 == 0 else None)
+        registry.record(f"tool_{worker}", 1.0)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry._shards) == 4
+    tools = registry.snapshot()["tools"]
+    assert set(tools) == {"search", "tool_0", "tool_1", "tool_2", "tool_3"}
+    search = tools["search"]
+    assert (search["calls"], search["errors"], search["errors_by_type"]) == (2000, 20, {"ValueError": 20})
+    assert search["request_bytes"]["total"] == 20000 and search["response_bytes"]["p99"] == 100
+
+    every = sorted(latency for values in latencies.values() for latency in values)
+    assert search["latency_ms"]["max"] == pytest.approx(every[-1])
+    assert search["latency_ms"]["p50"] == pytest.approx(statistics.median(every), rel=0.04)
+    assert search["phases_ms"]["service"]["p50"] == pytest.approx(statistics.median(every) / 2, rel=0.04)
+
+
+def test_prometheus_exposes_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    for latency_ms in (0.5, 3, 3, 40, 2000):
+        registry.record("search", latency_ms, {"service": latency_ms}, request_bytes=100, response_bytes=5000)
+    registry.record("search", 1, error="TimeoutError")
+    text = registry.prometheus(prefix="test")
+    lines = text.splitlines()
+
+    assert "# TYPE test_tool_latency_seconds histogram" in lines
+    assert "# TYPE test_tool_response_bytes histogram" in lines
+    buckets = [(m.group(1), int(m.group(2))) for m in
+               (re.fullmatch(r'test_tool_latency_seconds_bucket\{tool="search",le="([^"]+)"\} (\d+)', line)
+                for line in lines) if m]
+    assert [le for le, _ in buckets] == [str(bound) for bound in LATENCY_BUCKETS_S] + ["+Inf"]
+    counts = dict(buckets)
+    assert (counts["0.001"], counts["0.005"], counts["0.05"], counts["1.0"], counts["2.5"], counts["+Inf"]) == \
+        (2, 4, 5, 5, 6, 6)
+    assert [count for _, count in buckets] == sorted(count for _, count in buckets)
+
+    assert 'test_tool_latency_seconds_sum{tool="search"} 2.0475' in lines
+    assert 'test_tool_latency_seconds_count{tool="search"} 6' in lines
+    assert 'test_tool_phase_latency_seconds_bucket{tool="search",phase="service",le="+Inf"} 5' in lines
+    assert 'test_tool_response_bytes_bucket{tool="search",le="4096"} 1' in lines
+    assert 'test_tool_response_bytes_bucket{tool="search",le="16384"} 6' in lines
+    assert 'test_tool_response_bytes_sum{tool="search"} 25000' in lines
+    assert 'test_tool_errors_total{tool="search",error="TimeoutError"} 1' in lines
+    assert text.endswith("\n")
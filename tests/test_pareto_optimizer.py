@@ -0,0 +1,175 @@
+# tests/test_pareto_optimizer.py
+"""ParetoOptimizer 테스트 (프론티어의 비지배성, 제약 조건 해석, 가중치/제약 선택, 시간 예산과 대체 선택)"""
+
+import random
+import time
+
+import pytest
+
+from services.pareto_optimizer import OBJECTIVES, ParetoOptimizer, parse_constraints
+
+TOOL_MODEL = {
+    "default": {"failure_probability": 0.02},
+    "tools": {
+        "web_search": {"cost_per_call": 5.0, "failure_probability": 0.05},
+        "document_retrieve": {"cost_per_call": 1.0, "failure_probability": 0.02},
+        "content_generation": {"cost_per_call": 8.0, "cost_per_second": 0.5}
+    },
+    "substitutes": {"web_search": ["document_retrieve"]}
+}
+TOOLS = ["web_search", "document_retrieve", "data_analysis", "content_generation"]
+
+
+def _layered_workflow(node_count, seed=0, width=20):
+    rng = random.Random(seed)
+    nodes = [{"id": "start", "type": "start"}]
+    connections = []
+    previous, layer = ["start"], []
+    for i in range(node_count):
+        node_id = f"n{i}"
+        nodes.append({"id": node_id, "type": "process", "tool_id": rng.choice(TOOLS),
+                      "estimated_time_ms": rng.choice([200, 800, 1500, 3000])})
+        connections += [{"id": f"{s}->{node_id}", "from_node": s, "to_node": node_id, "type": "direct"}
+                        for s in rng.sample(previous, min(len(previous), rng.randint(1, 2)))]
+        layer.append(node_id)
+        if len(layer) == width:
+            previous, layer = layer, []
+    nodes.append({"id": "end", "type": "end"})
+    connections += [{"id": f"{s}->end", "from_node": s, "to_node": "end", "type": "direct"}
+                    for s in layer or previous]
+    return {"workflow_id": "pareto-test", "nodes": nodes, "connections": connections}
+
+
+def _dominates(a, b):
+    return all(x <= y for x, y in zip(a, b)) and a != b
+
+
+def _candidate(variant_id, p95_ms, cost, failure_rate):
+    scores = {"p95_ms": p95_ms, "expected_cost": cost, "failure_rate": failure_rate,
+              "success_rate": 1.0 - failure_rate}
+    return {"variant_id": variant_id, "selection_scores": scores}
+
+
+# 빠르지만 불안정(fast), 싸지만 느림(cheap), 안정적이지만 비쌈(reliable)
+FRONTIER = [_candidate("fast", 1000, 10.0, 0.05),
+            _candidate("cheap", 2000, 5.0, 0.01),
+            _candidate("reliable", 1500, 20.0, 0.0)]
+
+
+def test_frontier_has_no_dominated_candidates():
+    result = ParetoOptimizer().optimize(_layered_workflow(30), tool_model=TOOL_MODEL, time_budget_ms=300)
+    frontier = result["pareto"]["frontier"]
+    assert len(frontier) > 1
+    assert sum(item["selected"] for item in frontier) == 1
+    objectives = [tuple(item["scores"][metric] for metric in OBJECTIVES) for item in frontier]
+    for i, a in enumerate(objectives):
+        assert not any(_dominates(b, a) for j, b in enumerate(objectives) if j != i)
+    # 기준 워크플로우도 프론티어 후보 중 하나에 지배되거나 같음
+    baseline = tuple(result["pareto"]["baseline"][metric] for metric in OBJECTIVES)
+    assert any(all(x <= y for x, y in zip(candidate, baseline)) for candidate in objectives)
+
+
+def test_parse_constraints():
+    assert parse_constraints("p95 < 5s, minimize cost") == {
+        "constraints": [{"metric": "p95_ms", "op": "<", "value": 5000.0}],
+        "objective": {"metric": "expected_cost", "direction": "minimize"}}
+    assert parse_constraints("success >= 99%") == {
+        "constraints": [{"metric": "success_rate", "op": ">=", "value": 0.99}], "objective": None}
+    assert parse_constraints(["latency <= 1.5min", "maximize reliability"])["constraints"][0]["value"] == 90000.0
+    assert parse_constraints("") == {"constraints": [], "objective": None}
+
+
+@pytest.mark.parametrize("constraints, message", [
+    ("speedup < 5", "알 수 없는 지표입니다: speedup"),
+    ("minimize throughput", "알 수 없는 지표입니다: throughput"),
+    ("p95 < 5h", "시간 단위를 해석할 수 없습니다: p95 < 5h"),
+    ("cost < 5s", "expected_cost에는 단위 s를 쓸 수 없습니다"),
+    ("success >= 99ms", "success_rate에는 단위 ms를 쓸 수 없습니다"),
+    ("p95 about 5s", "제약 조건을 해석할 수 없습니다: p95 about 5s"),
+    ("minimize cost, maximize success", "최소화/최대화 목표는 하나만"),
+    (42, "constraints는 문자열 또는 문자열 목록"),
+])
+def test_parse_constraints_rejects_invalid_input(constraints, message):
+    with pytest.raises(ValueError, match=message):
+        parse_constraints(constraints)
+
+
+@pytest.mark.parametrize("weights, expected", [
+    ({"latency": 1}, "fast"),
+    ({"cost": 1}, "cheap"),
+    ({"reliability": 1}, "reliable"),
+    ({"latency": 1, "cost": 1, "reliability": 1}, "cheap"),
+])
+def test_weighted_selection(weights, expected):
+    optimizer = ParetoOptimizer()
+    selected, selection = optimizer._select(FRONTIER, parse_constraints(None), optimizer._normalize_weights(weights))
+    assert selected["variant_id"] == expected
+    assert (selection["method"], selection["feasible"]) == ("weights", True)
+
+
+@pytest.mark.parametrize("constraints, expected, method, feasible", [
+    ("p95 < 1.8s, minimize cost", "fast", "objective", True),
+    ("success >= 99%, minimize p95", "reliable", "objective", True),
+    ("cost <= 10, maximize success", "cheap", "objective", True),
+    ("p95 < 1800ms", "fast", "weights", True),
+    # 만족하는 후보가 없으면 위반 비율이 가장 작은 후보
+    ("p95 < 500ms", "fast", "least_violation", False),
+])
+def test_constraint_selection(constraints, expected, method, feasible):
+    optimizer = ParetoOptimizer()
+    selected, selection = optimizer._select(FRONTIER, parse_constraints(constraints),
+                                            optimizer._normalize_weights(None))
+    assert selected["variant_id"] == expected
+    assert (selection["method"], selection["feasible"]) == (method, feasible)
+
+
+def test_infeasible_constraints_fall_back_to_least_violation():
+    result = ParetoOptimizer().optimize(_layered_workflow(8), tool_model=TOOL_MODEL,
+                                        constraints="p95 < 1ms", time_budget_ms=5000)
+    pareto = result["pareto"]
+    assert pareto["search"]["converged"] and not pareto["search"]["budget_exhausted"]
+    assert (pareto["selection"]["method"], pareto["selection"]["feasible"]) == ("least_violation", False)
+    assert pareto["selection"]["fallback_reason"] == "no_feasible_candidate"
+    best_p95 = min(item["scores"]["p95_ms"] for item in pareto["frontier"])
+    assert pareto["selection"]["scores"]["p95_ms"] == best_p95
+    assert result["optimized_workflow"]["nodes"]
+
+
+@pytest.mark.parametrize("node_count, time_budget_ms", [(200, 100), (500, 250)])
+def test_time_budget_is_respected_with_usable_selection(node_count, time_budget_ms):
+    workflow = _layered_workflow(node_count)
+    optimizer = ParetoOptimizer()
+    started = time.perf_counter()
+    result = optimizer.optimize(workflow, tool_model=TOOL_MODEL, constraints="success >= 99%, minimize cost",
+                                time_budget_ms=time_budget_ms)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    search = result["pareto"]["search"]
+    # 부하가 있는 환경을 고려해 여유를 둠
+    assert elapsed_ms < time_budget_ms * 1.5
+    assert search["budget_exhausted"]
+    # 구조 변형보다 먼저 일괄 재시도 정책을 평가하므로 기준보다 나은 후보가 있음
+    assert search["evaluated"] > 1
+    selection = result["pareto"]["selection"]
+    assert selection["feasible"], selection
+    assert selection["scores"]["success_rate"] > result["pareto"]["baseline"]["success_rate"]
+    assert "fallback_reason" not in selection
+
+
+def test_budget_exhausted_before_feasible_candidate_is_reported():
+    result = ParetoOptimizer().optimize(_layered_workflow(200), tool_model=TOOL_MODEL,
+                                        constraints="p95 < 1ms", time_budget_ms=50)
+    selection = result["pareto"]["selection"]
+    assert (selection["method"], selection["feasible"]) == ("least_violation", False)
+    assert selection["fallback_reason"] == "time_budget_exhausted"
+    assert result["optimized_workflow"]["nodes"]
+
+
+def test_invalid_arguments_are_rejected():
+    optimizer = ParetoOptimizer()
+    workflow = _layered_workflow(3)
+    with pytest.raises(ValueError, match="time_budget_ms"):
+        optimizer.optimize(workflow, time_budget_ms=0)
+    with pytest.raises(ValueError, match="알 수 없는 대체 도구"):
+        optimizer.optimize(workflow, tool_model={"substitutes": {"web_search": ["no_such_tool"]}})
+    with pytest.raises(ValueError, match="가중치에는"):
+        optimizer.optimize(workflow, weights={"p50": 1})
@@ -0,0 +1,112 @@
+# tests/test_pattern_matcher.py
+"""PatternMatcher 비트마스크 Jaccard/충족률 점수와 NodeRecommender의 템플릿 도구 채우기 테스트"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.catalog_index import get_catalog_index
+from services.node_recommender import NodeRecommender
+from services.pattern_matcher import PatternMatcher
+
+
+def _patterns(**required):
+    return {pattern_id: {"name": pattern_id, "required_capabilities": capabilities}
+            for pattern_id, capabilities in required.items()}
+
+
+def _jaccard(a, b):
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+def test_exact_match_scores_one():
+    matcher = PatternMatcher(_patterns(pipeline=["x", "y", "z"], single=["w"]))
+    best = matcher.best(["z", "y", "x", "x"])
+    assert (best["id"], best["score"], best["coverage"]) == ("pipeline", 1.0, 1.0)
+    assert best["matched_capabilities"] == ["x", "y", "z"] and best["missing_capabilities"] == []
+
+
+def test_partial_match_and_min_score():
+    matcher = PatternMatcher(_patterns(pair=["x", "y"], triple=["x", "y", "z"]))
+    # 템플릿에 없는 기능(q)도 합집합 크기에 들어감
+    matches = matcher.match(["x", "q"])
+    assert [(m["id"], m["score"], m["coverage"]) for m in matches] == [
+        ("pair", round(1 / 3, 4), 0.5), ("triple", 0.25, round(1 / 3, 4))]
+    assert matches[0]["missing_capabilities"] == ["y"]
+
+    assert matcher.best(["x", "q"], min_score=0.5) is None
+    assert [m["id"] for m in matcher.match(["x", "q"], min_score=0.3)] == ["pair"]
+    # 겹치는 기능이 없으면 점수가 0이므로 반환하지 않음
+    assert matcher.match(["unknown"]) == [] and matcher.match([]) == []
+
+
+def test_ties_prefer_coverage_then_definition_order():
+    # 둘 다 Jaccard 0.5지만 narrow는 필요 기능을 모두 충족
+    matcher = PatternMatcher(_patterns(wide=["x", "y", "z", "u"], narrow=["x"], same=["x"]))
+    matches = matcher.match(["x", "y"], top_k=3)
+    assert [(m["id"], m["score"], m["coverage"]) for m in matches] == [
+        ("narrow", 0.5, 1.0), ("same", 0.5, 1.0), ("wide", 0.5, 0.5)]
+
+    masks, sizes = matcher.encode_many([["x", "y"], ["x", "y"], ["u", "z"]])
+    best, jaccard, coverage = matcher.best_many(masks, sizes)
+    assert [matcher.pattern_ids[i] for i in best] == ["narrow", "narrow", "wide"]
+    assert np.allclose(jaccard, [0.5, 0.5, 0.5]) and np.allclose(coverage, [1.0, 1.0, 0.5])
+
+
+def test_scores_match_python_sets_across_words():
+    rng = random.Random(0)
+    universe = [f"c{i}" for i in range(150)]
+    patterns = {f"p{i}": {"required_capabilities": rng.sample(universe, rng.randint(1, 90))} for i in range(40)}
+    matcher = PatternMatcher(patterns)
+    assert matcher.words == 3
+
+    queries = [rng.sample(universe + ["extra1", "extra2"], rng.randint(0, 60)) for _ in range(50)]
+    masks, sizes = matcher.encode_many(queries)
+    jaccard, coverage = matcher.score_masks(masks, sizes)
+    for row, query in enumerate(queries):
+        for column, spec in enumerate(patterns.values()):
+            required = spec["required_capabilities"]
+            assert jaccard[row, column] == pytest.approx(_jaccard(query, required), abs=1e-6)
+            assert coverage[row, column] == pytest.approx(len(set(query) & set(required)) / len(required), abs=1e-6)
+
+    # 점수 행렬을 작게 나눠 계산해도 같은 결과
+    best, best_jaccard, _ = matcher.best_many(masks, sizes, chunk_cells=len(patterns) * 3)
+    assert np.allclose(best_jaccard, jaccard.max(axis=1))
+    for row, query in enumerate(queries):
+        top = matcher.best(query)
+        if top is not None:
+            assert matcher.pattern_ids[best[row]] == top["id"]
+
+
+def test_recommendation_lists_tools_added_from_template():
+    recommender = NodeRecommender()
+    web_search = get_catalog_index().get("web_search")
+    result = recommender.recommend("analysis", ["information_retrieval", "data_processing", "generation"],
+                                   [web_search], "low", "sequential")
+    template = result["workflow_template"]
+    assert template["id"] == "analysis_workflow"
+    added = {item["capability"]: item["tool_id"] for item in template["added_tools"]}
+    assert set(added) == {"data_processing", "generation"}
+    assert template["unfilled_capabilities"] == []
+
+    flagged = {node["tool_id"] for node in result["nodes"] if node.get("added_from_template")}
+    assert flagged == set(added.values())
+    assert result["metadata"]["template_tool_count"] == 2
+    assert [node["tool_id"] for node in result["nodes"] if node["type"] == "process"][0] == "web_search"
+
+
+def test_recommendation_reports_capabilities_without_catalog_tools():
+    recommender = NodeRecommender()
+    recommender.pattern_matcher = PatternMatcher(_patterns(custom=["information_retrieval", "no_such_capability"]))
+    result = recommender.recommend("search", ["information_retrieval", "no_such_capability"], [], "low", "sequential")
+    template = result["workflow_template"]
+    assert template["unfilled_capabilities"] == ["no_such_capability"]
+    assert [item["capability"] for item in template["added_tools"]] == ["information_retrieval"]
+
+    # 기준 점수 미만이면 템플릿을 쓰지 않고 분석이 추천한 도구만 배치
+    recommender.template_min_score = 1.01
+    result = recommender.recommend("search", ["information_retrieval", "no_such_capability"], [], "low", "sequential")
+    assert "workflow_template" not in result
+    assert not [node for node in result["nodes"] if node["type"] == "process"]
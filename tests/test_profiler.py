@@ -0,0 +1,70 @@
+# tests/test_profiler.py
+"""profile_call(동시 호출, 다른 프로파일러가 사용 중일 때)과 ToolProfiler 보관 테스트"""
+
+import marshal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import services.profiler as profiler_module
+from services.profiler import ToolProfiler, profile_call
+
+
+def _work(label, delay):
+    time.sleep(delay)
+    return sum(range(1000)), label
+
+
+def test_concurrent_profiled_calls_both_succeed():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(profile_call, False, 5, _work, label, 0.05) for label in ("a", "b")]
+        outcomes = [future.result(timeout=5) for future in futures]
+
+    for label, (result, record) in zip(("a", "b"), outcomes):
+        assert result == (499500, label)
+        assert "profile" not in record
+        assert any("_work" in item["function"] for item in record["top_functions"])
+        assert marshal.loads(record["stats"])
+    assert not profiler_module._profile_lock.locked()
+
+
+def test_profiled_call_runs_unprofiled_when_profiler_is_busy(monkeypatch, tmp_path):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiler_module.cProfile, "Profile", BusyProfile)
+    result, record = profile_call(True, 5, _work, "a", 0)
+    assert result == (499500, "a")
+    assert record["profile"] == {"skipped": "Another profiling tool is already active"}
+    assert "stats" not in record and "memory" in record
+
+    profiler = ToolProfiler(str(tmp_path), keep_slowest=2)
+    assert profiler.add("optimize_workflow", record) is None
+    summary = profiler.summary()
+    assert (summary["profiled_calls"], summary["skipped_calls"], summary["slowest_calls"]) == (1, 1, [])
+
+
+def test_keeps_dumps_of_slowest_calls_only(tmp_path):
+    profiler = ToolProfiler(str(tmp_path), keep_slowest=2)
+    stats = marshal.dumps({})
+    paths = [profiler.add("tool", {"elapsed_ms": elapsed, "pid": 1, "stats": stats}) for elapsed in (5, 20, 10, 1)]
+    assert paths[3] is None
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        path.rsplit("/", 1)[-1] for path in paths[1:3])
+    assert [record["elapsed_ms"] for record in profiler.summary()["slowest_calls"]] == [20, 10]
+
+
+def test_profile_lock_is_released_when_function_raises():
+    def failing():
+        raise RuntimeError("boom")
+
+    try:
+        profile_call(False, 5, failing)
+    except RuntimeError:
+        pass
+    assert not profiler_module._profile_lock.locked()
+    # 다른 스레드에서도 바로 프로파일링할 수 있어야 함
+    done = threading.Event()
+    threading.Thread(target=lambda: (profile_call(False, 5, _work, "c", 0), done.set())).start()
+    assert done.wait(5)
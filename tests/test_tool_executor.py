@@ -0,0 +1,131 @@
+# tests/test_tool_executor.py
+"""ToolExecutor 테스트 (동시 실행 제한, 대기열이 가득 찼을 때의 busy 오류, 스레드/프로세스 실행, 여러 이벤트 루프)"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from services.tool_executor import ToolBusyError, ToolExecutor, parse_limits
+
+
+class _Tracker:
+    """동시에 실행 중인 호출 수의 최댓값을 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def work(self, delay):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(delay)
+        with self.lock:
+            self.running -= 1
+        return delay
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(concurrency_limit=2, queue_limit=8, concurrency_limits={"slow": 1},
+                            queue_limits={"slow": 1})
+    yield executor
+    executor.shutdown()
+
+
+def test_concurrency_limit_per_tool(executor):
+    tracker = _Tracker()
+
+    async def main():
+        return await asyncio.gather(*[executor.run("fast", tracker.work, 0.03) for _ in range(6)])
+
+    assert asyncio.run(main()) == [0.03] * 6
+    assert tracker.peak == 2
+    stats = executor.stats()["tools"]["fast"]
+    assert (stats["completed"], stats["active"], stats["queued"], stats["rejected"]) == (6, 0, 0, 0)
+    assert stats["average_ms"] >= 30
+
+
+def test_full_queue_returns_busy_with_retry_after(executor):
+    async def main():
+        # 평균 소요 시간을 먼저 기록해 재시도 권장 시간을 계산할 수 있게 함
+        await executor.run("slow", time.sleep, 0.02)
+        first = asyncio.ensure_future(executor.run("slow", time.sleep, 0.05))
+        second = asyncio.ensure_future(executor.run("slow", time.sleep, 0.05))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ToolBusyError) as busy:
+            await executor.run("slow", time.sleep, 0)
+        await asyncio.gather(first, second)
+        return busy.value
+
+    busy = asyncio.run(main())
+    details = busy.to_dict()
+    assert details["error"] == "busy" and details["tool"] == "slow"
+    assert (details["active"], details["queued"], details["concurrency_limit"], details["queue_limit"]) == (1, 1, 1, 1)
+    assert isinstance(details["retry_after_ms"], int) and details["retry_after_ms"] >= 20
+    assert executor.stats()["tools"]["slow"]["rejected"] == 1
+
+
+def test_failures_are_counted_and_release_the_slot(executor):
+    def failing():
+        raise RuntimeError("boom")
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await executor.run("slow", failing)
+        return await executor.run("slow", lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    stats = executor.stats()["tools"]["slow"]
+    assert (stats["failed"], stats["completed"], stats["active"]) == (1, 1, 0)
+
+
+def test_limits_work_across_event_loops(executor):
+    tracker = _Tracker()
+
+    async def main():
+        return await asyncio.gather(*[executor.run("slow", tracker.work, 0.01) for _ in range(2)])
+
+    # asyncio.run을 여러 번 부르거나 다른 스레드에서 루프를 돌려도 이전 루프의 세마포어를 쓰지 않음
+    assert asyncio.run(main()) == [0.01, 0.01]
+    assert asyncio.run(main()) == [0.01, 0.01]
+    results = []
+    thread = threading.Thread(target=lambda: results.append(asyncio.run(main())))
+    thread.start()
+    thread.join()
+    assert results == [[0.01, 0.01]]
+    assert tracker.peak == 1
+
+
+def test_thread_and_process_modes():
+    thread_executor = ToolExecutor(mode="thread")
+    process_executor = ToolExecutor(mode="process", max_workers=1)
+    try:
+        async def main():
+            return (await thread_executor.run("tool", threading.current_thread),
+                    await process_executor.run("tool", os.getpid),
+                    await process_executor.run("tool", os.getpid, thread_only=True))
+
+        worker_thread, process_pid, thread_only_pid = asyncio.run(main())
+        assert worker_thread.name.startswith("tool")
+        assert process_pid != os.getpid()
+        assert thread_only_pid == os.getpid()
+    finally:
+        thread_executor.shutdown()
+        process_executor.shutdown()
+
+    with pytest.raises(ValueError):
+        ToolExecutor(mode="fiber")
+    with pytest.raises(ValueError):
+        ToolExecutor(concurrency_limit=0)
+
+
+def test_parse_limits():
+    assert parse_limits("optimize_workflow=2, simulate_workflow=1,") == {"optimize_workflow": 2, "simulate_workflow": 1}
+    assert parse_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_limits("optimize_workflow")
@@ -0,0 +1,142 @@
+# tests/test_tool_memo.py
+"""ToolCallMemo(키, single-flight, 실행을 맡은 호출의 취소)와 런타임 메모이제이션 테스트"""
+
+import asyncio
+
+import pytest
+
+from services.tool_memo import ToolArgumentError, ToolCallMemo
+from services.workflow_runtime import WorkflowRuntime
+
+
+def _workflow(tool_id="web_search", loop=False):
+    nodes = [{"id": "start", "type": "start"},
+             {"id": "fetch", "type": "process", "tool_id": tool_id, "estimated_time_ms": 10},
+             {"id": "end", "type": "end"}]
+    connections = [{"from_node": "start", "to_node": "fetch"}, {"from_node": "fetch", "to_node": "end"}]
+    if loop:
+        connections.append({"from_node": "fetch", "to_node": "fetch", "type": "loop_back"})
+    return {"nodes": nodes, "connections": connections}
+
+
+def _fetch_runs(result):
+    return next(node for node in result["nodes"] if node["node_id"] == "fetch")["runs"]
+
+
+def test_key_normalizes_arguments_and_includes_context():
+    memo = ToolCallMemo()
+    key, normalized, _ = memo.key("web_search", {"query": "q", "max_results": 10.0})
+    assert normalized == {"query": "q", "max_results": 10}
+    assert memo.key("web_search", {"query": "q"})[0] == key
+    assert memo.key("web_search", {"query": "q"}, "a")[0] != key
+    assert memo.key("web_search", {"query": "q"}, "a")[0] != memo.key("web_search", {"query": "q"}, "b")[0]
+
+
+def test_key_rejects_invalid_arguments():
+    memo = ToolCallMemo()
+    with pytest.raises(ToolArgumentError):
+        memo.key("web_search", {})
+    with pytest.raises(ToolArgumentError):
+        memo.key("web_search", {"query": "q", "max_results": "many"}, "context")
+    # context가 있으면 필수 인자는 context로 채워질 수 있으므로 검사하지 않음
+    memo.key("web_search", {}, "context")
+    assert memo.stats()["invalid_arguments"] == 2
+
+
+def test_concurrent_identical_calls_run_once():
+    memo = ToolCallMemo()
+    executions = []
+
+    async def compute():
+        executions.append(1)
+        await asyncio.sleep(0.02)
+        return {"results": len(executions)}
+
+    async def main():
+        return await asyncio.gather(*[memo.call_traced("web_search", {"query": "same"}, compute)
+                                      for _ in range(10)])
+
+    results = asyncio.run(main())
+    assert len(executions) == 1
+    assert [value for value, _ in results] == [{"results": 1}] * 10
+    assert sorted(source for _, source in results) == ["miss"] + ["shared"] * 9
+    assert memo.call_sync("web_search", {"query": "same"}, lambda: pytest.fail("재실행됨")) == {"results": 1}
+
+
+def test_cancelled_leader_hands_execution_to_waiter():
+    memo = ToolCallMemo()
+    started = []
+
+    async def compute():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return len(started)
+
+    async def main():
+        leader = asyncio.create_task(memo.call_traced("web_search", {"query": "q"}, compute))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(memo.call_traced("web_search", {"query": "q"}, compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    value, source = asyncio.run(main())
+    assert (value, source) == (2, "miss")
+    assert memo.stats()["errors"] == 0
+
+
+def test_errors_are_shared_but_not_stored():
+    memo = ToolCallMemo()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(*[memo.call("web_search", {"query": "q"}, failing) for _ in range(3)],
+                                    return_exceptions=True)
+
+    assert all(isinstance(e, RuntimeError) for e in asyncio.run(main()))
+    assert len(calls) == 1
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_runtime_memo_key_covers_inputs():
+    runtime = WorkflowRuntime(memo=ToolCallMemo())
+    arguments = {"web_search": {"query": "q"}}
+    first = runtime.run_sync(_workflow(), inputs={"topic": "a"}, arguments=arguments, time_scale=0, memoize=True)
+    other = runtime.run_sync(_workflow(), inputs={"topic": "b"}, arguments=arguments, time_scale=0, memoize=True)
+    repeat = runtime.run_sync(_workflow(), inputs={"topic": "a"}, arguments=arguments, time_scale=0, memoize=True)
+
+    plain = WorkflowRuntime().run_sync(_workflow(), inputs={"topic": "b"}, arguments=arguments, time_scale=0)
+    assert other["outputs"]["fetch"] == plain["outputs"]["fetch"]
+    assert other["outputs"]["fetch"]["digest"] != first["outputs"]["fetch"]["digest"]
+    assert _fetch_runs(other)[0]["attempts"][0]["memo"] == "miss"
+    assert _fetch_runs(repeat)[0]["attempts"][0]["memo"] == "memory"
+    assert repeat["outputs"] == first["outputs"]
+
+
+def test_runtime_memo_key_covers_loop_iteration():
+    runtime = WorkflowRuntime(memo=ToolCallMemo())
+    result = runtime.run_sync(_workflow(loop=True), loop_iterations=3, time_scale=0, memoize=True)
+    runs = _fetch_runs(result)
+    assert [run["attempts"][0]["memo"] for run in runs] == ["miss"] * 3
+    assert result["outputs"]["fetch"]["iteration"] == 3
+
+
+@pytest.mark.parametrize("memoize", [False, True])
+def test_argument_validation_does_not_depend_on_memoize(memoize):
+    runtime = WorkflowRuntime(memo=ToolCallMemo())
+    # 인자가 없는 노드(recommend_nodes 결과 그대로)는 입력/선행 결과로 실행
+    assert runtime.run_sync(_workflow(), time_scale=0, memoize=memoize)["status"] == "succeeded"
+
+    result = runtime.run_sync(_workflow(), arguments={"fetch": {"query": "q", "max_results": "many"}},
+                              time_scale=0, memoize=memoize)
+    assert result["status"] == "failed"
+    attempts = _fetch_runs(result)[0]["attempts"]
+    assert [attempt["outcome"] for attempt in attempts] == ["invalid_arguments"]
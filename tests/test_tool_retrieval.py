@@ -0,0 +1,134 @@
+# tests/test_tool_retrieval.py
+"""HashingEmbedder/ToolRetrievalIndex 테스트 (검색, 저장/읽기, 근사 검색 재현율, 디스크 인덱스 무효화)"""
+
+import random
+
+import numpy as np
+import pytest
+
+from config.tools_config import ToolCatalog
+from services.tool_retrieval import HashingEmbedder, ToolRetrievalIndex, prepare_tool_index
+
+TOOLS = {
+    "web_search": {"category": "search", "name": "웹 검색", "description": "인터넷에서 최신 정보를 검색합니다"},
+    "document_retrieve": {"category": "search", "name": "문서 검색", "description": "사내 문서 저장소에서 문서를 찾습니다"},
+    "data_analysis": {"category": "analysis", "name": "데이터 분석", "description": "표 데이터의 통계와 추세를 분석합니다"},
+    "send_email": {"category": "communication", "name": "이메일 발송", "description": "결과를 메일로 보냅니다"},
+}
+
+TOPICS = ["weather", "finance", "travel", "music", "sports", "health", "legal", "retail",
+          "energy", "gaming", "cooking", "science", "history", "art", "cars", "pets"]
+ACTIONS = ["search", "summarize", "translate", "forecast", "classify", "compare", "export", "monitor"]
+
+
+def _synthetic_tools(count, seed=0):
+    rng = random.Random(seed)
+    tools = {}
+    for i in range(count):
+        topic, action = rng.choice(TOPICS), rng.choice(ACTIONS)
+        extra = " ".join(rng.sample(TOPICS + ACTIONS, 2))
+        tools[f"{topic}_{action}_{i}"] = {"category": topic, "name": f"{topic} {action}",
+                                           "description": f"{action} {topic} records with {extra} filters"}
+    return tools
+
+
+def test_embedder_is_deterministic_and_matches_inflected_korean():
+    embedder = HashingEmbedder(dim=256)
+    first, second = embedder.embed(["검색해서 정리", "검색합니다"]), HashingEmbedder(dim=256).embed(["검색해서 정리"])
+    assert first.shape == (2, 256) and first.dtype == np.float32
+    assert np.array_equal(first[0], second[0])
+    # 조사/어미가 달라도 문자 n-gram이 겹침
+    assert float(first[0] @ first[1]) > 0
+    assert not embedder.embed(["!!!"]).any()
+
+
+def test_search_ranks_relevant_tools():
+    index = ToolRetrievalIndex.build(TOOLS, dim=256)
+    assert not index.approximate
+    assert index.search("웹에서 최신 뉴스 검색해줘", top_k=2)[0][0] == "web_search"
+    assert index.search("데이터 추세 분석", top_k=1)[0][0] == "data_analysis"
+    results = index.search("메일로 보내기", top_k=10)
+    assert results[0][0] == "send_email"
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert all(score > 0 for _, score in results)
+    assert index.search("???") == [] and index.search("검색", top_k=0) == []
+    with pytest.raises(ValueError):
+        index.search("검색", mode="fast")
+
+
+@pytest.mark.parametrize("approx_min_tools", [4096, 2])
+def test_save_and_load_round_trip(tmp_path, approx_min_tools):
+    tools = _synthetic_tools(200)
+    index = ToolRetrievalIndex.build(tools, dim=128, approx_min_tools=approx_min_tools)
+    path = str(tmp_path / "nested" / "index.npz")
+    index.save(path)
+    loaded = ToolRetrievalIndex.load(path)
+
+    assert loaded.tool_ids == index.tool_ids
+    assert loaded.approximate == index.approximate == (approx_min_tools == 2)
+    assert np.array_equal(loaded.matrix, index.matrix)
+    for query in ("weather forecast", "translate legal records", "monitor energy"):
+        assert loaded.search(query, top_k=5) == index.search(query, top_k=5)
+    assert list(tmp_path.joinpath("nested").iterdir()) == [tmp_path / "nested" / "index.npz"]
+
+
+def test_load_rejects_missing_or_other_format(tmp_path, monkeypatch):
+    import services.tool_retrieval as tool_retrieval
+
+    assert ToolRetrievalIndex.load(str(tmp_path / "missing.npz")) is None
+    path = str(tmp_path / "index.npz")
+    ToolRetrievalIndex.build(TOOLS, dim=64).save(path)
+    monkeypatch.setattr(tool_retrieval, "INDEX_FORMAT", tool_retrieval.INDEX_FORMAT + 1)
+    assert ToolRetrievalIndex.load(path) is None
+
+
+def test_approximate_search_recall_against_exact():
+    tools = _synthetic_tools(3000)
+    index = ToolRetrievalIndex.build(tools, dim=256, approx_min_tools=1000)
+    assert index.approximate and len(index.centroids) == int(3000 ** 0.5)
+    rng = random.Random(1)
+    found = total = 0
+    for _ in range(50):
+        query = f"{rng.choice(ACTIONS)} {rng.choice(TOPICS)} records"
+        exact = {tool_id for tool_id, _ in index.search(query, top_k=10, mode="exact")}
+        approx = index.search(query, top_k=10, mode="approx", nprobe=8)
+        assert len(approx) == 10
+        found += len(exact & {tool_id for tool_id, _ in approx})
+        total += len(exact)
+    assert found / total >= 0.9
+    # 군집을 모두 살펴보면 전체 검색과 같음
+    query = "forecast weather records"
+    assert index.search(query, top_k=10, mode="approx", nprobe=len(index.centroids)) == \
+        index.search(query, top_k=10, mode="exact")
+
+
+def _catalog(tools, version=1):
+    return ToolCatalog(tools, version, ("test-fingerprint",), "files")
+
+
+def test_disk_index_is_rebuilt_when_tool_ids_differ(tmp_path, monkeypatch):
+    monkeypatch.setenv("TOOL_CATALOG_SNAPSHOT", str(tmp_path / "catalog.marshal"))
+    first = prepare_tool_index(_catalog(TOOLS), dim=64)
+    assert list(tmp_path.glob("tool_index.*.npz"))
+    # 같은 파일 지문에서 읽어도 다시 만들지 않음
+    assert prepare_tool_index(_catalog(TOOLS, 2), dim=64).tool_ids == first.tool_ids
+
+    # 파일 지문은 같지만 도구가 바뀐 카탈로그 (bump_catalog_version)
+    changed = dict(TOOLS, translate={"category": "language", "name": "번역", "description": "문장을 번역합니다"})
+    index = prepare_tool_index(_catalog(changed, 3), dim=64)
+    assert set(index.tool_ids) == set(changed)
+    assert index.search("번역해줘", top_k=1)[0][0] == "translate"
+
+
+def test_disk_index_follows_approx_threshold(tmp_path, monkeypatch):
+    monkeypatch.setenv("TOOL_CATALOG_SNAPSHOT", str(tmp_path / "catalog.marshal"))
+    tools = _synthetic_tools(100)
+    monkeypatch.setenv("TOOL_INDEX_APPROX_MIN_TOOLS", "4096")
+    assert not prepare_tool_index(_catalog(tools), dim=64).approximate
+
+    # 기준을 낮추면 저장해 둔 전체 검색용 인덱스 대신 군집이 있는 인덱스를 만듦
+    monkeypatch.setenv("TOOL_INDEX_APPROX_MIN_TOOLS", "50")
+    assert prepare_tool_index(_catalog(tools, 2), dim=64).approximate
+    assert len(list(tmp_path.glob("tool_index.*.npz"))) == 2
+    monkeypatch.setenv("TOOL_INDEX_APPROX_MIN_TOOLS", "4096")
+    assert not prepare_tool_index(_catalog(tools, 3), dim=64).approximate
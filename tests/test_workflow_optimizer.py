@@ -0,0 +1,187 @@
+# tests/test_workflow_optimizer.py
+"""WorkflowOptimizer 재작성 패스(parallelize_chains, merge_duplicates, reorder_cheap_first) 테스트"""
+
+import copy
+import random
+
+import pytest
+
+from services import WorkflowOptimizer
+from services.dag_scheduler import build_execution_plan
+from services.workflow_graph import WorkflowGraph
+
+
+def _node(node_id, tool_id=None, time_ms=1000, **fields):
+    if tool_id is None:
+        return {"id": node_id, "type": node_id, "name": node_id}
+    return dict({"id": node_id, "type": "process", "tool_id": tool_id, "name": node_id,
+                 "estimated_time_ms": time_ms}, **fields)
+
+
+def _chain(*node_ids):
+    return [{"id": f"conn_{u}_to_{v}", "from_node": u, "to_node": v, "type": "direct"}
+            for u, v in zip(node_ids, node_ids[1:])]
+
+
+def _workflow(nodes, connections):
+    return {"workflow_id": "wf-test", "nodes": nodes, "connections": connections}
+
+
+def _stage_of(result, node_id):
+    return result["optimized_workflow"]["execution_plan"]["node_timing"][node_id]["stage"]
+
+
+def _assert_valid_dag(workflow):
+    node_ids = {node["id"] for node in workflow["nodes"]}
+    for connection in workflow["connections"]:
+        assert connection["from_node"] in node_ids
+        assert connection["to_node"] in node_ids
+    plan = build_execution_plan(workflow["nodes"], workflow["connections"])
+    assert not plan["has_cycle"]
+    assert sorted(workflow["execution_order"]) == sorted(node_ids)
+
+
+def test_independent_chain_is_parallelized():
+    workflow = _workflow(
+        [_node("start"), _node("search", "web_search", 2000), _node("retrieve", "document_retrieve", 1000),
+         _node("end")],
+        _chain("start", "search", "retrieve", "end")
+    )
+    result = WorkflowOptimizer().optimize(workflow, "speed")
+
+    _assert_valid_dag(result["optimized_workflow"])
+    assert _stage_of(result, "search") == _stage_of(result, "retrieve")
+    metrics = result["improvement_metrics"]
+    assert metrics["critical_path_before_ms"] == 3000
+    assert metrics["critical_path_after_ms"] == 2000
+    parallelize = result["optimization_passes"][0]
+    assert parallelize["name"] == "parallelize_chains" and parallelize["applied"]
+
+
+@pytest.mark.parametrize("downstream", [
+    # 카탈로그 도구 의존성 (content_generation → data_analysis)
+    _node("generate", "content_generation", 500),
+    # 노드의 depends_on 필드
+    _node("generate", "web_search", 500, depends_on=["analyze"]),
+])
+def test_dependent_chain_is_not_parallelized_or_reordered(downstream):
+    workflow = _workflow(
+        [_node("start"), _node("analyze", "data_analysis", 5000), downstream, _node("end")],
+        _chain("start", "analyze", "generate", "end")
+    )
+    for goal in ("speed", "cost"):
+        result = WorkflowOptimizer().optimize(workflow, goal)
+        optimized = result["optimized_workflow"]
+        _assert_valid_dag(optimized)
+        # 더 빠른 generate가 analyze보다 먼저 오거나 같은 단계로 옮겨지지 않음
+        assert _stage_of(result, "analyze") < _stage_of(result, "generate")
+        assert WorkflowGraph(optimized).reachable("analyze", "generate")
+        assert result["improvement_metrics"]["critical_path_after_ms"] == 5500
+
+
+def test_duplicate_calls_are_merged():
+    workflow = _workflow(
+        [_node("start"),
+         _node("search_a", "web_search", 2000, arguments={"query": "x"}, retry_count=1),
+         _node("search_b", "web_search", 2000, arguments={"query": "x"}, retry_count=3),
+         _node("search_c", "web_search", 2000, arguments={"query": "y"}),
+         _node("end")],
+        [{"id": f"conn_{u}_to_{v}", "from_node": u, "to_node": v, "type": "parallel"}
+         for u, v in [("start", "search_a"), ("start", "search_b"), ("start", "search_c"),
+                      ("search_a", "end"), ("search_b", "end"), ("search_c", "end")]]
+    )
+    result = WorkflowOptimizer().optimize(workflow, "cost")
+    optimized = result["optimized_workflow"]
+    _assert_valid_dag(optimized)
+
+    nodes = {node["id"]: node for node in optimized["nodes"]}
+    assert "search_b" not in nodes
+    assert "search_c" in nodes
+    assert nodes["search_a"]["merged_from"] == ["search_b"]
+    assert nodes["search_a"]["retry_count"] == 3
+    assert result["improvement_metrics"]["tool_invocations_after"] == 2
+    assert all("search_b" not in (c["from_node"], c["to_node"]) for c in optimized["connections"])
+
+
+def test_cheap_nodes_move_first_in_independent_chain():
+    workflow = _workflow(
+        [_node("start"), _node("slow", "code_execution", 3000), _node("mid", "api_call", 2000),
+         _node("fast", "document_retrieve", 500), _node("end")],
+        _chain("start", "slow", "mid", "fast", "end")
+    )
+    result = WorkflowOptimizer().optimize(workflow, "cost")
+    optimized = result["optimized_workflow"]
+    _assert_valid_dag(optimized)
+
+    assert optimized["execution_order"] == ["start", "fast", "mid", "slow", "end"]
+    reorder = next(report for report in result["optimization_passes"] if report["name"] == "reorder_cheap_first")
+    assert reorder["changes"] == [{"chain": ["slow", "mid", "fast"], "reordered": ["fast", "mid", "slow"]}]
+    assert result["improvement_metrics"]["critical_path_after_ms"] == 5500
+
+
+def test_cycle_skips_rewrites():
+    workflow = _workflow(
+        [_node("a", "web_search"), _node("b", "document_retrieve")],
+        _chain("a", "b") + _chain("b", "a")
+    )
+    result = WorkflowOptimizer().optimize(workflow, "speed")
+    assert result["optimization_passes"][0]["name"] == "all"
+    assert not result["optimization_passes"][0]["applied"]
+
+
+def test_unknown_pass_is_rejected():
+    with pytest.raises(ValueError):
+        WorkflowOptimizer().optimize(_workflow([], []), "speed", passes=["no_such_pass"])
+
+
+def _random_workflow(rng, size):
+    tools = ["web_search", "document_retrieve", "data_analysis", "code_execution", "database_query",
+             "api_call", "content_generation"]
+    nodes = [_node("start")]
+    connections = []
+    previous = ["start"]
+    for i in range(size):
+        node_id = f"n{i}"
+        sources = rng.sample(previous, min(len(previous), rng.randint(1, 2)))
+        fields = {"arguments": {"q": rng.randint(0, 2)}}
+        if rng.random() < 0.3:
+            fields["depends_on"] = [s for s in sources if s != "start"]
+        nodes.append(_node(node_id, rng.choice(tools), rng.choice([200, 1000, 3000]), **fields))
+        connections += [{"id": f"conn_{s}_to_{node_id}", "from_node": s, "to_node": node_id,
+                         "type": rng.choice(["direct", "direct", "parallel"])} for s in sources]
+        previous = previous[-4:] + [node_id]
+    sinks = {node["id"] for node in nodes} - {c["from_node"] for c in connections}
+    nodes.append(_node("end"))
+    connections += [{"id": f"conn_{s}_to_end", "from_node": s, "to_node": "end", "type": "direct"}
+                    for s in sorted(sinks)]
+    return _workflow(nodes, connections)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("goal", ["speed", "cost", "reliability"])
+def test_random_workflows_keep_required_order(seed, goal):
+    workflow = _random_workflow(random.Random(seed), 25)
+    original = copy.deepcopy(workflow)
+    result = WorkflowOptimizer().optimize(workflow, goal)
+
+    # 원본 워크플로우는 수정하지 않음
+    assert workflow == original
+    optimized = result["optimized_workflow"]
+    _assert_valid_dag(optimized)
+
+    # 병합된 노드는 남은 노드로 대응시켜 실제 의존 관계가 모두 순서로 남아 있는지 확인
+    kept = {}
+    for node in optimized["nodes"]:
+        kept[node["id"]] = node["id"]
+        for merged in node.get("merged_from", []):
+            kept[merged] = node["id"]
+    resolve = lambda node_id: kept[node_id] if kept[node_id] == node_id else resolve(kept[node_id])
+
+    before = WorkflowGraph(workflow)
+    after = WorkflowGraph(optimized)
+    for connection in workflow["connections"]:
+        u, v = connection["from_node"], connection["to_node"]
+        if before.depends_on(v, u) and resolve(u) != resolve(v):
+            assert after.reachable(resolve(u), resolve(v)), (u, v)
+    assert result["improvement_metrics"]["critical_path_after_ms"] <= \
+        result["improvement_metrics"]["critical_path_before_ms"]
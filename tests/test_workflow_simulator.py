@@ -0,0 +1,25 @@
+# tests/test_workflow_simulator.py
+"""WorkflowSimulator 지연 모델 병합 테스트"""
+
+from services import WorkflowSimulator
+
+
+def test_default_model_does_not_apply_to_non_process_nodes():
+    nodes = [{"id": "start", "type": "start"}, {"id": "input_node", "type": "input"},
+             {"id": "a", "type": "process", "tool_id": "web_search"}, {"id": "check", "type": "condition"},
+             {"id": "b", "type": "process", "tool_id": "web_search"}, {"id": "output_node", "type": "output"},
+             {"id": "end", "type": "end"}]
+    order = [node["id"] for node in nodes]
+    workflow = {"nodes": nodes,
+                "connections": [{"from_node": u, "to_node": v} for u, v in zip(order, order[1:])]}
+    result = WorkflowSimulator().simulate(
+        workflow, trials=50, seed=0,
+        latency_model={"default": {"median_ms": 500, "distribution": "fixed", "retry_count": 2,
+                                   "timeout_ms": 100000}}
+    )
+
+    assert result["makespan_ms"]["p99"] == 1000.0
+    blame = {item["node_id"]: item for item in result["node_blame"]}
+    for node_id in ("start", "input_node", "check", "output_node", "end"):
+        assert blame[node_id]["mean_duration_ms"] == 0.0
+    assert blame["a"]["mean_critical_contribution_ms"] == 500.0
@@ -0,0 +1,105 @@
+# tests/test_workflow_store.py
+"""WorkflowStore 버전 저장(중복 제거, 보관 개수/기간 정리, delta 복원, 저장 실패 처리) 테스트"""
+
+import pytest
+
+from services.workflow_store import WorkflowNotFoundError, WorkflowStore
+
+
+def _workflow(name, node_count=2):
+    return {"name": name, "nodes": [{"id": f"n{i}", "type": "process"} for i in range(node_count)],
+            "connections": []}
+
+
+def _apply_delta(base, delta):
+    return dict(base, **delta)
+
+
+def test_identical_save_is_deduplicated(tmp_path):
+    store = WorkflowStore(str(tmp_path / "workflows.db"))
+    first = store.save(_workflow("a"), "recommend_nodes")
+    again = store.save(_workflow("a"), "recommend_nodes", workflow_id=first["workflow_id"])
+    assert again["deduplicated"] and again["version"] == first["version"] == 1
+
+    changed = store.save(_workflow("a", 3), "patch", workflow_id=first["workflow_id"])
+    assert (changed["version"], changed["parent_version"], changed["deduplicated"]) == (2, 1, False)
+    # 내용이 같아도 최신 버전이 아니면 새 버전으로 저장
+    back = store.save(_workflow("a"), "patch", workflow_id=first["workflow_id"])
+    assert back["version"] == 3
+    assert store.stats()["deduplicated"] == 1
+
+
+def test_saved_document_is_isolated_from_caller(tmp_path):
+    store = WorkflowStore(str(tmp_path / "workflows.db"))
+    workflow = _workflow("a")
+    info = store.save(workflow, "recommend_nodes")
+    workflow["nodes"].append({"id": "late"})
+    assert len(store.get(info["workflow_id"])["nodes"]) == 2
+    assert "workflow_id" not in workflow
+
+
+def test_max_versions_keeps_snapshot_needed_by_deltas(tmp_path):
+    store = WorkflowStore(str(tmp_path / "workflows.db"), max_versions=2, delta_applier=_apply_delta,
+                          cache_size=0)
+    workflow_id = store.save(_workflow("a"), "recommend_nodes")["workflow_id"]
+    for step in range(3):
+        store.save_delta(workflow_id, {"step": step}, "incremental", parent_version=step + 1, node_count=2)
+
+    versions = [info["version"] for info in store.history(workflow_id)]
+    # v3, v4만 보관 대상이지만 delta를 복원할 v1 전체 문서(와 사이의 delta)는 남김
+    assert versions == [4, 3, 2, 1]
+    assert store.get(workflow_id)["step"] == 2
+
+    store.save(_workflow("b"), "patch", workflow_id=workflow_id)
+    store.save(_workflow("c"), "patch", workflow_id=workflow_id)
+    assert [info["version"] for info in store.history(workflow_id)] == [6, 5]
+    with pytest.raises(WorkflowNotFoundError):
+        store.load(workflow_id, 4)
+
+
+def test_max_workflows_removes_least_recently_saved(tmp_path):
+    store = WorkflowStore(str(tmp_path / "workflows.db"), max_workflows=2)
+    ids = [store.save(_workflow(name), "recommend_nodes")["workflow_id"] for name in ("a", "b")]
+    # a를 다시 저장하면 가장 최근에 저장한 워크플로우가 됨
+    store.save(_workflow("a", 3), "patch", workflow_id=ids[0])
+    newest = store.save(_workflow("c"), "recommend_nodes")["workflow_id"]
+
+    assert store.stats()["workflows"] == 2
+    assert store.stats()["expired"] == 1
+    store.load(ids[0])
+    store.load(newest)
+    with pytest.raises(WorkflowNotFoundError):
+        store.load(ids[1])
+    with pytest.raises(WorkflowNotFoundError):
+        store.load(ids[1], 1)
+
+
+def test_max_age_removes_stale_workflows(tmp_path, monkeypatch):
+    import services.workflow_store as workflow_store
+
+    store = WorkflowStore(str(tmp_path / "workflows.db"), max_age_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr(workflow_store.time, "time", lambda: now[0])
+    stale = store.save(_workflow("a"), "recommend_nodes")["workflow_id"]
+    now[0] += 30
+    kept = store.save(_workflow("b"), "recommend_nodes")["workflow_id"]
+    now[0] += 45
+    store.save(_workflow("c"), "recommend_nodes")
+
+    assert store.stats()["workflows"] == 2
+    store.load(kept)
+    with pytest.raises(WorkflowNotFoundError):
+        store.load(stale)
+
+
+def test_try_save_logs_and_reports_write_failures(tmp_path, caplog):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    store = WorkflowStore(str(blocker / "workflows.db"))
+    with caplog.at_level("WARNING", logger="services.workflow_store"):
+        result = store.try_save(_workflow("a"), "recommend_nodes")
+    assert set(result) == {"error", "message"}
+    assert store.save_errors == 1
+    assert "워크플로우 저장 실패" in caplog.text
+    with pytest.raises(OSError):
+        store.save(_workflow("a"), "recommend_nodes")